@@ -0,0 +1,134 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.logger.logger import JSONLogger
+from downloader.transform.transform_aggregations import (
+    Aggregation,
+    TransformAggregations,
+)
+
+AGGREGATIONS = [
+    ("views_per_category", ["category_id"], "views", "sum"),
+    ("likes_per_category", ["category_id"], "likes", "sum"),
+    ("dislikes_per_category", ["category_id"], "dislikes", "sum"),
+    ("comments_per_category", ["category_id"], "comment_count", "sum"),
+    ("mean_views_per_category", ["category_id"], "views", "mean"),
+    ("views_per_channel", ["channel_title"], "views", "sum"),
+]
+
+"""
+Computes every aggregation of `AGGREGATIONS` using one variant and
+measures it.
+
+Variants:
+    - "separate": a transform per aggregation, parsing the file each time.
+    - "single": one transform computing every aggregation in a single scan.
+
+Args:
+    directory (str): The directory holding the synthetic dataset.
+    variant (str): The variant.
+    chunk_size (int | None): The chunk size used to stream the file.
+
+Returns:
+    dict[str, Any]: The time in seconds, the rows parsed and the peak RSS
+        of the process in bytes.
+"""
+
+
+def aggregate(
+    directory: str, variant: str, chunk_size: int | None
+) -> dict[str, Any]:
+    aggregations = [
+        Aggregation(name=name, group_by=group_by, metric=metric, reducer=r)
+        for name, group_by, metric, r in AGGREGATIONS
+    ]
+    batches = (
+        [[aggregation] for aggregation in aggregations]
+        if variant == "separate"
+        else [aggregations]
+    )
+    paths = {
+        "video_file_path": f"{directory}/GBvideos.csv",
+        "category_file_path": f"{directory}/GB_category_id.json",
+        "output_path": f"{directory}/{variant}",
+    }
+    rows_read = 0
+
+    start = time.perf_counter()
+
+    for batch in batches:
+        transform = TransformAggregations(
+            aggregations=batch,
+            logger=mock.MagicMock(spec=JSONLogger),
+            chunk_size=chunk_size,
+        )
+        transform.transform(paths, [])
+        rows_read += transform.rows_read
+
+    return {
+        "variant": variant,
+        "aggregations": len(aggregations),
+        "chunk_size": chunk_size,
+        "rows_read": rows_read,
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * 1024,
+    }
+
+
+"""
+Compares computing several aggregations with a transform each against
+computing them in a single scan, over a synthetic dataset.
+
+Every variant runs in a freshly spawned process so peak RSS figures are
+not affected by earlier variants.
+
+Usage:
+    python -m downloader.benchmark.aggregations --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("aggregations_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the synthetic dataset(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Rows read at a time, defaults to reading the file in full.",
+        default=None,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Generated in a process of its own so its memory does not count
+        # towards the peak RSS of the variants.
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            executor.submit(generate, directory, args.rows).result()
+
+        for variant in ["separate", "single"]:
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results.append(
+                    executor.submit(
+                        aggregate, directory, variant, args.chunk_size
+                    ).result()
+                )
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,230 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import time
+import types
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.data_retrieve import kaggle_retrieve
+from downloader.data_retrieve.resumable_download import ResumableDownload
+from downloader.logger.logger import JSONLogger
+from downloader.main import batch, batch_parser, parser, run
+
+REMOTE_PATH = "owner/dataset"
+COUNTRIES = ["GB", "US"]
+
+"""
+Returns a stand-in for the Kaggle API serving the current version of a
+dataset.
+
+Returns:
+    mock.MagicMock
+"""
+
+
+def stub_api() -> mock.MagicMock:
+    api = mock.MagicMock()
+    api.dataset_list.return_value = [
+        types.SimpleNamespace(
+            ref=REMOTE_PATH,
+            current_version_number=115,
+            last_updated=datetime.datetime(2019, 6, 3),
+        )
+    ]
+
+    return api
+
+
+"""
+Returns a stand-in for `ResumableDownload.download`, each file download
+copying it from `source_path` after `latency` seconds.
+
+Args:
+    source_path (str): The directory holding the dataset files.
+    latency (float): The seconds each file download takes.
+
+Returns:
+    mock.MagicMock
+"""
+
+
+def stub_download(source_path: str, latency: float) -> mock.MagicMock:
+    def download(
+        url: str, directory: str, file_name: str, **kwargs: Any
+    ) -> str:
+        time.sleep(latency)
+        os.makedirs(directory, exist_ok=True)
+
+        return shutil.copy(
+            f"{source_path}/{file_name}", f"{directory}/{file_name}"
+        )
+
+    return mock.MagicMock(side_effect=download)
+
+
+"""
+Returns the bytes on disk of the files under a directory, counting files
+linked more than once a single time.
+
+Args:
+    directory (str): The directory.
+
+Returns:
+    int
+"""
+
+
+def disk_bytes(directory: str) -> int:
+    inodes: dict[int, int] = {}
+
+    for root, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            stat = os.stat(f"{root}/{file_name}")
+            inodes[stat.st_ino] = stat.st_size
+
+    return sum(inodes.values())
+
+
+"""
+Retrieves and transforms versions of a dataset in one variant, from an
+empty temporary save directory.
+
+Variants:
+    - "sequential": a run of each version in turn, as separate invocations
+      of the importer do, without their interpreter start up.
+    - "batch": a batch of every version.
+
+Args:
+    directory (str): The working directory, holding the dataset files in
+        "data".
+    variant (str): The variant.
+    versions (int): The number of versions.
+    workers (int): The number of worker processes.
+    latency (float): The seconds each file download takes.
+
+Returns:
+    dict[str, Any]: The time in seconds, the number of file downloads and
+        the bytes on disk of the retrieved files.
+"""
+
+
+def measure(
+    directory: str, variant: str, versions: int, workers: int, latency: float
+) -> dict[str, Any]:
+    tmp_path = f"{directory}/{variant}/scratch"
+    api = stub_api()
+    download = stub_download(f"{directory}/data", latency)
+    logger = mock.MagicMock(spec=JSONLogger)
+    options = ["--force", "--workers", str(workers), "--countries", *COUNTRIES]
+    manifest_path = f"{directory}/{variant}/manifest.txt"
+
+    os.makedirs(f"{directory}/{variant}/downloader/logs")
+    os.chdir(f"{directory}/{variant}")
+
+    with open(manifest_path, "w") as f:
+        f.writelines(
+            f"{REMOTE_PATH}/{version}\n" for version in range(1, versions + 1)
+        )
+
+    start = time.perf_counter()
+
+    with mock.patch("downloader.main.TMP_PATH", tmp_path), mock.patch.object(
+        kaggle_retrieve, "kaggle_api", return_value=api
+    ), mock.patch.object(ResumableDownload, "download", download):
+        if variant == "sequential":
+            succeeded = sum(
+                run(
+                    parser.parse_args(
+                        ["owner", "dataset", str(version), *options]
+                    ),
+                    logger,
+                )["success"]
+                for version in range(1, versions + 1)
+            )
+        else:
+            args = batch_parser.parse_args([manifest_path, *options])
+            succeeded = batch(
+                args,
+                [
+                    ("owner", "dataset", str(version))
+                    for version in range(1, versions + 1)
+                ],
+                logger,
+            )["succeeded"]
+
+    return {
+        "variant": variant,
+        "seconds": round(time.perf_counter() - start, 4),
+        "succeeded": succeeded,
+        "downloads": download.call_count,
+        "retrieved_bytes": disk_bytes(f"{tmp_path}/owner"),
+    }
+
+
+"""
+Compares retrieving and transforming many versions of a dataset with a
+batch against a run of each version in turn, with a stand-in for the Kaggle
+API serving the current version of a synthetic dataset.
+
+Usage:
+    python -m downloader.benchmark.batch --versions 10 --rows 200000
+"""
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser("batch_benchmark")
+    argument_parser.add_argument(
+        "--rows",
+        help="Number of rows in the synthetic dataset of each "
+        "country(default=200000).",
+        default=200_000,
+        type=int,
+    )
+    argument_parser.add_argument(
+        "--versions",
+        help="Number of versions(default=10).",
+        default=10,
+        type=int,
+    )
+    argument_parser.add_argument(
+        "--workers",
+        help="Number of worker processes(default=4).",
+        default=4,
+        type=int,
+    )
+    argument_parser.add_argument(
+        "--latency",
+        help="Seconds each file download takes(default=0.5).",
+        default=0.5,
+        type=float,
+    )
+    args = argument_parser.parse_args()
+
+    cwd = os.getcwd()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for seed, country in enumerate(COUNTRIES):
+            generate(
+                f"{directory}/data", args.rows, country=country, seed=seed
+            )
+
+        try:
+            for variant in ["sequential", "batch"]:
+                results.append(
+                    measure(
+                        directory,
+                        variant,
+                        args.versions,
+                        args.workers,
+                        args.latency,
+                    )
+                )
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps(results, indent=2))
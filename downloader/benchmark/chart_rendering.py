@@ -0,0 +1,116 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from downloader.data_output.chart_renderer import BarChart, ChartRenderer
+
+LABELS = [f"Category {index}" for index in range(16)]
+
+"""
+Renders a number of bar charts using one rendering variant and measures it.
+
+Variants:
+    - "pyplot": a new pyplot figure per chart, closed once saved.
+    - "renderer": a single `ChartRenderer` figure reused for every chart.
+
+Args:
+    variant (str): The rendering variant.
+    charts (int): The number of charts to render.
+
+Returns:
+    dict[str, Any]: The charts rendered per second and the peak RSS of the
+        process in bytes.
+"""
+
+
+def render(variant: str, charts: int) -> dict[str, Any]:
+    bar_charts = [
+        BarChart(
+            labels=LABELS,
+            values=[(index * 7 + bar) % 23 for bar in range(len(LABELS))],
+            title="Youtube Views by Category",
+            xlabel="Category",
+            ylabel="Views(millions)",
+        )
+        for index in range(charts)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+
+        if variant == "pyplot":
+            import matplotlib
+
+            matplotlib.use("Agg")
+
+            import matplotlib.pyplot as plt
+
+            for index, chart in enumerate(bar_charts):
+                plt.figure()
+                plt.bar(chart.labels, chart.values, color=chart.color)
+                plt.xlabel(chart.xlabel)
+                plt.ylabel(chart.ylabel)
+                plt.xticks(rotation=chart.label_rotation)
+                plt.title(chart.title)
+                plt.savefig(f"{directory}/chart_{index}.png")
+                plt.close()
+        else:
+            ChartRenderer().render_many(
+                (chart, f"{directory}/chart_{index}")
+                for index, chart in enumerate(bar_charts)
+            )
+
+        seconds = time.perf_counter() - start
+
+    return {
+        "variant": variant,
+        "charts": charts,
+        "seconds": round(seconds, 4),
+        "charts_per_second": round(charts / seconds, 2),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * 1024,
+    }
+
+
+"""
+Reports the rendering rate and memory of each chart rendering variant.
+
+Every variant runs in a freshly spawned process so peak RSS figures are
+not affected by earlier variants.
+
+Usage:
+    python -m downloader.benchmark.chart_rendering --charts 200
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("chart_rendering_benchmark")
+    parser.add_argument(
+        "--charts",
+        help="Number of charts rendered by each variant(default=100).",
+        default=100,
+        type=int,
+    )
+    parser.add_argument(
+        "--variants",
+        help="Rendering variants to measure(default=all).",
+        nargs="+",
+        default=["pyplot", "renderer"],
+    )
+    args = parser.parse_args()
+
+    results = []
+
+    for variant in args.variants:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results.append(
+                executor.submit(render, variant, args.charts).result()
+            )
+
+    print(json.dumps(results, indent=2))
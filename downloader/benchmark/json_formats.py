@@ -0,0 +1,140 @@
+import argparse
+import importlib.util
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import pandas as pd
+
+from downloader.benchmark.synthetic import generate
+from downloader.data_output.json_formats import (
+    JSON_COMPRESSIONS,
+    JSON_FORMATS,
+    file_name,
+    write_json,
+)
+
+"""
+Builds a per-video result from a synthetic dataset, the title, channel,
+summed views and likes and the number of trending days of each video.
+
+Args:
+    directory (str): The directory the synthetic dataset is written to.
+    rows (int): The number of rows in the synthetic dataset.
+
+Returns:
+    pd.DataFrame
+"""
+
+
+def per_video(directory: str, rows: int) -> pd.DataFrame:
+    video_file_path = generate(directory, rows)[0]
+
+    return (
+        pd.read_csv(
+            video_file_path,
+            usecols=["video_id", "title", "channel_title", "views", "likes"],
+        )
+        .groupby("video_id", sort=False)
+        .agg(
+            title=("title", "last"),
+            channel_title=("channel_title", "last"),
+            views=("views", "sum"),
+            likes=("likes", "sum"),
+            days=("views", "size"),
+        )
+        .reset_index()
+    )
+
+
+"""
+Writes a result in one format and measures it.
+
+Variants:
+    - "baseline": `DataFrame.to_json(orient="records")` written in place,
+      as outputs were written before formats were added.
+    - "<format>" or "<format>+<compression>": written by `write_json`.
+
+Args:
+    data (pd.DataFrame): The result.
+    directory (str): The directory the file is written to.
+    variant (str): The variant.
+
+Returns:
+    dict[str, Any]: The time in seconds, the size of the file in bytes and
+        the peak memory in bytes allocated while writing.
+"""
+
+
+def write(data: pd.DataFrame, directory: str, variant: str) -> dict[str, Any]:
+    json_format, _, compression = variant.partition("+")
+    file_path = (
+        f"{directory}/baseline.json"
+        if variant == "baseline"
+        else file_name(
+            f"{directory}/{json_format}", json_format, compression or None
+        )
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    if variant == "baseline":
+        data.to_json(file_path, orient="records")
+    else:
+        write_json(data, file_path, json_format, compression or None)
+
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "variant": variant,
+        "seconds": round(seconds, 4),
+        "bytes": os.path.getsize(file_path),
+        "peak_alloc_bytes": peak,
+    }
+
+
+"""
+Compares the size, write time and memory of each output format and
+compression for a per-video result, against the records JSON written
+before formats were added.
+
+Usage:
+    python -m downloader.benchmark.json_formats --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("json_formats_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the synthetic dataset, the result holds a "
+        "row per video, about a tenth of them(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    compressions = [None] + [
+        compression
+        for compression in JSON_COMPRESSIONS
+        if compression != "zstd" or importlib.util.find_spec("zstandard")
+    ]
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = per_video(f"{directory}/data", args.rows)
+        variants = ["baseline"] + [
+            f"{json_format}+{compression}" if compression else json_format
+            for json_format in JSON_FORMATS
+            for compression in compressions
+        ]
+
+        for variant in variants:
+            results.append(write(data, directory, variant))
+
+    print(json.dumps({"rows": len(data), "results": results}, indent=2))
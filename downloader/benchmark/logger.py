@@ -0,0 +1,88 @@
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from downloader.logger.logger import JSONLogger
+
+"""
+Logs a number of messages using one logging mode and measures it.
+
+Modes:
+    - "sync": records are formatted and written on the calling thread.
+    - "queued": records are enqueued and written by a background thread.
+
+Args:
+    mode (str): The logging mode.
+    messages (int): The number of messages to log.
+
+Returns:
+    dict[str, Any]: The time spent by the caller per message and the total
+        time taken until every record is written.
+"""
+
+
+def log(mode: str, messages: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        logger = JSONLogger(
+            f"{directory}/logs.json",
+            name=f"benchmark_{mode}",
+            queued=mode == "queued",
+        )
+
+        start = time.perf_counter()
+
+        for index in range(messages):
+            logger.info("Chunk processed.", chunk=index, rows=100000)
+
+        caller_seconds = time.perf_counter() - start
+
+        logger.close()
+
+        total_seconds = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "messages": messages,
+        "caller_us_per_message": round(caller_seconds / messages * 1e6, 2),
+        "total_seconds": round(total_seconds, 4),
+    }
+
+
+"""
+Reports the per call overhead of each logging mode.
+
+Every mode runs in a freshly spawned process.
+
+Usage:
+    python -m downloader.benchmark.logger --messages 100000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("logger_benchmark")
+    parser.add_argument(
+        "--messages",
+        help="Number of messages logged by each mode(default=100000).",
+        default=100000,
+        type=int,
+    )
+    parser.add_argument(
+        "--modes",
+        help="Logging modes to measure(default=all).",
+        nargs="+",
+        default=["sync", "queued"],
+    )
+    args = parser.parse_args()
+
+    results = []
+
+    for mode in args.modes:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results.append(executor.submit(log, mode, args.messages).result())
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,91 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+"""
+Parses a CSV file using one parse variant and measures it.
+
+Variants:
+    - "baseline": every column, inferred dtypes, "c" engine.
+    - "projected": only the declared columns and dtypes, "c" engine.
+    - "pyarrow": only the declared columns and dtypes, "pyarrow" engine.
+
+Args:
+    file_path (str): The videos CSV file to parse.
+    variant (str): The parse variant.
+
+Returns:
+    dict[str, Any]: The parse time in seconds, the memory used by the
+        resulting DataFrame and the peak RSS of the process in bytes.
+"""
+
+
+def parse(file_path: str, variant: str) -> dict[str, Any]:
+    transform = TransformViewsToCategories(
+        logger=mock.MagicMock(spec=JSONLogger),
+        engine="pyarrow" if variant == "pyarrow" else "c",
+    )
+    columns: list[str] | None = None
+    dtypes: dict[str, str] | None = None
+
+    if variant != "baseline":
+        columns = list(transform.VIDEO_DTYPES)
+        dtypes = transform.VIDEO_DTYPES
+
+    start = time.perf_counter()
+    dataframe = transform.csv_to_dataframe(file_path, columns, dtypes)
+    seconds = time.perf_counter() - start
+
+    return {
+        "variant": variant,
+        "engine": transform.engine,
+        "rows": len(dataframe),
+        "seconds": round(seconds, 4),
+        "dataframe_bytes": int(dataframe.memory_usage(deep=True).sum()),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * 1024,
+    }
+
+
+"""
+Reports the parse time and memory of each parse variant for a CSV file.
+
+Every variant runs in a freshly spawned process so peak RSS figures are
+not affected by earlier variants.
+
+Usage:
+    python -m downloader.benchmark.parse_csv /tmp/kaggle/.../GBvideos.csv
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("parse_csv_benchmark")
+    parser.add_argument("file_path", help="Videos CSV file to parse.")
+    parser.add_argument(
+        "--variants",
+        help="Parse variants to measure(default=all).",
+        nargs="+",
+        default=["baseline", "projected", "pyarrow"],
+    )
+    args = parser.parse_args()
+
+    results = []
+
+    for variant in args.variants:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results.append(
+                executor.submit(parse, args.file_path, variant).result()
+            )
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,177 @@
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from typing import Any, Callable
+from unittest import mock
+
+import pandas as pd
+
+from downloader.benchmark.synthetic import generate
+from downloader.data_output.results_store import ResultsStore
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.countries import COUNTRIES
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+"""
+Transforms a synthetic dataset and writes its views per category to a
+results store as every country of each of a number of versions, as runs of
+those versions with the results store enabled would.
+
+Args:
+    directory (str): The directory holding the dataset and the store.
+    rows (int): The number of rows in the synthetic dataset.
+    versions (int): The number of versions written.
+
+Returns:
+    float: The time in seconds taken by the transform.
+"""
+
+
+def populate(directory: str, rows: int, versions: int) -> float:
+    logger = mock.MagicMock(spec=JSONLogger)
+    video_file_path, category_file_path = generate(directory, rows)
+    views_transform = TransformViewsToCategories(logger=logger)
+
+    start = time.perf_counter()
+    views_transform.transform(
+        {
+            "video_file_path": video_file_path,
+            "category_file_path": category_file_path,
+            "output_path": directory,
+        },
+        [],
+    )
+    seconds = time.perf_counter() - start
+    dataframe = views_transform.dataframe
+
+    if dataframe is None:
+        raise RuntimeError("The transform produced no result.")
+
+    store = ResultsStore(
+        store_path=f"{directory}/results.sqlite3", logger=logger
+    )
+
+    for version in range(1, versions + 1):
+        for country in COUNTRIES:
+            store.write(
+                owner="owner",
+                dataset="dataset",
+                version=str(version),
+                country=country,
+                name="views_to_categories",
+                data=dataframe.assign(views=dataframe["views"] * version),
+                keys=["category_id", "snippet.title"],
+                metrics=["views"],
+            )
+
+    return seconds
+
+
+"""
+Measures reading a version's views per category, and their change between
+two versions, from the results store.
+
+Args:
+    directory (str): The directory holding the store.
+    versions (int): The number of versions held.
+    repeats (int): The number of times each query is run.
+
+Returns:
+    list[dict[str, Any]]: The median and maximum time in milliseconds of
+        each query.
+"""
+
+
+def queries(
+    directory: str, versions: int, repeats: int
+) -> list[dict[str, Any]]:
+    store = ResultsStore(
+        store_path=f"{directory}/results.sqlite3",
+        logger=mock.MagicMock(spec=JSONLogger),
+    )
+    results = []
+    runs: list[tuple[str, Callable[[], pd.DataFrame | None]]] = [
+        (
+            "load",
+            lambda: store.load(
+                "owner", "dataset", "1", "GB", "views_to_categories"
+            ),
+        ),
+        (
+            "diff",
+            lambda: store.diff(
+                "owner",
+                "dataset",
+                "1",
+                str(versions),
+                "GB",
+                "views_to_categories",
+            ),
+        ),
+    ]
+
+    for name, run in runs:
+        timings = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        results.append(
+            {
+                "query": name,
+                "median_ms": round(statistics.median(timings), 3),
+                "max_ms": round(max(timings), 3),
+            }
+        )
+
+    return results
+
+
+"""
+Compares reading a past version's views per category, or their change
+between versions, from the results store against transforming the raw CSV
+file again.
+
+Usage:
+    python -m downloader.benchmark.results_store --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("results_store_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the synthetic dataset(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--versions",
+        help="Number of versions held by the store(default=100).",
+        default=100,
+        type=int,
+    )
+    parser.add_argument(
+        "--repeats",
+        help="Number of times each query is run(default=100).",
+        default=100,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        transform_seconds = populate(directory, args.rows, args.versions)
+        results: list[dict[str, Any]] = [
+            {
+                "query": "transform",
+                "median_ms": round(transform_seconds * 1000, 3),
+            }
+        ]
+        results += queries(directory, args.versions, args.repeats)
+
+    print(json.dumps(results, indent=2))
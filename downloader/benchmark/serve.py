@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import tempfile
+import time
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.data_output.output_views_to_categories import (
+    ViewsToCategoriesBarChart,
+    ViewsToCategoriesJSON,
+)
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.output_server import OutputServer
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+"""
+Writes the views per category outputs of a synthetic dataset as the GB
+outputs of version 1 of a dataset, followed by its run metrics, as a
+finished run does.
+
+Args:
+    dataset_path (str): The directory of the dataset's versions.
+    rows (int): The number of rows in the synthetic dataset.
+
+Returns:
+    None
+"""
+
+
+def outputs(dataset_path: str, rows: int) -> None:
+    logger = mock.MagicMock(spec=JSONLogger)
+    output_path = f"{dataset_path}/1/GB"
+    video_file_path, category_file_path = generate(
+        f"{dataset_path}/data", rows
+    )
+
+    os.makedirs(output_path)
+
+    TransformViewsToCategories(logger=logger).transform(
+        {
+            "video_file_path": video_file_path,
+            "category_file_path": category_file_path,
+            "output_path": output_path,
+        },
+        [
+            ViewsToCategoriesBarChart(logger=logger),
+            ViewsToCategoriesJSON(logger=logger),
+        ],
+    )
+
+    with open(f"{dataset_path}/1/run_metrics.json", "w") as f:
+        json.dump({"version": "1"}, f)
+
+
+"""
+Serves the outputs of a dataset until terminated.
+
+Args:
+    dataset_path (str): The directory of the dataset's versions.
+    port (int): The port listened on.
+
+Returns:
+    None
+"""
+
+
+def serve(dataset_path: str, port: int) -> None:
+    OutputServer(
+        dataset_path=dataset_path,
+        port=port,
+        logger=mock.MagicMock(spec=JSONLogger),
+    ).start()
+
+
+"""
+Sends requests for a path over several kept alive connections at once,
+each connection sending its next request once the last response is read.
+
+Args:
+    port (int): The port of the server.
+    path (str): The path requested.
+    headers (dict[str, str]): The headers of every request.
+    connections (int): The number of connections.
+    requests (int): The number of requests sent on each connection.
+
+Returns:
+    tuple[list[float], int, dict[int, int]]: The latency in seconds of
+        each request, the bytes received and the number of responses of
+        each status.
+"""
+
+
+async def load(
+    port: int,
+    path: str,
+    headers: dict[str, str],
+    connections: int,
+    requests: int,
+) -> tuple[list[float], int, dict[int, int]]:
+    request = "".join(
+        [f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"]
+        + [f"{name}: {value}\r\n" for name, value in headers.items()]
+        + ["\r\n"]
+    ).encode("latin-1")
+    latencies: list[float] = []
+    received = 0
+    statuses: dict[int, int] = {}
+
+    async def connection() -> None:
+        nonlocal received
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            length = next(
+                (
+                    int(line.split(":", 1)[1])
+                    for line in lines
+                    if line.lower().startswith("content-length:")
+                ),
+                0,
+            )
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+
+            status = int(lines[0].split(" ")[1])
+            statuses[status] = statuses.get(status, 0) + 1
+            received += len(head) + length
+
+        writer.close()
+        await writer.wait_closed()
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+
+    return latencies, received, statuses
+
+
+"""
+Measures the requests of one variant.
+
+Variants:
+    - "<file>": the file requested in full.
+    - "<file>_gzip": the file requested accepting gzip.
+    - "<file>_conditional": the file requested with the entity tag of the
+      copy held, as a client polling for changes does.
+
+Args:
+    port (int): The port of the server.
+    variant (str): The variant.
+    path (str): The path of the file.
+    connections (int): The number of connections.
+    requests (int): The number of requests sent on each connection.
+
+Returns:
+    dict[str, Any]: The requests per second, the median and 99th
+        percentile latency in milliseconds, the bytes received per request
+        and the number of responses of each status.
+"""
+
+
+def measure(
+    port: int, variant: str, path: str, connections: int, requests: int
+) -> dict[str, Any]:
+    headers = {}
+
+    if variant.endswith("_gzip"):
+        headers["Accept-Encoding"] = "gzip"
+
+    if variant.endswith("_conditional"):
+        reader = socket.create_connection(("127.0.0.1", port))
+        reader.sendall(f"HEAD {path} HTTP/1.0\r\n\r\n".encode())
+        head = reader.recv(65536).decode("latin-1")
+        reader.close()
+        headers["If-None-Match"] = next(
+            line.split(":", 1)[1].strip()
+            for line in head.split("\r\n")
+            if line.lower().startswith("etag:")
+        )
+
+    start = time.perf_counter()
+    latencies, received, statuses = asyncio.run(
+        load(port, path, headers, connections, requests)
+    )
+    seconds = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    return {
+        "variant": variant,
+        "requests_per_second": round(len(latencies) / seconds),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "bytes_per_request": round(received / len(latencies)),
+        "statuses": statuses,
+    }
+
+
+"""
+Measures the throughput and latency of the output server under a local
+load generator, for the views per category JSON and bar chart requested in
+full, gzip encoded and revalidated with their entity tag.
+
+The server runs in a spawned process of its own.
+
+Usage:
+    python -m downloader.benchmark.serve --connections 50 --requests 200
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("serve_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the synthetic dataset(default=100000).",
+        default=100_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--connections",
+        help="Number of concurrent connections(default=50).",
+        default=50,
+        type=int,
+    )
+    parser.add_argument(
+        "--requests",
+        help="Number of requests per connection(default=200).",
+        default=200,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory, socket.socket() as free:
+        outputs(directory, args.rows)
+
+        free.bind(("127.0.0.1", 0))
+        port = free.getsockname()[1]
+        free.close()
+
+        server = multiprocessing.get_context("spawn").Process(
+            target=serve, args=(directory, port)
+        )
+        server.start()
+
+        try:
+            deadline = time.monotonic() + 30
+
+            while time.monotonic() < deadline:
+                try:
+                    socket.create_connection(("127.0.0.1", port)).close()
+
+                    break
+                except OSError:
+                    time.sleep(0.1)
+
+            for file_name, path in [
+                ("json", "/GB/views_to_categories.json"),
+                ("png", "/GB/views_to_categories_bar_chart.png"),
+            ]:
+                for suffix in ["", "_gzip", "_conditional"]:
+                    results.append(
+                        measure(
+                            port,
+                            f"{file_name}{suffix}",
+                            path,
+                            args.connections,
+                            args.requests,
+                        )
+                    )
+        finally:
+            server.terminate()
+            server.join()
+
+    print(json.dumps(results, indent=2))
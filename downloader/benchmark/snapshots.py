@@ -0,0 +1,127 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.logger.logger import JSONLogger
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+"""
+Runs `TransformViewsToCategories` over a synthetic dataset using one
+variant and measures it.
+
+Variants:
+    - "sum": every row summed.
+    - "latest": the latest snapshot of each video summed.
+    - "peak": the peak snapshot of each video summed.
+
+Args:
+    directory (str): The directory holding the synthetic dataset.
+    variant (str): The variant.
+    chunk_size (int | None): The chunk size used to stream the file.
+
+Returns:
+    dict[str, Any]: The time in seconds, the rows per second, the total
+        views in millions and the peak RSS of the process in bytes.
+"""
+
+
+def transform(
+    directory: str, variant: str, chunk_size: int | None
+) -> dict[str, Any]:
+    views_transform = TransformViewsToCategories(
+        logger=mock.MagicMock(spec=JSONLogger),
+        chunk_size=chunk_size,
+        snapshot=None if variant == "sum" else variant,
+    )
+
+    start = time.perf_counter()
+
+    views_transform.transform(
+        {
+            "video_file_path": f"{directory}/GBvideos.csv",
+            "category_file_path": f"{directory}/GB_category_id.json",
+            "output_path": directory,
+        },
+        [],
+    )
+
+    seconds = time.perf_counter() - start
+    dataframe = views_transform.dataframe
+
+    return {
+        "variant": variant,
+        "chunk_size": chunk_size,
+        "rows": views_transform.rows_read,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(views_transform.rows_read / seconds),
+        "views_millions": (
+            round(float(dataframe["views"].sum()), 2)
+            if dataframe is not None
+            else None
+        ),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * 1024,
+    }
+
+
+"""
+Compares summing every row against summing one snapshot per video, read
+in full and streamed, over synthetic datasets of each size.
+
+Every variant runs in a freshly spawned process so peak RSS figures are
+not affected by earlier variants.
+
+Usage:
+    python -m downloader.benchmark.snapshots --rows 1000000 10000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("snapshots_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in each synthetic dataset(default=1000000).",
+        nargs="+",
+        default=[1_000_000],
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Rows read at a time when streaming(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            # Generated in a process of its own so its memory does not
+            # count towards the peak RSS of the variants.
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=context
+            ) as executor:
+                executor.submit(generate, directory, rows).result()
+
+            for chunk_size in [None, args.chunk_size]:
+                for variant in ["sum", "latest", "peak"]:
+                    with ProcessPoolExecutor(
+                        max_workers=1, mp_context=context
+                    ) as executor:
+                        results.append(
+                            executor.submit(
+                                transform, directory, variant, chunk_size
+                            ).result()
+                        )
+
+    print(json.dumps(results, indent=2))
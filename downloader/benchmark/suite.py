@@ -0,0 +1,229 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess  # nosec B404
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.data_output.output_views_to_categories import (
+    ViewsToCategoriesBarChart,
+    ViewsToCategoriesJSON,
+)
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+"""
+Runs `TransformViewsToCategories` and each of its outputs over a synthetic
+dataset and measures every stage.
+
+Args:
+    data_path (str): The directory holding the synthetic dataset.
+    rows (int): The number of rows in the dataset.
+    chunk_size (int | None): The chunk size used to stream the videos CSV.
+    engine (str): The CSV parse engine.
+
+Returns:
+    list[dict[str, Any]]: The metrics of the transform stage and of each
+        output stage.
+"""
+
+
+def run(
+    data_path: str, rows: int, chunk_size: int | None, engine: str
+) -> list[dict[str, Any]]:
+    logger = mock.MagicMock(spec=JSONLogger)
+    profiler = StageProfiler(logger=logger)
+    transform = TransformViewsToCategories(
+        logger=logger, chunk_size=chunk_size, engine=engine, profiler=profiler
+    )
+
+    with tempfile.TemporaryDirectory() as output_path:
+        with profiler.stage("transform", size=rows) as metrics:
+            transform.transform(
+                {
+                    "video_file_path": f"{data_path}/GBvideos.csv",
+                    "category_file_path": f"{data_path}/GB_category_id.json",
+                    "output_path": f"{output_path}/",
+                },
+                [
+                    ViewsToCategoriesBarChart(logger=logger),
+                    ViewsToCategoriesJSON(logger=logger),
+                ],
+            )
+
+            metrics["rows"] = transform.rows_read
+
+    for stage in profiler.stages:
+        stage["size"] = rows
+
+    return profiler.stages
+
+
+"""
+Returns the commit the benchmark is run against, if known.
+"""
+
+
+def _commit() -> str | None:
+    git = shutil.which("git")
+
+    if not git:
+        return None
+
+    try:
+        # the arguments are fixed and the executable resolved to a full path
+        result = subprocess.run(  # nosec B603
+            [git, "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return result.stdout.strip()
+
+
+"""
+Prints the wall time of each stage of a benchmark run relative to a
+baseline run, matching stages by stage, output and size.
+"""
+
+
+def _compare(baseline_file: str, results_file: str) -> None:
+    def stages(file_name: str) -> dict[tuple[Any, ...], dict[str, Any]]:
+        with open(file_name) as f:
+            return {
+                (stage["size"], stage["stage"], stage.get("output")): stage
+                for stage in json.load(f)["stages"]
+            }
+
+    baseline = stages(baseline_file)
+
+    for key, stage in sorted(
+        stages(results_file).items(), key=lambda item: str(item[0])
+    ):
+        if key in baseline and baseline[key]["wall_seconds"]:
+            print(
+                json.dumps(
+                    {
+                        "size": key[0],
+                        "stage": key[1],
+                        "output": key[2],
+                        "wall_seconds": stage["wall_seconds"],
+                        "baseline_wall_seconds": baseline[key]["wall_seconds"],
+                        "ratio": round(
+                            stage["wall_seconds"]
+                            / baseline[key]["wall_seconds"],
+                            3,
+                        ),
+                    }
+                )
+            )
+
+
+"""
+Measures the transform and outputs across synthetic datasets of several
+sizes and saves the results as JSON.
+
+Datasets are generated once and reused from the data directory. Every size
+runs in a freshly spawned process so peak RSS figures are not affected by
+earlier sizes. A results file can be compared against the results file of
+another commit with `--compare`.
+
+Usage:
+    python -m downloader.benchmark.suite --sizes 10000 1000000 \\
+        --output results.json
+    python -m downloader.benchmark.suite --compare baseline.json results.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("benchmark_suite")
+    parser.add_argument(
+        "--sizes",
+        help=f"Rows in each synthetic dataset(default={SIZES}).",
+        nargs="+",
+        default=SIZES,
+        type=int,
+    )
+    parser.add_argument(
+        "--data-path",
+        help="Directory synthetic datasets are generated in and reused "
+        "from(default=<temporary directory>/kaggle_benchmark).",
+        default=os.path.join(tempfile.gettempdir(), "kaggle_benchmark"),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Stream the videos CSV in chunks of this many rows.",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "--engine",
+        help="CSV parse engine(default=c).",
+        default="c",
+        choices=["c", "pyarrow"],
+    )
+    parser.add_argument(
+        "--output",
+        help="File the results are saved to(default=benchmark_results.json).",
+        default="benchmark_results.json",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Compare a results file against a baseline results file.",
+        nargs=2,
+        metavar=("BASELINE", "RESULTS"),
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        raise SystemExit
+
+    stages = []
+
+    for size in args.sizes:
+        data_path = f"{args.data_path}/{size}"
+
+        if not os.path.exists(f"{data_path}/GBvideos.csv"):
+            generate(data_path, size)
+
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            stages.extend(
+                executor.submit(
+                    run, data_path, size, args.chunk_size, args.engine
+                ).result()
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "commit": _commit(),
+                "created": datetime.datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "chunk_size": args.chunk_size,
+                "engine": args.engine,
+                "stages": stages,
+            },
+            f,
+            indent=2,
+        )
+
+    print(json.dumps(stages, indent=2))
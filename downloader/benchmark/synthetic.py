@@ -0,0 +1,253 @@
+import argparse
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = {
+    1: "Film & Animation",
+    2: "Autos & Vehicles",
+    10: "Music",
+    15: "Pets & Animals",
+    17: "Sports",
+    18: "Short Movies",
+    19: "Travel & Events",
+    20: "Gaming",
+    21: "Videoblogging",
+    22: "People & Blogs",
+    23: "Comedy",
+    24: "Entertainment",
+    25: "News & Politics",
+    26: "Howto & Style",
+    27: "Education",
+    28: "Science & Technology",
+    29: "Nonprofits & Activism",
+    30: "Movies",
+    43: "Shows",
+    44: "Trailers",
+}
+
+CATEGORY_WEIGHTS = {
+    10: 0.35,
+    24: 0.24,
+    22: 0.08,
+    1: 0.05,
+    23: 0.05,
+    17: 0.04,
+    26: 0.04,
+    20: 0.03,
+    25: 0.03,
+    27: 0.02,
+    28: 0.02,
+    2: 0.01,
+    15: 0.01,
+    19: 0.01,
+    29: 0.01,
+    43: 0.01,
+}
+
+COLUMNS = [
+    "video_id",
+    "trending_date",
+    "title",
+    "channel_title",
+    "category_id",
+    "publish_time",
+    "tags",
+    "views",
+    "likes",
+    "dislikes",
+    "comment_count",
+    "thumbnail_link",
+    "comments_disabled",
+    "ratings_disabled",
+    "video_error_or_removed",
+    "description",
+]
+
+"""
+Writes a `<country>videos.csv` file and matching
+`<country>_category_id.json` file shaped like the YouTube trending dataset.
+
+Each row is a trending appearance of a video, videos appear on average
+`repeats` times with a different view count each time. Categories follow
+the skew of the real dataset, with music and entertainment making up most
+rows.
+Titles, tags and descriptions contain commas, quotes and line breaks so
+files are as costly to parse as the real ones. The same arguments always
+produce the same files.
+
+Args:
+    directory (str): The directory the files are written to.
+    rows (int): The number of rows in the videos CSV file.
+    country (str): The two letter country code used in the file names.
+    repeats (int): The average number of rows per video.
+    seed (int): The seed of the random number generator.
+    chunk_size (int): The number of rows generated and written at a time.
+
+Returns:
+    list[str]: The videos CSV file path and the category JSON file path.
+"""
+
+
+def generate(
+    directory: str,
+    rows: int,
+    country: str = "GB",
+    repeats: int = 10,
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+) -> list[str]:
+    os.makedirs(directory, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    videos = max(1, rows // repeats)
+    category_ids = np.array(list(CATEGORY_WEIGHTS), dtype=np.int32)
+    weights = np.array(list(CATEGORY_WEIGHTS.values()))
+    video_categories = rng.choice(
+        category_ids, size=videos, p=weights / weights.sum()
+    )
+    video_views = rng.lognormal(mean=12, sigma=1.5, size=videos).astype(
+        np.int64
+    )
+    start_date = datetime.date(2017, 11, 14)
+    video_file_path = f"{directory}/{country}videos.csv"
+    category_file_path = f"{directory}/{country}_category_id.json"
+
+    with open(video_file_path, "w", newline="") as f:
+        for offset in range(0, rows, chunk_size):
+            f.write(
+                _videos_chunk(
+                    rng,
+                    range(offset, min(offset + chunk_size, rows)),
+                    rows,
+                    video_categories,
+                    video_views,
+                    start_date,
+                ).to_csv(header=offset == 0, index=False)
+            )
+
+    with open(category_file_path, "w") as f:
+        json.dump(_categories(), f)
+
+    return [video_file_path, category_file_path]
+
+
+"""
+Generates the rows of the videos CSV file at the given positions.
+"""
+
+
+def _videos_chunk(
+    rng: np.random.Generator,
+    positions: range,
+    rows: int,
+    video_categories: np.ndarray,
+    video_views: np.ndarray,
+    start_date: datetime.date,
+) -> pd.DataFrame:
+    size = len(positions)
+    video_index = rng.integers(0, len(video_categories), size=size)
+    growth = rng.uniform(1, 3, size=size)
+    views = (video_views[video_index] * growth).astype(np.int64)
+    days = np.arange(positions.start, positions.stop) * 200 // max(rows, 1)
+    dates = pd.to_datetime(start_date) + pd.to_timedelta(days, unit="D")
+    id_text = pd.Series(video_index).map("v{:010d}".format)
+    text_rows = rng.integers(0, 4, size=size)
+
+    return pd.DataFrame(
+        {
+            "video_id": id_text,
+            "trending_date": dates.strftime("%y.%d.%m"),
+            "title": "Video "
+            + id_text
+            + np.where(text_rows == 0, ", live", ""),
+            "channel_title": "Channel "
+            + pd.Series(video_index % 5000).astype(str),
+            "category_id": video_categories[video_index],
+            "publish_time": (dates - pd.Timedelta(days=2)).strftime(
+                "%Y-%m-%dT%H:%M:%S.000Z"
+            ),
+            "tags": np.where(
+                text_rows == 1, '"music"|"official video"', "[none]"
+            ),
+            "views": views,
+            "likes": views // 40,
+            "dislikes": views // 1000,
+            "comment_count": views // 200,
+            "thumbnail_link": "https://i.ytimg.com/vi/"
+            + id_text
+            + "/default.jpg",
+            "comments_disabled": text_rows == 3,
+            "ratings_disabled": False,
+            "video_error_or_removed": False,
+            "description": np.where(
+                text_rows == 2,
+                'Watch now!\nSubscribe, like and "share".',
+                "Description of the video.",
+            ),
+        },
+        columns=COLUMNS,
+    )
+
+
+"""
+Builds the contents of a category JSON file.
+"""
+
+
+def _categories() -> dict[str, object]:
+    return {
+        "kind": "youtube#videoCategoryListResponse",
+        "items": [
+            {
+                "kind": "youtube#videoCategory",
+                "id": str(category_id),
+                "snippet": {
+                    "channelId": "UCBR8-60-B28hp2BmDPdntcQ",
+                    "title": title,
+                    "assignable": True,
+                },
+            }
+            for category_id, title in CATEGORIES.items()
+        ],
+    }
+
+
+"""
+Generates synthetic YouTube trending dataset files.
+
+Usage:
+    python -m downloader.benchmark.synthetic /tmp/synthetic --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("synthetic_dataset")
+    parser.add_argument("directory", help="Directory the files are saved in.")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the videos CSV file(default=10000).",
+        default=10_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--country",
+        help="Country code used in the file names(default=GB).",
+        default="GB",
+        type=str.upper,
+    )
+    parser.add_argument(
+        "--seed",
+        help="Seed of the random number generator(default=0).",
+        default=0,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            generate(args.directory, args.rows, args.country, seed=args.seed)
+        )
+    )
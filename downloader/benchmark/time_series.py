@@ -0,0 +1,152 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+import pandas as pd
+
+from downloader.benchmark.synthetic import generate
+from downloader.logger.logger import JSONLogger
+from downloader.transform.transform_views_time_series import (
+    TransformViewsTimeSeries,
+)
+
+"""
+Writes two versions of a synthetic dataset, the second appending a further
+day of rows to the first, as a new version of the trending dataset does.
+
+Args:
+    directory (str): The directory the "previous" and "next" versions are
+        written to.
+    rows (int): The number of rows in the previous version.
+
+Returns:
+    None
+"""
+
+
+def versions(directory: str, rows: int) -> None:
+    generate(f"{directory}/previous", rows)
+    shutil.copytree(f"{directory}/previous", f"{directory}/next")
+
+    videos = pd.read_csv(f"{directory}/previous/GBvideos.csv", dtype="str")
+    last_day = videos[videos["trending_date"] == videos["trending_date"].max()]
+    next_day = pd.to_datetime(
+        last_day["trending_date"], format="%y.%d.%m"
+    ) + pd.Timedelta(days=1)
+
+    last_day.assign(trending_date=next_day.dt.strftime("%y.%d.%m")).to_csv(
+        f"{directory}/next/GBvideos.csv", mode="a", header=False, index=False
+    )
+
+
+"""
+Runs `TransformViewsTimeSeries` over the next version of a dataset, its
+store holding the days of the previous version, using one variant and
+measures it.
+
+Variants:
+    - "rebuild": the store is cleared and every day aggregated again.
+    - "incremental": only the rows appended by the next version are parsed.
+
+Args:
+    directory (str): The directory holding both versions of the dataset.
+    variant (str): The variant.
+    chunk_size (int | None): The chunk size used to stream the file.
+
+Returns:
+    dict[str, Any]: The time in seconds, the rows parsed and the days
+        aggregated by the run over the next version.
+"""
+
+
+def transform(
+    directory: str, variant: str, chunk_size: int | None
+) -> dict[str, Any]:
+    store_path = f"{directory}/{variant}_{chunk_size}/views_per_day"
+
+    for version in ["previous", "next"]:
+        time_series_transform = TransformViewsTimeSeries(
+            store_path=store_path,
+            rebuild=variant == "rebuild" and version == "next",
+            logger=mock.MagicMock(spec=JSONLogger),
+            chunk_size=chunk_size,
+        )
+
+        start = time.perf_counter()
+
+        time_series_transform.transform(
+            {
+                "video_file_path": f"{directory}/{version}/GBvideos.csv",
+                "category_file_path": (
+                    f"{directory}/{version}/GB_category_id.json"
+                ),
+                "output_path": os.path.dirname(store_path),
+            },
+            [],
+        )
+
+    return {
+        "variant": variant,
+        "chunk_size": chunk_size,
+        "rows": time_series_transform.rows_read,
+        "seconds": round(time.perf_counter() - start, 4),
+        "days_aggregated": len(time_series_transform.dates_added),
+    }
+
+
+"""
+Compares rebuilding the daily store of views per category per day against
+appending to it, for a dataset version appending a day of rows, read in
+full and streamed.
+
+Every variant runs in a freshly spawned process with a store of its own.
+
+Usage:
+    python -m downloader.benchmark.time_series --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("time_series_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows in the previous version of the synthetic "
+        "dataset(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Rows read at a time when streaming(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=context
+        ) as executor:
+            executor.submit(versions, directory, args.rows).result()
+
+        for chunk_size in [None, args.chunk_size]:
+            for variant in ["rebuild", "incremental"]:
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=context
+                ) as executor:
+                    results.append(
+                        executor.submit(
+                            transform, directory, variant, chunk_size
+                        ).result()
+                    )
+
+    print(json.dumps(results, indent=2))
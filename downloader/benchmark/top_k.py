@@ -0,0 +1,171 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from unittest import mock
+
+from downloader.benchmark.synthetic import generate
+from downloader.logger.logger import JSONLogger
+from downloader.transform.transform_top_k import TransformTopK
+
+COUNTRIES = ["CA", "GB", "US"]
+
+"""
+Writes a synthetic dataset for each country of `COUNTRIES`.
+
+Args:
+    directory (str): The directory the datasets are written to.
+    rows (int): The number of rows of each country.
+
+Returns:
+    list[str]: The video CSV file of each country.
+"""
+
+
+def datasets(directory: str, rows: int) -> list[str]:
+    return [
+        generate(directory, rows, country=country, seed=seed)[0]
+        for seed, country in enumerate(COUNTRIES)
+    ]
+
+
+"""
+Computes the top keys of the video files using one variant and measures
+it.
+
+Variants:
+    - "exact": every key summed with a pandas group-by of each file.
+    - "sketch": the files streamed into a summary of `capacity` keys.
+    - "verified": the summary's keys summed exactly in a second pass.
+
+Args:
+    file_paths (list[str]): The video CSV files.
+    key (str): The column the metric is summed per.
+    k (int): The number of keys kept.
+    variant (str): The variant.
+    capacity (int): The number of keys held by the summary.
+    chunk_size (int): The chunk size used to stream the files.
+
+Returns:
+    dict[str, Any]: The time in seconds, the peak RSS of the process in
+        bytes, the error bound, whether the keys are known to be the top
+        keys and the keys found.
+"""
+
+
+def top_k(
+    file_paths: list[str],
+    key: str,
+    k: int,
+    variant: str,
+    capacity: int,
+    chunk_size: int,
+) -> dict[str, Any]:
+    transform = TransformTopK(
+        key=key,
+        metric="views",
+        k=k,
+        capacity=None if variant == "exact" else capacity,
+        verify=variant == "verified",
+        logger=mock.MagicMock(spec=JSONLogger),
+        chunk_size=None if variant == "exact" else chunk_size,
+    )
+
+    start = time.perf_counter()
+    dataframe = transform.top_k(file_paths)
+
+    return {
+        "key": key,
+        "variant": variant,
+        "rows_read": transform.rows_read,
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * 1024,
+        "max_error": int(dataframe["max_error"].max()),
+        "guaranteed": transform.guaranteed,
+        "keys": list(dataframe[key]),
+    }
+
+
+"""
+Compares the exact top keys by views of every country, per channel and per
+video, against those of a summary of a fixed number of keys, with and
+without an exact second pass.
+
+Every variant runs in a freshly spawned process so peak RSS figures are
+not affected by earlier variants. The "recall" of a variant is the share
+of the exact top keys it finds.
+
+Usage:
+    python -m downloader.benchmark.top_k --rows 1000000
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("top_k_benchmark")
+    parser.add_argument(
+        "--rows",
+        help="Number of rows of each country(default=1000000).",
+        default=1_000_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--k",
+        help="Number of top keys(default=10).",
+        default=10,
+        type=int,
+    )
+    parser.add_argument(
+        "--capacity",
+        help="Number of keys held by the summary(default=10000).",
+        default=10_000,
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Rows streamed at a time into the summary(default=100000).",
+        default=100_000,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Generated in a process of its own so its memory does not count
+        # towards the peak RSS of the variants.
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=context
+        ) as executor:
+            file_paths = executor.submit(
+                datasets, directory, args.rows
+            ).result()
+
+        for key in ["channel_title", "video_id"]:
+            exact_keys: list[Any] = []
+
+            for variant in ["exact", "sketch", "verified"]:
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=context
+                ) as executor:
+                    result = executor.submit(
+                        top_k,
+                        file_paths,
+                        key,
+                        args.k,
+                        variant,
+                        args.capacity,
+                        args.chunk_size,
+                    ).result()
+
+                exact_keys = exact_keys or result["keys"]
+                result["recall"] = len(
+                    set(result.pop("keys")) & set(exact_keys)
+                ) / len(exact_keys)
+                results.append(result)
+
+    print(json.dumps(results, indent=2))
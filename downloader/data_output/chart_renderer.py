@@ -0,0 +1,261 @@
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Sequence
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+CHART_FORMATS = ("png", "svg", "thumbnail")
+
+
+class BarChart:
+    """
+    Describes a bar chart to be drawn by a `ChartRenderer`.
+
+    Attributes:
+        labels (Sequence[str]): The label of each bar.
+        values (Sequence[float]): The height of each bar.
+        title (str): The chart title.
+        xlabel (str): The x axis label.
+        ylabel (str): The y axis label.
+        color (str): The bar colour.
+        label_rotation (int): The rotation in degrees of the bar labels.
+    """
+
+    def __init__(
+        self,
+        *,
+        labels: Sequence[str],
+        values: Sequence[float],
+        title: str,
+        xlabel: str,
+        ylabel: str,
+        color: str = "skyblue",
+        label_rotation: int = 90,
+    ) -> None:
+        self.labels = labels
+        self.values = values
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.color = color
+        self.label_rotation = label_rotation
+
+    """
+    Draws the chart on a set of axes.
+
+    Args:
+        axes (Axes): The axes drawn on.
+
+    Returns:
+        None
+    """
+
+    def draw(self, axes: "Axes") -> None:
+        axes.bar(self.labels, self.values, color=self.color)
+        axes.set_xlabel(self.xlabel)
+        axes.set_ylabel(self.ylabel)
+        axes.tick_params(axis="x", labelrotation=self.label_rotation)
+        axes.set_title(self.title)
+
+
+class LineChart:
+    """
+    Describes a line chart of one or more series to be drawn by a
+    `ChartRenderer`.
+
+    Attributes:
+        x (Sequence[Any]): The x value of each point, shared by every series,
+            e.g. dates.
+        series (Mapping[str, Sequence[float]]): The y value of each point of
+            each series, by the series label shown in the legend.
+        title (str): The chart title.
+        xlabel (str): The x axis label.
+        ylabel (str): The y axis label.
+        label_rotation (int): The rotation in degrees of the x axis labels.
+    """
+
+    def __init__(
+        self,
+        *,
+        x: Sequence[Any],
+        series: Mapping[str, Sequence[float]],
+        title: str,
+        xlabel: str,
+        ylabel: str,
+        label_rotation: int = 45,
+    ) -> None:
+        self.x = x
+        self.series = series
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.label_rotation = label_rotation
+
+    """
+    Draws the chart on a set of axes, with a legend when there is more than
+    one series.
+
+    Args:
+        axes (Axes): The axes drawn on.
+
+    Returns:
+        None
+    """
+
+    def draw(self, axes: "Axes") -> None:
+        for label, values in self.series.items():
+            axes.plot(self.x, values, label=label)
+
+        axes.set_xlabel(self.xlabel)
+        axes.set_ylabel(self.ylabel)
+        axes.tick_params(axis="x", labelrotation=self.label_rotation)
+        axes.set_title(self.title)
+
+        if len(self.series) > 1:
+            axes.legend(fontsize="x-small")
+
+
+class ChartRenderer:
+    """
+    Renders charts to files without using pyplot and its global state.
+
+    Each renderer owns a single figure attached to the non-interactive Agg
+    canvas. The figure is cleared and redrawn for every chart, so the
+    figure size, fonts and layout are set up once and memory stays bounded
+    however many charts are rendered. A renderer must only be used by one
+    thread at a time, `thread_renderer` returns a renderer per thread.
+
+    matplotlib is imported when the first renderer is created, so runs that
+    render no charts never load it.
+
+    Attributes:
+        figsize (tuple[float, float]): The figure size in inches.
+        dpi (int): The resolution of "png" output.
+        thumbnail_dpi (int): The resolution of "thumbnail" output.
+    """
+
+    def __init__(
+        self,
+        *,
+        figsize: tuple[float, float] = (6.4, 4.8),
+        dpi: int = 100,
+        thumbnail_dpi: int = 25,
+    ) -> None:
+        self.figsize = figsize
+        self.dpi = dpi
+        self.thumbnail_dpi = thumbnail_dpi
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+
+        FigureCanvasAgg(self.figure)
+
+    """
+    Returns the file written for a chart in a given format.
+
+    Args:
+        file_path (str): The path of the chart without an extension.
+        chart_format (str): One of `CHART_FORMATS`.
+
+    Returns:
+        str
+    """
+
+    @staticmethod
+    def file_name(file_path: str, chart_format: str) -> str:
+        if chart_format == "thumbnail":
+            return f"{file_path}_thumbnail.png"
+
+        return f"{file_path}.{chart_format}"
+
+    """
+    Renders a chart and saves it in each of the given formats.
+
+    Args:
+        chart (BarChart | LineChart): The chart to render.
+        file_path (str): The path of the chart without an extension.
+        formats (Sequence[str]): The formats to save, from `CHART_FORMATS`.
+
+    Returns:
+        list[str]: The files written.
+    """
+
+    def render(
+        self,
+        chart: BarChart | LineChart,
+        file_path: str,
+        formats: Sequence[str] = ("png",),
+    ) -> list[str]:
+        for chart_format in formats:
+            if chart_format not in CHART_FORMATS:
+                raise ValueError(f"Unknown chart format {chart_format}.")
+
+        self.figure.clear()
+
+        chart.draw(self.figure.add_subplot())
+
+        file_names = []
+
+        for chart_format in formats:
+            file_name = self.file_name(file_path, chart_format)
+
+            self.figure.savefig(
+                file_name,
+                format="svg" if chart_format == "svg" else "png",
+                dpi=(
+                    self.thumbnail_dpi
+                    if chart_format == "thumbnail"
+                    else self.dpi
+                ),
+            )
+
+            file_names.append(file_name)
+
+        self.figure.clear()
+
+        return file_names
+
+    """
+    Renders many charts in turn using the same figure.
+
+    Args:
+        charts (Iterable[tuple[BarChart | LineChart, str]]): Each chart and
+            the path it is saved to without an extension.
+        formats (Sequence[str]): The formats to save, from `CHART_FORMATS`.
+
+    Returns:
+        list[str]: The files written.
+    """
+
+    def render_many(
+        self,
+        charts: Iterable[tuple[BarChart | LineChart, str]],
+        formats: Sequence[str] = ("png",),
+    ) -> list[str]:
+        return [
+            file_name
+            for chart, file_path in charts
+            for file_name in self.render(chart, file_path, formats)
+        ]
+
+
+_renderers = threading.local()
+
+"""
+Returns the `ChartRenderer` of the calling thread, creating it on first
+use, so that charts rendered by the same thread share one figure.
+
+Returns:
+    ChartRenderer
+"""
+
+
+def thread_renderer() -> ChartRenderer:
+    if not hasattr(_renderers, "renderer"):
+        _renderers.renderer = ChartRenderer()
+
+    renderer: ChartRenderer = _renderers.renderer
+
+    return renderer
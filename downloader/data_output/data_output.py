@@ -1,4 +1,8 @@
+import os
+import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
 
 import pandas as pd
 
@@ -16,8 +20,14 @@ class DataOutput(ABC):
         logger (JSONLogger):
             A logger instance for structured logging. If no logger is provided,
             a default instance of `JSONLogger` is created.
+
+        cpu_bound (bool):
+            Whether generating the output is CPU bound, such outputs are
+            generated in a separate process by `OutputExecutor`.
     """
 
+    cpu_bound = False
+
     def __init__(self, *, logger: JSONLogger | None = None) -> None:
         if not logger:
             self.logger = JSONLogger()
@@ -50,3 +60,50 @@ class DataOutput(ABC):
         save_path: str,
     ) -> None:
         pass
+
+    """
+    Returns the files written by `generate` for a given save path.
+
+    Subclasses should override this so that outputs which are already up
+    to date can be detected and skipped. The default, an empty list, means
+    the output is always generated.
+
+    Args:
+        save_path (str): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str) -> list[str]:
+        return []
+
+
+"""
+Yields a temporary path in the directory of a file, which replaces the file
+once the block has written it, so readers never see a partially written
+file. The block creates the temporary file, so it gets the permissions of
+any other file written, and it is removed if the block fails.
+
+Args:
+    file_path (str): The file written.
+
+Returns:
+    Iterator[str]: The temporary path to write to.
+"""
+
+
+@contextmanager
+def atomic_path(file_path: str) -> Iterator[str]:
+    temp_path = os.path.join(
+        os.path.dirname(file_path),
+        f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp",
+    )
+
+    try:
+        yield temp_path
+
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,193 @@
+import gzip
+import importlib.util
+import json
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Iterator
+
+from downloader.logger.logger import JSONLogger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+JSON_FORMATS = ("records", "ndjson", "columnar", "parquet")
+JSON_COMPRESSIONS = ("gzip", "zstd")
+CHUNK_ROWS = 100_000
+
+EXTENSIONS = {
+    "records": ".json",
+    "ndjson": ".ndjson",
+    "columnar": ".json",
+    "parquet": ".parquet",
+}
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+"""
+Checks that a format and compression can be written, falling back when
+an optional dependency is missing. Parquet requires pyarrow, the "arrow"
+extra, and falls back to "records". zstd requires the zstandard package
+and falls back to gzip.
+
+Args:
+    json_format (str): The format, one of `JSON_FORMATS`.
+    compression (str | None): The compression, one of `JSON_COMPRESSIONS`,
+        `None` for none.
+    logger (JSONLogger): Warned of any fallback.
+
+Returns:
+    tuple[str, str | None]: The format and compression written.
+
+Raises:
+    ValueError: If the format or compression is unknown.
+"""
+
+
+def resolve(
+    json_format: str, compression: str | None, logger: JSONLogger
+) -> tuple[str, str | None]:
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format {json_format}.")
+
+    if compression is not None and compression not in JSON_COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression}.")
+
+    if json_format == "parquet" and not importlib.util.find_spec("pyarrow"):
+        logger.warning(
+            "pyarrow is not installed, falling back to the records format."
+        )
+
+        json_format = "records"
+
+    if compression == "zstd" and not importlib.util.find_spec("zstandard"):
+        logger.warning(
+            "zstandard is not installed, falling back to gzip compression."
+        )
+
+        compression = "gzip"
+
+    return json_format, compression
+
+
+"""
+Returns the file a result is written to in a format, the extension of the
+format and of any compression being appended. Parquet files compress their
+columns internally so have no compression extension.
+
+Args:
+    file_path (str): The file without an extension.
+    json_format (str): The format, one of `JSON_FORMATS`.
+    compression (str | None): The compression, `None` for none.
+
+Returns:
+    str
+"""
+
+
+def file_name(
+    file_path: str, json_format: str, compression: str | None
+) -> str:
+    extension = EXTENSIONS[json_format]
+
+    if compression and json_format != "parquet":
+        extension += COMPRESSION_EXTENSIONS[compression]
+
+    return f"{file_path}{extension}"
+
+
+"""
+Writes a result in a format, atomically.
+
+Formats:
+    - "records": a JSON array of an object per row, as
+      `DataFrame.to_json(orient="records")` writes.
+    - "ndjson": a JSON object per row, one per line.
+    - "columnar": a JSON object of an array of values per column, so each
+      column name is written once.
+    - "parquet": a Parquet file, compressed with `compression`.
+
+JSON formats are written `chunk_rows` rows, or one column, at a time so
+the whole document is never held in memory, and are compressed as they
+are written.
+
+Args:
+    data (pd.DataFrame): The result.
+    file_path (str): The file written, see `file_name`.
+    json_format (str): The format, one of `JSON_FORMATS`. Defaults to
+        "records".
+    compression (str | None): The compression, one of `JSON_COMPRESSIONS`,
+        `None` for none.
+    chunk_rows (int): The rows encoded at a time.
+
+Returns:
+    None
+"""
+
+
+def write_json(
+    data: "pd.DataFrame",
+    file_path: str,
+    json_format: str = "records",
+    compression: str | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> None:
+    from downloader.data_output.data_output import atomic_path
+
+    with atomic_path(file_path) as temp_path:
+        if json_format == "parquet":
+            data.to_parquet(temp_path, index=False, compression=compression)
+
+            return
+
+        with _open(temp_path, compression) as f:
+            if json_format == "columnar":
+                f.write("{")
+
+                for index, column in enumerate(data.columns):
+                    f.write(
+                        f"{',' if index else ''}{json.dumps(str(column))}:"
+                        f"{data[column].to_json(orient='values')}"
+                    )
+
+                f.write("}")
+
+                return
+
+            lines = json_format == "ndjson"
+
+            if not lines:
+                f.write("[")
+
+            for start in range(0, len(data), chunk_rows):
+                end = start + chunk_rows
+                chunk = data.iloc[start:end].to_json(
+                    orient="records", lines=lines
+                )
+
+                if lines:
+                    f.write(chunk if chunk.endswith("\n") else f"{chunk}\n")
+                else:
+                    f.write(f"{',' if start else ''}{chunk[1:-1]}")
+
+            if not lines:
+                f.write("]")
+
+
+"""
+opens a file for writing text, compressed as it is written
+"""
+
+
+@contextmanager
+def _open(file_path: str, compression: str | None) -> Iterator[IO[str]]:
+    if compression == "gzip":
+        with gzip.open(
+            file_path, "wt", encoding="utf-8", compresslevel=6
+        ) as f:
+            yield f
+    elif compression == "zstd":
+        import zstandard
+
+        with zstandard.open(file_path, "wt", encoding="utf-8") as f:
+            yield f
+    else:
+        with open(file_path, "w", encoding="utf-8") as f:
+            yield f
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.data_output.json_formats import file_name, resolve, write_json
+from downloader.logger.logger import JSONLogger
+
+
+class AggregationJSON(DataOutput):
+    """
+    Generates and saves a json file containing any result, such as that of
+    an `Aggregation`, as a list of records or another format given by
+    `json_format`, saved atomically.
+
+    Attributes:
+        file_name (str): The name of the file without an extension.
+        json_format (str): The format written, one of `JSON_FORMATS`,
+            falling back to "records" if "parquet" cannot be written.
+        compression (str | None): The compression of the file, one of
+            `JSON_COMPRESSIONS`, falling back to gzip if zstd cannot be
+            written.
+
+    Methods:
+        generate(data: pd.DataFrame, save_path: str):
+            Converts the provided dataset into a JSON file and saves it.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        file_name: str = "aggregation",
+        json_format: str = "records",
+        compression: str | None = None,
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.file_name = file_name
+        self.json_format, self.compression = resolve(
+            json_format, compression, self.logger
+        )
+
+    """
+    Generates and saves a json file containing a record for each row of
+    the dataset.
+
+    Args:
+        data (pd.DataFrame): The dataset to save.
+        save_path (str): The directory path where the file should be saved.
+
+    Returns:
+        None
+    """
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        self.logger.info(f"Starting Output {self.file_name} as JSON")
+
+        if data.empty:
+            self.logger.error(
+                f"Output {self.file_name} as JSON failed empty data"
+            )
+
+        write_json(
+            data,
+            self.output_files(save_path)[0],
+            self.json_format,
+            self.compression,
+        )
+
+        self.logger.info(f"Complete Output {self.file_name} as JSON")
+
+    """
+    Returns the path of the JSON file.
+
+    Args:
+        save_path (str): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str) -> list[str]:
+        return [
+            file_name(
+                f"{save_path}/{self.file_name}",
+                self.json_format,
+                self.compression,
+            )
+        ]
@@ -0,0 +1,228 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+
+
+class OutputExecutor:
+    """
+    Generates a list of `DataOutput` concurrently from a shared DataFrame.
+
+    Outputs flagged as `cpu_bound`, such as chart renderers, are generated
+    in worker processes while all other outputs are generated in threads,
+    so the total time taken approaches that of the slowest output. The
+    DataFrame must not be modified by the outputs.
+
+    Worker processes are forked by each `run`, unless `start` has started
+    them beforehand. Callers running the executor from threads of their
+    own, such as `TransformGraph` nodes, must call `start` before starting
+    those threads, as forking a process while other threads run may
+    deadlock the child.
+
+    Attributes:
+        max_workers (int | None): The maximum number of threads and of
+            processes, defaults to one per output.
+        mp_context (BaseContext | None): The multiprocessing context used to
+            start worker processes, defaults to the platform default.
+        logger (JSONLogger): A logger instance for structured logging.
+        profiler (StageProfiler | None): When set each output is measured
+            as an "output" stage, including outputs generated in worker
+            processes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+        logger: JSONLogger | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self.profiler = profiler
+        self._processes: ProcessPoolExecutor | None = None
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Starts the worker processes shared by every later `run`, one per
+    output flagged as `cpu_bound` up to `max_workers`, waiting until each
+    is running. Nothing is started when no output is `cpu_bound`.
+
+    Args:
+        data_outputs (list[DataOutput]): Every output later generated.
+
+    Returns:
+        None
+    """
+
+    def start(self, data_outputs: list[DataOutput]) -> None:
+        process_outputs = [
+            (index, output)
+            for index, output in enumerate(data_outputs)
+            if output.cpu_bound
+        ]
+
+        if self._processes or not process_outputs:
+            return
+
+        workers = self._workers(process_outputs)
+        self._processes = ProcessPoolExecutor(
+            max_workers=workers, mp_context=self.mp_context
+        )
+
+        for future in [
+            self._processes.submit(_started) for _ in range(workers)
+        ]:
+            future.result()
+
+    """
+    Stops the worker processes started by `start`.
+
+    Returns:
+        None
+    """
+
+    def shutdown(self) -> None:
+        if self._processes:
+            self._processes.shutdown()
+            self._processes = None
+
+    """
+    Generates each output, collecting the error raised by any output
+    without stopping the others.
+
+    Outputs flagged as `cpu_bound` are generated by the worker processes
+    started by `start`, otherwise by processes started for this call
+    before any thread, so that processes are never forked while output
+    threads are running.
+
+    Args:
+        data_outputs (list[DataOutput]): The outputs to generate.
+        data (pd.DataFrame): The dataset passed to every output.
+        save_path (str): The path passed to every output.
+
+    Returns:
+        dict[int, Exception]: The error raised by each failed output, keyed
+            by the position of the output in `data_outputs`.
+    """
+
+    def run(
+        self,
+        data_outputs: list[DataOutput],
+        data: pd.DataFrame,
+        save_path: str,
+    ) -> dict[int, Exception]:
+        process_outputs = [
+            (index, output)
+            for index, output in enumerate(data_outputs)
+            if output.cpu_bound
+        ]
+        thread_outputs = [
+            (index, output)
+            for index, output in enumerate(data_outputs)
+            if not output.cpu_bound
+        ]
+        futures: dict[int, Future[dict[str, Any] | None]] = {}
+        processes = self._processes or ProcessPoolExecutor(
+            max_workers=self._workers(process_outputs),
+            mp_context=self.mp_context,
+        )
+
+        try:
+            for index, output in process_outputs:
+                futures[index] = processes.submit(
+                    generate, output, data, save_path, self.profiler
+                )
+
+            with ThreadPoolExecutor(
+                max_workers=self._workers(thread_outputs)
+            ) as threads:
+                for index, output in thread_outputs:
+                    futures[index] = threads.submit(
+                        generate, output, data, save_path, self.profiler
+                    )
+        finally:
+            if processes is not self._processes:
+                processes.shutdown()
+
+        errors: dict[int, Exception] = {}
+
+        for index, future in sorted(futures.items()):
+            error = future.exception()
+
+            if isinstance(error, Exception):
+                self.logger.error(
+                    f"{type(data_outputs[index]).__name__} failed: {error}."
+                )
+
+                errors[index] = error
+            elif self.profiler and data_outputs[index].cpu_bound:
+                metrics = future.result()
+
+                if metrics:
+                    self.profiler.record(metrics)
+
+        return errors
+
+    """
+    Returns the number of workers used for a group of outputs.
+    """
+
+    def _workers(self, outputs: list[tuple[int, DataOutput]]) -> int:
+        return max(1, min(self.max_workers or len(outputs), len(outputs)))
+
+
+"""
+returns once a worker process of `OutputExecutor.start` is running
+"""
+
+
+def _started() -> None:
+    return None
+
+
+"""
+Generates an output, measuring it as an "output" stage when a profiler is
+given.
+
+In a worker process the output is measured by a copy of the profiler, so
+the metrics are returned to be recorded by the calling process.
+
+Args:
+    output (DataOutput): The output to generate.
+    data (pd.DataFrame): The dataset passed to the output.
+    save_path (str): The path passed to the output.
+    profiler (StageProfiler | None): The profiler of the run.
+
+Returns:
+    dict[str, Any] | None: The metrics of the stage, if measured.
+"""
+
+
+def generate(
+    output: DataOutput,
+    data: pd.DataFrame,
+    save_path: str,
+    profiler: StageProfiler | None,
+) -> dict[str, Any] | None:
+    if not profiler:
+        output.generate(data, save_path)
+
+        return None
+
+    with profiler.stage(
+        "output", output=type(output).__name__, rows=len(data)
+    ) as metrics:
+        output.generate(data, save_path)
+
+    return metrics
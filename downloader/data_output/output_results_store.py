@@ -0,0 +1,86 @@
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.data_output.results_store import ResultsStore
+from downloader.logger.logger import JSONLogger
+
+
+class ResultsStoreOutput(DataOutput):
+    """
+    Writes a result to the `ResultsStore`, keyed by the dataset version and
+    country it was computed from, so it can later be queried or compared
+    with other versions.
+
+    The store is written on every run, as it holds no files of its own to
+    check for being up to date.
+
+    Attributes:
+        store_path (str): The SQLite database file of the store.
+        owner (str): The owner slug of the dataset.
+        dataset (str): The dataset slug.
+        version (str): The dataset version.
+        country (str): The two letter country code.
+        name (str): The name the result is stored under.
+        keys (list[str]): The columns identifying each row.
+        metrics (list[str]): The columns compared between versions.
+
+    Methods:
+        generate(data: pd.DataFrame, save_path: str):
+            Writes the key and metric columns of the dataset to the store.
+    """
+
+    def __init__(
+        self,
+        *,
+        store_path: str,
+        owner: str,
+        dataset: str,
+        version: str,
+        country: str,
+        name: str,
+        keys: list[str],
+        metrics: list[str],
+        logger: JSONLogger | None = None,
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.store_path = store_path
+        self.owner = owner
+        self.dataset = dataset
+        self.version = version
+        self.country = country
+        self.name = name
+        self.keys = keys
+        self.metrics = metrics
+
+    """
+    Writes the key and metric columns of the dataset to the store.
+
+    Args:
+        data (pd.DataFrame): The result.
+        save_path (str): The directory of the other outputs, unused.
+
+    Returns:
+        None
+    """
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        self.logger.info(f"Starting Output {self.name} to results store")
+
+        if data.empty:
+            self.logger.error(
+                f"Output {self.name} to results store failed empty data"
+            )
+
+        ResultsStore(store_path=self.store_path, logger=self.logger).write(
+            owner=self.owner,
+            dataset=self.dataset,
+            version=self.version,
+            country=self.country,
+            name=self.name,
+            data=data,
+            keys=self.keys,
+            metrics=self.metrics,
+        )
+
+        self.logger.info(f"Complete Output {self.name} to results store")
@@ -0,0 +1,209 @@
+from typing import Sequence
+
+import pandas as pd
+
+from downloader.data_output.chart_renderer import (
+    ChartRenderer,
+    LineChart,
+    thread_renderer,
+)
+from downloader.data_output.data_output import DataOutput
+from downloader.data_output.json_formats import file_name, resolve, write_json
+from downloader.logger.logger import JSONLogger
+
+
+class ViewsTimeSeriesLineChart(DataOutput):
+    """
+    Generates and saves a line chart that visualizes YouTube views per
+    category on each trending date.
+
+    A line is drawn per category, the categories with the most views
+    first, and a category missing on a day counts no views for it. Charts
+    are drawn by the `ChartRenderer` of the calling thread.
+
+    Attributes:
+        formats (Sequence[str]): The formats the chart is saved in, from
+            `CHART_FORMATS`.
+
+    Methods:
+        generate(data: pd.DataFrame, save_path: str | None):
+            Generates and saves a line chart using the provided dataset.
+    """
+
+    cpu_bound = True
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        formats: Sequence[str] = ("png",),
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.formats = formats
+
+    """
+    Generates and saves a line chart showing YouTube views by category
+    over time.
+
+    Args:
+        data (pd.DataFrame): The dataset containing "trending_date",
+                             "snippet.title" and "views" columns.
+        save_path (str | None): The directory path where the chart image
+                                should be saved.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: Logs an error if the provided dataset is empty.
+    """
+
+    def generate(self, data: pd.DataFrame, save_path: str | None) -> None:
+        self.logger.info("Starting Output ViewsTimeSeries as Line Chart")
+
+        if data.empty:
+            self.logger.error(
+                "Output ViewsTimeSeries as Line Chart failed empty data"
+            )
+
+        views = data.pivot_table(
+            index="trending_date",
+            columns="snippet.title",
+            values="views",
+            aggfunc="sum",
+            fill_value=0,
+        )
+        views = views[views.sum().sort_values(ascending=False).index]
+
+        thread_renderer().render(
+            LineChart(
+                x=list(views.index),
+                series={
+                    str(title): list(views[title]) for title in views.columns
+                },
+                title="Youtube Views by Category over Time",
+                xlabel="Trending Date",
+                ylabel="Views(millions)",
+            ),
+            f"{save_path}/views_time_series_line_chart",
+            self.formats,
+        )
+
+        self.logger.info("Complete Output ViewsTimeSeries as Line Chart")
+
+    """
+    Returns the path of the line chart in each format.
+
+    Args:
+        save_path (str | None): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str | None) -> list[str]:
+        return [
+            ChartRenderer.file_name(
+                f"{save_path}/views_time_series_line_chart", chart_format
+            )
+            for chart_format in self.formats
+        ]
+
+
+class ViewsTimeSeriesJSON(DataOutput):
+    """
+    Generates and saves a json file that contains YouTube views per
+    category on each trending date, dates given as "YYYY-MM-DD", or
+    another format given by `json_format`, saved atomically.
+
+    Attributes:
+        json_format (str): The format written, one of `JSON_FORMATS`,
+            falling back to "records" if "parquet" cannot be written.
+        compression (str | None): The compression of the file, one of
+            `JSON_COMPRESSIONS`, falling back to gzip if zstd cannot be
+            written.
+
+    Methods:
+        generate(data: pd.DataFrame, save_path: str):
+            Converts the provided dataset into a JSON file and saves it.
+    """
+
+    """
+    Initializes the output.
+
+    Args:
+        logger (JSONLogger | None): A logger instance for structured logging.
+        json_format (str): The format written, see `write_json`. Defaults to
+            "records".
+        compression (str | None): The compression of the file. Defaults to
+            none.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        json_format: str = "records",
+        compression: str | None = None,
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.json_format, self.compression = resolve(
+            json_format, compression, self.logger
+        )
+
+    """
+    Generates and saves a json file containing YouTube views by category
+    on each trending date.
+
+    Args:
+        data (pd.DataFrame): The dataset containing "trending_date",
+                             "category_id", "snippet.title" and "views"
+                             columns.
+        save_path (str): The directory path where the file should be saved.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: Logs an error if the provided dataset is empty.
+    """
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        self.logger.info("Starting Output ViewsTimeSeries as JSON")
+
+        if data.empty:
+            self.logger.error(
+                "Output ViewsTimeSeries as JSON failed empty data"
+            )
+
+        write_json(
+            data.assign(
+                trending_date=data["trending_date"].dt.strftime("%Y-%m-%d")
+            )[["trending_date", "category_id", "snippet.title", "views"]],
+            self.output_files(save_path)[0],
+            self.json_format,
+            self.compression,
+        )
+
+        self.logger.info("Complete Output ViewsTimeSeries as JSON")
+
+    """
+    Returns the path of the JSON file.
+
+    Args:
+        save_path (str): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str) -> list[str]:
+        return [
+            file_name(
+                f"{save_path}/views_time_series",
+                self.json_format,
+                self.compression,
+            )
+        ]
@@ -1,7 +1,15 @@
-import matplotlib.pyplot as plt
+from typing import Sequence
+
 import pandas as pd
 
+from downloader.data_output.chart_renderer import (
+    BarChart,
+    ChartRenderer,
+    thread_renderer,
+)
 from downloader.data_output.data_output import DataOutput
+from downloader.data_output.json_formats import file_name, resolve, write_json
+from downloader.logger.logger import JSONLogger
 
 
 class ViewsToCategoriesBarChart(DataOutput):
@@ -10,13 +18,30 @@ class ViewsToCategoriesBarChart(DataOutput):
     per category.
 
     This implementation creates a bar chart using the provided dataset and
-    saves it to the specified location.
+    saves it to the specified location in each of the requested formats.
+    Charts are drawn by the `ChartRenderer` of the calling thread.
+
+    Attributes:
+        formats (Sequence[str]): The formats the chart is saved in, from
+            `CHART_FORMATS`.
 
     Methods:
         generate(data: pd.DataFrame, save_path: str | None):
             Generates and saves a bar chart using the provided dataset.
     """
 
+    cpu_bound = True
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        formats: Sequence[str] = ("png",),
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.formats = formats
+
     """
     Generates and saves a bar chart showing YouTube views by category.
 
@@ -41,34 +66,84 @@ class ViewsToCategoriesBarChart(DataOutput):
                 "Output ViewsToCategories as Bar Chart failed empty data"
             )
 
-        plt.bar(
-            data["snippet.title"],
-            data["views"],
-            color="skyblue",
+        thread_renderer().render(
+            BarChart(
+                labels=list(data["snippet.title"]),
+                values=list(data["views"]),
+                title="Youtube Views by Category",
+                xlabel="Category",
+                ylabel="Views(millions)",
+            ),
+            f"{save_path}/views_to_categories_bar_chart",
+            self.formats,
         )
 
-        plt.xlabel("Category")
-        plt.ylabel("Views(millions)")
-        plt.tick_params(axis="x", labelrotation=90)
-        plt.title("Youtube Views by Category")
-        plt.savefig(f"{save_path}/views_to_categories_bar_chart.png")
-
         self.logger.info("Complete Output ViewsToCategories as Bar Chart")
 
+    """
+    Returns the path of the bar chart in each format.
+
+    Args:
+        save_path (str | None): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str | None) -> list[str]:
+        return [
+            ChartRenderer.file_name(
+                f"{save_path}/views_to_categories_bar_chart", chart_format
+            )
+            for chart_format in self.formats
+        ]
+
 
 class ViewsToCategoriesJSON(DataOutput):
     """
     Generates and saves a json file that contains YouTube views
     per category.
 
-    This implementation converts the provided dataset into a JSON file
-    and saves it to the specified location.
+    This implementation converts the provided dataset into a JSON file,
+    or another format given by `json_format`, and saves it atomically to
+    the specified location.
+
+    Attributes:
+        json_format (str): The format written, one of `JSON_FORMATS`,
+            falling back to "records" if "parquet" cannot be written.
+        compression (str | None): The compression of the file, one of
+            `JSON_COMPRESSIONS`, falling back to gzip if zstd cannot be
+            written.
 
     Methods:
         generate(data: pd.DataFrame, save_path: str):
             Converts the provided dataset into a JSON file and saves it.
     """
 
+    """
+    Initializes the output.
+
+    Args:
+        logger (JSONLogger | None): A logger instance for structured logging.
+        json_format (str): The format written, see `write_json`. Defaults to
+            "records".
+        compression (str | None): The compression of the file. Defaults to
+            none.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        json_format: str = "records",
+        compression: str | None = None,
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.json_format, self.compression = resolve(
+            json_format, compression, self.logger
+        )
+
     """
     Generates and saves a json file containing YouTube views by category.
 
@@ -93,6 +168,30 @@ class ViewsToCategoriesJSON(DataOutput):
                 "Output ViewsToCategories as JSON failed empty data"
             )
 
-        data.to_json(f"{save_path}/views_to_categories.json", orient="records")
+        write_json(
+            data,
+            self.output_files(save_path)[0],
+            self.json_format,
+            self.compression,
+        )
 
         self.logger.info("Complete Output ViewsToCategories as JSON")
+
+    """
+    Returns the path of the JSON file.
+
+    Args:
+        save_path (str): The path passed to `generate`.
+
+    Returns:
+        list[str]
+    """
+
+    def output_files(self, save_path: str) -> list[str]:
+        return [
+            file_name(
+                f"{save_path}/views_to_categories",
+                self.json_format,
+                self.compression,
+            )
+        ]
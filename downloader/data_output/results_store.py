@@ -0,0 +1,307 @@
+import io
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import pandas as pd
+
+from downloader.logger.logger import JSONLogger
+
+
+class ResultsStore:
+    """
+    An embedded SQLite store of the results of each run, such as the views
+    per category of a country, kept for every dataset version so past
+    versions can be read and compared without retrieving or transforming
+    them again.
+
+    A result is keyed by the owner, dataset, version, country and name of
+    the result. Its rows are held as JSON with the key columns identifying
+    each row and the metric columns compared between versions. Writing a
+    result replaces any result held under the same key. Datetime columns
+    are held as ISO dates.
+
+    The store is written by the worker process of each country at once, so
+    it uses write-ahead logging and waits up to `TIMEOUT` seconds for a
+    lock.
+
+    Attributes:
+        store_path (str): The SQLite database file.
+        logger (JSONLogger): A logger instance for structured logging.
+
+        TIMEOUT (float):
+            The seconds waited for another process to release a lock.
+    """
+
+    TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        *,
+        store_path: str,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.store_path = store_path
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Writes a result, replacing any result held under the same key.
+
+    Args:
+        owner (str): The owner slug of the dataset.
+        dataset (str): The dataset slug.
+        version (str): The dataset version.
+        country (str): The two letter country code.
+        name (str): The name of the result, e.g. "views_to_categories".
+        data (pd.DataFrame): The result.
+        keys (list[str]): The columns identifying each row.
+        metrics (list[str]): The columns compared between versions.
+
+    Returns:
+        None
+    """
+
+    def write(
+        self,
+        *,
+        owner: str,
+        dataset: str,
+        version: str,
+        country: str,
+        name: str,
+        data: pd.DataFrame,
+        keys: list[str],
+        metrics: list[str],
+    ) -> None:
+        data = data[keys + metrics].copy()
+
+        for column in data.columns:
+            if pd.api.types.is_datetime64_any_dtype(data[column]):
+                data[column] = data[column].dt.strftime("%Y-%m-%d")
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    owner,
+                    dataset,
+                    version,
+                    country,
+                    name,
+                    json.dumps(keys),
+                    json.dumps(metrics),
+                    data.to_json(orient="split", index=False),
+                    len(data),
+                    time.time(),
+                ),
+            )
+
+        self.logger.info(
+            "Result stored.",
+            dataset=f"{owner}/{dataset}/{version}",
+            country=country,
+            name=name,
+            rows=len(data),
+        )
+
+    """
+    Loads a result.
+
+    Args:
+        owner (str): The owner slug of the dataset.
+        dataset (str): The dataset slug.
+        version (str): The dataset version.
+        country (str): The two letter country code.
+        name (str): The name of the result.
+
+    Returns:
+        pd.DataFrame | None: The key and metric columns of the result,
+            `None` if it is not held.
+    """
+
+    def load(
+        self, owner: str, dataset: str, version: str, country: str, name: str
+    ) -> pd.DataFrame | None:
+        row = self._fetch(owner, dataset, version, country, name)
+
+        return None if row is None else row[2]
+
+    """
+    Compares a result of two versions of a dataset. Rows are matched by
+    their key columns, a row held by one version only has no metrics for
+    the other and its change is the difference from 0.
+
+    Args:
+        owner (str): The owner slug of the dataset.
+        dataset (str): The dataset slug.
+        version (str): The version compared from.
+        other_version (str): The version compared to.
+        country (str): The two letter country code.
+        name (str): The name of the result.
+
+    Returns:
+        pd.DataFrame | None: The key columns of each row with
+            "<metric>_from", "<metric>_to" and "<metric>_change" columns
+            for each metric, largest absolute change of the first metric
+            first, `None` if either version's result is not held.
+    """
+
+    def diff(
+        self,
+        owner: str,
+        dataset: str,
+        version: str,
+        other_version: str,
+        country: str,
+        name: str,
+    ) -> pd.DataFrame | None:
+        before = self._fetch(owner, dataset, version, country, name)
+        after = self._fetch(owner, dataset, other_version, country, name)
+
+        if before is None or after is None:
+            return None
+
+        keys = [key for key in after[0] if key in before[0]]
+        metrics = [metric for metric in after[1] if metric in before[1]]
+        merged = before[2][keys + metrics].merge(
+            after[2][keys + metrics],
+            on=keys,
+            how="outer",
+            suffixes=("_from", "_to"),
+        )
+
+        for metric in metrics:
+            merged[f"{metric}_change"] = merged[f"{metric}_to"].fillna(
+                0
+            ) - merged[f"{metric}_from"].fillna(0)
+
+        if metrics:
+            merged = merged.sort_values(
+                f"{metrics[0]}_change",
+                key=abs,
+                ascending=False,
+                kind="stable",
+                ignore_index=True,
+            )
+
+        return merged
+
+    """
+    Lists the results held for a dataset.
+
+    Args:
+        owner (str): The owner slug of the dataset.
+        dataset (str): The dataset slug.
+
+    Returns:
+        pd.DataFrame: The "version", "country", "name", "rows" and
+            "written_at" of each result held, numeric versions in numeric
+            order.
+    """
+
+    def results(self, owner: str, dataset: str) -> pd.DataFrame:
+        columns = ["version", "country", "name", "rows", "written_at"]
+
+        if not os.path.exists(self.store_path):
+            return pd.DataFrame(columns=columns)
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT version, country, name, rows, written_at "
+                "FROM results "
+                "WHERE owner = ? AND dataset = ? "
+                "ORDER BY CAST(version AS INTEGER), version, country, name",
+                (owner, dataset),
+            ).fetchall()
+
+        return pd.DataFrame(rows, columns=columns)
+
+    """
+    fetches the key columns, metric columns and rows of a result, `None` if
+    it is not held
+    """
+
+    def _fetch(
+        self, owner: str, dataset: str, version: str, country: str, name: str
+    ) -> tuple[list[str], list[str], pd.DataFrame] | None:
+        if not os.path.exists(self.store_path):
+            return None
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT keys, metrics, data FROM results WHERE owner = ? "
+                "AND dataset = ? AND version = ? AND country = ? "
+                "AND name = ?",
+                (owner, dataset, version, country, name),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return (
+            json.loads(row[0]),
+            json.loads(row[1]),
+            pd.read_json(
+                io.StringIO(row[2]),
+                orient="split",
+                dtype=False,
+                convert_dates=False,
+            ),
+        )
+
+    """
+    yields a connection to the store, creating its table if needed, which
+    commits on success and is closed on exit
+    """
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(self.store_path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.store_path, timeout=self.TIMEOUT)
+
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "owner TEXT NOT NULL, dataset TEXT NOT NULL, "
+                "version TEXT NOT NULL, country TEXT NOT NULL, "
+                "name TEXT NOT NULL, keys TEXT NOT NULL, "
+                "metrics TEXT NOT NULL, data TEXT NOT NULL, "
+                "rows INTEGER NOT NULL, written_at REAL NOT NULL, "
+                "PRIMARY KEY (owner, dataset, name, country, version))"
+            )
+
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+"""
+Converts a result into JSON serialisable records, missing values becoming
+`None`.
+
+Args:
+    data (pd.DataFrame): The result.
+
+Returns:
+    list[dict[str, Any]]: A record for each row.
+"""
+
+
+def records(data: pd.DataFrame) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = json.loads(data.to_json(orient="records"))
+
+    return records
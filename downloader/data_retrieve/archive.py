@@ -0,0 +1,157 @@
+import os
+import shutil
+import uuid
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+ARCHIVE_EXTENSION = ".zip"
+
+"""
+Splits a path that refers to a member of a zip archive into the path of
+the archive and the name of the member.
+
+Members of an archive are addressed by appending the member name to the
+archive path, e.g. "/tmp/youtube-new.zip/GBvideos.csv".
+
+Args:
+    file_path (str): The path to split.
+
+Returns:
+    tuple[str, str] | None: The archive path and member name, or `None` if
+        `file_path` does not refer to a member of an existing archive.
+"""
+
+
+def split_archive_path(file_path: str) -> tuple[str, str] | None:
+    head, separator, member = file_path.partition(f"{ARCHIVE_EXTENSION}/")
+
+    if separator and os.path.isfile(f"{head}{ARCHIVE_EXTENSION}"):
+        return f"{head}{ARCHIVE_EXTENSION}", member
+
+    return None
+
+
+"""
+Returns the path of the file on disk that holds `file_path`, this is the
+archive for archive members and `file_path` itself otherwise.
+
+Args:
+    file_path (str): A plain file path or archive member path.
+
+Returns:
+    str
+"""
+
+
+def stored_path(file_path: str) -> str:
+    archive_path = split_archive_path(file_path)
+
+    return archive_path[0] if archive_path else file_path
+
+
+"""
+Opens a plain file or a member of a zip archive for binary reading.
+
+Archive members are decompressed as they are read, nothing is extracted
+to disk.
+
+Args:
+    file_path (str): A plain file path or archive member path.
+
+Returns:
+    Iterator[IO[bytes]]: A context manager yielding the open file.
+"""
+
+
+@contextmanager
+def open_file(file_path: str) -> Iterator[IO[bytes]]:
+    archive_path = split_archive_path(file_path)
+
+    if archive_path is None:
+        with open(file_path, "rb") as f:
+            yield f
+    else:
+        with zipfile.ZipFile(archive_path[0]) as archive:
+            with archive.open(archive_path[1]) as f:
+                yield f
+
+
+"""
+Finds a file within a directory, whether it is stored as a plain file,
+compressed in its own archive or as a member of another archive in the
+directory.
+
+Args:
+    save_path (str): The directory to search.
+    file_name (str): The name of the file to find.
+
+Returns:
+    str | None: A plain file or archive member path that can be passed to
+        `open_file`, or `None` if the file cannot be found.
+"""
+
+
+def locate(save_path: str, file_name: str) -> str | None:
+    if os.path.isfile(f"{save_path}/{file_name}"):
+        return f"{save_path}/{file_name}"
+
+    archive_paths = [f"{save_path}/{file_name}{ARCHIVE_EXTENSION}"]
+
+    if os.path.isdir(save_path):
+        archive_paths += sorted(
+            f"{save_path}/{entry}"
+            for entry in os.listdir(save_path)
+            if entry.endswith(ARCHIVE_EXTENSION)
+        )
+
+    for archive_path in archive_paths:
+        if not os.path.isfile(archive_path):
+            continue
+
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                if file_name in archive.namelist():
+                    return f"{archive_path}/{file_name}"
+        except zipfile.BadZipFile:
+            continue
+
+    return None
+
+
+"""
+Extracts a member of a zip archive into a directory atomically, the member
+is written to a temporary file which replaces any existing file once the
+member has been read in full and its CRC-32 checked.
+
+Args:
+    archive_path (str): The archive.
+    member (str): The name of the member.
+    directory (str): The directory extracted to.
+
+Returns:
+    str: The path of the extracted file.
+
+Raises:
+    zipfile.BadZipFile: If the member fails its CRC-32 check.
+"""
+
+
+def extract(archive_path: str, member: str, directory: str) -> str:
+    file_path = f"{directory}/{member}"
+    temp_path = (
+        f"{os.path.dirname(file_path)}/."
+        f"{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp"
+    )
+
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            with archive.open(member) as source, open(temp_path, "wb") as f:
+                shutil.copyfileobj(source, f, 1024 * 1024)
+
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return file_path
@@ -0,0 +1,230 @@
+import os
+import shutil
+import threading
+import uuid
+
+from downloader.data_retrieve.archive import locate
+from downloader.data_retrieve.kaggle_retrieve import KaggleRetrieve
+from downloader.data_retrieve.manifest import Manifest
+from downloader.logger.logger import JSONLogger
+
+
+class DownloadCache:
+    """
+    A content-addressed store of retrieved dataset files, shared by the
+    retrievals of a batch of dataset versions.
+
+    Each retrieved file is stored once under the SHA-256 digest recorded by
+    its `Manifest` and hard linked into the save path of every dataset
+    version holding it, so the save paths take no more space than the
+    distinct files. The manifest of each remote version retrieved is
+    indexed by its remote path and version.
+
+    Retrievals resolving to the same remote version run one at a time, the
+    first downloads the files and the rest restore them from the store
+    without downloading them again. Nothing is evicted, the store is
+    cleared by deleting `cache_path`.
+
+    Attributes:
+        cache_path (str): The directory of the store.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    """
+    Initializes the `DownloadCache` class.
+
+    Args:
+        cache_path (str): The directory of the store, created if missing.
+        logger (JSONLogger | None): An optional logger instance for
+            structured logging.
+    """
+
+    def __init__(
+        self, *, cache_path: str, logger: JSONLogger | None = None
+    ) -> None:
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._metadata: dict[str, str | None] = {}
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Retrieves the files of a dataset into `save_path`, restoring them from
+    the store when the version pinned by `retrieve`, or else the current
+    remote version, is held and otherwise retrieving them with `retrieve`
+    and adding them to the store.
+
+    The remote version of each dataset is looked up once, when no version
+    is pinned. When it is unknown the files are retrieved without the
+    store.
+
+    Args:
+        retrieve (KaggleRetrieve): Retrieves the files when they are not
+            held.
+        remote_path (str): The remote path on Kaggle of the dataset.
+        save_path (str): The local directory the files are saved to.
+        file_names (list[str]): The files that are required locally.
+
+    Returns:
+        bool: `True` if the files are present in `save_path`.
+    """
+
+    def get(
+        self,
+        retrieve: KaggleRetrieve,
+        remote_path: str,
+        save_path: str,
+        file_names: list[str],
+    ) -> bool:
+        version = retrieve.version
+
+        if version is None:
+            with self._lock:
+                if remote_path not in self._metadata:
+                    self._metadata[remote_path] = retrieve.remote_metadata(
+                        remote_path
+                    )[0]
+
+                version = self._metadata[remote_path]
+
+        if version is None:
+            return retrieve.get(remote_path, save_path, file_names)
+
+        with self._lock:
+            lock = self._locks.setdefault(
+                (remote_path, version), threading.Lock()
+            )
+
+        with lock:
+            if self.restore(remote_path, version, save_path, file_names):
+                self.logger.info(
+                    f"{remote_path} version {version} restored from the "
+                    f"download cache to {save_path}."
+                )
+
+                return True
+
+            if not retrieve.get(remote_path, save_path, file_names):
+                return False
+
+            self.add(save_path)
+
+            return True
+
+    """
+    Links the files of a remote version held by the store into
+    `save_path`, with its manifest.
+
+    Args:
+        remote_path (str): The remote path on Kaggle of the dataset.
+        version (str): The remote version.
+        save_path (str): The local directory the files are linked into.
+        file_names (list[str]): The files that are required locally.
+
+    Returns:
+        bool: `True` if the version is held and holds every file.
+    """
+
+    def restore(
+        self,
+        remote_path: str,
+        version: str,
+        save_path: str,
+        file_names: list[str],
+    ) -> bool:
+        manifest = Manifest.load(self._index_path(remote_path, version))
+
+        if manifest is None or not all(
+            os.path.exists(self._object_path(details["sha256"]))
+            and os.path.getsize(self._object_path(details["sha256"]))
+            == details["size"]
+            for details in manifest.files.values()
+        ):
+            return False
+
+        os.makedirs(save_path, exist_ok=True)
+
+        for file_name, details in manifest.files.items():
+            _link(
+                self._object_path(details["sha256"]),
+                f"{save_path}/{file_name}",
+            )
+
+        if not all(locate(save_path, file_name) for file_name in file_names):
+            return False
+
+        manifest.save(save_path)
+
+        return True
+
+    """
+    Adds the files retrieved into `save_path` to the store, replacing each
+    with a link to the stored file, and indexes the manifest of their
+    remote version. Files without a manifest recording their remote
+    version are not added.
+
+    Args:
+        save_path (str): The local directory holding the retrieved files.
+
+    Returns:
+        None
+    """
+
+    def add(self, save_path: str) -> None:
+        manifest = Manifest.load(save_path)
+
+        if manifest is None or manifest.version is None:
+            return
+
+        for file_name, details in manifest.files.items():
+            file_path = f"{save_path}/{file_name}"
+            object_path = self._object_path(details["sha256"])
+
+            if os.path.exists(object_path):
+                _link(object_path, file_path)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                _link(file_path, object_path)
+
+        index_path = self._index_path(manifest.remote_path, manifest.version)
+
+        os.makedirs(index_path, exist_ok=True)
+        manifest.save(index_path)
+
+    """
+    returns the stored file of a digest
+    """
+
+    def _object_path(self, sha256: str) -> str:
+        return f"{self.cache_path}/objects/{sha256[:2]}/{sha256}"
+
+    """
+    returns the directory indexing the manifest of a remote version
+    """
+
+    def _index_path(self, remote_path: str, version: str) -> str:
+        return f"{self.cache_path}/index/{remote_path}/{version}"
+
+
+"""
+links a file to a path, replacing any other file at the path, copying it
+when the two are on different file systems
+"""
+
+
+def _link(source_path: str, file_path: str) -> None:
+    if os.path.exists(file_path) and os.path.samefile(source_path, file_path):
+        return
+
+    temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copyfile(source_path, temp_path)
+
+    os.replace(temp_path, file_path)
@@ -1,8 +1,40 @@
 import os
+import urllib.parse
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-from kaggle import api
-
+from downloader.data_retrieve.archive import (
+    ARCHIVE_EXTENSION,
+    extract,
+    locate,
+    stored_path,
+)
 from downloader.data_retrieve.data_retrieve import DataRetrieve
+from downloader.data_retrieve.manifest import Manifest
+from downloader.logger.logger import JSONLogger
+
+if TYPE_CHECKING:
+    from downloader.data_retrieve.resumable_download import ResumableDownload
+
+MAX_DOWNLOAD_WORKERS = 4
+KAGGLE_DOWNLOAD_URL = "https://www.kaggle.com/api/v1/datasets/download"
+
+"""
+Returns the Kaggle API client.
+
+The kaggle package authenticates when it is imported, so it is only
+imported once a request to Kaggle is needed.
+
+Returns:
+    KaggleApi
+"""
+
+
+def kaggle_api() -> Any:
+    from kaggle import api
+
+    return api
 
 
 class KaggleRetrieve(DataRetrieve):
@@ -14,12 +46,78 @@ class KaggleRetrieve(DataRetrieve):
     from a specified emote path and checks for the presence
     of the specified files in the target directory.
 
+    A manifest recording the remote version and the size and SHA-256
+    digest of each file is written alongside the extracted files. When the
+    manifest shows the local copy matches the current remote version and
+    is intact the download is skipped.
+
+    Only the requested files are downloaded, in parallel, with the full
+    dataset archive used as a fallback when per-file download is
+    unavailable.
+
+    When `extract` is disabled downloaded archives are kept compressed and
+    the requested files are read directly from them, see `locate`.
+
+    When a `version` is pinned that version is downloaded, even once the
+    dataset has a later version, and when the manifest shows an intact
+    local copy of it Kaggle is not contacted at all.
+
+    When a `downloader` is given each file is downloaded by it from the
+    Kaggle download endpoint, resuming interrupted transfers and verifying
+    each file before it is extracted, rather than by the Kaggle client.
+    Archives, including the full dataset archive, are extracted atomically
+    either way, each requested member being checked against its CRC-32,
+    see `extract`.
+
     Attributes:
         logger (JSONLogger):
             Inherited from the parent `DataRetrieve` class. Used to log
             actions and errors during the data retrieval process.
+        max_workers (int):
+            The maximum number of files downloaded concurrently.
+        extract (bool):
+            Whether downloaded archives are extracted.
+        version (str | None):
+            The dataset version downloaded, if any, otherwise the current
+            remote version is.
+        downloader (ResumableDownload | None):
+            Downloads each file, if `None` the Kaggle client does.
     """
 
+    """
+    Initializes the `KaggleRetrieve` class.
+
+    Args:
+        logger (JSONLogger | None): An optional logger instance for
+            structured logging.
+        max_workers (int): The maximum number of files downloaded
+            concurrently. Defaults to `MAX_DOWNLOAD_WORKERS`.
+        extract (bool): Whether downloaded archives are extracted, if
+            `False` they are kept compressed. Defaults to `True`.
+        version (str | None): The dataset version downloaded. If not
+            provided, the current remote version is downloaded and the
+            remote version is always checked.
+        downloader (ResumableDownload | None): Downloads each file from
+            the Kaggle download endpoint. If not provided the Kaggle client
+            downloads them.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        max_workers: int = MAX_DOWNLOAD_WORKERS,
+        extract: bool = True,
+        version: str | None = None,
+        downloader: "ResumableDownload | None" = None,
+    ) -> None:
+        super().__init__(logger=logger)
+
+        self.max_workers = max(1, max_workers)
+        self.extract = extract
+        self.version = version
+        self.downloader = downloader
+
     """
     Downloads and extracts a Kaggle dataset to the specified local directory.
 
@@ -28,6 +126,17 @@ class KaggleRetrieve(DataRetrieve):
     by `save_path`. The specified `file_names` are then checked
     to ensure they exist after extraction.
 
+    If the manifest in `save_path` records the pinned `version` and the
+    files are intact nothing is downloaded and Kaggle is not contacted.
+    Otherwise the remote version and last updated timestamp are checked, if
+    the manifest records the version to download, the pinned `version` or
+    else the current remote version, and the files are intact the download
+    is skipped.
+
+    Each of `file_names` is downloaded individually using a bounded pool of
+    workers, if per-file download fails the full dataset archive is
+    downloaded and extracted instead.
+
     Args:
         remote_path (str): The remote path on Kaggle where the dataset is
              located. E.g., "username/dataset-name".
@@ -55,8 +164,45 @@ class KaggleRetrieve(DataRetrieve):
         file_names: list[str],
     ) -> bool:
         try:
+            manifest = Manifest.load(save_path)
+
+            if (
+                self.version
+                and manifest
+                and self._is_current(
+                    remote_path,
+                    save_path,
+                    file_names,
+                    self.version,
+                    manifest.last_updated,
+                )
+            ):
+                self.logger.info(
+                    f"{remote_path} version {self.version} is up to date in "
+                    f"{save_path}, download skipped."
+                )
+
+                return True
+
+            version, last_updated = self.remote_metadata(remote_path)
+
+            if self.version and version != self.version:
+                # The last updated timestamp is only known for the current
+                # remote version.
+                version, last_updated = self.version, None
+
+            if self._is_current(
+                remote_path, save_path, file_names, version, last_updated
+            ):
+                self.logger.info(
+                    f"{remote_path} version {version} is up to date in "
+                    f"{save_path}, download skipped."
+                )
+
+                return True
+
             self.logger.info(f"Download of {remote_path} started.")
-            api.dataset_download_files(remote_path, save_path, unzip=True)
+            self._download(remote_path, save_path, file_names, version)
             self.logger.info(
                 f"Download and extraction of {remote_path} completed."
             )
@@ -65,7 +211,7 @@ class KaggleRetrieve(DataRetrieve):
 
             for file_name in file_names:
 
-                if not os.path.exists(f"{save_path}/{file_name}"):
+                if not locate(save_path, file_name):
                     self.logger.error(f"{file_name} not found in {save_path}.")
 
                     success = False
@@ -75,6 +221,15 @@ class KaggleRetrieve(DataRetrieve):
                         f"and extracted to {save_path}."
                     )
 
+            if success:
+                Manifest.build(
+                    save_path,
+                    remote_path,
+                    version,
+                    last_updated,
+                    self._stored_files(save_path, file_names) or [],
+                ).save(save_path)
+
             return success
 
         except Exception as e:
@@ -83,3 +238,280 @@ class KaggleRetrieve(DataRetrieve):
             )
 
             return False
+
+    """
+    Retrieves the current version number and last updated timestamp of a
+    Kaggle dataset.
+
+    Args:
+        remote_path (str): The remote path on Kaggle where the dataset is
+             located. E.g., "username/dataset-name".
+
+    Returns:
+        tuple[str | None, str | None]: The version and last updated
+            timestamp, either is `None` if it could not be determined.
+    """
+
+    def remote_metadata(
+        self, remote_path: str
+    ) -> tuple[str | None, str | None]:
+        owner_slug, _, dataset_slug = remote_path.partition("/")
+
+        try:
+            datasets = kaggle_api().dataset_list(
+                user=owner_slug, search=dataset_slug
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Unable to retrieve metadata for {remote_path}: {e}."
+            )
+
+            return None, None
+
+        for dataset in datasets or []:
+            if str(getattr(dataset, "ref", "")).lower() != remote_path.lower():
+                continue
+
+            version = getattr(dataset, "current_version_number", None)
+            last_updated = getattr(dataset, "last_updated", None)
+
+            return (
+                str(version) if version else None,
+                str(last_updated) if last_updated else None,
+            )
+
+        self.logger.warning(f"No metadata found for {remote_path}.")
+
+        return None, None
+
+    """
+    Checks whether `save_path` already holds an intact copy of the given
+    remote version of a dataset.
+
+    Args:
+        remote_path (str): The remote path on Kaggle of the dataset.
+        save_path (str): The local directory holding the dataset files.
+        file_names (list[str]): The files that are required locally.
+        version (str | None): The current remote version.
+        last_updated (str | None): The current remote last updated timestamp.
+
+    Returns:
+        bool
+    """
+
+    def _is_current(
+        self,
+        remote_path: str,
+        save_path: str,
+        file_names: list[str],
+        version: str | None,
+        last_updated: str | None,
+    ) -> bool:
+        manifest = Manifest.load(save_path)
+        stored_files = self._stored_files(save_path, file_names)
+
+        if (
+            manifest is None
+            or stored_files is None
+            or not manifest.matches(
+                remote_path, version, last_updated, stored_files
+            )
+        ):
+            return False
+
+        if not manifest.verify(save_path):
+            self.logger.warning(
+                f"Local copy of {remote_path} in {save_path} failed "
+                f"verification."
+            )
+
+            return False
+
+        return True
+
+    """
+    Downloads the requested files of a version of a Kaggle dataset into
+    `save_path`, falling back to downloading the full dataset archive if
+    the files cannot be downloaded individually. Unless `extract` is
+    disabled the requested files are extracted from it and the archive
+    removed.
+
+    Partial downloads are kept so a later run resumes them, unless the
+    full dataset archive is downloaded instead.
+
+    Args:
+        remote_path (str): The remote path on Kaggle of the dataset.
+        save_path (str): The local directory the files are saved to.
+        file_names (list[str]): The files to download.
+        version (str | None): The version to download, `None` for the
+            current version.
+
+    Returns:
+        None
+    """
+
+    def _download(
+        self,
+        remote_path: str,
+        save_path: str,
+        file_names: list[str],
+        version: str | None,
+    ) -> None:
+        for file_name in file_names:
+            for file_path in (
+                f"{save_path}/{file_name}",
+                f"{save_path}/{file_name}{ARCHIVE_EXTENSION}",
+            ):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(file_names))
+            ) as executor:
+                list(
+                    executor.map(
+                        lambda file_name: self._download_file(
+                            remote_path, save_path, file_name, version
+                        ),
+                        file_names,
+                    )
+                )
+        except Exception as e:
+            self.logger.warning(
+                f"Per-file download of {remote_path} unavailable, "
+                f"downloading full archive: {e}."
+            )
+
+            kaggle_api().dataset_download_files(
+                _versioned(remote_path, version), save_path, unzip=False
+            )
+
+            if self.extract:
+                self._extract_archive(
+                    f"{save_path}/{remote_path.partition('/')[2]}"
+                    f"{ARCHIVE_EXTENSION}",
+                    save_path,
+                    file_names,
+                )
+
+            from downloader.data_retrieve.resumable_download import (
+                PARTIAL_EXTENSION,
+                remove_partial,
+            )
+
+            for file_name in file_names:
+                remove_partial(f"{save_path}/{file_name}{PARTIAL_EXTENSION}")
+
+    """
+    extracts the requested files held by the full dataset archive, then
+    removes it
+    """
+
+    def _extract_archive(
+        self, archive_path: str, save_path: str, file_names: list[str]
+    ) -> None:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = set(archive.namelist())
+
+        for file_name in file_names:
+            if file_name in members:
+                extract(archive_path, file_name, save_path)
+
+        os.remove(archive_path)
+
+    """
+    Downloads a single file of a version of a Kaggle dataset into
+    `save_path`.
+
+    Kaggle serves larger files compressed, in which case the downloaded
+    archive is extracted and removed unless `extract` is disabled.
+
+    With a `downloader` the file is downloaded from the Kaggle download
+    endpoint, authenticated with the user name and key of the Kaggle
+    client.
+
+    Args:
+        remote_path (str): The remote path on Kaggle of the dataset.
+        save_path (str): The local directory the file is saved to.
+        file_name (str): The file to download.
+        version (str | None): The version to download, `None` for the
+            current version.
+
+    Returns:
+        None
+    """
+
+    def _download_file(
+        self,
+        remote_path: str,
+        save_path: str,
+        file_name: str,
+        version: str | None,
+    ) -> None:
+        api = kaggle_api()
+
+        if self.downloader:
+            self.downloader.download(
+                f"{KAGGLE_DOWNLOAD_URL}/{remote_path}/"
+                f"{urllib.parse.quote(file_name)}"
+                + (f"?datasetVersionNumber={version}" if version else ""),
+                save_path,
+                file_name,
+                auth=(
+                    api.get_config_value("username"),
+                    api.get_config_value("key"),
+                ),
+            )
+        else:
+            api.dataset_download_file(
+                _versioned(remote_path, version),
+                file_name,
+                path=save_path,
+                force=True,
+                quiet=True,
+            )
+
+        archive_path = f"{save_path}/{file_name}{ARCHIVE_EXTENSION}"
+
+        if self.extract and os.path.exists(archive_path):
+            extract(archive_path, file_name, save_path)
+            os.remove(archive_path)
+
+    """
+    Finds the files on disk, plain files or archives, that hold the
+    requested files.
+
+    Args:
+        save_path (str): The local directory holding the dataset files.
+        file_names (list[str]): The requested files.
+
+    Returns:
+        list[str] | None: The sorted names of the stored files, or `None`
+            if any requested file cannot be found.
+    """
+
+    def _stored_files(
+        self, save_path: str, file_names: list[str]
+    ) -> list[str] | None:
+        stored_files: set[str] = set()
+
+        for file_name in file_names:
+            file_path = locate(save_path, file_name)
+
+            if file_path is None:
+                return None
+
+            stored_files.add(os.path.basename(stored_path(file_path)))
+
+        return sorted(stored_files)
+
+
+"""
+returns the reference of a version of a dataset used by the Kaggle client,
+"<owner_slug>/<dataset_slug>/<version>", or of its current version
+"""
+
+
+def _versioned(remote_path: str, version: str | None) -> str:
+    return f"{remote_path}/{version}" if version else remote_path
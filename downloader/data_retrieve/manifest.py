@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+from typing import Any
+
+MANIFEST_FILE_NAME = ".manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+"""
+Calculates the SHA-256 digest of a file.
+
+The file is read in fixed-size blocks so that large dataset files are
+never held in memory in full.
+
+Args:
+    file_path (str): The path of the file to hash.
+
+Returns:
+    str: The hex encoded SHA-256 digest of the file.
+"""
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Records which version of a remote dataset has been retrieved into a
+    local directory, along with the size and SHA-256 digest of every
+    retrieved file.
+
+    The manifest is stored alongside the retrieved files and is used to
+    decide whether a local copy is both current and intact, allowing a
+    retrieval to be skipped.
+
+    Attributes:
+        remote_path (str): The remote location the files were retrieved from.
+        version (str | None): The remote version of the dataset.
+        last_updated (str | None): The remote last updated timestamp.
+        files (dict[str, dict[str, Any]]): A mapping of file name to its
+            recorded "size" and "sha256".
+    """
+
+    def __init__(
+        self,
+        *,
+        remote_path: str,
+        version: str | None,
+        last_updated: str | None,
+        files: dict[str, dict[str, Any]],
+    ) -> None:
+        self.remote_path = remote_path
+        self.version = version
+        self.last_updated = last_updated
+        self.files = files
+
+    """
+    Builds a manifest by measuring and hashing the given files.
+
+    Args:
+        save_path (str): The directory containing the retrieved files.
+        remote_path (str): The remote location the files were retrieved from.
+        version (str | None): The remote version of the dataset.
+        last_updated (str | None): The remote last updated timestamp.
+        file_names (list[str]): The files to record in the manifest.
+
+    Returns:
+        Manifest
+    """
+
+    @classmethod
+    def build(
+        cls,
+        save_path: str,
+        remote_path: str,
+        version: str | None,
+        last_updated: str | None,
+        file_names: list[str],
+    ) -> "Manifest":
+        files: dict[str, dict[str, Any]] = {}
+
+        for file_name in file_names:
+            file_path = f"{save_path}/{file_name}"
+            files[file_name] = {
+                "size": os.path.getsize(file_path),
+                "sha256": file_sha256(file_path),
+            }
+
+        return cls(
+            remote_path=remote_path,
+            version=version,
+            last_updated=last_updated,
+            files=files,
+        )
+
+    """
+    Loads the manifest stored in a directory.
+
+    Args:
+        save_path (str): The directory containing the manifest.
+
+    Returns:
+        Manifest | None: The stored manifest, or `None` if no readable
+            manifest exists.
+    """
+
+    @classmethod
+    def load(cls, save_path: str) -> "Manifest | None":
+        try:
+            with open(f"{save_path}/{MANIFEST_FILE_NAME}") as f:
+                data = json.load(f)
+
+            return cls(
+                remote_path=data["remote_path"],
+                version=data["version"],
+                last_updated=data["last_updated"],
+                files=data["files"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    """
+    Writes the manifest into a directory.
+
+    Args:
+        save_path (str): The directory the manifest should be written to.
+
+    Returns:
+        None
+    """
+
+    def save(self, save_path: str) -> None:
+        with open(f"{save_path}/{MANIFEST_FILE_NAME}", "w") as f:
+            json.dump(
+                {
+                    "remote_path": self.remote_path,
+                    "version": self.version,
+                    "last_updated": self.last_updated,
+                    "files": self.files,
+                },
+                f,
+                indent=2,
+            )
+
+    """
+    Checks whether the manifest describes the given remote dataset version
+    and covers all the required files.
+
+    A manifest without a known version never matches, as there is nothing
+    to compare the remote version against.
+
+    Args:
+        remote_path (str): The remote location of the dataset.
+        version (str | None): The current remote version of the dataset.
+        last_updated (str | None): The current remote last updated timestamp.
+        file_names (list[str]): The files that are required locally.
+
+    Returns:
+        bool
+    """
+
+    def matches(
+        self,
+        remote_path: str,
+        version: str | None,
+        last_updated: str | None,
+        file_names: list[str],
+    ) -> bool:
+        return (
+            version is not None
+            and self.remote_path == remote_path
+            and self.version == version
+            and self.last_updated == last_updated
+            and all(file_name in self.files for file_name in file_names)
+        )
+
+    """
+    Checks that the recorded files are present in a directory and have the
+    recorded size and SHA-256 digest.
+
+    Sizes are compared for every file before any file is hashed, so an
+    obviously damaged copy is detected without reading it.
+
+    Args:
+        save_path (str): The directory containing the retrieved files.
+
+    Returns:
+        bool
+    """
+
+    def verify(self, save_path: str) -> bool:
+        for file_name, details in self.files.items():
+            file_path = f"{save_path}/{file_name}"
+
+            if (
+                not os.path.exists(file_path)
+                or os.path.getsize(file_path) != details["size"]
+            ):
+                return False
+
+        return all(
+            file_sha256(f"{save_path}/{file_name}") == details["sha256"]
+            for file_name, details in self.files.items()
+        )
@@ -0,0 +1,386 @@
+import base64
+import hashlib
+import os
+import secrets
+import time
+import urllib.parse
+
+import requests
+
+from downloader.data_retrieve.manifest import HASH_BLOCK_SIZE
+from downloader.logger.logger import JSONLogger
+
+PARTIAL_EXTENSION = ".partial"
+VALIDATOR_EXTENSION = ".validator"
+DOWNLOAD_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+CHUNK_BYTES = 1024 * 1024
+TIMEOUT_SECONDS = 60.0
+
+"""
+Calculates the MD5 digest of a file, reading it in fixed-size blocks.
+
+Args:
+    file_path (str): The path of the file to hash.
+
+Returns:
+    str: The hex encoded MD5 digest of the file.
+"""
+
+
+def file_md5(file_path: str) -> str:
+    digest = hashlib.md5(usedforsecurity=False)
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+"""
+Removes a partial file and the validator saved with it, if present.
+
+Args:
+    partial_path (str): The partial file.
+
+Returns:
+    None
+"""
+
+
+def remove_partial(partial_path: str) -> None:
+    for file_path in (partial_path, f"{partial_path}{VALIDATOR_EXTENSION}"):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+class ResumableDownload:
+    """
+    Downloads files over HTTP into a partial file, which is resumed from
+    its last byte with a range request when a transfer is interrupted,
+    whether by a retry or by a later run.
+
+    The strong entity tag, or else the Last-Modified date, of the file
+    served is saved next to the partial file and sent as an If-Range
+    header, so a file changed since the partial file was started is served
+    in full and downloaded again from its first byte. A partial file
+    without a saved validator is downloaded again from its first byte.
+
+    Failed attempts are retried after a delay doubling from `backoff` up to
+    `max_backoff`, varied by `jitter`. Client errors other than 429 Too
+    Many Requests are not retried.
+
+    A completed file is verified against the size given by the server and,
+    when the server gives one, the MD5 digest of its "x-goog-hash" header,
+    or "Content-MD5" header of a full response, before it is renamed to
+    its final name. A file failing verification is discarded and downloaded
+    again.
+
+    Attributes:
+        retries (int): The number of retries after a failed attempt.
+        backoff (float): The seconds before the first retry.
+        max_backoff (float): The maximum seconds between retries.
+        jitter (float): The fraction by which each delay is varied.
+        chunk_bytes (int): The bytes written at a time.
+        timeout (float): The seconds to wait for a connection or for data.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = DOWNLOAD_RETRIES,
+        backoff: float = BACKOFF_SECONDS,
+        max_backoff: float = MAX_BACKOFF_SECONDS,
+        jitter: float = 0.1,
+        chunk_bytes: int = CHUNK_BYTES,
+        timeout: float = TIMEOUT_SECONDS,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.chunk_bytes = chunk_bytes
+        self.timeout = timeout
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Downloads a file into a directory, resuming any partial download of it
+    left by an earlier attempt.
+
+    The file is named after the last segment of the URL the response was
+    served from, after any redirects, so a file served compressed keeps its
+    archive extension.
+
+    Args:
+        url (str): The URL of the file.
+        directory (str): The directory the file is saved to.
+        file_name (str): The name of the file, naming its partial file.
+        auth (tuple[str, str] | None): The user name and password sent as
+            basic authentication, not sent on to other hosts when
+            redirected.
+
+    Returns:
+        str: The path of the downloaded file.
+
+    Raises:
+        requests.RequestException: If the file cannot be downloaded.
+        ValueError: If the file fails verification on the last attempt.
+    """
+
+    def download(
+        self,
+        url: str,
+        directory: str,
+        file_name: str,
+        auth: tuple[str, str] | None = None,
+    ) -> str:
+        partial_path = f"{directory}/{file_name}{PARTIAL_EXTENSION}"
+        attempt = 0
+
+        while True:
+            try:
+                return self._attempt(url, directory, partial_path, auth)
+            except (requests.RequestException, ValueError) as e:
+                if attempt >= self.retries or not _retryable(e):
+                    raise
+
+                delay = self._delay(attempt)
+                attempt += 1
+
+                self.logger.warning(
+                    f"Download of {file_name} failed, retrying in "
+                    f"{delay:.1f} seconds: {e}.",
+                    attempt=attempt,
+                )
+
+                time.sleep(delay)
+
+    """
+    downloads the rest of a file into its partial file, verifying and
+    renaming it once complete
+    """
+
+    def _attempt(
+        self,
+        url: str,
+        directory: str,
+        partial_path: str,
+        auth: tuple[str, str] | None,
+    ) -> str:
+        validator_path = f"{partial_path}{VALIDATOR_EXTENSION}"
+        validator = _read_validator(validator_path)
+        offset = (
+            os.path.getsize(partial_path)
+            if validator and os.path.exists(partial_path)
+            else 0
+        )
+        headers = {"Accept-Encoding": "identity"}
+
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        with requests.get(
+            url, headers=headers, auth=auth, stream=True, timeout=self.timeout
+        ) as response:
+            if response.status_code == 416:
+                remove_partial(partial_path)
+
+                raise ValueError(
+                    f"{partial_path} is larger than the file served."
+                )
+
+            response.raise_for_status()
+
+            size = _size(response)
+
+            if response.status_code != 206:
+                offset = 0
+            elif _range_start(response) != offset:
+                remove_partial(partial_path)
+
+                raise ValueError(
+                    f"Range served for {partial_path} does not start at "
+                    f"{offset}."
+                )
+            elif _validator(response) != validator:
+                remove_partial(partial_path)
+
+                raise ValueError(
+                    f"File served for {partial_path} changed since it was "
+                    "started."
+                )
+
+            with open(partial_path, "ab" if offset else "wb") as f:
+                # saved once the partial file is truncated, so a validator
+                # is never paired with the bytes of another file
+                if not offset:
+                    _write_validator(validator_path, _validator(response))
+
+                for chunk in response.iter_content(self.chunk_bytes):
+                    f.write(chunk)
+
+            md5 = _md5(response)
+            file_path = f"{directory}/{_served_name(response, partial_path)}"
+
+        received = os.path.getsize(partial_path)
+
+        if size is not None and received != size:
+            if received > size:
+                remove_partial(partial_path)
+
+            raise ValueError(
+                f"{partial_path} holds {received} of {size} bytes."
+            )
+
+        if md5 and file_md5(partial_path) != md5:
+            remove_partial(partial_path)
+
+            raise ValueError(f"{partial_path} failed MD5 verification.")
+
+        os.replace(partial_path, file_path)
+        remove_partial(partial_path)
+
+        return file_path
+
+    """
+    returns the jittered delay before a retry, doubling for each attempt
+    """
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2.0 ** min(attempt, 32))
+
+        return delay * secrets.SystemRandom().uniform(
+            1 - self.jitter, 1 + self.jitter
+        )
+
+
+"""
+checks whether a failed attempt is worth retrying, client errors other than
+too many requests are not
+"""
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+
+        return status >= 500 or status == 429
+
+    return True
+
+
+"""
+returns the size of the whole file served, `None` when not given
+"""
+
+
+def _size(response: requests.Response) -> int | None:
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+
+        return int(total) if total.isdigit() else None
+
+    length = response.headers.get("Content-Length", "")
+
+    return int(length) if length.isdigit() else None
+
+
+"""
+returns the validator of the file served, its strong entity tag or else
+its last modified date, `None` when neither is given
+"""
+
+
+def _validator(response: requests.Response) -> str | None:
+    etag = response.headers.get("ETag")
+
+    if etag and not etag.startswith("W/"):
+        return str(etag)
+
+    last_modified = response.headers.get("Last-Modified")
+
+    return str(last_modified) if last_modified else None
+
+
+"""
+reads the validator saved with a partial file, `None` when none is saved
+"""
+
+
+def _read_validator(validator_path: str) -> str | None:
+    try:
+        with open(validator_path) as f:
+            return f.read() or None
+    except OSError:
+        return None
+
+
+"""
+saves the validator of a partial file, removing any saved before when the
+server gives none
+"""
+
+
+def _write_validator(validator_path: str, validator: str | None) -> None:
+    if validator is None:
+        if os.path.exists(validator_path):
+            os.remove(validator_path)
+
+        return
+
+    with open(validator_path, "w") as f:
+        f.write(validator)
+
+
+"""
+returns the first byte of a partial response
+"""
+
+
+def _range_start(response: requests.Response) -> int | None:
+    content_range = response.headers.get("Content-Range", "")
+    start = content_range.partition(" ")[2].partition("-")[0]
+
+    return int(start) if start.isdigit() else None
+
+
+"""
+returns the hex encoded MD5 digest of the whole file given by the server,
+`None` when not given
+"""
+
+
+def _md5(response: requests.Response) -> str | None:
+    for value in response.headers.get("x-goog-hash", "").split(","):
+        name, _, digest = value.strip().partition("=")
+
+        if name == "md5":
+            return base64.b64decode(digest).hex()
+
+    if response.status_code == 200 and "Content-MD5" in response.headers:
+        return base64.b64decode(response.headers["Content-MD5"]).hex()
+
+    return None
+
+
+"""
+returns the name of the file served, the last segment of the URL it was
+served from
+"""
+
+
+def _served_name(response: requests.Response, partial_path: str) -> str:
+    name = os.path.basename(
+        urllib.parse.unquote(urllib.parse.urlsplit(response.url).path)
+    )
+
+    return name or os.path.basename(partial_path)[: -len(PARTIAL_EXTENSION)]
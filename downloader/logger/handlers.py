@@ -0,0 +1,367 @@
+import gzip
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+
+
+class RotatingJSONFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    A file handler rotating its file by size, by age or both, optionally
+    compressing rotated files with gzip.
+
+    Rotated files are named `<file_name>.1`, `<file_name>.2` and so on, the
+    most recent being `.1`, with a `.gz` suffix when compressed. Records
+    can be written one at a time through `emit` or in batches through
+    `emit_batch`, which flushes the file once per batch.
+
+    Attributes:
+        max_bytes (int): The size in bytes after which the file is rotated,
+            0 disables rotation by size.
+        rotate_interval (float | None): The age in seconds after which the
+            file is rotated, `None` disables rotation by age.
+        backup_count (int): The number of rotated files kept.
+        compress (bool): Whether rotated files are compressed with gzip.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        *,
+        max_bytes: int = 0,
+        rotate_interval: float | None = None,
+        backup_count: int = 5,
+        compress: bool = False,
+    ) -> None:
+        super().__init__(file_name, "a", encoding="utf-8", delay=True)
+
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.rollover_at = self._next_rollover(
+            os.path.getmtime(file_name)
+            if os.path.exists(file_name)
+            else time.time()
+        )
+
+        if compress:
+            self.namer = self._gzip_name
+            self.rotator = self._gzip_rotate
+
+    """
+    Checks whether writing a record would require the file to be rotated.
+
+    Args:
+        record (logging.LogRecord): The record to be written.
+
+    Returns:
+        bool
+    """
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        return self._rollover_due(len(self.format(record)) + 1)
+
+    """
+    Closes the file, shifts the rotated files up by one and moves the file
+    to `<file_name>.1`, dropping the oldest rotated file.
+
+    Returns:
+        None
+    """
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.rotation_filename(f"{self.baseFilename}.{index}")
+
+                if os.path.exists(source):
+                    os.replace(
+                        source,
+                        self.rotation_filename(
+                            f"{self.baseFilename}.{index + 1}"
+                        ),
+                    )
+
+            if os.path.exists(self.baseFilename):
+                self.rotate(
+                    self.baseFilename,
+                    self.rotation_filename(f"{self.baseFilename}.1"),
+                )
+        elif os.path.exists(self.baseFilename):
+            os.remove(self.baseFilename)
+
+        self.stream = self._open()
+        self.rollover_at = self._next_rollover(time.time())
+
+    """
+    Writes a batch of records, rotating the file as needed, and flushes
+    the file once.
+
+    Args:
+        records (list[logging.LogRecord]): The records to write.
+
+    Returns:
+        None
+    """
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            for record in records:
+                try:
+                    message = f"{self.format(record)}{self.terminator}"
+
+                    if self._rollover_due(len(message)):
+                        self.doRollover()
+
+                    if self.stream is None:
+                        self.stream = self._open()
+
+                    self.stream.write(message)
+                except Exception:
+                    self.handleError(record)
+
+            if self.stream:
+                self.stream.flush()
+
+    """
+    Checks whether the file must be rotated before a message of a given
+    length is written.
+    """
+
+    def _rollover_due(self, length: int) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+
+        if self.max_bytes > 0:
+            position = self.stream.tell()
+
+            return position > 0 and position + length > self.max_bytes
+
+        return False
+
+    """
+    Returns the time of the next rotation by age.
+    """
+
+    def _next_rollover(self, start: float) -> float | None:
+        if self.rotate_interval is None:
+            return None
+
+        return start + self.rotate_interval
+
+    """
+    names a rotated file as compressed
+    """
+
+    @staticmethod
+    def _gzip_name(name: str) -> str:
+        return f"{name}.gz"
+
+    """
+    compresses a rotated file to its destination
+    """
+
+    @staticmethod
+    def _gzip_rotate(source: str, dest: str) -> None:
+        with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+
+        os.remove(source)
+
+
+class EnqueueHandler(logging.handlers.QueueHandler):
+    """
+    A queue handler that enqueues records unchanged.
+
+    `QueueHandler` formats every record on the calling thread so it can
+    cross a process boundary. Records handled here are only consumed by a
+    `BatchWriter` thread in the same process, so formatting is left to the
+    writer and logging costs the caller little more than creating the
+    record.
+    """
+
+    """
+    Returns the record unchanged, to be formatted by the writer.
+
+    Args:
+        record (logging.LogRecord): The record enqueued.
+
+    Returns:
+        logging.LogRecord
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class RelayHandler(logging.handlers.QueueHandler):
+    """
+    A queue handler sending the records of a forked child process to the
+    `BatchWriter` of its parent through the writer's `ProcessRelay`.
+
+    Records are prepared as by `QueueHandler`, so they can be pickled, and
+    written to the pipe of the relay before logging returns, so a child
+    exiting without running exit handlers loses none of them.
+    """
+
+    """
+    Puts a prepared record on the process queue of the relay.
+
+    Args:
+        record (logging.LogRecord): The prepared record.
+
+    Returns:
+        None
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.put(record)
+
+
+class ProcessRelay(threading.Thread):
+    """
+    A background thread of a parent process moving the records its forked
+    child processes put on a process queue, see `RelayHandler`, to the
+    queue of a `BatchWriter`, so only the parent writes and rotates the
+    log file.
+
+    Attributes:
+        queue (multiprocessing.SimpleQueue): The process queue records are
+            taken from.
+        target (queue.SimpleQueue[logging.LogRecord | None]): The queue
+            records are moved to.
+    """
+
+    def __init__(
+        self, target: "queue.SimpleQueue[logging.LogRecord | None]"
+    ) -> None:
+        super().__init__(name="JSONLoggerRelay", daemon=True)
+
+        self.queue = multiprocessing.SimpleQueue()
+        self.target = target
+
+    """
+    Moves records until the stop sentinel is taken.
+
+    Returns:
+        None
+    """
+
+    def run(self) -> None:
+        while (record := self.queue.get()) is not None:
+            self.target.put(record)
+
+    """
+    Moves every record already put by child processes then stops the
+    thread.
+
+    Returns:
+        None
+    """
+
+    def stop(self) -> None:
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+
+
+class BatchWriter(threading.Thread):
+    """
+    A background thread writing queued log records in batches.
+
+    Each time records are available the writer takes up to `batch_size` of
+    them from the queue and writes them to its handler with a single
+    flush. Records of forked child processes reach the queue through
+    `relay`. `stop` writes every record still queued before returning.
+
+    Attributes:
+        handler (RotatingJSONFileHandler): The handler records are written
+            to.
+        batch_size (int): The maximum number of records written per batch.
+        queue (queue.SimpleQueue[logging.LogRecord | None]): The queue
+            records are taken from.
+        relay (ProcessRelay): Moves the records of child processes to
+            `queue`.
+    """
+
+    def __init__(
+        self, handler: RotatingJSONFileHandler, *, batch_size: int = 512
+    ) -> None:
+        super().__init__(name="JSONLoggerWriter", daemon=True)
+
+        self.handler = handler
+        self.batch_size = batch_size
+        self.queue: queue.SimpleQueue[logging.LogRecord | None] = (
+            queue.SimpleQueue()
+        )
+        self.relay = ProcessRelay(self.queue)
+
+    """
+    Starts the thread and its relay.
+
+    Returns:
+        None
+    """
+
+    def start(self) -> None:
+        super().start()
+        self.relay.start()
+
+    """
+    Writes batches of records until the stop sentinel is taken.
+
+    Returns:
+        None
+    """
+
+    def run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            batch: list[logging.LogRecord] = []
+            record = self.queue.get()
+
+            while True:
+                if record is None:
+                    stopping = True
+                    break
+
+                batch.append(record)
+
+                if len(batch) >= self.batch_size:
+                    break
+
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self.handler.emit_batch(batch)
+
+    """
+    Writes every queued record, including those of child processes, then
+    stops the thread.
+
+    Returns:
+        None
+    """
+
+    def stop(self) -> None:
+        self.relay.stop()
+
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
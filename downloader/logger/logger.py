@@ -1,8 +1,19 @@
+import atexit
 import logging
+import os
 from typing import Any, Optional
 
 from pythonjsonlogger import jsonlogger
 
+from downloader.logger.handlers import (
+    BatchWriter,
+    EnqueueHandler,
+    RelayHandler,
+    RotatingJSONFileHandler,
+)
+
+_writers: dict[str, BatchWriter] = {}
+
 
 class JSONLogger:
     """
@@ -11,6 +22,12 @@ class JSONLogger:
     The `JSONLogger` provides logging with JSON formatting using the
     `python-json-logger`
 
+    In queued mode logging a message only enqueues its record, a background
+    `BatchWriter` formats and writes records in batches. `close`, which is
+    also called at exit, writes every queued record. Processes forked from
+    a process using queued mode send their records to the writer of that
+    process, so only it writes and rotates the file.
+
     Attributes:
         logger (logging.Logger):
             The underlying logger instance used to handle the logging logic.
@@ -26,20 +43,65 @@ class JSONLogger:
         level (Optional[int]):
             The logging level to be set for the logger.
             Defaults to `logging.INFO`.
+        name (str): The name of the underlying logger, loggers of the same
+            name share their handlers.
+        queued (bool): Whether records are written by a background thread.
+        max_bytes (int): The size in bytes after which the log file is
+            rotated, 0 disables rotation by size.
+        rotate_interval (float | None): The age in seconds after which the
+            log file is rotated, `None` disables rotation by age.
+        backup_count (int): The number of rotated log files kept.
+        compress (bool): Whether rotated log files are compressed with gzip.
+        batch_size (int): The maximum number of records written per batch
+            in queued mode.
     """
 
     def __init__(
         self,
         file_name: Optional[str] = "app_log.json",
         level: Optional[int] = logging.INFO,
+        *,
+        name: str = "JSONLogger",
+        queued: bool = False,
+        max_bytes: int = 0,
+        rotate_interval: float | None = None,
+        backup_count: int = 5,
+        compress: bool = False,
+        batch_size: int = 512,
     ):
-        self.logger = logging.getLogger("JSONLogger")
+        self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
 
         if not self.logger.handlers:
-            file_handler = logging.FileHandler(file_name)
+            file_handler = RotatingJSONFileHandler(
+                file_name,
+                max_bytes=max_bytes,
+                rotate_interval=rotate_interval,
+                backup_count=backup_count,
+                compress=compress,
+            )
             file_handler.setFormatter(self._get_json_formatter())
-            self.logger.addHandler(file_handler)
+
+            if queued:
+                writer = BatchWriter(file_handler, batch_size=batch_size)
+                writer.start()
+                _writers[name] = writer
+
+                self.logger.addHandler(EnqueueHandler(writer.queue))
+            else:
+                self.logger.addHandler(file_handler)
+
+    """
+    Writes every queued record and closes the handlers of the logger. A
+    `JSONLogger` created afterwards with the same name sets up new
+    handlers.
+
+    Returns:
+        None
+    """
+
+    def close(self) -> None:
+        _close(self.logger)
 
     """
     Creates and configures a JSON formatter for the logger.
@@ -90,3 +152,64 @@ class JSONLogger:
     def critical(self, message: str, **kwargs: Any) -> None:
         """Log a message with the CRITICAL level."""
         self.log(logging.CRITICAL, message, **kwargs)
+
+
+"""
+Writes the records queued for a logger and closes its handlers.
+
+Args:
+    logger (logging.Logger): The logger to close.
+
+Returns:
+    None
+"""
+
+
+def _close(logger: logging.Logger) -> None:
+    writer = _writers.pop(logger.name, None)
+
+    if writer:
+        writer.stop()
+        writer.handler.close()
+
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+"""
+Writes the records queued by every queued `JSONLogger` at exit.
+"""
+
+
+@atexit.register
+def _close_writers() -> None:
+    for name in list(_writers):
+        _close(logging.getLogger(name))
+
+
+"""
+Switches queued loggers in a forked child process to sending their records
+to the writer of the parent.
+
+The writer thread of the parent does not exist in the child, and worker
+processes exit without running exit handlers, so records queued in the
+child would never be written. Nor can the child write the file itself, as
+the parent may rotate it and, when compressing, remove it while the child
+still has it open.
+"""
+
+
+def _after_fork_in_child() -> None:
+    for name, writer in list(_writers.items()):
+        logger = logging.getLogger(name)
+
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        logger.addHandler(RelayHandler(writer.relay.queue))
+
+    _writers.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
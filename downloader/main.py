@@ -1,83 +1,942 @@
 import argparse
+import json
 import os
+import sys
+from typing import Any
 
-from downloader.data_output.output_views_to_categories import (
-    ViewsToCategoriesBarChart,
-    ViewsToCategoriesJSON,
-)
+from downloader.data_output.chart_renderer import CHART_FORMATS
+from downloader.data_output.json_formats import JSON_COMPRESSIONS, JSON_FORMATS
+from downloader.data_retrieve.download_cache import DownloadCache
 from downloader.data_retrieve.kaggle_retrieve import KaggleRetrieve
 from downloader.logger.logger import JSONLogger
-from downloader.transform.transform_views_to_categories import (
-    TransformViewsToCategories,
+from downloader.pipeline.batch import (
+    DOWNLOAD_WORKERS,
+    BatchRunner,
+    read_manifest,
+)
+from downloader.pipeline.countries import (
+    COUNTRIES,
+    CountryRunner,
+    country_file_names,
+    preload,
+    run_countries,
+    run_top_k,
+)
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.pipeline.watcher import Watcher
+from downloader.transform.engines import (
+    COUNT_METRICS,
+    PARSE_ENGINES,
+    REDUCERS,
+    SNAPSHOTS,
 )
 
 OWNER_SLUG = "datasnaek"
 DATASET_SLUG = "youtube-new"
 DATASET_VERSION = "115"
 
-parser = argparse.ArgumentParser("kaggle_importer")
-parser.add_argument(
-    "owner_slug",
-    help=f"Owner slug for dataset(default={OWNER_SLUG}).",
-    nargs="?",
-    default=OWNER_SLUG,
-    type=str,
+"""
+Parses an aggregation given as NAME=GROUP_BY[,GROUP_BY...]:METRIC[:REDUCER],
+the reducer defaulting to "sum".
+
+Args:
+    value (str): The aggregation, e.g. "likes_per_channel=channel_title:likes".
+
+Returns:
+    tuple[str, list[str], str, str]: The name, group-by columns, metric and
+        reducer.
+
+Raises:
+    argparse.ArgumentTypeError: If the aggregation is malformed.
+"""
+
+
+def aggregation(value: str) -> tuple[str, list[str], str, str]:
+    name, _, spec = value.partition("=")
+    fields = spec.split(":")
+
+    if not name or len(fields) not in (2, 3) or not all(fields):
+        raise argparse.ArgumentTypeError(
+            f"{value} is not of the form "
+            "NAME=GROUP_BY[,GROUP_BY...]:METRIC[:REDUCER]."
+        )
+
+    reducer = fields[2] if len(fields) == 3 else "sum"
+
+    if reducer not in REDUCERS:
+        raise argparse.ArgumentTypeError(
+            f"Unknown reducer {reducer}, choose from {', '.join(REDUCERS)}."
+        )
+
+    return name, fields[0].split(","), fields[1], reducer
+
+
+"""
+Parses a top-K result given as NAME=KEY:METRIC[:K], K defaulting to 10.
+
+Args:
+    value (str): The result, e.g. "top_channels=channel_title:views:20".
+
+Returns:
+    tuple[str, str, str, int]: The name, key column, metric and number of
+        keys.
+
+Raises:
+    argparse.ArgumentTypeError: If the result is malformed.
+"""
+
+
+def top(value: str) -> tuple[str, str, str, int]:
+    name, _, spec = value.partition("=")
+    fields = spec.split(":")
+
+    if (
+        not name
+        or len(fields) not in (2, 3)
+        or not all(fields)
+        or (len(fields) == 3 and not fields[2].isdigit())
+    ):
+        raise argparse.ArgumentTypeError(
+            f"{value} is not of the form NAME=KEY:METRIC[:K]."
+        )
+
+    if fields[1] not in COUNT_METRICS:
+        raise argparse.ArgumentTypeError(
+            f"Unknown metric {fields[1]}, choose from "
+            f"{', '.join(COUNT_METRICS)}."
+        )
+
+    k = int(fields[2]) if len(fields) == 3 else 10
+
+    if k < 1:
+        raise argparse.ArgumentTypeError("K must be at least 1.")
+
+    return name, fields[0], fields[1], k
+
+
+log_options = argparse.ArgumentParser(add_help=False)
+log_options.add_argument(
+    "--log-max-size",
+    help="Size in MB after which the log file is rotated, 0 disables "
+    "rotation by size(default=100).",
+    default=100,
+    type=int,
 )
-parser.add_argument(
-    "dataset_slug",
-    help=f"Slug for dataset(default={DATASET_SLUG}).",
-    nargs="?",
-    default=DATASET_SLUG,
-    type=str,
+log_options.add_argument(
+    "--log-rotate-hours",
+    help="Age in hours after which the log file is rotated(default=never).",
+    default=None,
+    type=float,
 )
-parser.add_argument(
-    "dataset_version",
-    help=f"Dataset version(default={DATASET_VERSION}).",
-    nargs="?",
-    default=DATASET_VERSION,
+log_options.add_argument(
+    "--log-compress",
+    help="Compress rotated log files with gzip.",
+    action="store_true",
+)
+
+options = argparse.ArgumentParser(add_help=False, parents=[log_options])
+options.add_argument(
+    "--no-extract",
+    help="Keep downloaded files compressed and read them from the archive.",
+    action="store_true",
+)
+options.add_argument(
+    "--chunk-size",
+    help="Stream the videos CSV in chunks of this many rows, bounding memory "
+    "use(default=read in full).",
+    default=None,
+    type=int,
+)
+options.add_argument(
+    "--engine",
+    help="CSV parse engine, pyarrow parses using multiple threads"
+    "(default=c).",
+    choices=PARSE_ENGINES,
+    default="c",
     type=str,
 )
+options.add_argument(
+    "--cache-size",
+    help="Maximum size in MB of the parsed dataset cache, 0 disables the "
+    "cache(default=1024).",
+    default=1024,
+    type=int,
+)
+options.add_argument(
+    "--force",
+    help="Recompute the transform and regenerate outputs even if the "
+    "inputs are unchanged.",
+    action="store_true",
+)
+options.add_argument(
+    "--countries",
+    help="Countries to process, outputs are saved to a directory per "
+    "country(default=GB).",
+    nargs="+",
+    choices=COUNTRIES + ["ALL"],
+    default=["GB"],
+    type=str.upper,
+)
+options.add_argument(
+    "--workers",
+    help="Number of countries processed in parallel(default=CPU count).",
+    default=None,
+    type=int,
+)
+options.add_argument(
+    "--output-workers",
+    help="Number of outputs generated concurrently for each country"
+    "(default=all outputs).",
+    default=None,
+    type=int,
+)
+options.add_argument(
+    "--chart-formats",
+    help="Formats each chart is saved in(default=png).",
+    nargs="+",
+    choices=CHART_FORMATS,
+    default=["png"],
+)
+options.add_argument(
+    "--json-format",
+    help="Format of each JSON output, records, ndjson with an object per "
+    "line, columnar with an array per column, or parquet which requires "
+    "the arrow extra(default=records).",
+    choices=JSON_FORMATS,
+    default="records",
+)
+options.add_argument(
+    "--json-compression",
+    help="Compress each JSON output as it is written, zstd requires the "
+    "zstandard package(default=none).",
+    choices=JSON_COMPRESSIONS,
+    default=None,
+)
+options.add_argument(
+    "--snapshot",
+    help="Count the views of each video once, from its latest trending day "
+    "or its peak day, instead of summing every day it trended"
+    "(default=sum every day).",
+    choices=SNAPSHOTS,
+    default=None,
+)
+options.add_argument(
+    "--time-series",
+    help="Also save the views per category on each trending date as JSON "
+    "and a line chart. Days are kept in a store with the outputs so new "
+    "dataset versions only aggregate new days, --force rebuilds it.",
+    action="store_true",
+)
+options.add_argument(
+    "--aggregate",
+    help="Also save a metric reduced per group as JSON, given as "
+    "NAME=GROUP_BY[,GROUP_BY...]:METRIC[:REDUCER], e.g. "
+    "likes_per_channel=channel_title:likes:sum. The reducer is one of "
+    f"{', '.join(REDUCERS)}(default=sum), may be repeated.",
+    action="append",
+    default=[],
+    dest="aggregations",
+    metavar="AGGREGATION",
+    type=aggregation,
+)
+options.add_argument(
+    "--top",
+    help="Also save the K keys with the largest summed metric over every "
+    "country as JSON in the top directory, given as NAME=KEY:METRIC[:K], "
+    "e.g. top_channels=channel_title:views. The metric is one of "
+    f"{', '.join(COUNT_METRICS)}, K defaults to 10, may be repeated.",
+    action="append",
+    default=[],
+    metavar="TOP",
+    type=top,
+)
+options.add_argument(
+    "--top-capacity",
+    help="Number of keys held in memory when computing --top results, "
+    "results are then estimated with a bounded error, 0 sums every key "
+    "exactly(default=100000).",
+    default=100_000,
+    type=int,
+)
+options.add_argument(
+    "--top-verify",
+    help="Sum the keys held in memory exactly in a second pass over the "
+    "data when computing --top results.",
+    action="store_true",
+)
+options.add_argument(
+    "--profile",
+    help="Save cProfile stats of the transform stage of each country as "
+    "transform.pstats with its outputs.",
+    action="store_true",
+)
+options.add_argument(
+    "--results-store",
+    help="Also write each result to the results store, so versions can be "
+    "read and compared with the query command.",
+    action="store_true",
+)
+
+parser = argparse.ArgumentParser(
+    "kaggle_importer",
+    parents=[options],
+    epilog="Execute with watch as the first argument to keep polling for "
+    "new dataset versions, see watch -h, with batch to process many "
+    "dataset versions listed in a manifest, see batch -h, with query to "
+    "read results held by the results store, see query -h, or with serve to "
+    "serve the latest outputs over HTTP, see serve -h.",
+)
+watch_parser = argparse.ArgumentParser(
+    "kaggle_importer watch",
+    parents=[options],
+    description="Polls the dataset for new versions, retrieving and "
+    "transforming each new version.",
+)
 
-args = parser.parse_args()
+batch_parser = argparse.ArgumentParser(
+    "kaggle_importer batch",
+    parents=[options],
+    description="Retrieves and transforms each dataset version listed in a "
+    "manifest, sharing downloads between them, and prints a summary of each "
+    "as JSON. Countries of every version are transformed by one pool of "
+    "--workers processes.",
+)
 
-location = f"{args.owner_slug}/{args.dataset_slug}"
-save_path = (
-    f"/{os.environ['TMP_SAVE_DIRECTORY']}/kaggle/"
-    f"{args.owner_slug}/{args.dataset_slug}/{args.dataset_version}/"
+query_parser = argparse.ArgumentParser(
+    "kaggle_importer query",
+    parents=[log_options],
+    description="Prints a result of a dataset version, or its change "
+    "between two versions, as JSON from the results store, without "
+    "retrieving or transforming the dataset.",
 )
-output_save_path = (
-    f"./downloader/visualisations/kaggle/{args.owner_slug}/"
-    f"{args.dataset_slug}/{args.dataset_version}/"
+
+serve_parser = argparse.ArgumentParser(
+    "kaggle_importer serve",
+    parents=[log_options],
+    description="Serves the views per category of the latest run of the "
+    "dataset over HTTP, reloading them whenever a new run finishes.",
 )
-log_path = "./downloader/logs/"
 
-if not os.path.exists(output_save_path):
-    os.makedirs(os.path.dirname(output_save_path))
+for dataset_parser in (parser, watch_parser, query_parser, serve_parser):
+    dataset_parser.add_argument(
+        "owner_slug",
+        help=f"Owner slug for dataset(default={OWNER_SLUG}).",
+        nargs="?",
+        default=OWNER_SLUG,
+        type=str,
+    )
+    dataset_parser.add_argument(
+        "dataset_slug",
+        help=f"Slug for dataset(default={DATASET_SLUG}).",
+        nargs="?",
+        default=DATASET_SLUG,
+        type=str,
+    )
+
+for version_parser in (parser, query_parser):
+    version_parser.add_argument(
+        "dataset_version",
+        help=f"Dataset version(default={DATASET_VERSION}).",
+        nargs="?",
+        default=DATASET_VERSION,
+        type=str,
+    )
+
+batch_parser.add_argument(
+    "manifest",
+    help="File listing a dataset version per line as "
+    "<owner_slug>/<dataset_slug>/<dataset_version>, blank lines and lines "
+    "starting with # are ignored.",
+    type=str,
+)
+batch_parser.add_argument(
+    "--download-workers",
+    help="Number of dataset versions retrieved at once"
+    f"(default={DOWNLOAD_WORKERS}).",
+    default=DOWNLOAD_WORKERS,
+    type=int,
+)
+
+watch_parser.add_argument(
+    "--interval",
+    help="Minutes between checks for a new version(default=60).",
+    default=60,
+    type=float,
+)
+watch_parser.add_argument(
+    "--max-interval",
+    help="Maximum minutes between checks after failures(default=360).",
+    default=360,
+    type=float,
+)
 
-if not os.path.exists(log_path):
-    os.makedirs(os.path.dirname(log_path))
+query_parser.add_argument(
+    "--result",
+    help="Name of the result, views_to_categories, views_time_series or "
+    "the name of an aggregation(default=views_to_categories).",
+    default="views_to_categories",
+    type=str,
+)
+query_parser.add_argument(
+    "--diff",
+    help="Print the change of the result from the dataset version to this "
+    "version instead.",
+    default=None,
+    metavar="VERSION",
+    type=str,
+)
+query_parser.add_argument(
+    "--countries",
+    help="Countries whose result is printed(default=GB).",
+    nargs="+",
+    choices=COUNTRIES + ["ALL"],
+    default=["GB"],
+    type=str.upper,
+)
+query_parser.add_argument(
+    "--list",
+    help="Print the results held for the dataset instead.",
+    action="store_true",
+)
 
-logger = JSONLogger(
-    file_name=f"{log_path}/project_logs.json",
+serve_parser.add_argument(
+    "--host",
+    help="Address listened on(default=127.0.0.1).",
+    default="127.0.0.1",
+    type=str,
 )
+serve_parser.add_argument(
+    "--port",
+    help="Port listened on(default=8080).",
+    default=8080,
+    type=int,
+)
+serve_parser.add_argument(
+    "--reload-interval",
+    help="Seconds between checks for a newly finished run(default=5).",
+    default=5,
+    type=float,
+)
+
+TMP_PATH = f"/{os.environ.get('TMP_SAVE_DIRECTORY', 'tmp')}/kaggle"
+LOG_PATH = "./downloader/logs/"
+RESULTS_STORE_PATH = "./downloader/visualisations/kaggle/results.sqlite3"
+
+"""
+Creates the logger of the run, writing to the project log file.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+
+Returns:
+    JSONLogger
+"""
+
+
+def create_logger(args: argparse.Namespace) -> JSONLogger:
+    if not os.path.exists(LOG_PATH):
+        os.makedirs(os.path.dirname(LOG_PATH))
+
+    return JSONLogger(
+        file_name=f"{LOG_PATH}/project_logs.json",
+        queued=True,
+        max_bytes=args.log_max_size * 1024 * 1024,
+        rotate_interval=(
+            args.log_rotate_hours * 3600 if args.log_rotate_hours else None
+        ),
+        compress=args.log_compress,
+    )
+
+
+"""
+Returns the countries to process.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+
+Returns:
+    list[str]
+"""
+
+
+def selected_countries(args: argparse.Namespace) -> list[str]:
+    countries: list[str] = (
+        COUNTRIES if "ALL" in args.countries else args.countries
+    )
+
+    return countries
+
+
+"""
+Returns the remote location of a version of the dataset, the directory its
+files are retrieved to and the directory its outputs are saved to.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+
+Returns:
+    tuple[str, str, str]
+"""
+
+
+def dataset_paths(args: argparse.Namespace) -> tuple[str, str, str]:
+    return (
+        f"{args.owner_slug}/{args.dataset_slug}",
+        f"{TMP_PATH}/"
+        f"{args.owner_slug}/{args.dataset_slug}/{args.dataset_version}/",
+        f"./downloader/visualisations/kaggle/{args.owner_slug}/"
+        f"{args.dataset_slug}/{args.dataset_version}/",
+    )
+
+
+"""
+Retrieves the files of each country of a version of the dataset, each file
+is downloaded resumably, see `ResumableDownload`.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+    logger (JSONLogger): A logger instance for structured logging.
+    cache (DownloadCache | None): Shares the files between the versions of
+        a batch, `None` retrieves them directly.
+
+Returns:
+    bool: Whether the files were retrieved.
+"""
+
+
+def retrieve(
+    args: argparse.Namespace,
+    logger: JSONLogger,
+    cache: DownloadCache | None = None,
+) -> bool:
+    from downloader.data_retrieve.resumable_download import ResumableDownload
 
-logger.info("Kaggle retrieve and transform started")
+    location, save_path, _ = dataset_paths(args)
+    retrieval = KaggleRetrieve(
+        logger=logger,
+        extract=not args.no_extract,
+        version=args.dataset_version,
+        downloader=ResumableDownload(logger=logger),
+    )
+    file_names = [
+        file_name
+        for country in selected_countries(args)
+        for file_name in country_file_names(country)
+    ]
+
+    retrieved: bool = (
+        cache.get(retrieval, location, save_path, file_names)
+        if cache
+        else retrieval.get(location, save_path, file_names)
+    )
+
+    return retrieved
+
+
+"""
+Creates the runner transforming each country of a version of the dataset.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+
+Returns:
+    CountryRunner
+"""
+
+
+def country_runner(args: argparse.Namespace) -> CountryRunner:
+    location, save_path, output_save_path = dataset_paths(args)
+
+    return CountryRunner(
+        save_path=save_path,
+        output_save_path=output_save_path,
+        log_file_name=f"{LOG_PATH}/project_logs.json",
+        namespace=f"{location}/{args.dataset_version}",
+        cache_path=f"{TMP_PATH}/cache/",
+        cache_size=args.cache_size * 1024 * 1024,
+        force=args.force,
+        chunk_size=args.chunk_size,
+        engine=args.engine,
+        output_workers=args.output_workers,
+        chart_formats=args.chart_formats,
+        profile=args.profile,
+        aggregations=args.aggregations,
+        snapshot=args.snapshot,
+        time_series=args.time_series,
+        results_store=RESULTS_STORE_PATH if args.results_store else None,
+        json_format=args.json_format,
+        json_compression=args.json_compression,
+    )
+
+
+"""
+Computes the top-K results of a retrieved version of the dataset, when
+requested, and writes the metrics of its run.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+    results (dict[str, dict[str, Any] | None]): The timings of each country,
+        `None` for countries that failed.
+    profiler (StageProfiler): The profiler of the run.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    dict[str, Any]: The error bound of each top-K result, `None` for
+        results that failed.
+"""
+
+
+def finish(
+    args: argparse.Namespace,
+    results: dict[str, Any],
+    profiler: StageProfiler,
+    logger: JSONLogger,
+) -> dict[str, Any]:
+    location, save_path, output_save_path = dataset_paths(args)
+    top_results: dict[str, Any] = {}
+
+    if args.top:
+        top_results = run_top_k(
+            args.top,
+            save_path=save_path,
+            output_save_path=output_save_path,
+            countries=selected_countries(args),
+            capacity=args.top_capacity or None,
+            verify=args.top_verify,
+            chunk_size=args.chunk_size,
+            logger=logger,
+            profiler=profiler,
+            json_format=args.json_format,
+            json_compression=args.json_compression,
+        )
+
+    profiler.write(
+        f"{output_save_path}run_metrics.json",
+        dataset=location,
+        version=args.dataset_version,
+        countries=results,
+        top=top_results,
+    )
+
+    return top_results
+
+
+"""
+Retrieves a version of the dataset, transforms the data of each country
+and generates its outputs.
+
+Args:
+    args (argparse.Namespace): The parsed arguments.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    dict[str, Any]: Whether the run succeeded, with the metrics of the
+        retrieve stage and the timings of each country.
+"""
+
+
+def run(args: argparse.Namespace, logger: JSONLogger) -> dict[str, Any]:
+    location, _, output_save_path = dataset_paths(args)
+
+    if not os.path.exists(output_save_path):
+        os.makedirs(os.path.dirname(output_save_path))
+
+    logger.info("Kaggle retrieve and transform started")
+
+    profiler = StageProfiler(logger=logger)
+    results: dict[str, Any] = {}
+    top_results: dict[str, Any] = {}
+
+    with profiler.stage("retrieve", dataset=location):
+        retrieved = retrieve(args, logger)
+
+    if retrieved:
+        results = run_countries(
+            country_runner(args),
+            selected_countries(args),
+            args.workers,
+            logger,
+        )
+        top_results = finish(args, results, profiler, logger)
+
+    logger.info("Kaggle retrieve and transform completed")
+
+    return {
+        "success": retrieved
+        and all(timings is not None for timings in results.values())
+        and all(result is not None for result in top_results.values()),
+        "stages": profiler.stages,
+        "countries": results,
+        "top": top_results,
+    }
+
+
+"""
+Polls the dataset for new versions until stopped, each new version is
+retrieved, transformed and saved under its own version.
+
+The transform and outputs are imported once up front, so runs neither
+start a new interpreter nor import pandas again.
+
+Args:
+    args (argparse.Namespace): The parsed watch arguments.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    bool: `False` if another watcher is already running.
+"""
+
+
+def watch(args: argparse.Namespace, logger: JSONLogger) -> bool:
+    location = f"{args.owner_slug}/{args.dataset_slug}"
+    retrieve = KaggleRetrieve(logger=logger)
+
+    preload()
+
+    started: bool = Watcher(
+        check=lambda: retrieve.remote_metadata(location)[0],
+        run=lambda version: run(
+            argparse.Namespace(**vars(args), dataset_version=version), logger
+        ),
+        lock_path=(
+            f"{TMP_PATH}/watch/{args.owner_slug}_{args.dataset_slug}.lock"
+        ),
+        status_path=(
+            f"{TMP_PATH}/watch/{args.owner_slug}_{args.dataset_slug}.json"
+        ),
+        interval=args.interval * 60,
+        max_interval=args.max_interval * 60,
+        logger=logger,
+    ).start()
+
+    return started
+
+
+"""
+Returns the arguments of a dataset version of a batch.
+
+Args:
+    args (argparse.Namespace): The parsed batch arguments.
+    item (tuple[str, str, str]): The owner slug, dataset slug and version.
+
+Returns:
+    argparse.Namespace
+"""
+
+
+def version_args(
+    args: argparse.Namespace, item: tuple[str, str, str]
+) -> argparse.Namespace:
+    owner_slug, dataset_slug, dataset_version = item
 
-if KaggleRetrieve(logger=logger).get(
-    location,
-    save_path,
-    ["GBvideos.csv", "GB_category_id.json"],
-):
-    TransformViewsToCategories().transform(
-        {
-            "video_file_path": f"{save_path}/GBvideos.csv",
-            "category_file_path": f"{save_path}/GB_category_id.json",
-            "output_path": f"{output_save_path}",
-        },
-        [
-            ViewsToCategoriesBarChart(logger=logger),
-            ViewsToCategoriesJSON(logger=logger),
-        ],
+    return argparse.Namespace(
+        **vars(args),
+        owner_slug=owner_slug,
+        dataset_slug=dataset_slug,
+        dataset_version=dataset_version,
     )
 
-logger.info("Kaggle retrieve and transform completed")
+
+"""
+Retrieves and transforms each dataset version of a batch, sharing
+downloads between versions through a content-addressed cache in the
+temporary save directory, see `DownloadCache`. Each version is saved and
+its run metrics written as a run of the version would.
+
+The transform and outputs are imported once up front, so the worker
+processes shared by every version start with them already imported.
+
+Args:
+    args (argparse.Namespace): The parsed batch arguments.
+    items (list[tuple[str, str, str]]): The owner slug, dataset slug and
+        version of each dataset version.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    dict[str, Any]: The summary of the batch, see `BatchRunner.run`.
+"""
+
+
+def batch(
+    args: argparse.Namespace,
+    items: list[tuple[str, str, str]],
+    logger: JSONLogger,
+) -> dict[str, Any]:
+    cache = DownloadCache(
+        cache_path=f"{TMP_PATH}/download_cache", logger=logger
+    )
+
+    preload()
+
+    summary: dict[str, Any] = BatchRunner(
+        retrieve=lambda item: retrieve(
+            version_args(args, item), logger, cache
+        ),
+        runner=lambda item: country_runner(version_args(args, item)),
+        finish=lambda item, results, profiler: all(
+            result is not None
+            for result in finish(
+                version_args(args, item), results, profiler, logger
+            ).values()
+        ),
+        countries=selected_countries(args),
+        download_workers=args.download_workers,
+        workers=args.workers,
+        logger=logger,
+    ).run(items)
+
+    return summary
+
+
+"""
+Reads a result of each country from the results store, or the change of
+the result between two versions when `diff` is set. When `list` is set
+the results held for the dataset are read instead.
+
+Args:
+    args (argparse.Namespace): The parsed query arguments.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    dict[str, Any]: The records of the result of each country, `None` for
+        countries whose result is not held, or the records of the results
+        held under "results" when listing.
+"""
+
+
+def query(args: argparse.Namespace, logger: JSONLogger) -> dict[str, Any]:
+    from downloader.data_output.results_store import ResultsStore, records
+
+    store = ResultsStore(store_path=RESULTS_STORE_PATH, logger=logger)
+
+    if args.list:
+        return {
+            "results": records(
+                store.results(args.owner_slug, args.dataset_slug)
+            )
+        }
+
+    output: dict[str, Any] = {}
+
+    for country in COUNTRIES if "ALL" in args.countries else args.countries:
+        if args.diff:
+            result = store.diff(
+                args.owner_slug,
+                args.dataset_slug,
+                args.dataset_version,
+                args.diff,
+                country,
+                args.result,
+            )
+        else:
+            result = store.load(
+                args.owner_slug,
+                args.dataset_slug,
+                args.dataset_version,
+                country,
+                args.result,
+            )
+
+        output[country] = None if result is None else records(result)
+
+    return output
+
+
+"""
+Serves the outputs of the latest run of the dataset until stopped.
+
+Args:
+    args (argparse.Namespace): The parsed serve arguments.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    None
+"""
+
+
+def serve(args: argparse.Namespace, logger: JSONLogger) -> None:
+    from downloader.pipeline.output_server import OutputServer
+
+    OutputServer(
+        dataset_path=(
+            f"./downloader/visualisations/kaggle/{args.owner_slug}/"
+            f"{args.dataset_slug}"
+        ),
+        host=args.host,
+        port=args.port,
+        reload_interval=args.reload_interval,
+        logger=logger,
+    ).start()
+
+
+"""
+Runs the importer once, keeps watching for new dataset versions when the
+first argument is watch, processes the dataset versions of a manifest when
+it is batch, prints results from the results store when it is query, or
+serves the latest outputs when it is serve.
+
+Heavy dependencies, pandas, matplotlib and the kaggle API, are only
+imported by the stages that use them, so showing help or a run where
+everything is up to date does not load them.
+
+Returns:
+    None
+"""
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["watch"]:
+        args = watch_parser.parse_args(sys.argv[2:])
+        logger = create_logger(args)
+        started = watch(args, logger)
+
+        logger.close()
+
+        if not started:
+            sys.exit(1)
+    elif sys.argv[1:2] == ["batch"]:
+        args = batch_parser.parse_args(sys.argv[2:])
+
+        try:
+            items = read_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            batch_parser.error(str(e))
+
+        logger = create_logger(args)
+        summary = batch(args, items, logger)
+
+        logger.close()
+
+        print(json.dumps(summary, indent=2))
+
+        if summary["failed"]:
+            sys.exit(1)
+    elif sys.argv[1:2] == ["query"]:
+        args = query_parser.parse_args(sys.argv[2:])
+        logger = create_logger(args)
+        output = query(args, logger)
+
+        logger.close()
+
+        print(json.dumps(output, indent=2))
+
+        if any(result is None for result in output.values()):
+            sys.exit(1)
+    elif sys.argv[1:2] == ["serve"]:
+        args = serve_parser.parse_args(sys.argv[2:])
+        logger = create_logger(args)
+
+        serve(args, logger)
+
+        logger.close()
+    else:
+        args = parser.parse_args()
+        logger = create_logger(args)
+
+        run(args, logger)
+
+        logger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable
+
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+
+DOWNLOAD_WORKERS = 2
+
+Item = tuple[str, str, str]
+
+"""
+Reads a batch manifest, a text file listing a dataset version per line as
+"<owner_slug>/<dataset_slug>/<dataset_version>", e.g.
+"datasnaek/youtube-new/115". Blank lines, lines starting with "#" and
+repeats of a version already listed are skipped.
+
+Args:
+    file_path (str): The manifest file.
+
+Returns:
+    list[tuple[str, str, str]]: The owner slug, dataset slug and version of
+        each dataset version, in the order listed.
+
+Raises:
+    ValueError: If a line is not of that form.
+"""
+
+
+def read_manifest(file_path: str) -> list[Item]:
+    items: list[Item] = []
+
+    with open(file_path) as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            fields = line.split("/")
+
+            if len(fields) != 3 or not all(fields):
+                raise ValueError(
+                    f"Line {number} of {file_path}, {line}, is not of the "
+                    "form <owner_slug>/<dataset_slug>/<dataset_version>."
+                )
+
+            item = (fields[0], fields[1], fields[2])
+
+            if item not in items:
+                items.append(item)
+
+    return items
+
+
+class BatchRunner:
+    """
+    Retrieves and transforms many dataset versions, each an owner slug,
+    dataset slug and version, in one process.
+
+    Versions are retrieved by a bounded pool of threads and the countries
+    of each retrieved version are transformed by a pool of worker processes
+    shared by every version, so later versions are retrieved while earlier
+    ones are transformed. A version that fails to be retrieved, or whose
+    countries fail, is recorded in the summary and does not stop the
+    others.
+
+    Attributes:
+        retrieve (Callable[[tuple[str, str, str]], bool]): Retrieves the
+            files of a version, returning whether they were retrieved.
+        runner (Callable[[tuple[str, str, str]], Callable[[str],
+            dict[str, Any]]]): Returns the runner of a version's countries,
+            e.g. a `CountryRunner`, which is sent to the worker processes.
+        finish (Callable[[tuple[str, str, str], dict[str, dict[str, Any] |
+            None], StageProfiler], bool]): Called once every country of a
+            version completes, with the timings of each country and the
+            profiler holding its retrieve stage, e.g. to write its run
+            metrics. Returns whether it succeeded.
+        countries (list[str]): The two letter country codes of each version.
+        download_workers (int): The number of versions retrieved at once.
+        workers (int | None): The number of worker processes, defaults to
+            the number of CPUs.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    def __init__(
+        self,
+        *,
+        retrieve: Callable[[Item], bool],
+        runner: Callable[[Item], Callable[[str], dict[str, Any]]],
+        finish: Callable[
+            [Item, dict[str, dict[str, Any] | None], StageProfiler], bool
+        ],
+        countries: list[str],
+        download_workers: int = DOWNLOAD_WORKERS,
+        workers: int | None = None,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.retrieve = retrieve
+        self.runner = runner
+        self.finish = finish
+        self.countries = countries
+        self.download_workers = max(1, download_workers)
+        self.workers = workers
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Retrieves and transforms each version, continuing past failures.
+
+    Args:
+        items (list[tuple[str, str, str]]): The owner slug, dataset slug and
+            version of each version.
+
+    Returns:
+        dict[str, Any]: The summary of the batch, its duration, the number
+            of versions that succeeded and failed, and for each version its
+            status, "succeeded", "retrieve_failed" or "failed", the seconds
+            spent retrieving and transforming it and its failed countries.
+    """
+
+    def run(self, items: list[Item]) -> dict[str, Any]:
+        start = time.perf_counter()
+        profilers = {item: StageProfiler(logger=self.logger) for item in items}
+        results: dict[Item, dict[str, dict[str, Any] | None]] = {
+            item: {} for item in items
+        }
+        summaries: dict[Item, dict[str, Any]] = {
+            item: {
+                "dataset": f"{item[0]}/{item[1]}",
+                "version": item[2],
+                "status": None,
+                "retrieve_seconds": None,
+                "transform_seconds": None,
+                "failed_countries": [],
+            }
+            for item in items
+        }
+        transform_starts: dict[Item, float] = {}
+
+        self.logger.info(f"Batch of {len(items)} dataset versions started.")
+
+        # Threads are only started once retrieves are submitted, so the
+        # worker processes are forked before any retrieve thread starts.
+        with ProcessPoolExecutor(
+            max_workers=self.workers or os.cpu_count()
+        ) as transforms, ThreadPoolExecutor(
+            max_workers=self.download_workers
+        ) as downloads:
+            transforms.submit(os.getpid).result()
+
+            pending: dict[Future[Any], tuple[Item, str | None]] = {
+                downloads.submit(self._retrieve, item, profiler): (item, None)
+                for item, profiler in profilers.items()
+            }
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    item, country = pending.pop(future)
+
+                    if country is None:
+                        transform_starts[item] = time.perf_counter()
+                        pending.update(
+                            self._retrieved(
+                                transforms,
+                                item,
+                                future.result(),
+                                summaries[item],
+                                profilers[item],
+                            )
+                        )
+                    elif self._completed(item, country, future, results[item]):
+                        summaries[item].update(
+                            self._finish(
+                                item,
+                                results[item],
+                                profilers[item],
+                                transform_starts[item],
+                            )
+                        )
+
+        summary = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "succeeded": sum(
+                item_summary["status"] == "succeeded"
+                for item_summary in summaries.values()
+            ),
+            "failed": sum(
+                item_summary["status"] != "succeeded"
+                for item_summary in summaries.values()
+            ),
+            "items": list(summaries.values()),
+        }
+
+        self.logger.info(
+            "Batch completed.",
+            **{
+                key: summary[key] for key in ["seconds", "succeeded", "failed"]
+            },
+        )
+
+        return summary
+
+    """
+    retrieves a version as its retrieve stage, a failure is logged
+    """
+
+    def _retrieve(self, item: Item, profiler: StageProfiler) -> bool:
+        try:
+            with profiler.stage(
+                "retrieve", dataset=f"{item[0]}/{item[1]}", version=item[2]
+            ):
+                retrieved = self.retrieve(item)
+        except Exception as e:
+            self.logger.error(f"Retrieve of {'/'.join(item)} failed: {e}.")
+
+            return False
+
+        if not retrieved:
+            self.logger.error(f"Retrieve of {'/'.join(item)} failed.")
+
+        return retrieved
+
+    """
+    records the retrieve of a version, submitting each of its countries to
+    the worker processes once retrieved
+    """
+
+    def _retrieved(
+        self,
+        transforms: ProcessPoolExecutor,
+        item: Item,
+        retrieved: bool,
+        summary: dict[str, Any],
+        profiler: StageProfiler,
+    ) -> dict[Future[Any], tuple[Item, str | None]]:
+        summary["retrieve_seconds"] = next(
+            (
+                stage["wall_seconds"]
+                for stage in profiler.stages
+                if stage["stage"] == "retrieve"
+            ),
+            None,
+        )
+
+        if not retrieved:
+            summary["status"] = "retrieve_failed"
+
+            return {}
+
+        try:
+            runner = self.runner(item)
+        except Exception as e:
+            self.logger.error(f"Transform of {'/'.join(item)} failed: {e}.")
+            summary["status"] = "failed"
+
+            return {}
+
+        return {
+            transforms.submit(runner, country): (item, country)
+            for country in self.countries
+        }
+
+    """
+    records the timings of a country, a failure is logged, returning
+    whether every country of the version has completed
+    """
+
+    def _completed(
+        self,
+        item: Item,
+        country: str,
+        future: Future[Any],
+        results: dict[str, dict[str, Any] | None],
+    ) -> bool:
+        try:
+            results[country] = future.result()
+        except Exception as e:
+            self.logger.error(
+                f"Country {country} of {'/'.join(item)} failed: {e}."
+            )
+
+            results[country] = None
+
+        return len(results) == len(self.countries)
+
+    """
+    finishes a version whose countries completed, returning its summary
+    """
+
+    def _finish(
+        self,
+        item: Item,
+        results: dict[str, dict[str, Any] | None],
+        profiler: StageProfiler,
+        transform_start: float,
+    ) -> dict[str, Any]:
+        try:
+            finished = self.finish(item, results, profiler)
+        except Exception as e:
+            self.logger.error(f"Finishing {'/'.join(item)} failed: {e}.")
+
+            finished = False
+
+        failed_countries = sorted(
+            country for country, timings in results.items() if timings is None
+        )
+
+        return {
+            "status": (
+                "succeeded" if finished and not failed_countries else "failed"
+            ),
+            "transform_seconds": round(
+                time.perf_counter() - transform_start, 4
+            ),
+            "failed_countries": failed_countries,
+        }
@@ -0,0 +1,632 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any
+
+from downloader.data_retrieve.archive import locate
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.transform.result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from downloader.data_output.data_output import DataOutput
+    from downloader.transform.transform import Transform
+
+COUNTRIES = ["CA", "DE", "FR", "GB", "IN", "JP", "KR", "MX", "RU", "US"]
+
+"""
+Returns the dataset files holding the video and category data of a country.
+
+Args:
+    country (str): The two letter country code, e.g. "GB".
+
+Returns:
+    list[str]: The video CSV file name and the category JSON file name.
+"""
+
+
+def country_file_names(country: str) -> list[str]:
+    return [f"{country}videos.csv", f"{country}_category_id.json"]
+
+
+class CountryRunner:
+    """
+    Runs `TransformViewsToCategories`, `TransformAggregations` when
+    aggregations are given and `TransformViewsTimeSeries` when
+    `time_series` is set, with their outputs for a single country. When
+    `results_store` is set each result is also written to the
+    `ResultsStore`.
+
+    The transforms are run by a `TransformGraph`, loading each input file
+    once for all of them, unless `chunk_size` is set in which case each
+    transform streams its input in turn.
+
+    Instances hold only plain settings so they can be sent to worker
+    processes, the transform, caches and outputs are built in the process
+    running the country.
+
+    Unless `force` is set, a country whose inputs and settings are unchanged
+    since its outputs were last generated, and whose outputs are intact, is
+    skipped without loading the transform or its outputs.
+
+    Attributes:
+        save_path (str): The directory holding the retrieved dataset files.
+        output_save_path (str): The directory of the dataset version under
+            which a directory is created for each country's outputs.
+        log_file_name (str): The file the worker logger writes to.
+        namespace (str): The dataset version namespace, given as
+            "<owner>/<dataset>/<version>", used by the cache and to key the
+            results store.
+        cache_path (str | None): The cache directory, `None` disables caching.
+        cache_size (int): The maximum size in bytes of the dataframe cache,
+            0 disables the dataframe cache.
+        force (bool): Whether the result cache is bypassed.
+        chunk_size (int | None): The chunk size used to stream the videos CSV.
+        engine (str): The CSV parse engine.
+        output_workers (int | None): The maximum number of outputs generated
+            concurrently, defaults to all outputs at once.
+        chart_formats (list[str]): The formats each chart is saved in.
+        profile (bool): Whether the transform stage is run under cProfile,
+            the stats are saved as "transform.pstats" with the outputs.
+        aggregations (list[tuple[str, list[str], str, str]]): The name,
+            group-by columns, metric and reducer of each aggregation, each
+            saved as JSON in a directory of its name with the outputs.
+        snapshot (str | None): The snapshot of each video whose views are
+            summed per category, `None` sums every row.
+        time_series (bool): Whether the views per category on each trending
+            date are also saved. Their daily store is shared by every
+            version of the dataset, kept in "views_per_day/<country>" next
+            to the directory of each version, and is rebuilt when `force`
+            is set. A version earlier than the one the store was last
+            updated from leaves it unchanged.
+        results_store (str | None): The SQLite database file each result
+            is also written to, `None` disables the results store.
+        json_format (str): The format of each JSON output, one of
+            `JSON_FORMATS`.
+        json_compression (str | None): The compression of each JSON output,
+            one of `JSON_COMPRESSIONS`, `None` for none.
+    """
+
+    def __init__(
+        self,
+        *,
+        save_path: str,
+        output_save_path: str,
+        log_file_name: str,
+        namespace: str,
+        cache_path: str | None = None,
+        cache_size: int = 0,
+        force: bool = False,
+        chunk_size: int | None = None,
+        engine: str = "c",
+        output_workers: int | None = None,
+        chart_formats: list[str] | None = None,
+        profile: bool = False,
+        aggregations: list[tuple[str, list[str], str, str]] | None = None,
+        snapshot: str | None = None,
+        time_series: bool = False,
+        results_store: str | None = None,
+        json_format: str = "records",
+        json_compression: str | None = None,
+    ) -> None:
+        self.save_path = save_path
+        self.output_save_path = output_save_path
+        self.log_file_name = log_file_name
+        self.namespace = namespace
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.force = force
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.output_workers = output_workers
+        self.chart_formats = chart_formats or ["png"]
+        self.profile = profile
+        self.aggregations = aggregations or []
+        self.snapshot = snapshot
+        self.time_series = time_series
+        self.results_store = results_store
+        self.json_format = json_format
+        self.json_compression = json_compression
+
+    """
+    Transforms the data of a country and generates its outputs.
+
+    The metrics of each stage are saved as "run_metrics.json" with the
+    outputs.
+
+    Args:
+        country (str): The two letter country code.
+
+    Returns:
+        dict[str, Any]: The stage timings and metrics of the country.
+    """
+
+    def __call__(self, country: str) -> dict[str, Any]:
+        logger = JSONLogger(file_name=self.log_file_name)
+        video_file_name, category_file_name = country_file_names(country)
+        output_path = f"{self.output_save_path}/{country}/"
+        paths = {
+            "video_file_path": str(locate(self.save_path, video_file_name)),
+            "category_file_path": str(
+                locate(self.save_path, category_file_name)
+            ),
+            "output_path": output_path,
+        }
+
+        os.makedirs(output_path, exist_ok=True)
+
+        start = time.perf_counter()
+        result_cache = (
+            ResultCache(cache_path=self.cache_path, logger=logger)
+            if self.cache_path and not self.force
+            else None
+        )
+        run_key = None
+
+        if result_cache:
+            run_key = result_cache.key(
+                f"{__name__}.{type(self).__name__}",
+                {
+                    "chart_formats": self.chart_formats,
+                    "aggregations": self.aggregations,
+                    "snapshot": self.snapshot,
+                    "time_series": self.time_series,
+                    "results_store": self.results_store,
+                    "json_format": self.json_format,
+                    "json_compression": self.json_compression,
+                },
+                [paths["video_file_path"], paths["category_file_path"]],
+            )
+
+            if result_cache.outputs_current(
+                run_key, result_cache.recorded_outputs(run_key)
+            ):
+                timings = {
+                    "country": country,
+                    "pid": os.getpid(),
+                    "transform_seconds": round(time.perf_counter() - start, 4),
+                    "skipped": True,
+                }
+
+                logger.info(f"Country {country} is up to date", **timings)
+
+                return timings
+
+        # pandas and matplotlib are only imported once a country has to run.
+        from downloader.data_output.output_aggregation import AggregationJSON
+        from downloader.data_output.output_executor import OutputExecutor
+        from downloader.data_output.output_views_time_series import (
+            ViewsTimeSeriesJSON,
+            ViewsTimeSeriesLineChart,
+        )
+        from downloader.data_output.output_views_to_categories import (
+            ViewsToCategoriesBarChart,
+            ViewsToCategoriesJSON,
+        )
+        from downloader.pipeline.transform_graph import TransformGraph
+        from downloader.transform.dataframe_cache import DataFrameCache
+        from downloader.transform.transform_aggregations import (
+            Aggregation,
+            TransformAggregations,
+        )
+        from downloader.transform.transform_views_time_series import (
+            TransformViewsTimeSeries,
+        )
+        from downloader.transform.transform_views_to_categories import (
+            TransformViewsToCategories,
+        )
+
+        profiler = StageProfiler(logger=logger)
+        output_executor = OutputExecutor(
+            max_workers=self.output_workers,
+            logger=logger,
+            profiler=profiler,
+        )
+        settings: dict[str, Any] = {
+            "logger": logger,
+            "chunk_size": self.chunk_size,
+            "engine": self.engine,
+            "cache": (
+                DataFrameCache(
+                    cache_path=self.cache_path,
+                    namespace=self.namespace,
+                    max_bytes=self.cache_size,
+                    logger=logger,
+                )
+                if self.cache_path and self.cache_size
+                else None
+            ),
+            "result_cache": result_cache,
+            "output_executor": output_executor,
+            "profiler": profiler,
+        }
+        outputs: list["DataOutput"] = []
+        output_files = []
+        nodes: dict[str, tuple["Transform", list["DataOutput"]]] = {
+            "views_to_categories": (
+                TransformViewsToCategories(snapshot=self.snapshot, **settings),
+                [
+                    ViewsToCategoriesBarChart(
+                        logger=logger, formats=self.chart_formats
+                    ),
+                    ViewsToCategoriesJSON(
+                        logger=logger,
+                        json_format=self.json_format,
+                        compression=self.json_compression,
+                    ),
+                    *self._stored(
+                        country,
+                        "views_to_categories",
+                        ["category_id", "snippet.title"],
+                        ["views"],
+                        logger,
+                    ),
+                ],
+            )
+        }
+
+        for output in nodes["views_to_categories"][1]:
+            outputs.append(output)
+            output_files += output.output_files(output_path)
+
+        if self.aggregations:
+            aggregations = [
+                Aggregation(
+                    name=name,
+                    group_by=group_by,
+                    metric=metric,
+                    reducer=reducer,
+                    outputs=[
+                        AggregationJSON(
+                            logger=logger,
+                            file_name=name,
+                            json_format=self.json_format,
+                            compression=self.json_compression,
+                        ),
+                        *self._stored(
+                            country,
+                            name,
+                            group_by
+                            + (
+                                ["category"]
+                                if "category_id" in group_by
+                                else []
+                            ),
+                            [metric],
+                            logger,
+                        ),
+                    ],
+                )
+                for name, group_by, metric, reducer in self.aggregations
+            ]
+            nodes["aggregations"] = (
+                TransformAggregations(aggregations=aggregations, **settings),
+                [],
+            )
+
+            for aggregation in aggregations:
+                for output in aggregation.outputs:
+                    outputs.append(output)
+                    output_files += output.output_files(
+                        os.path.join(output_path, aggregation.name)
+                    )
+
+        if self.time_series:
+            nodes["views_time_series"] = (
+                TransformViewsTimeSeries(
+                    store_path=os.path.join(
+                        os.path.dirname(
+                            os.path.normpath(self.output_save_path)
+                        ),
+                        "views_per_day",
+                        country,
+                    ),
+                    rebuild=self.force,
+                    version=self.namespace.split("/")[-1],
+                    **settings,
+                ),
+                [
+                    ViewsTimeSeriesLineChart(
+                        logger=logger, formats=self.chart_formats
+                    ),
+                    ViewsTimeSeriesJSON(
+                        logger=logger,
+                        json_format=self.json_format,
+                        compression=self.json_compression,
+                    ),
+                    *self._stored(
+                        country,
+                        "views_time_series",
+                        ["trending_date", "category_id", "snippet.title"],
+                        ["views"],
+                        logger,
+                    ),
+                ],
+            )
+
+            for output in nodes["views_time_series"][1]:
+                outputs.append(output)
+                output_files += output.output_files(output_path)
+
+        # Output processes are forked before the graph starts its threads.
+        output_executor.start(outputs)
+
+        try:
+            with profiler.stage(
+                "transform",
+                profile_path=(
+                    f"{output_path}transform.pstats" if self.profile else None
+                ),
+                country=country,
+            ) as metrics:
+                if self.chunk_size:
+                    for transform, data_outputs in nodes.values():
+                        transform.transform(paths, data_outputs)
+                else:
+                    failed = [
+                        name
+                        for name, node_metrics in TransformGraph(
+                            logger=logger, profiler=profiler
+                        )
+                        .run(paths, nodes)
+                        .items()
+                        if node_metrics is None
+                    ]
+
+                    if failed:
+                        raise RuntimeError(
+                            f"Nodes {', '.join(failed)} failed."
+                        )
+
+                metrics["rows"] = sum(
+                    transform.rows_read for transform, _ in nodes.values()
+                )
+        finally:
+            output_executor.shutdown()
+
+        if (
+            result_cache
+            and run_key
+            and not any(
+                transform.output_errors for transform, _ in nodes.values()
+            )
+        ):
+            result_cache.record_outputs(run_key, output_files)
+
+        timings = {
+            "country": country,
+            "pid": os.getpid(),
+            "transform_seconds": round(time.perf_counter() - start, 4),
+        }
+
+        logger.info(f"Completed country {country}", **timings)
+
+        profiler.write(f"{output_path}run_metrics.json", **timings)
+
+        return {**timings, "stages": profiler.stages}
+
+    """
+    returns the output writing a result of the country to the results
+    store, none when the store is disabled
+    """
+
+    def _stored(
+        self,
+        country: str,
+        name: str,
+        keys: list[str],
+        metrics: list[str],
+        logger: JSONLogger,
+    ) -> list["DataOutput"]:
+        if not self.results_store:
+            return []
+
+        from downloader.data_output.output_results_store import (
+            ResultsStoreOutput,
+        )
+
+        owner, dataset, version = self.namespace.split("/")
+
+        return [
+            ResultsStoreOutput(
+                store_path=self.results_store,
+                owner=owner,
+                dataset=dataset,
+                version=version,
+                country=country,
+                name=name,
+                keys=keys,
+                metrics=metrics,
+                logger=logger,
+            )
+        ]
+
+
+"""
+Imports the transform and outputs used to run a country, which are
+otherwise imported on first use.
+
+A long running process calls this once so that every run, and every worker
+process forked for a run, starts with them already imported.
+
+Returns:
+    None
+"""
+
+
+def preload() -> None:
+    import matplotlib.backends.backend_agg  # noqa: F401
+    import matplotlib.figure  # noqa: F401
+
+    import downloader.data_output.output_aggregation  # noqa: F401
+    import downloader.data_output.output_results_store  # noqa: F401
+    import downloader.data_output.output_views_time_series  # noqa: F401
+    import downloader.data_output.output_views_to_categories  # noqa: F401
+    import downloader.pipeline.transform_graph  # noqa: F401
+    import downloader.transform.transform_aggregations  # noqa: F401
+    import downloader.transform.transform_top_k  # noqa: F401
+    import downloader.transform.transform_views_time_series  # noqa: F401
+    import downloader.transform.transform_views_to_categories  # noqa: F401
+
+
+"""
+Runs a `CountryRunner` for each country using a pool of worker processes.
+
+A failure in one country is logged and does not stop the other countries.
+A single country, or a single worker, runs in the calling process.
+
+Args:
+    runner (CountryRunner): The runner to call for each country.
+    countries (list[str]): The two letter country codes to run.
+    workers (int | None): The number of worker processes, defaults to the
+        number of CPUs.
+    logger (JSONLogger): A logger instance for structured logging.
+
+Returns:
+    dict[str, dict[str, Any] | None]: The stage timings of each country,
+        `None` for countries that failed.
+"""
+
+
+def run_countries(
+    runner: CountryRunner,
+    countries: list[str],
+    workers: int | None,
+    logger: JSONLogger,
+) -> dict[str, dict[str, Any] | None]:
+    results: dict[str, dict[str, Any] | None] = {}
+    workers = min(workers or os.cpu_count() or 1, len(countries))
+
+    if workers <= 1:
+        for country in countries:
+            try:
+                results[country] = runner(country)
+            except Exception as e:
+                logger.error(f"Country {country} failed: {e}.")
+                results[country] = None
+
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(runner, country): country for country in countries
+        }
+
+        for future in as_completed(futures):
+            country = futures[future]
+
+            try:
+                results[country] = future.result()
+            except Exception as e:
+                logger.error(f"Country {country} failed: {e}.")
+                results[country] = None
+
+    return results
+
+
+"""
+Computes each top-K result over the video files of every country in the
+calling process, saving each as JSON in the "top" directory of the outputs.
+
+Each result is measured as a "top_k" stage. A failed result is logged and
+does not stop the others, countries whose video file is missing are left
+out.
+
+Args:
+    top (list[tuple[str, str, str, int]]): The name, key column, metric and
+        number of keys of each result.
+    save_path (str): The directory holding the retrieved dataset files.
+    output_save_path (str): The directory holding the outputs.
+    countries (list[str]): The two letter country codes read.
+    capacity (int | None): The number of keys held by each summary, `None`
+        sums exactly.
+    verify (bool): Whether the keys of each summary are summed exactly in a
+        second pass.
+    chunk_size (int | None): The chunk size used to stream the video files.
+    logger (JSONLogger): A logger instance for structured logging.
+    profiler (StageProfiler): Measures each result.
+    json_format (str): The format of each result, one of `JSON_FORMATS`.
+    json_compression (str | None): The compression of each result, one of
+        `JSON_COMPRESSIONS`, `None` for none.
+
+Returns:
+    dict[str, dict[str, Any] | None]: The error bound of each result and
+        whether its keys are known to be the top keys, `None` for results
+        that failed.
+"""
+
+
+def run_top_k(
+    top: list[tuple[str, str, str, int]],
+    *,
+    save_path: str,
+    output_save_path: str,
+    countries: list[str],
+    capacity: int | None,
+    verify: bool,
+    chunk_size: int | None,
+    logger: JSONLogger,
+    profiler: StageProfiler,
+    json_format: str = "records",
+    json_compression: str | None = None,
+) -> dict[str, dict[str, Any] | None]:
+    from downloader.data_output.output_aggregation import AggregationJSON
+    from downloader.transform.transform_top_k import TransformTopK
+
+    file_paths = []
+
+    for country in countries:
+        file_path = locate(save_path, country_file_names(country)[0])
+
+        if file_path:
+            file_paths.append(file_path)
+        else:
+            logger.warning(f"Country {country} has no video file.")
+
+    output_path = os.path.join(output_save_path, "top")
+    results: dict[str, dict[str, Any] | None] = {}
+
+    os.makedirs(output_path, exist_ok=True)
+
+    for name, key, metric, k in top:
+        try:
+            with profiler.stage("top_k", result=name) as metrics:
+                transform = TransformTopK(
+                    key=key,
+                    metric=metric,
+                    k=k,
+                    capacity=capacity,
+                    verify=verify,
+                    logger=logger,
+                    chunk_size=chunk_size,
+                )
+                transform.top_k(file_paths)
+                transform.generate_outputs(
+                    [
+                        AggregationJSON(
+                            logger=logger,
+                            file_name=name,
+                            json_format=json_format,
+                            compression=json_compression,
+                        )
+                    ],
+                    output_path,
+                )
+
+                metrics["rows"] = transform.rows_read
+        except Exception as e:
+            logger.error(f"Top-K result {name} failed: {e}.")
+            results[name] = None
+
+            continue
+
+        results[name] = {
+            "max_error": (
+                transform.summary.error
+                if transform.summary and not verify
+                else 0
+            ),
+            "guaranteed": transform.guaranteed,
+        }
+
+    return results
@@ -0,0 +1,585 @@
+import asyncio
+import contextlib
+import email.utils
+import gzip
+import hashlib
+import http
+import json
+import os
+import signal
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from downloader.data_output.chart_renderer import CHART_FORMATS, ChartRenderer
+from downloader.data_output.json_formats import (
+    JSON_COMPRESSIONS,
+    JSON_FORMATS,
+    file_name,
+)
+from downloader.logger.logger import JSONLogger
+
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".ndjson": "application/x-ndjson",
+    ".parquet": "application/vnd.apache.parquet",
+    ".gz": "application/gzip",
+    ".zst": "application/zstd",
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+}
+COMPRESSED_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+
+class Resource:
+    """
+    An output file held in memory with the validators and the gzip encoding
+    served with it.
+
+    The gzip encoding is compressed once when the resource is loaded and is
+    only kept when it is smaller than the file. The gzip encoding has an
+    entity tag of its own, as the bytes served differ.
+
+    Attributes:
+        body (bytes): The content of the file.
+        content_type (str): The media type of the file.
+        last_modified (int): The modification time of the file, in whole
+            seconds as HTTP dates have no finer resolution.
+        etag (str): The strong entity tag of the file.
+        gzip_body (bytes | None): The gzip encoding of the file, `None` if
+            it is not served compressed.
+        gzip_etag (str): The strong entity tag of the gzip encoding.
+    """
+
+    def __init__(
+        self, *, body: bytes, content_type: str, last_modified: float
+    ) -> None:
+        self.body = body
+        self.content_type = content_type
+        self.last_modified = int(last_modified)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.gzip_body: bytes | None = None
+
+        if content_type in COMPRESSED_TYPES:
+            gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+            if len(gzip_body) < len(body):
+                self.gzip_body = gzip_body
+
+
+class Snapshot:
+    """
+    The outputs of a finished run held in memory, keyed by the URL path
+    each is served at. A snapshot is never changed once built, a new run
+    is loaded into a new snapshot which replaces the old one.
+
+    Attributes:
+        version (str): The dataset version of the run.
+        signature (tuple[str, int, int]): The path, modification time and
+            size of the run metrics file of the run.
+        resources (dict[str, Resource]): The outputs by URL path.
+    """
+
+    def __init__(
+        self,
+        *,
+        version: str,
+        signature: tuple[str, int, int],
+        resources: dict[str, Resource],
+    ) -> None:
+        self.version = version
+        self.signature = signature
+        self.resources = resources
+
+
+class OutputServer:
+    """
+    A read-only HTTP server of the views per category of the latest run of
+    a dataset, from the outputs of `ViewsToCategoriesJSON` and
+    `ViewsToCategoriesBarChart`.
+
+    Each country's outputs are served at "/<country>/<file name>", the
+    JSON in each format and compression written, e.g.
+    "views_to_categories.ndjson.gz", and an index of every output with its
+    entity tag at "/". Outputs are read
+    into memory once per run, so requests never read files that a run may
+    be writing. A run counts as finished once its "run_metrics.json",
+    written last, appears or changes. The dataset directory is checked for
+    such a run every `reload_interval` seconds, and the outputs of the
+    finished run of the highest version, numeric versions in numeric
+    order, are loaded into a new `Snapshot` which replaces the old one in a
+    single assignment. Each request reads one snapshot, so
+    responses never mix the outputs of two runs.
+
+    Responses carry an ETag and a Last-Modified header and must be
+    revalidated, requests whose If-None-Match or If-Modified-Since header
+    matches get a 304 without a body. JSON and SVG outputs are served
+    gzip encoded, compressed once per run, to clients accepting gzip.
+    Connections are kept alive between requests until idle for
+    `idle_timeout` seconds.
+
+    The server runs in an asyncio event loop, SIGTERM and SIGINT stop it
+    when started from the main thread.
+
+    Attributes:
+        dataset_path (str): The directory holding a directory per dataset
+            version, each with a directory per country.
+        host (str): The address listened on.
+        port (int): The port listened on, 0 picks a free port which is
+            set once listening.
+        reload_interval (float): The seconds between checks for a new run.
+        idle_timeout (float): The seconds an idle connection is kept open.
+        snapshot (Snapshot | None): The outputs being served, `None` until
+            a finished run is found.
+        ready (threading.Event): Set once the server is listening.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    def __init__(
+        self,
+        *,
+        dataset_path: str,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        reload_interval: float = 5.0,
+        idle_timeout: float = 30.0,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.dataset_path = dataset_path
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.idle_timeout = idle_timeout
+        self.snapshot: Snapshot | None = None
+        self.ready = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping: asyncio.Event | None = None
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Serves until stopped.
+
+    Returns:
+        None
+    """
+
+    def start(self) -> None:
+        asyncio.run(self.serve())
+
+    """
+    Stops the server, from any thread or as a signal handler.
+
+    Returns:
+        None
+    """
+
+    def stop(self, *args: Any) -> None:
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    """
+    Loads the latest finished run, listens and reloads whenever a new run
+    finishes, until stopped.
+
+    Returns:
+        None
+    """
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                self._loop.add_signal_handler(signum, self._stopping.set)
+
+        await self._loop.run_in_executor(None, self.reload)
+
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.logger.info(
+            "Output server started.", host=self.host, port=self.port
+        )
+
+        async with server:
+            while not self._stopping.is_set():
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stopping.wait(), self.reload_interval
+                    )
+
+                if not self._stopping.is_set():
+                    await self._loop.run_in_executor(None, self.reload)
+
+        self.ready.clear()
+        self.logger.info("Output server stopped.", port=self.port)
+
+    """
+    Loads the outputs of the latest finished run when it differs from the
+    run being served, replacing the snapshot being served.
+
+    Returns:
+        bool: Whether a new snapshot is served.
+    """
+
+    def reload(self) -> bool:
+        latest = _latest_run(self.dataset_path)
+
+        if latest is None or (
+            self.snapshot and self.snapshot.signature == latest
+        ):
+            return False
+
+        try:
+            snapshot = _load_snapshot(latest)
+        except OSError as e:
+            self.logger.warning(f"Loading outputs failed: {e}.")
+
+            return False
+
+        self.snapshot = snapshot
+        self.logger.info(
+            "Outputs loaded.",
+            version=snapshot.version,
+            files=len(snapshot.resources),
+        )
+
+        return True
+
+    """
+    Builds the response to a request from the snapshot being served.
+
+    Args:
+        method (str): The request method.
+        target (str): The request target.
+        headers (dict[str, str]): The request headers, with lower case
+            names.
+
+    Returns:
+        tuple[int, dict[str, str], bytes]: The status, headers and body of
+            the response, the body being left out of HEAD responses when
+            sent.
+    """
+
+    def respond(
+        self, method: str, target: str, headers: dict[str, str]
+    ) -> tuple[int, dict[str, str], bytes]:
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            return 503, {"Retry-After": str(int(self.reload_interval))}, b""
+
+        resource = snapshot.resources.get(urlsplit(target).path)
+
+        if resource is None:
+            return 404, {}, b""
+
+        compressed = resource.gzip_body is not None and _accepts_gzip(
+            headers.get("accept-encoding", "")
+        )
+        response_headers = {
+            "ETag": resource.gzip_etag if compressed else resource.etag,
+            "Last-Modified": email.utils.formatdate(
+                resource.last_modified, usegmt=True
+            ),
+            "Cache-Control": "no-cache",
+        }
+
+        if resource.gzip_body is not None:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if _not_modified(resource, headers):
+            return 304, response_headers, b""
+
+        response_headers["Content-Type"] = resource.content_type
+
+        if compressed and resource.gzip_body is not None:
+            response_headers["Content-Encoding"] = "gzip"
+
+            return 200, response_headers, resource.gzip_body
+
+        return 200, response_headers, resource.body
+
+    """
+    serves the requests of a connection until it is closed, idle, sends
+    a malformed request or asks for it to be closed
+    """
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), self.idle_timeout
+                    )
+                except (
+                    asyncio.TimeoutError,
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ConnectionError,
+                ):
+                    break
+
+                request = _parse_request(head)
+
+                if request is None:
+                    writer.write(_encode(400, {}, b"", False))
+
+                    break
+
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = (
+                    connection != "close"
+                    if version == "HTTP/1.1"
+                    else connection == "keep-alive"
+                )
+
+                content_length = headers.get("content-length", "0")
+
+                if content_length.isdigit():
+                    await reader.readexactly(int(content_length))
+
+                status, response_headers, body = self.respond(
+                    method, target, headers
+                )
+                writer.write(
+                    _encode(
+                        status,
+                        response_headers,
+                        b"" if method == "HEAD" else body,
+                        keep_alive,
+                        len(body),
+                    )
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+"""
+finds the run metrics file of the finished run of the highest version of
+a dataset, numeric versions in numeric order, as its path, modification
+time and size, `None` if no run has finished. Runs of older versions
+finishing later, as in a backfill, are not taken for the latest
+"""
+
+
+def _latest_run(dataset_path: str) -> tuple[str, int, int] | None:
+    runs = []
+
+    for version in (
+        os.listdir(dataset_path) if os.path.isdir(dataset_path) else []
+    ):
+        try:
+            stat = os.stat(f"{dataset_path}/{version}/run_metrics.json")
+        except OSError:
+            continue
+
+        runs.append(
+            (
+                (int(version) if version.isdigit() else -1, version),
+                f"{dataset_path}/{version}/run_metrics.json",
+                stat.st_mtime_ns,
+                stat.st_size,
+            )
+        )
+
+    if not runs:
+        return None
+
+    _, path, mtime, size = max(runs)
+
+    return path, mtime, size
+
+
+"""
+reads the views per category outputs of each country of a run, in every
+JSON format and compression written, and an index of them, into a snapshot
+"""
+
+
+def _load_snapshot(signature: tuple[str, int, int]) -> Snapshot:
+    run_path = os.path.dirname(signature[0])
+    resources = {}
+
+    for country in sorted(os.listdir(run_path)):
+        country_path = f"{run_path}/{country}"
+
+        if not os.path.isdir(country_path):
+            continue
+
+        json_paths = [
+            file_name(
+                f"{country_path}/views_to_categories", json_format, compression
+            )
+            for json_format in JSON_FORMATS
+            for compression in [None, *JSON_COMPRESSIONS]
+        ]
+
+        for file_path in list(dict.fromkeys(json_paths)) + [
+            ChartRenderer.file_name(
+                f"{country_path}/views_to_categories_bar_chart", chart_format
+            )
+            for chart_format in CHART_FORMATS
+        ]:
+            if not os.path.exists(file_path):
+                continue
+
+            with open(file_path, "rb") as f:
+                body = f.read()
+
+            resources[f"/{country}/{os.path.basename(file_path)}"] = Resource(
+                body=body,
+                content_type=CONTENT_TYPES[os.path.splitext(file_path)[1]],
+                last_modified=os.path.getmtime(file_path),
+            )
+
+    version = os.path.basename(run_path)
+    resources["/"] = Resource(
+        body=json.dumps(
+            {
+                "version": version,
+                "finished": email.utils.formatdate(
+                    signature[1] / 1e9, usegmt=True
+                ),
+                "files": {
+                    path: resource.etag for path, resource in resources.items()
+                },
+            }
+        ).encode(),
+        content_type="application/json",
+        last_modified=signature[1] / 1e9,
+    )
+
+    return Snapshot(version=version, signature=signature, resources=resources)
+
+
+"""
+parses the request line and headers of a request, `None` if malformed
+"""
+
+
+def _parse_request(
+    head: bytes,
+) -> tuple[str, str, str, dict[str, str]] | None:
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+        headers = {}
+
+        for line in lines[1:]:
+            if line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+    except ValueError:
+        return None
+
+    if not version.startswith("HTTP/1."):
+        return None
+
+    return method, target, version, headers
+
+
+"""
+whether an Accept-Encoding header accepts gzip
+"""
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.lower().split(","):
+        name, _, parameters = coding.partition(";")
+
+        if name.strip() in ("gzip", "*"):
+            quality = parameters.strip().removeprefix("q=")
+
+            try:
+                return not parameters or float(quality) > 0
+            except ValueError:
+                return False
+
+    return False
+
+
+"""
+whether the validators of a request match a resource, If-None-Match taking
+precedence over If-Modified-Since. Entity tags are compared weakly so the
+tag of either encoding matches
+"""
+
+
+def _not_modified(resource: Resource, headers: dict[str, str]) -> bool:
+    if "if-none-match" in headers:
+        tags = {
+            tag.strip().removeprefix("W/")
+            for tag in headers["if-none-match"].split(",")
+        }
+
+        return "*" in tags or bool(tags & {resource.etag, resource.gzip_etag})
+
+    if "if-modified-since" in headers:
+        try:
+            since = email.utils.parsedate_to_datetime(
+                headers["if-modified-since"]
+            ).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+        return resource.last_modified <= since
+
+    return False
+
+
+"""
+encodes a response, with its length, date and connection headers
+"""
+
+
+def _encode(
+    status: int,
+    headers: dict[str, str],
+    body: bytes,
+    keep_alive: bool,
+    content_length: int | None = None,
+) -> bytes:
+    headers = {
+        **headers,
+        "Date": email.utils.formatdate(time.time(), usegmt=True),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+
+    if status != 304:
+        headers["Content-Length"] = str(
+            len(body) if content_length is None else content_length
+        )
+
+    head = [f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}"] + [
+        f"{name}: {value}" for name, value in headers.items()
+    ]
+
+    return "\r\n".join(head + ["", ""]).encode("latin-1") + body
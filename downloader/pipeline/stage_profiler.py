@@ -0,0 +1,251 @@
+import cProfile
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from downloader.logger.logger import JSONLogger
+
+
+class StageProfiler:
+    """
+    Measures the stages of a pipeline run.
+
+    For each stage the wall and CPU time, the peak RSS, the bytes read and
+    written and the rows per second are recorded, logged as fields of the
+    `extra` payload and kept in `stages` so they can be written as the
+    metrics of the run.
+
+    CPU time covers every thread of the process and any child process
+    reaped during the stage. On Linux the peak RSS is reset at the start of
+    each stage, with the peak reached so far carried over to any enclosing
+    stage, and bytes are counted from `/proc/self/io`. Elsewhere the peak
+    RSS is that of the whole process and bytes are not counted.
+
+    Attributes:
+        logger (JSONLogger): A logger instance for structured logging.
+        stages (list[dict[str, Any]]): The metrics of each completed stage.
+    """
+
+    def __init__(self, *, logger: JSONLogger | None = None) -> None:
+        self.stages: list[dict[str, Any]] = []
+        self._peaks: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Returns the state sent to a worker process, the settings without the
+    stages measured so far.
+
+    Returns:
+        dict[str, Any]
+    """
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.update({"stages": [], "_peaks": {}})
+        del state["_lock"]
+
+        return state
+
+    """
+    Restores the settings in a worker process.
+
+    Args:
+        state (dict[str, Any]): The state returned by `__getstate__`.
+
+    Returns:
+        None
+    """
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    """
+    Measures the enclosed block as a stage.
+
+    The yielded dictionary holds the fields of the stage, the block may set
+    "rows" to the number of rows it processed. Metrics of a stage that
+    raises are not recorded.
+
+    Args:
+        name (str): The name of the stage, e.g. "transform".
+        profile_path (str | None): When set the stage is run under cProfile
+            and the stats are dumped to this file for use with pstats.
+        **fields (Any): Fields identifying the stage, e.g. the country.
+
+    Yields:
+        dict[str, Any]
+    """
+
+    @contextmanager
+    def stage(
+        self, name: str, profile_path: str | None = None, **fields: Any
+    ) -> Iterator[dict[str, Any]]:
+        metrics: dict[str, Any] = {"stage": name, **fields}
+        profile = cProfile.Profile() if profile_path else None
+
+        with self._lock:
+            peak = _peak_rss()
+
+            for key in self._peaks:
+                self._peaks[key] = max(self._peaks[key], peak)
+
+            self._peaks[id(metrics)] = 0
+            _reset_peak_rss()
+
+        io_start = _io_counters()
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+
+        if profile:
+            profile.enable()
+
+        try:
+            yield metrics
+        finally:
+            if profile:
+                profile.disable()
+
+            with self._lock:
+                peak = max(self._peaks.pop(id(metrics)), _peak_rss())
+
+        wall_seconds = time.perf_counter() - start
+        io_end = _io_counters()
+        rows = metrics.get("rows")
+
+        metrics.update(
+            {
+                "pid": os.getpid(),
+                "wall_seconds": round(wall_seconds, 4),
+                "cpu_seconds": round(_cpu_seconds() - cpu_start, 4),
+                "peak_rss_bytes": peak,
+                "bytes_read": (
+                    io_end["rchar"] - io_start["rchar"]
+                    if io_start and io_end
+                    else None
+                ),
+                "bytes_written": (
+                    io_end["wchar"] - io_start["wchar"]
+                    if io_start and io_end
+                    else None
+                ),
+                "rows_per_second": (
+                    round(rows / wall_seconds, 2)
+                    if rows is not None and wall_seconds > 0
+                    else None
+                ),
+            }
+        )
+
+        if profile and profile_path:
+            profile.dump_stats(profile_path)
+            metrics["profile_path"] = profile_path
+
+        self.record(metrics)
+        self.logger.info(f"Stage {name} completed.", **metrics)
+
+    """
+    Records the metrics of a stage measured elsewhere, such as in a worker
+    process, without logging them again.
+
+    Args:
+        metrics (dict[str, Any]): The metrics of the stage.
+
+    Returns:
+        None
+    """
+
+    def record(self, metrics: dict[str, Any]) -> None:
+        self.stages.append(metrics)
+
+    """
+    Writes the recorded stages, and any other metrics of the run, to a JSON
+    file. The file is replaced atomically.
+
+    Args:
+        file_path (str): The metrics file.
+        **fields (Any): Other metrics of the run.
+
+    Returns:
+        None
+    """
+
+    def write(self, file_path: str, **fields: Any) -> None:
+        directory = os.path.dirname(file_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(fd, "w") as f:
+            json.dump({**fields, "stages": self.stages}, f, indent=2)
+
+        os.replace(temp_path, file_path)
+
+
+"""
+Returns the CPU time used by the process and its reaped children.
+"""
+
+
+def _cpu_seconds() -> float:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+"""
+Resets the peak RSS of the process to its current RSS, where supported.
+"""
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+"""
+Returns the peak RSS in bytes since the last reset, or of the whole
+process where resetting is not supported.
+"""
+
+
+def _peak_rss() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+"""
+Returns the bytes read and written by the process, or an empty dict where
+they are not available.
+"""
+
+
+def _io_counters() -> dict[str, int]:
+    try:
+        with open("/proc/self/io") as f:
+            return {
+                key: int(value)
+                for key, value in (line.split(": ") for line in f)
+            }
+    except OSError:
+        return {}
@@ -0,0 +1,379 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.transform.transform import Transform
+
+# The frames loaded from input files, and the path holding each file.
+SOURCES = {"videos": "video_file_path", "categories": "category_file_path"}
+
+
+class TransformGraph:
+    """
+    Runs several transformations as a dependency graph sharing their
+    inputs.
+
+    Each transformation declares the frames it reads through `inputs` and
+    the frames it produces for others through `produces`. Every input file
+    is loaded once, with the union of the columns read by its consumers,
+    and the frames are shared read-only between transformations. A
+    transformation runs as soon as the frames it reads are available, so
+    independent transformations run in parallel threads. A frame is
+    released as soon as the last transformation reading it has completed.
+
+    Before any input file is loaded each transformation loads its cached
+    results, see `Transform.reuse_cached_results`. A transformation whose
+    results are all cached reads no input file, and an input file read
+    only by such transformations is not loaded.
+
+    Each load and each transformation is measured as a "node" stage, with
+    its wall time and peak RSS.
+
+    Attributes:
+        max_workers (int | None): The maximum number of nodes run at once,
+            defaults to all nodes.
+        logger (JSONLogger): A logger instance for structured logging.
+        profiler (StageProfiler): Measures each node.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        logger: JSONLogger | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+        self.profiler = profiler or StageProfiler(logger=self.logger)
+
+    """
+    Loads the inputs and runs each transformation, generating its outputs.
+
+    A failed node is logged and the transformations depending on it are
+    skipped, other nodes are unaffected.
+
+    Args:
+        paths (dict[str, str]): The "video_file_path" and
+            "category_file_path" input files, which may be members of a zip
+            archive, and the "output_path" outputs are saved to.
+        nodes (dict[str, tuple[Transform, list[DataOutput]]]): Each
+            transformation and its outputs, by node name.
+
+    Returns:
+        dict[str, dict[str, Any] | None]: The metrics of each node, the
+            loads being named after their frame, `None` for nodes that
+            failed or were skipped. Input files not loaded have no metrics.
+
+    Raises:
+        ValueError: If a frame is not produced by exactly one node, or the
+            nodes depend on each other in a cycle.
+    """
+
+    def run(
+        self,
+        paths: dict[str, str],
+        nodes: dict[str, tuple[Transform, list[DataOutput]]],
+    ) -> dict[str, dict[str, Any] | None]:
+        reads = self._reads(nodes, [paths[path] for path in SOURCES.values()])
+        dependencies, columns = self._plan(nodes, reads)
+        consumers: dict[str, int] = {}
+
+        for frames_read in reads.values():
+            for frame in frames_read:
+                consumers[frame] = consumers.get(frame, 0) + 1
+
+        frames: dict[str, pd.DataFrame] = {}
+        results: dict[str, dict[str, Any] | None] = {}
+        failed: set[str] = set()
+        pending = {name: set(names) for name, names in dependencies.items()}
+        futures: dict[
+            Future[tuple[dict[str, Any], dict[str, pd.DataFrame]]], str
+        ] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers or len(dependencies) or 1
+        ) as executor:
+            while pending or futures:
+                for name in [n for n, names in pending.items() if not names]:
+                    del pending[name]
+
+                    if name in nodes:
+                        transform, data_outputs = nodes[name]
+                        futures[
+                            executor.submit(
+                                self._transform,
+                                name,
+                                transform,
+                                {
+                                    frame: frames[frame]
+                                    for frame in reads[name]
+                                },
+                                data_outputs,
+                                paths["output_path"],
+                            )
+                        ] = name
+                    else:
+                        futures[
+                            executor.submit(
+                                self._load,
+                                name,
+                                paths[SOURCES[name]],
+                                columns[name],
+                                self._loader(name, nodes, reads),
+                            )
+                        ] = name
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = futures.pop(future)
+
+                    try:
+                        results[name], produced = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Node {name} failed: {e}.")
+
+                        results[name] = None
+                        failed.add(name)
+                        produced = {}
+
+                    for frame, dataframe in produced.items():
+                        if consumers.get(frame):
+                            frames[frame] = dataframe
+
+                    if name in nodes:
+                        self._release(reads[name], frames, consumers)
+
+                    for names in pending.values():
+                        if name not in failed:
+                            names.discard(name)
+
+                self._skip_failed(
+                    reads, pending, failed, results, frames, consumers
+                )
+
+        return results
+
+    """
+    returns the frames each transformation reads, loading its cached
+    results first, the input files are not read by one whose results are
+    all cached
+    """
+
+    def _reads(
+        self,
+        nodes: dict[str, tuple[Transform, list[DataOutput]]],
+        input_paths: list[str],
+    ) -> dict[str, list[str]]:
+        reads: dict[str, list[str]] = {}
+
+        for name, (transform, _) in nodes.items():
+            reads[name] = list(transform.inputs())
+
+            if transform.reuse_cached_results(input_paths):
+                reads[name] = [
+                    frame for frame in reads[name] if frame not in SOURCES
+                ]
+
+                self.logger.info(
+                    f"Node {name} results are cached, its input files are "
+                    "not read."
+                )
+
+        return reads
+
+    """
+    Checks the nodes form a graph and returns the nodes each node depends
+    on, including a load node for each input file read, and the columns
+    loaded from each input file with their dtypes.
+    """
+
+    def _plan(
+        self,
+        nodes: dict[str, tuple[Transform, list[DataOutput]]],
+        reads: dict[str, list[str]],
+    ) -> tuple[dict[str, set[str]], dict[str, dict[str, str | None]]]:
+        producers: dict[str, str] = {}
+
+        for name, (transform, _) in nodes.items():
+            if name in SOURCES:
+                raise ValueError(f"Node {name} is named after an input.")
+
+            for frame in transform.produces():
+                if frame in SOURCES or frame in producers:
+                    raise ValueError(f"Frame {frame} is produced twice.")
+
+                producers[frame] = name
+
+        dependencies: dict[str, set[str]] = {}
+        columns: dict[str, dict[str, str | None]] = {}
+
+        for name, (transform, _) in nodes.items():
+            dependencies[name] = set()
+
+            for frame, frame_columns in transform.inputs().items():
+                if frame in SOURCES and frame not in reads[name]:
+                    continue
+
+                if frame in SOURCES:
+                    dependencies.setdefault(frame, set())
+                    dependencies[name].add(frame)
+
+                    loaded = columns.setdefault(frame, {})
+
+                    for column, dtype in frame_columns.items():
+                        if loaded.get(column, dtype) != dtype:
+                            raise ValueError(
+                                f"Column {column} of {frame} is read with "
+                                "different dtypes."
+                            )
+
+                        loaded[column] = dtype
+                elif frame in producers:
+                    dependencies[name].add(producers[frame])
+                else:
+                    raise ValueError(f"No node produces frame {frame}.")
+
+        ordered: set[str] = set()
+
+        while len(ordered) < len(dependencies):
+            ready = {
+                name
+                for name, names in dependencies.items()
+                if name not in ordered and names <= ordered
+            }
+
+            if not ready:
+                raise ValueError("The nodes depend on each other in a cycle.")
+
+            ordered |= ready
+
+        return dependencies, columns
+
+    """
+    returns the transformation loading an input file, the first to read it,
+    so its parse settings and cache are used and the rows it parses counted
+    """
+
+    def _loader(
+        self,
+        frame: str,
+        nodes: dict[str, tuple[Transform, list[DataOutput]]],
+        reads: dict[str, list[str]],
+    ) -> Transform:
+        return next(
+            transform
+            for name, (transform, _) in nodes.items()
+            if frame in reads[name]
+        )
+
+    """
+    loads an input file as a load node
+    """
+
+    def _load(
+        self,
+        frame: str,
+        file_path: str,
+        columns: dict[str, str | None],
+        loader: Transform,
+    ) -> tuple[dict[str, Any], dict[str, pd.DataFrame]]:
+        dtypes = {column: dtype for column, dtype in columns.items() if dtype}
+
+        with self.profiler.stage("node", node=frame) as metrics:
+            if frame == "videos":
+                dataframe = loader.csv_to_dataframe(
+                    file_path, list(columns), dtypes
+                )
+            else:
+                dataframe = loader.json_to_dataframe(
+                    file_path, list(columns)
+                ).astype(dtypes)
+
+            metrics["rows"] = len(dataframe)
+
+        return metrics, {frame: dataframe}
+
+    """
+    runs a transformation as a node
+    """
+
+    def _transform(
+        self,
+        name: str,
+        transform: Transform,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> tuple[dict[str, Any], dict[str, pd.DataFrame]]:
+        with self.profiler.stage(
+            "node", node=name, transform=type(transform).__name__
+        ) as metrics:
+            produced = transform.derive(frames, data_outputs, output_path)
+
+            metrics["rows"] = max(
+                (len(dataframe) for dataframe in frames.values()), default=0
+            )
+
+        return metrics, produced
+
+    """
+    releases each frame read by a completed or skipped transformation once
+    no other transformation still has to read it
+    """
+
+    def _release(
+        self,
+        frames_read: list[str],
+        frames: dict[str, pd.DataFrame],
+        consumers: dict[str, int],
+    ) -> None:
+        for frame in frames_read:
+            consumers[frame] -= 1
+
+            if not consumers[frame]:
+                frames.pop(frame, None)
+
+    """
+    skips every pending node depending on a failed node
+    """
+
+    def _skip_failed(
+        self,
+        reads: dict[str, list[str]],
+        pending: dict[str, set[str]],
+        failed: set[str],
+        results: dict[str, dict[str, Any] | None],
+        frames: dict[str, pd.DataFrame],
+        consumers: dict[str, int],
+    ) -> None:
+        skipped = True
+
+        while skipped:
+            skipped = False
+
+            for name in [n for n, names in pending.items() if names & failed]:
+                self.logger.error(f"Node {name} skipped, an input failed.")
+
+                del pending[name]
+                results[name] = None
+                failed.add(name)
+                skipped = True
+
+                if name in reads:
+                    self._release(reads[name], frames, consumers)
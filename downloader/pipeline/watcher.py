@@ -0,0 +1,280 @@
+import datetime
+import fcntl
+import json
+import os
+import secrets
+import signal
+import tempfile
+import threading
+import time
+from types import FrameType
+from typing import IO, Any, Callable
+
+from downloader.logger.logger import JSONLogger
+
+
+class Watcher:
+    """
+    Polls a remote dataset version and runs the pipeline whenever it
+    changes, until stopped.
+
+    Only one watcher may hold the lock file at a time. SIGTERM and SIGINT
+    stop the watcher once any run in progress has completed. Polls are
+    spaced by `interval` seconds, after a failed check or run the spacing
+    doubles up to `max_interval`, and every delay is varied by `jitter` so
+    several watchers do not poll in step.
+
+    The state of the watcher, the version last run and the timings of the
+    last run are kept in a JSON status file, which also lets a restarted
+    watcher resume without running an unchanged version again.
+
+    Attributes:
+        check (Callable[[], str | None]): Returns the current remote
+            version, or `None` if it cannot be determined.
+        run (Callable[[str], dict[str, Any]]): Runs the pipeline for a
+            version, returning a summary with a "success" flag.
+        lock_path (str): The lock file ensuring a single watcher.
+        status_path (str): The JSON status file.
+        interval (float): The seconds between polls.
+        max_interval (float): The maximum seconds between polls after
+            failures.
+        jitter (float): The fraction by which each delay is varied.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    def __init__(
+        self,
+        *,
+        check: Callable[[], str | None],
+        run: Callable[[str], dict[str, Any]],
+        lock_path: str,
+        status_path: str,
+        interval: float = 3600,
+        max_interval: float = 6 * 3600,
+        jitter: float = 0.1,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.check = check
+        self.run = run
+        self.lock_path = lock_path
+        self.status_path = status_path
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.jitter = jitter
+        self.status: dict[str, Any] = {}
+        self.failures = 0
+        self._stopping = threading.Event()
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Takes the lock and polls until stopped.
+
+    Returns:
+        bool: `False` if another watcher holds the lock, otherwise `True`
+            once stopped.
+    """
+
+    def start(self) -> bool:
+        lock_file = self._lock()
+
+        if lock_file is None:
+            self.logger.error(
+                f"Another watcher holds {self.lock_path}, not started."
+            )
+
+            return False
+
+        handlers = self._handle_signals()
+
+        try:
+            self.status = self._load_status()
+            self.logger.info("Watcher started.", pid=os.getpid())
+
+            while not self._stopping.is_set():
+                delay = self.poll()
+
+                self._write_status(
+                    state="waiting", next_check=_timestamp(time.time() + delay)
+                )
+                self._stopping.wait(delay)
+
+            self.logger.info("Watcher stopped.", pid=os.getpid())
+        finally:
+            self._write_status(state="stopped", next_check=None)
+
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+        return True
+
+    """
+    Stops the watcher once any run in progress has completed.
+
+    Returns:
+        None
+    """
+
+    def stop(
+        self, signum: int | None = None, frame: FrameType | None = None
+    ) -> None:
+        self._stopping.set()
+
+    """
+    Checks the remote version once and runs the pipeline if the version
+    differs from the last one run successfully.
+
+    Returns:
+        float: The seconds to wait before the next poll.
+    """
+
+    def poll(self) -> float:
+        self._write_status(state="checking", last_check=_timestamp())
+
+        try:
+            version = self.check()
+        except Exception as e:
+            self.logger.warning(f"Remote version check failed: {e}.")
+
+            version = None
+
+        if version is None:
+            self.failures += 1
+
+            return self._delay()
+
+        if version == self.status.get("version"):
+            self.logger.info(f"Version {version} unchanged.")
+            self.failures = 0
+
+            return self._delay()
+
+        self.logger.info(f"Version {version} found, run started.")
+        self._write_status(state="running")
+
+        start = time.time()
+
+        try:
+            result = self.run(version)
+        except Exception as e:
+            self.logger.error(f"Run of version {version} failed: {e}.")
+
+            result = {"success": False, "error": str(e)}
+
+        success = bool(result.get("success"))
+        self.failures = 0 if success else self.failures + 1
+        self.status["last_run"] = {
+            "version": version,
+            "started": _timestamp(start),
+            "finished": _timestamp(),
+            "seconds": round(time.time() - start, 4),
+            **result,
+        }
+
+        if success:
+            self.status["version"] = version
+
+        return self._delay()
+
+    """
+    Returns the jittered delay before the next poll, doubling for each
+    consecutive failure up to `max_interval`.
+    """
+
+    def _delay(self) -> float:
+        delay = min(
+            self.max_interval, self.interval * 2.0 ** min(self.failures, 32)
+        )
+
+        return delay * secrets.SystemRandom().uniform(
+            1 - self.jitter, 1 + self.jitter
+        )
+
+    """
+    Takes the lock file without waiting, returning `None` if it is held.
+    """
+
+    def _lock(self) -> IO[str] | None:
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+
+        lock_file = open(self.lock_path, "a+")
+
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+
+            return None
+
+        lock_file.truncate(0)
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+
+        return lock_file
+
+    """
+    Stops the watcher on SIGTERM and SIGINT, returning the previous
+    handlers. Signals can only be handled from the main thread.
+    """
+
+    def _handle_signals(self) -> dict[int, Any]:
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        return {
+            signum: signal.signal(signum, self.stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+    """
+    Reads the status file, an unreadable file is treated as empty.
+    """
+
+    def _load_status(self) -> dict[str, Any]:
+        try:
+            with open(self.status_path) as f:
+                status: dict[str, Any] = json.load(f)
+
+            return status
+        except (OSError, ValueError):
+            return {}
+
+    """
+    Updates and atomically writes the status file.
+    """
+
+    def _write_status(self, **fields: Any) -> None:
+        self.status.update(
+            {
+                "pid": os.getpid(),
+                "consecutive_failures": self.failures,
+                **fields,
+            }
+        )
+
+        directory = os.path.dirname(self.status_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.status, f, indent=2, default=str)
+
+        os.replace(temp_path, self.status_path)
+
+
+"""
+Formats a time, defaulting to now, as an ISO 8601 UTC timestamp.
+"""
+
+
+def _timestamp(seconds: float | None = None) -> str:
+    return datetime.datetime.fromtimestamp(
+        time.time() if seconds is None else seconds, datetime.timezone.utc
+    ).isoformat()
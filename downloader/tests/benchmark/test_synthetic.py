@@ -0,0 +1,40 @@
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+
+from downloader.benchmark.synthetic import COLUMNS, generate
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def test_generate(self) -> None:
+        video_file_path, category_file_path = generate(
+            self.directory, 5000, "US", chunk_size=1000
+        )
+
+        videos = pd.read_csv(video_file_path)
+
+        with open(category_file_path) as f:
+            category_ids = {int(item["id"]) for item in json.load(f)["items"]}
+
+        assert video_file_path == f"{self.directory}/USvideos.csv"
+        assert list(videos.columns) == COLUMNS
+        assert len(videos) == 5000
+        assert videos["video_id"].nunique() < 1000
+        assert videos["category_id"].value_counts().index[0] == 10
+        assert set(videos["category_id"]) <= category_ids
+        assert videos["description"].str.contains("\n").any()
+
+    def test_generate_deterministic(self) -> None:
+        first, _ = generate(f"{self.directory}/first", 1000)
+        second, _ = generate(f"{self.directory}/second", 1000)
+
+        with open(first) as f_first, open(second) as f_second:
+            assert f_first.read() == f_second.read()
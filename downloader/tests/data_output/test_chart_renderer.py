@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from downloader.data_output.chart_renderer import (
+    BarChart,
+    ChartRenderer,
+    LineChart,
+    thread_renderer,
+)
+
+CHART = BarChart(
+    labels=["Music", "Entertainment"],
+    values=[2.5, 1.0],
+    title="Youtube Views by Category",
+    xlabel="Category",
+    ylabel="Views(millions)",
+)
+
+
+class TestChartRenderer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def test_render_formats(self) -> None:
+        file_names = ChartRenderer().render(
+            CHART, f"{self.directory}/chart", ["png", "svg", "thumbnail"]
+        )
+
+        assert file_names == [
+            f"{self.directory}/chart.png",
+            f"{self.directory}/chart.svg",
+            f"{self.directory}/chart_thumbnail.png",
+        ]
+
+        with open(file_names[1]) as f:
+            assert "<svg" in f.read()
+
+        assert os.path.getsize(file_names[2]) < os.path.getsize(file_names[0])
+
+    def test_charts_do_not_accumulate(self) -> None:
+        renderer = ChartRenderer()
+
+        renderer.render_many(
+            (CHART, f"{self.directory}/chart_{index}") for index in range(3)
+        )
+
+        with open(f"{self.directory}/chart_0.png", "rb") as f:
+            first = f.read()
+
+        with open(f"{self.directory}/chart_2.png", "rb") as f:
+            assert f.read() == first
+
+        assert not renderer.figure.axes
+
+    def test_render_line_chart(self) -> None:
+        renderer = ChartRenderer()
+
+        file_names = renderer.render(
+            LineChart(
+                x=["2017-11-14", "2017-11-15"],
+                series={"Music": [1.0, 2.0], "Entertainment": [2.5, 0.5]},
+                title="Youtube Views by Category over Time",
+                xlabel="Trending Date",
+                ylabel="Views(millions)",
+            ),
+            f"{self.directory}/line_chart",
+            ["svg"],
+        )
+
+        with open(file_names[0]) as f:
+            svg = f.read()
+
+        assert "Entertainment" in svg
+        assert not renderer.figure.axes
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            ChartRenderer().render(CHART, f"{self.directory}/chart", ["gif"])
+
+    def test_thread_renderer_reused(self) -> None:
+        assert thread_renderer() is thread_renderer()
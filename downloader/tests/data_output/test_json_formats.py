@@ -0,0 +1,127 @@
+import gzip
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.json_formats import file_name, resolve, write_json
+from downloader.logger.logger import JSONLogger
+
+DATA = pd.DataFrame(
+    {
+        "video_id": ["a1", "b2", "c3", "d4", "e5"],
+        "title": ['Say "hi", all', "Line\nbreak", "", "café", None],
+        "likes": [10, 0, 3, 7, 1],
+        "views": [2.5, 1.0001, 0.0, 3.25, 8.0],
+    }
+)
+
+
+class TestJSONFormats(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def test_file_name(self) -> None:
+        assert file_name("a/b", "records", None) == "a/b.json"
+        assert file_name("a/b", "ndjson", "gzip") == "a/b.ndjson.gz"
+        assert file_name("a/b", "columnar", "zstd") == "a/b.json.zst"
+        assert file_name("a/b", "parquet", "zstd") == "a/b.parquet"
+
+    def test_records_match_to_json(self) -> None:
+        for data in [DATA, DATA.head(0)]:
+            for chunk_rows in [1, 2, 100]:
+                write_json(
+                    data,
+                    f"{self.directory}/data.json",
+                    chunk_rows=chunk_rows,
+                )
+
+                with open(f"{self.directory}/data.json") as f:
+                    assert f.read() == data.to_json(orient="records")
+
+    def test_formats_round_trip(self) -> None:
+        for json_format, compression in [
+            ("ndjson", None),
+            ("ndjson", "gzip"),
+            ("columnar", None),
+            ("columnar", "gzip"),
+            ("parquet", None),
+            ("parquet", "gzip"),
+        ]:
+            file_path = file_name(
+                f"{self.directory}/data", json_format, compression
+            )
+
+            write_json(DATA, file_path, json_format, compression, chunk_rows=2)
+
+            if json_format == "ndjson":
+                loaded = pd.read_json(
+                    file_path, lines=True, compression=compression
+                )
+            elif json_format == "columnar":
+                with (gzip.open if compression else open)(
+                    file_path, "rt", encoding="utf-8"
+                ) as f:
+                    loaded = pd.DataFrame(json.load(f))
+            else:
+                loaded = pd.read_parquet(file_path)
+
+            pd.testing.assert_frame_equal(loaded, DATA)
+
+        assert sorted(os.listdir(self.directory)) == [
+            "data.json",
+            "data.json.gz",
+            "data.ndjson",
+            "data.ndjson.gz",
+            "data.parquet",
+        ]
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("zstandard"), "zstandard is not installed"
+    )
+    def test_zstd(self) -> None:
+        write_json(DATA, f"{self.directory}/data.ndjson.zst", "ndjson", "zstd")
+
+        pd.testing.assert_frame_equal(
+            pd.read_json(
+                f"{self.directory}/data.ndjson.zst",
+                lines=True,
+                compression="zstd",
+            ),
+            DATA,
+        )
+
+    def test_failed_write_leaves_file(self) -> None:
+        write_json(DATA, f"{self.directory}/data.json")
+
+        with mock.patch.object(
+            pd.DataFrame, "to_json", side_effect=ValueError("failed")
+        ):
+            with self.assertRaises(ValueError):
+                write_json(DATA.head(1), f"{self.directory}/data.json")
+
+        assert os.listdir(self.directory) == ["data.json"]
+
+        with open(f"{self.directory}/data.json") as f:
+            assert json.load(f) == json.loads(DATA.to_json(orient="records"))
+
+    def test_resolve(self) -> None:
+        logger = mock.MagicMock(spec=JSONLogger)
+
+        assert resolve("ndjson", "gzip", logger) == ("ndjson", "gzip")
+
+        with mock.patch("importlib.util.find_spec", return_value=None):
+            assert resolve("parquet", "zstd", logger) == ("records", "gzip")
+
+        assert logger.warning.call_count == 2
+
+        for json_format, compression in [("xml", None), ("records", "lz4")]:
+            with self.assertRaises(ValueError):
+                resolve(json_format, compression, logger)
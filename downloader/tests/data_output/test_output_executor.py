@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output import output_executor
+from downloader.data_output.data_output import DataOutput
+from downloader.data_output.output_executor import OutputExecutor
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.tests.helpers import NullLogger
+
+
+class SlowOutput(DataOutput):
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        time.sleep(0.3)
+
+        with open(f"{save_path}/{type(self).__name__}", "w") as f:
+            f.write(str(os.getpid()))
+
+
+class CPUBoundOutput(SlowOutput):
+    cpu_bound = True
+
+
+class FailingOutput(DataOutput):
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        raise ValueError("failed")
+
+
+class TestOutputExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.save_path = temp_dir.name
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.data = pd.DataFrame({"views": [1, 2]})
+
+    def _pid(self, output: DataOutput) -> int:
+        with open(f"{self.save_path}/{type(output).__name__}") as f:
+            return int(f.read())
+
+    def test_outputs_generated_concurrently(self) -> None:
+        outputs: list[DataOutput] = [
+            SlowOutput(logger=self.logger),
+            SlowOutput(logger=self.logger),
+            CPUBoundOutput(logger=NullLogger()),
+        ]
+
+        start = time.perf_counter()
+        errors = OutputExecutor(logger=self.logger).run(
+            outputs, self.data, self.save_path
+        )
+
+        assert errors == {}
+        assert time.perf_counter() - start < 0.8
+        assert self._pid(outputs[0]) == os.getpid()
+        assert self._pid(outputs[2]) != os.getpid()
+
+    def test_failed_output_does_not_block_others(self) -> None:
+        outputs: list[DataOutput] = [
+            FailingOutput(logger=self.logger),
+            SlowOutput(logger=self.logger),
+        ]
+
+        errors = OutputExecutor(logger=self.logger).run(
+            outputs, self.data, self.save_path
+        )
+
+        assert list(errors) == [0]
+        assert isinstance(errors[0], ValueError)
+        assert os.path.exists(f"{self.save_path}/SlowOutput")
+        self.logger.error.assert_called_once()
+
+    def test_outputs_profiled(self) -> None:
+        profiler = StageProfiler(logger=NullLogger())
+        outputs: list[DataOutput] = [
+            SlowOutput(logger=self.logger),
+            CPUBoundOutput(logger=NullLogger()),
+        ]
+
+        OutputExecutor(logger=self.logger, profiler=profiler).run(
+            outputs, self.data, self.save_path
+        )
+
+        assert sorted(
+            (stage["output"], stage["pid"] == os.getpid())
+            for stage in profiler.stages
+        ) == [("CPUBoundOutput", False), ("SlowOutput", True)]
+        assert all(stage["rows"] == 2 for stage in profiler.stages)
+        assert all(stage["wall_seconds"] >= 0.3 for stage in profiler.stages)
+
+    def test_started_processes_shared_by_runs_in_threads(self) -> None:
+        outputs: list[DataOutput] = [
+            SlowOutput(logger=self.logger),
+            CPUBoundOutput(logger=NullLogger()),
+        ]
+        executor = OutputExecutor(logger=self.logger)
+        executor.start(outputs)
+        self.addCleanup(executor.shutdown)
+        pids = []
+
+        def run() -> None:
+            assert executor.run(outputs, self.data, self.save_path) == {}
+
+            pids.append(self._pid(outputs[1]))
+
+        with mock.patch.object(
+            output_executor, "ProcessPoolExecutor"
+        ) as process_pool:
+            for _ in range(2):
+                thread = threading.Thread(target=run)
+                thread.start()
+                thread.join()
+
+        process_pool.assert_not_called()
+        assert len(set(pids)) == 1
+        assert pids[0] != os.getpid()
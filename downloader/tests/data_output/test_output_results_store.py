@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.output_results_store import ResultsStoreOutput
+from downloader.data_output.results_store import ResultsStore
+from downloader.logger.logger import JSONLogger
+
+DATA = pd.DataFrame(
+    {
+        "category_id": [24, 10],
+        "views": [2.5, 1.0001],
+        "id": [24, 10],
+        "snippet.title": ["Entertainment", "Music"],
+    }
+)
+
+
+class TestResultsStoreOutput(unittest.TestCase):
+
+    def test_generate(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store_path = f"{directory}/results.sqlite3"
+            output = ResultsStoreOutput(
+                store_path=store_path,
+                owner="owner",
+                dataset="dataset",
+                version="1",
+                country="GB",
+                name="views_to_categories",
+                keys=["category_id", "snippet.title"],
+                metrics=["views"],
+                logger=mock.MagicMock(spec=JSONLogger),
+            )
+
+            output.generate(DATA, directory)
+
+            assert output.output_files(directory) == []
+            assert (
+                ResultsStore(
+                    store_path=store_path,
+                    logger=mock.MagicMock(spec=JSONLogger),
+                ).load("owner", "dataset", "1", "GB", "views_to_categories")
+                is not None
+            )
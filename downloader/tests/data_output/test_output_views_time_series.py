@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.output_views_time_series import (
+    ViewsTimeSeriesJSON,
+    ViewsTimeSeriesLineChart,
+)
+from downloader.logger.logger import JSONLogger
+
+DATA = pd.DataFrame(
+    {
+        "trending_date": pd.to_datetime(
+            ["2017-11-14", "2017-11-14", "2017-11-15"]
+        ),
+        "category_id": [10, 24, 10],
+        "views": [0.0001, 2.5, 1.0],
+        "id": [10, 24, 10],
+        "snippet.title": ["Music", "Entertainment", "Music"],
+    }
+)
+
+
+class TestViewsTimeSeriesLineChart(unittest.TestCase):
+
+    def test_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            output = ViewsTimeSeriesLineChart(
+                logger=mock.MagicMock(spec=JSONLogger),
+                formats=["png", "svg"],
+            )
+
+            output.generate(DATA, directory)
+
+            assert output.output_files(directory) == [
+                f"{directory}/views_time_series_line_chart.png",
+                f"{directory}/views_time_series_line_chart.svg",
+            ]
+            assert all(map(os.path.exists, output.output_files(directory)))
+
+
+class TestViewsTimeSeriesJSON(unittest.TestCase):
+
+    def test_generate(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            output = ViewsTimeSeriesJSON(
+                logger=mock.MagicMock(spec=JSONLogger)
+            )
+
+            output.generate(DATA, directory)
+
+            with open(output.output_files(directory)[0]) as f:
+                assert json.load(f) == [
+                    {
+                        "trending_date": "2017-11-14",
+                        "category_id": 10,
+                        "snippet.title": "Music",
+                        "views": 0.0001,
+                    },
+                    {
+                        "trending_date": "2017-11-14",
+                        "category_id": 24,
+                        "snippet.title": "Entertainment",
+                        "views": 2.5,
+                    },
+                    {
+                        "trending_date": "2017-11-15",
+                        "category_id": 10,
+                        "snippet.title": "Music",
+                        "views": 1.0,
+                    },
+                ]
@@ -1,7 +1,80 @@
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.output_views_to_categories import (
+    ViewsToCategoriesBarChart,
+    ViewsToCategoriesJSON,
+)
+from downloader.logger.logger import JSONLogger
+
+DATA = pd.DataFrame(
+    {
+        "category_id": [24, 10],
+        "views": [2.5, 1.0001],
+        "id": [24, 10],
+        "snippet.title": ["Entertainment", "Music"],
+    }
+)
 
 
 class TestViewsToCategoriesBarChart(unittest.TestCase):
 
     def test_initial(self):
         assert True is True
+
+    def test_formats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = ViewsToCategoriesBarChart(
+                logger=mock.MagicMock(spec=JSONLogger),
+                formats=["png", "thumbnail"],
+            )
+
+            output.generate(DATA, directory)
+
+            assert output.output_files(directory) == [
+                f"{directory}/views_to_categories_bar_chart.png",
+                f"{directory}/views_to_categories_bar_chart_thumbnail.png",
+            ]
+            assert all(map(os.path.exists, output.output_files(directory)))
+
+
+class TestViewsToCategoriesJSON(unittest.TestCase):
+
+    def test_generate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = ViewsToCategoriesJSON(
+                logger=mock.MagicMock(spec=JSONLogger)
+            )
+
+            output.generate(DATA, directory)
+
+            with open(output.output_files(directory)[0]) as f:
+                assert json.load(f) == DATA.to_dict(orient="records")
+
+    def test_compressed_ndjson(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = ViewsToCategoriesJSON(
+                logger=mock.MagicMock(spec=JSONLogger),
+                json_format="ndjson",
+                compression="gzip",
+            )
+
+            output.generate(DATA, directory)
+
+            assert output.output_files(directory) == [
+                f"{directory}/views_to_categories.ndjson.gz"
+            ]
+            assert os.listdir(directory) == ["views_to_categories.ndjson.gz"]
+            pd.testing.assert_frame_equal(
+                pd.read_json(
+                    output.output_files(directory)[0],
+                    lines=True,
+                    compression="gzip",
+                ),
+                DATA,
+            )
@@ -0,0 +1,160 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.results_store import ResultsStore, records
+from downloader.logger.logger import JSONLogger
+
+VERSION_1 = pd.DataFrame(
+    {
+        "category_id": [24, 10],
+        "views": [2.5, 1.0001],
+        "id": [24, 10],
+        "snippet.title": ["Entertainment", "Music"],
+    }
+)
+VERSION_2 = pd.DataFrame(
+    {
+        "category_id": [24, 99],
+        "views": [3.0, 7.0],
+        "id": [24, 99],
+        "snippet.title": ["Entertainment", "Other"],
+    }
+)
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.store = ResultsStore(
+            store_path=f"{temp_dir.name}/store/results.sqlite3",
+            logger=mock.MagicMock(spec=JSONLogger),
+        )
+
+    def write(self, version: str, data: pd.DataFrame) -> None:
+        self.store.write(
+            owner="owner",
+            dataset="dataset",
+            version=version,
+            country="GB",
+            name="views_to_categories",
+            data=data,
+            keys=["category_id", "snippet.title"],
+            metrics=["views"],
+        )
+
+    def test_missing_store(self) -> None:
+        assert (
+            self.store.load(
+                "owner", "dataset", "1", "GB", "views_to_categories"
+            )
+            is None
+        )
+        assert self.store.results("owner", "dataset").empty
+
+    def test_write_and_load(self) -> None:
+        self.write("1", VERSION_1)
+        self.write("2", VERSION_1)
+        self.write("2", VERSION_2)
+
+        loaded = self.store.load(
+            "owner", "dataset", "2", "GB", "views_to_categories"
+        )
+
+        assert loaded is not None
+        pd.testing.assert_frame_equal(
+            loaded, VERSION_2[["category_id", "snippet.title", "views"]]
+        )
+        assert self.store.load("owner", "dataset", "2", "US", "views") is None
+        assert records(
+            self.store.results("owner", "dataset").drop(columns="written_at")
+        ) == [
+            {
+                "version": "1",
+                "country": "GB",
+                "name": "views_to_categories",
+                "rows": 2,
+            },
+            {
+                "version": "2",
+                "country": "GB",
+                "name": "views_to_categories",
+                "rows": 2,
+            },
+        ]
+
+    def test_strings_and_dates_kept(self) -> None:
+        self.store.write(
+            owner="owner",
+            dataset="dataset",
+            version="1",
+            country="GB",
+            name="views_time_series",
+            data=pd.DataFrame(
+                {
+                    "trending_date": pd.to_datetime(["2017-11-14"]),
+                    "channel_title": ["0123"],
+                    "views": [5],
+                }
+            ),
+            keys=["trending_date", "channel_title"],
+            metrics=["views"],
+        )
+
+        loaded = self.store.load(
+            "owner", "dataset", "1", "GB", "views_time_series"
+        )
+
+        assert loaded is not None
+        assert records(loaded) == [
+            {
+                "trending_date": "2017-11-14",
+                "channel_title": "0123",
+                "views": 5,
+            }
+        ]
+
+    def test_diff(self) -> None:
+        self.write("1", VERSION_1)
+
+        assert (
+            self.store.diff(
+                "owner", "dataset", "1", "2", "GB", "views_to_categories"
+            )
+            is None
+        )
+
+        self.write("2", VERSION_2)
+
+        diff = self.store.diff(
+            "owner", "dataset", "1", "2", "GB", "views_to_categories"
+        )
+
+        assert diff is not None
+        assert records(diff) == [
+            {
+                "category_id": 99,
+                "snippet.title": "Other",
+                "views_from": None,
+                "views_to": 7.0,
+                "views_change": 7.0,
+            },
+            {
+                "category_id": 10,
+                "snippet.title": "Music",
+                "views_from": 1.0001,
+                "views_to": None,
+                "views_change": -1.0001,
+            },
+            {
+                "category_id": 24,
+                "snippet.title": "Entertainment",
+                "views_from": 2.5,
+                "views_to": 3.0,
+                "views_change": 0.5,
+            },
+        ]
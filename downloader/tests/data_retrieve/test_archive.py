@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from downloader.data_retrieve.archive import (
+    extract,
+    locate,
+    open_file,
+    split_archive_path,
+    stored_path,
+)
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        with open(f"{self.directory}/plain.csv", "w") as f:
+            f.write("plain")
+
+        with zipfile.ZipFile(f"{self.directory}/single.csv.zip", "w") as z:
+            z.writestr("single.csv", "single")
+
+        with zipfile.ZipFile(f"{self.directory}/dataset.zip", "w") as z:
+            z.writestr("member.csv", "member")
+
+    def test_split_archive_path(self) -> None:
+        archive_path = f"{self.directory}/dataset.zip"
+
+        assert split_archive_path(f"{archive_path}/member.csv") == (
+            archive_path,
+            "member.csv",
+        )
+        assert split_archive_path(f"{self.directory}/plain.csv") is None
+        assert split_archive_path(f"{self.directory}/missing.zip/a") is None
+
+    def test_locate(self) -> None:
+        assert locate(self.directory, "plain.csv") == (
+            f"{self.directory}/plain.csv"
+        )
+        assert locate(self.directory, "single.csv") == (
+            f"{self.directory}/single.csv.zip/single.csv"
+        )
+        assert locate(self.directory, "member.csv") == (
+            f"{self.directory}/dataset.zip/member.csv"
+        )
+        assert locate(self.directory, "missing.csv") is None
+
+    def test_open_file(self) -> None:
+        for file_name in ["plain.csv", "single.csv", "member.csv"]:
+            file_path = locate(self.directory, file_name)
+
+            with open_file(str(file_path)) as f:
+                assert f.read() == file_name.split(".")[0].encode()
+
+    def test_stored_path(self) -> None:
+        file_path = str(locate(self.directory, "member.csv"))
+
+        assert os.path.basename(stored_path(file_path)) == "dataset.zip"
+
+    def test_extract(self) -> None:
+        archive_path = f"{self.directory}/dataset.zip"
+
+        assert extract(archive_path, "member.csv", self.directory) == (
+            f"{self.directory}/member.csv"
+        )
+
+        with open(f"{self.directory}/member.csv") as f:
+            assert f.read() == "member"
+
+        with open(archive_path, "rb") as f:
+            data = f.read()
+
+        with open(archive_path, "wb") as f:
+            f.write(data.replace(b".csvmemberPK", b".csvmEmberPK"))
+
+        with self.assertRaises(zipfile.BadZipFile):
+            extract(archive_path, "member.csv", self.directory)
+
+        with open(f"{self.directory}/member.csv") as f:
+            assert f.read() == "member"
+
+        assert sorted(os.listdir(self.directory)) == [
+            "dataset.zip",
+            "member.csv",
+            "plain.csv",
+            "single.csv.zip",
+        ]
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from downloader.data_retrieve import kaggle_retrieve
+from downloader.data_retrieve.download_cache import DownloadCache
+from downloader.data_retrieve.kaggle_retrieve import KaggleRetrieve
+from downloader.data_retrieve.manifest import Manifest
+from downloader.logger.logger import JSONLogger
+from downloader.tests.data_retrieve.test_kaggle_retrieve import (
+    FILE_NAMES,
+    REMOTE_PATH,
+    stub_api,
+)
+
+
+class TestDownloadCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.cache = DownloadCache(
+            cache_path=f"{self.directory}/cache", logger=self.logger
+        )
+
+    def get(
+        self, api: mock.MagicMock, version: str | None, save_name: str
+    ) -> bool:
+        os.makedirs(f"{self.directory}/{save_name}", exist_ok=True)
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            return self.cache.get(
+                KaggleRetrieve(logger=self.logger, version=version),
+                REMOTE_PATH,
+                f"{self.directory}/{save_name}",
+                FILE_NAMES,
+            )
+
+    def test_version_restored_from_store(self) -> None:
+        api = stub_api()
+
+        assert self.get(api, "115", "first")
+        assert self.get(api, "115", "second")
+        assert api.dataset_list.call_count == 1
+        assert api.dataset_download_file.call_count == len(FILE_NAMES)
+
+        for file_name in FILE_NAMES:
+            assert os.path.samefile(
+                f"{self.directory}/first/{file_name}",
+                f"{self.directory}/second/{file_name}",
+            )
+
+        manifest = Manifest.load(f"{self.directory}/second")
+
+        assert manifest is not None
+        assert manifest.version == "115"
+        assert manifest.verify(f"{self.directory}/second")
+
+    def test_pinned_versions_downloaded(self) -> None:
+        api = stub_api(116)
+
+        for version in ["114", "115", "114"]:
+            assert self.get(api, version, version)
+
+        assert [
+            call.args[0] for call in api.dataset_download_file.call_args_list
+        ] == [f"{REMOTE_PATH}/114"] * 2 + [f"{REMOTE_PATH}/115"] * 2
+
+        for version in ["114", "115"]:
+            manifest = Manifest.load(f"{self.directory}/{version}")
+
+            assert manifest is not None
+            assert manifest.version == version
+
+            with open(f"{self.directory}/{version}/GBvideos.csv") as f:
+                assert f.read() == f"GBvideos.csv version {version}"
+
+    def test_missing_file_downloaded_again(self) -> None:
+        api = stub_api()
+
+        assert self.get(api, "115", "first")
+
+        for root, _, file_names in os.walk(f"{self.directory}/cache/objects"):
+            for file_name in file_names:
+                os.remove(f"{root}/{file_name}")
+
+        assert self.get(api, "115", "second")
+        assert api.dataset_download_file.call_count == 2 * len(FILE_NAMES)
+
+    def test_unknown_version_not_cached(self) -> None:
+        api = stub_api()
+        api.dataset_list.return_value = []
+
+        assert self.get(api, None, "first")
+        assert self.get(api, None, "second")
+        assert api.dataset_download_file.call_count == 2 * len(FILE_NAMES)
+        assert not os.path.exists(f"{self.directory}/cache")
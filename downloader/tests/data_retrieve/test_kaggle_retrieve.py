@@ -0,0 +1,304 @@
+import datetime
+import io
+import os
+import tempfile
+import types
+import unittest
+import zipfile
+from unittest import mock
+
+from downloader.data_retrieve import kaggle_retrieve
+from downloader.data_retrieve.kaggle_retrieve import KaggleRetrieve
+from downloader.data_retrieve.manifest import MANIFEST_FILE_NAME, Manifest
+from downloader.data_retrieve.resumable_download import ResumableDownload
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import FileServer
+
+REMOTE_PATH = "datasnaek/youtube-new"
+FILE_NAMES = ["GBvideos.csv", "GB_category_id.json"]
+
+
+def stub_api(version: int = 115) -> mock.MagicMock:
+    api = mock.MagicMock()
+    api.dataset_list.return_value = [
+        types.SimpleNamespace(
+            ref=REMOTE_PATH,
+            current_version_number=version,
+            last_updated=datetime.datetime(2019, 6, 3),
+        )
+    ]
+
+    # A reference without a version downloads the current version.
+    def download_file(
+        reference: str, file_name: str, path: str, **kwargs: bool
+    ) -> None:
+        _, _, reference_version = reference.partition(f"{REMOTE_PATH}/")
+
+        with open(f"{path}/{file_name}", "w") as f:
+            f.write(f"{file_name} version {reference_version or version}")
+
+    def download_files(reference: str, save_path: str, unzip: bool) -> None:
+        _, _, reference_version = reference.partition(f"{REMOTE_PATH}/")
+
+        with zipfile.ZipFile(
+            f"{save_path}/{REMOTE_PATH.partition('/')[2]}.zip", "w"
+        ) as archive:
+            for file_name in FILE_NAMES + ["USvideos.csv"]:
+                archive.writestr(
+                    file_name,
+                    f"{file_name} version {reference_version or version}",
+                )
+
+    api.dataset_download_file.side_effect = download_file
+    api.dataset_download_files.side_effect = download_files
+
+    return api
+
+
+class TestKaggleRetrieve(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.save_path = temp_dir.name
+        self.retrieve = KaggleRetrieve(logger=mock.MagicMock(spec=JSONLogger))
+
+    def test_download_writes_manifest(self) -> None:
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=stub_api()
+        ):
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        manifest = Manifest.load(self.save_path)
+
+        assert manifest is not None
+        assert manifest.version == "115"
+        assert sorted(manifest.files) == sorted(FILE_NAMES)
+        assert manifest.verify(self.save_path)
+
+    def test_current_copy_skips_download(self) -> None:
+        api = stub_api()
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_download_file.call_count == len(FILE_NAMES)
+
+    def test_pinned_version_skips_remote(self) -> None:
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=stub_api()
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        self.retrieve.version = "115"
+
+        with mock.patch.object(kaggle_retrieve, "kaggle_api") as kaggle_api:
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        kaggle_api.assert_not_called()
+
+    def test_other_pinned_version_downloaded(self) -> None:
+        api = stub_api()
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+            self.retrieve.version = "114"
+
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_list.call_count == 2
+        assert [
+            call.args[0] for call in api.dataset_download_file.call_args_list
+        ] == [f"{REMOTE_PATH}/115"] * 2 + [f"{REMOTE_PATH}/114"] * 2
+        assert Manifest.load(self.save_path).version == "114"  # type: ignore
+
+        with open(f"{self.save_path}/GBvideos.csv") as f:
+            assert f.read() == "GBvideos.csv version 114"
+
+    def test_new_remote_version_downloads(self) -> None:
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=stub_api(115)
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        api = stub_api(116)
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_download_file.call_count == len(FILE_NAMES)
+        assert Manifest.load(self.save_path).version == "116"  # type: ignore
+
+    def test_damaged_copy_downloads(self) -> None:
+        api = stub_api()
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+            with open(f"{self.save_path}/GBvideos.csv", "w") as f:
+                f.write("truncated")
+
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_download_file.call_count == 2 * len(FILE_NAMES)
+
+    def test_unknown_remote_version_downloads(self) -> None:
+        api = stub_api()
+        api.dataset_list.side_effect = Exception("network unavailable")
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_download_file.call_count == 2 * len(FILE_NAMES)
+
+    def test_missing_file_does_not_write_manifest(self) -> None:
+        api = stub_api()
+        api.dataset_download_file.side_effect = None
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert not self.retrieve.get(
+                REMOTE_PATH, self.save_path, FILE_NAMES
+            )
+
+        assert not os.path.exists(f"{self.save_path}/{MANIFEST_FILE_NAME}")
+
+    def test_only_requested_files_downloaded(self) -> None:
+        api = stub_api()
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        api.dataset_download_files.assert_not_called()
+        assert not os.path.exists(f"{self.save_path}/USvideos.csv")
+
+    def test_compressed_file_extracted(self) -> None:
+        api = stub_api()
+
+        def download_file(
+            remote_path: str, file_name: str, path: str, **kwargs: bool
+        ) -> None:
+            with zipfile.ZipFile(f"{path}/{file_name}.zip", "w") as archive:
+                archive.writestr(file_name, file_name)
+
+        api.dataset_download_file.side_effect = download_file
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert os.listdir(self.save_path).count("GBvideos.csv.zip") == 0
+
+        with open(f"{self.save_path}/GBvideos.csv") as f:
+            assert f.read() == "GBvideos.csv"
+
+    def test_per_file_failure_falls_back_to_archive(self) -> None:
+        api = stub_api()
+        api.dataset_download_file.side_effect = Exception("unsupported")
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert self.retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        api.dataset_download_files.assert_called_once_with(
+            f"{REMOTE_PATH}/115", self.save_path, unzip=False
+        )
+        assert sorted(os.listdir(self.save_path)) == sorted(
+            FILE_NAMES + [MANIFEST_FILE_NAME]
+        )
+
+        with open(f"{self.save_path}/GBvideos.csv") as f:
+            assert f.read() == "GBvideos.csv version 115"
+
+    def test_compressed_file_kept_when_not_extracting(self) -> None:
+        api = stub_api()
+        retrieve = KaggleRetrieve(
+            logger=mock.MagicMock(spec=JSONLogger), extract=False
+        )
+
+        def download_file(
+            remote_path: str, file_name: str, path: str, **kwargs: bool
+        ) -> None:
+            with zipfile.ZipFile(f"{path}/{file_name}.zip", "w") as archive:
+                archive.writestr(file_name, file_name)
+
+        api.dataset_download_file.side_effect = download_file
+
+        with mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            assert retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+            assert retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        assert api.dataset_download_file.call_count == len(FILE_NAMES)
+        assert not os.path.exists(f"{self.save_path}/GBvideos.csv")
+        assert sorted(Manifest.load(self.save_path).files) == [  # type: ignore
+            "GB_category_id.json.zip",
+            "GBvideos.csv.zip",
+        ]
+
+    def test_resumable_download(self) -> None:
+        api = stub_api()
+        api.get_config_value.side_effect = {"username": "u", "key": "k"}.get
+        archive = io.BytesIO()
+        retrieve = KaggleRetrieve(
+            logger=mock.MagicMock(spec=JSONLogger),
+            max_workers=1,
+            downloader=ResumableDownload(
+                backoff=0,
+                chunk_bytes=4096,
+                logger=mock.MagicMock(spec=JSONLogger),
+            ),
+        )
+
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("GBvideos.csv", os.urandom(100_000))
+
+        with FileServer(
+            {
+                "/files/GBvideos.csv.zip": archive.getvalue(),
+                f"/{REMOTE_PATH}/GB_category_id.json"
+                "?datasetVersionNumber=115": b"{}",
+            }
+        ) as server, mock.patch.object(
+            kaggle_retrieve, "KAGGLE_DOWNLOAD_URL", server.url
+        ), mock.patch.object(
+            kaggle_retrieve, "kaggle_api", return_value=api
+        ):
+            server.redirects = {
+                f"/{REMOTE_PATH}/GBvideos.csv?datasetVersionNumber=115": (
+                    "/files/GBvideos.csv.zip"
+                )
+            }
+            server.faults = ["drop"]
+
+            assert retrieve.get(REMOTE_PATH, self.save_path, FILE_NAMES)
+
+        api.dataset_download_file.assert_not_called()
+        assert [
+            request["range"] is not None for request in server.requests
+        ] == [False, False, True, True, False]
+        assert sorted(os.listdir(self.save_path)) == sorted(
+            [MANIFEST_FILE_NAME] + FILE_NAMES
+        )
+        assert Manifest.load(self.save_path).verify(  # type: ignore
+            self.save_path
+        )
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from downloader.data_retrieve.resumable_download import ResumableDownload
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import FileServer
+
+BODY = bytes(range(256)) * 1024
+
+
+class TestResumableDownload(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+        self.downloader = ResumableDownload(
+            retries=2,
+            backoff=0,
+            chunk_bytes=4096,
+            timeout=5,
+            logger=mock.MagicMock(spec=JSONLogger),
+        )
+        self.server = FileServer({"/files/GBvideos.csv": BODY})
+        self.enterContext(self.server)
+
+    def download(self) -> str:
+        return self.downloader.download(
+            f"{self.server.url}/files/GBvideos.csv",
+            self.directory,
+            "GBvideos.csv",
+            auth=("user", "key"),
+        )
+
+    def read(self, file_path: str) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def test_interrupted_download_resumed(self) -> None:
+        self.server.faults = ["drop", "error"]
+
+        file_path = self.download()
+
+        assert file_path == f"{self.directory}/GBvideos.csv"
+        assert self.read(file_path) == BODY
+        assert os.listdir(self.directory) == ["GBvideos.csv"]
+        assert [request["range"] for request in self.server.requests] == [
+            None,
+            f"bytes={len(BODY) // 2}-",
+            f"bytes={len(BODY) // 2}-",
+        ]
+        assert all(
+            str(request["authorization"]).startswith("Basic ")
+            for request in self.server.requests
+        )
+
+    def test_partial_file_of_earlier_run_resumed(self) -> None:
+        etag = f'"{hashlib.md5(BODY).hexdigest()}"'
+
+        with open(f"{self.directory}/GBvideos.csv.partial", "wb") as f:
+            f.write(BODY[:1000])
+
+        with open(
+            f"{self.directory}/GBvideos.csv.partial.validator", "w"
+        ) as f:
+            f.write(etag)
+
+        assert self.read(self.download()) == BODY
+        assert [
+            (request["range"], request["if_range"])
+            for request in self.server.requests
+        ] == [("bytes=1000-", etag)]
+
+        with open(f"{self.directory}/GBvideos.csv.partial", "wb") as f:
+            f.write(b"x" * 1000)
+
+        assert self.read(self.download()) == BODY
+        assert self.server.requests[-1]["range"] is None
+
+    def test_changed_file_downloaded_again(self) -> None:
+        self.server.faults = ["drop", "drop", "drop"]
+
+        with self.assertRaises(requests.RequestException):
+            self.download()
+
+        changed = BODY[::-1]
+        self.server.files["/files/GBvideos.csv"] = changed
+        self.server.hashes = False
+
+        assert self.read(self.download()) == changed
+        assert self.server.requests[-1]["if_range"] is not None
+        assert os.listdir(self.directory) == ["GBvideos.csv"]
+
+    def test_corrupt_download_discarded(self) -> None:
+        self.server.faults = ["corrupt"]
+
+        assert self.read(self.download()) == BODY
+        assert [request["range"] for request in self.server.requests] == [
+            None,
+            None,
+        ]
+
+        os.remove(f"{self.directory}/GBvideos.csv")
+        self.server.faults = ["corrupt"] * 3
+
+        with self.assertRaisesRegex(ValueError, "MD5"):
+            self.download()
+
+        assert os.listdir(self.directory) == []
+
+    def test_client_error_not_retried(self) -> None:
+        with self.assertRaises(requests.HTTPError):
+            self.downloader.download(
+                f"{self.server.url}/files/missing.csv",
+                self.directory,
+                "missing.csv",
+            )
+
+        assert len(self.server.requests) == 1
+
+    def test_retries_exhausted(self) -> None:
+        self.server.faults = ["drop", "drop", "drop"]
+
+        with self.assertRaises(requests.RequestException):
+            self.download()
+
+        assert len(self.server.requests) == 3
+        assert os.path.getsize(f"{self.directory}/GBvideos.csv.partial") < len(
+            BODY
+        )
+        assert self.read(self.download()) == BODY
@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import http.server
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from downloader.logger.logger import JSONLogger
+
+ROOT_PATH = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+VIDEOS_CSV = (
+    "video_id,trending_date,title,category_id,views,likes\n"
+    'a1,17.14.11,"Title, one",10,100,1\n'
+    "b2,17.14.11,Title two,24,2500000,2\n"
+    "a1,17.15.11,Title one,10,1000000,3\n"
+    "c3,17.15.11,Title three,99,50,4\n"
+)
+
+CATEGORIES_JSON = {
+    "items": [
+        {"id": "10", "snippet": {"title": "Music"}},
+        {"id": "24", "snippet": {"title": "Entertainment"}},
+    ]
+}
+
+
+def write_fixtures(directory: str) -> None:
+    with open(f"{directory}/GBvideos.csv", "w") as f:
+        f.write(VIDEOS_CSV)
+
+    with open(f"{directory}/GB_category_id.json", "w") as f:
+        json.dump(CATEGORIES_JSON, f)
+
+
+class NullLogger(JSONLogger):
+    """
+    A `JSONLogger` that discards every record. Unlike a mock it can be
+    pickled, so it can be given to objects sent to worker processes.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.logger = logging.getLogger("NullLogger")
+        self.logger.propagate = False
+
+        if not self.logger.handlers:
+            self.logger.addHandler(logging.NullHandler())
+
+
+class FileServer(http.server.ThreadingHTTPServer):
+    """
+    A local HTTP server standing in for a download endpoint, serving
+    `files` by path with range requests, honouring If-Range, an entity tag
+    and, unless `hashes` is unset, the MD5 digest of each file in an
+    "x-goog-hash" header. Paths in `redirects` are redirected to another
+    path, as Kaggle redirects downloads to storage.
+
+    Each request takes the next of `faults`, if any: "drop" closes the
+    connection halfway through the body, "corrupt" changes the first byte
+    of the body and "error" responds 503. Requests are recorded in
+    `requests`.
+    """
+
+    def __init__(self, files: dict[str, bytes]) -> None:
+        super().__init__(("127.0.0.1", 0), FileRequestHandler)
+
+        self.files = files
+        self.redirects: dict[str, str] = {}
+        self.faults: list[str] = []
+        self.hashes = True
+        self.requests: list[dict[str, str | None]] = []
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> "FileServer":
+        threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class FileRequestHandler(http.server.BaseHTTPRequestHandler):
+    server: FileServer
+
+    def do_GET(self) -> None:
+        self.server.requests.append(
+            {
+                "path": self.path,
+                "range": self.headers.get("Range"),
+                "if_range": self.headers.get("If-Range"),
+                "authorization": self.headers.get("Authorization"),
+            }
+        )
+
+        if self.path in self.server.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirects[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return
+
+        body = self.server.files.get(self.path)
+        fault = self.server.faults.pop(0) if self.server.faults else None
+
+        if body is None or fault == "error":
+            self.send_error(404 if body is None else 503)
+
+            return
+
+        digest = hashlib.md5(body).digest()
+        etag = f'"{digest.hex()}"'
+        start = int(self.headers.get("Range", "bytes=0-")[6:].split("-")[0])
+
+        if self.headers.get("If-Range", etag) != etag:
+            start = 0
+
+        if start >= len(body):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(body)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+            return
+
+        payload = body[start:]
+
+        if fault == "corrupt":
+            payload = bytes([payload[0] ^ 1]) + payload[1:]
+
+        self.send_response(206 if start else 200)
+
+        if start:
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+
+        if self.server.hashes:
+            self.send_header(
+                "x-goog-hash",
+                "crc32c=AAAAAA==,md5=" + base64.b64encode(digest).decode(),
+            )
+
+        self.end_headers()
+
+        if fault == "drop":
+            self.wfile.write(payload[: len(payload) // 2])
+            self.close_connection = True
+        else:
+            self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        pass
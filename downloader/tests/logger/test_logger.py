@@ -0,0 +1,150 @@
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from downloader.logger.handlers import RotatingJSONFileHandler
+from downloader.logger.logger import JSONLogger
+
+
+class TestJSONLogger(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_name = f"{temp_dir.name}/logs.json"
+
+    def read_records(self, file_name: str) -> list[dict[str, object]]:
+        opener = gzip.open if file_name.endswith(".gz") else open
+
+        with opener(file_name, "rt") as f:
+            return [json.loads(line) for line in f]
+
+    def test_queued_close_writes_all_records(self) -> None:
+        logger = JSONLogger(self.file_name, name=self.id(), queued=True)
+        self.addCleanup(logger.close)
+
+        for index in range(1000):
+            logger.info("Chunk processed.", index=index)
+
+        logger.close()
+
+        records = self.read_records(self.file_name)
+
+        assert [record["extra"] for record in records] == [
+            {"index": index} for index in range(1000)
+        ]
+        assert records[0]["funcName"] == "test_queued_close_writes_all_records"
+        assert not logging.getLogger(self.id()).handlers
+
+    def test_rotation_by_size_compressed(self) -> None:
+        logger = JSONLogger(
+            self.file_name,
+            name=self.id(),
+            queued=True,
+            max_bytes=1024,
+            backup_count=2,
+            compress=True,
+        )
+        self.addCleanup(logger.close)
+
+        for index in range(100):
+            logger.info("Chunk processed.", index=index)
+
+        logger.close()
+
+        assert sorted(os.listdir(os.path.dirname(self.file_name))) == [
+            "logs.json",
+            "logs.json.1.gz",
+            "logs.json.2.gz",
+        ]
+        assert os.path.getsize(self.file_name) <= 1024
+
+        newest = self.read_records(self.file_name)
+        rotated = self.read_records(f"{self.file_name}.1.gz")
+
+        assert rotated[-1]["extra"] == {"index": 99 - len(newest)}
+
+    def test_rotation_by_age(self) -> None:
+        handler = RotatingJSONFileHandler(
+            self.file_name, rotate_interval=3600, backup_count=1
+        )
+        self.addCleanup(handler.close)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        record = logging.makeLogRecord({"msg": "first"})
+
+        handler.emit_batch([record])
+        handler.rollover_at = 0
+        handler.emit_batch([logging.makeLogRecord({"msg": "second"})])
+
+        with open(f"{self.file_name}.1") as f:
+            assert f.read() == "first\n"
+
+        with open(self.file_name) as f:
+            assert f.read() == "second\n"
+
+        assert handler.rollover_at > 0
+
+    def test_forked_child_logs_through_parent(self) -> None:
+        logger = JSONLogger(self.file_name, name=self.id(), queued=True)
+        self.addCleanup(logger.close)
+
+        process = multiprocessing.get_context("fork").Process(
+            target=logger.info, args=("Logged in child.",)
+        )
+        process.start()
+        process.join()
+
+        logger.close()
+
+        assert [
+            record["message"] for record in self.read_records(self.file_name)
+        ] == ["Logged in child."]
+
+    def test_forked_children_kept_by_compressed_rotation(self) -> None:
+        logger = JSONLogger(
+            self.file_name,
+            name=self.id(),
+            queued=True,
+            max_bytes=1024,
+            backup_count=100,
+            compress=True,
+        )
+        self.addCleanup(logger.close)
+
+        def log(source: int) -> None:
+            for index in range(50):
+                logger.info("Chunk processed.", source=source, index=index)
+
+        processes = [
+            multiprocessing.get_context("fork").Process(
+                target=log, args=(source,)
+            )
+            for source in range(1, 3)
+        ]
+
+        for process in processes:
+            process.start()
+
+        log(0)
+
+        for process in processes:
+            process.join()
+
+        logger.close()
+
+        directory = os.path.dirname(self.file_name)
+        records = [
+            record["extra"]
+            for file_name in os.listdir(directory)
+            for record in self.read_records(f"{directory}/{file_name}")
+        ]
+
+        assert len(os.listdir(directory)) > 2
+        assert sorted(
+            (record["source"], record["index"])  # type: ignore[index]
+            for record in records
+        ) == [(source, index) for source in range(3) for index in range(50)]
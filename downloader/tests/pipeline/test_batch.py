@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from typing import Any
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.batch import BatchRunner, read_manifest
+
+
+class Runner:
+    """
+    Runs a country of a dataset version in a worker process, failing for
+    "FR" of version "3".
+    """
+
+    def __init__(self, version: str) -> None:
+        self.version = version
+
+    def __call__(self, country: str) -> dict[str, Any]:
+        if country == "FR" and self.version == "3":
+            raise ValueError("no data")
+
+        return {
+            "country": country,
+            "version": self.version,
+            "pid": os.getpid(),
+        }
+
+
+class TestReadManifest(unittest.TestCase):
+
+    def test_read_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = f"{directory}/manifest.txt"
+
+            with open(file_path, "w") as f:
+                f.write(
+                    "# backfill\n"
+                    "datasnaek/youtube-new/114\n"
+                    "\n"
+                    " datasnaek/youtube-new/115 \n"
+                    "datasnaek/youtube-new/114\n"
+                )
+
+            assert read_manifest(file_path) == [
+                ("datasnaek", "youtube-new", "114"),
+                ("datasnaek", "youtube-new", "115"),
+            ]
+
+            with open(file_path, "a") as f:
+                f.write("datasnaek/youtube-new\n")
+
+            with self.assertRaisesRegex(ValueError, "Line 6"):
+                read_manifest(file_path)
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_failures_do_not_stop_batch(self) -> None:
+        finish = mock.MagicMock(return_value=True)
+        items = [
+            ("owner", "dataset", "1"),
+            ("owner", "dataset", "2"),
+            ("owner", "dataset", "3"),
+        ]
+
+        summary = BatchRunner(
+            retrieve=lambda item: item[2] != "2",
+            runner=lambda item: Runner(item[2]),
+            finish=finish,
+            countries=["FR", "GB"],
+            download_workers=2,
+            workers=2,
+            logger=mock.MagicMock(spec=JSONLogger),
+        ).run(items)
+
+        assert summary["succeeded"] == 1
+        assert summary["failed"] == 2
+
+        succeeded, retrieve_failed, failed = summary["items"]
+
+        assert succeeded["dataset"] == "owner/dataset"
+        assert succeeded["version"] == "1"
+        assert succeeded["status"] == "succeeded"
+        assert succeeded["retrieve_seconds"] >= 0
+        assert succeeded["transform_seconds"] >= 0
+        assert retrieve_failed["status"] == "retrieve_failed"
+        assert retrieve_failed["transform_seconds"] is None
+        assert failed["status"] == "failed"
+        assert failed["failed_countries"] == ["FR"]
+        assert finish.call_count == 2
+
+        for call in finish.call_args_list:
+            item, results, profiler = call.args
+
+            assert sorted(results) == ["FR", "GB"]
+            assert [stage["stage"] for stage in profiler.stages] == [
+                "retrieve"
+            ]
+
+            if item == items[0]:
+                assert all(
+                    timings["pid"] != os.getpid()
+                    for timings in results.values()
+                )
+            else:
+                assert results["FR"] is None
@@ -0,0 +1,371 @@
+import gzip
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from downloader.data_output.results_store import ResultsStore
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.countries import (
+    CountryRunner,
+    run_countries,
+    run_top_k,
+)
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.tests.helpers import ROOT_PATH, NullLogger, write_fixtures
+
+
+@mock.patch("downloader.pipeline.countries.JSONLogger", NullLogger)
+class TestRunCountries(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+        self.save_path = f"{self.directory}/data"
+        self.output_save_path = f"{self.directory}/output"
+
+        os.makedirs(self.save_path)
+        write_fixtures(self.save_path)
+
+        for country in ["CA", "US"]:
+            shutil.copy(
+                f"{self.save_path}/GBvideos.csv",
+                f"{self.save_path}/{country}videos.csv",
+            )
+            shutil.copy(
+                f"{self.save_path}/GB_category_id.json",
+                f"{self.save_path}/{country}_category_id.json",
+            )
+
+        self.runner = CountryRunner(
+            save_path=self.save_path,
+            output_save_path=self.output_save_path,
+            log_file_name=f"{self.directory}/logs.json",
+            namespace="owner/dataset/1",
+        )
+        self.logger = mock.MagicMock(spec=JSONLogger)
+
+    def test_outputs_saved_per_country(self) -> None:
+        for workers in [1, 2]:
+            results = run_countries(
+                self.runner, ["CA", "GB", "US"], workers, self.logger
+            )
+
+            assert sorted(results) == ["CA", "GB", "US"]
+
+            for country, timings in results.items():
+                assert timings is not None
+                assert timings["transform_seconds"] >= 0
+                assert sorted(
+                    os.listdir(f"{self.output_save_path}/{country}")
+                ) == [
+                    "run_metrics.json",
+                    "views_to_categories.json",
+                    "views_to_categories_bar_chart.png",
+                ]
+
+    def test_failed_country_does_not_stop_others(self) -> None:
+        results = run_countries(self.runner, ["FR", "GB"], 2, self.logger)
+
+        assert results["FR"] is None
+        assert results["GB"] is not None
+        self.logger.error.assert_called_once()
+
+    def test_run_metrics_and_profile(self) -> None:
+        self.runner.profile = True
+
+        timings = self.runner("GB")
+
+        with open(f"{self.output_save_path}/GB/run_metrics.json") as f:
+            run_metrics = json.load(f)
+
+        assert run_metrics["country"] == "GB"
+        assert run_metrics["stages"] == timings["stages"]
+        assert sorted(
+            (stage["stage"], stage.get("output") or stage.get("node"))
+            for stage in run_metrics["stages"]
+        ) == [
+            ("node", "categories"),
+            ("node", "videos"),
+            ("node", "views_to_categories"),
+            ("output", "ViewsToCategoriesBarChart"),
+            ("output", "ViewsToCategoriesJSON"),
+            ("transform", None),
+        ]
+
+        transform_stage = run_metrics["stages"][-1]
+
+        assert transform_stage["rows"] == 4
+        assert transform_stage["wall_seconds"] > 0
+        assert transform_stage["peak_rss_bytes"] > 0
+        pstats.Stats(transform_stage["profile_path"])
+
+    def test_aggregations_share_inputs(self) -> None:
+        self.runner.aggregations = [
+            ("likes_per_video", ["video_id"], "likes", "sum"),
+            ("mean_views_per_category", ["category_id"], "views", "mean"),
+        ]
+
+        for chunk_size, rows in [(None, 4), (2, 8)]:
+            self.runner.chunk_size = chunk_size
+            stages = self.runner("GB")["stages"]
+
+            with open(
+                f"{self.output_save_path}/GB/likes_per_video/"
+                "likes_per_video.json"
+            ) as f:
+                assert json.load(f) == [
+                    {"video_id": "a1", "likes": 4},
+                    {"video_id": "c3", "likes": 4},
+                    {"video_id": "b2", "likes": 2},
+                ]
+
+            assert os.path.exists(
+                f"{self.output_save_path}/GB/mean_views_per_category/"
+                "mean_views_per_category.json"
+            )
+            assert stages[-1]["rows"] == rows
+
+            if not chunk_size:
+                assert sorted(
+                    stage["node"]
+                    for stage in stages
+                    if stage["stage"] == "node"
+                ) == [
+                    "aggregations",
+                    "categories",
+                    "videos",
+                    "views_to_categories",
+                ]
+
+    def test_time_series_appended_per_version(self) -> None:
+        self.runner.time_series = True
+
+        for chunk_size in [None, 2]:
+            self.runner.chunk_size = chunk_size
+            self.runner("GB")
+
+            assert sorted(os.listdir(f"{self.output_save_path}/GB")) == [
+                "run_metrics.json",
+                "views_time_series.json",
+                "views_time_series_line_chart.png",
+                "views_to_categories.json",
+                "views_to_categories_bar_chart.png",
+            ]
+
+            with open(
+                f"{self.output_save_path}/GB/views_time_series.json"
+            ) as f:
+                assert [
+                    record["trending_date"] for record in json.load(f)
+                ] == [
+                    "2017-11-14",
+                    "2017-11-14",
+                    "2017-11-15",
+                ]
+
+        assert sorted(os.listdir(f"{self.directory}/views_per_day/GB")) == [
+            "2017-11-14.pkl",
+            "2017-11-15.pkl",
+            "source.json",
+        ]
+
+    def test_time_series_store_shared_by_versions(self) -> None:
+        save_path = f"{self.directory}/data_2"
+
+        shutil.copytree(self.save_path, save_path)
+
+        with open(f"{save_path}/GBvideos.csv", "a") as f:
+            f.write("d4,17.16.11,Title four,24,100,5\n")
+
+        # Streaming records the video file, so only its appended rows are
+        # parsed, otherwise the last day held is aggregated again.
+        for chunk_size, kept in [
+            (None, ["2017-11-14.pkl"]),
+            (2, ["2017-11-14.pkl", "2017-11-15.pkl"]),
+        ]:
+            dataset_path = f"{self.directory}/dataset_{chunk_size}"
+            store_path = f"{dataset_path}/views_per_day/GB"
+
+            for version, version_save_path in [
+                ("1", self.save_path),
+                ("2", save_path),
+            ]:
+                CountryRunner(
+                    save_path=version_save_path,
+                    output_save_path=f"{dataset_path}/{version}",
+                    log_file_name=f"{self.directory}/logs.json",
+                    namespace=f"owner/dataset/{version}",
+                    chunk_size=chunk_size,
+                    time_series=True,
+                )("GB")
+
+                if version == "1":
+                    written = {
+                        file_name: os.stat(
+                            f"{store_path}/{file_name}"
+                        ).st_mtime_ns
+                        for file_name in kept
+                    }
+
+            assert [
+                file_name
+                for file_name in sorted(os.listdir(store_path))
+                if file_name.endswith(".pkl")
+            ] == ["2017-11-14.pkl", "2017-11-15.pkl", "2017-11-16.pkl"]
+            assert {
+                file_name: os.stat(f"{store_path}/{file_name}").st_mtime_ns
+                for file_name in kept
+            } == written
+
+            with open(f"{dataset_path}/2/GB/views_time_series.json") as f:
+                assert [
+                    record["trending_date"] for record in json.load(f)
+                ] == [
+                    "2017-11-14",
+                    "2017-11-14",
+                    "2017-11-15",
+                    "2017-11-16",
+                ]
+
+    def test_results_stored_per_version(self) -> None:
+        self.runner.results_store = f"{self.directory}/results.sqlite3"
+        self.runner.aggregations = [
+            ("likes_per_category", ["category_id"], "likes", "sum"),
+        ]
+        self.runner.time_series = True
+
+        for version in ["1", "2"]:
+            self.runner.namespace = f"owner/dataset/{version}"
+            self.runner("GB")
+
+        store = ResultsStore(
+            store_path=self.runner.results_store, logger=self.logger
+        )
+
+        assert (
+            list(store.results("owner", "dataset")["name"])
+            == [
+                "likes_per_category",
+                "views_time_series",
+                "views_to_categories",
+            ]
+            * 2
+        )
+
+        likes = store.load("owner", "dataset", "2", "GB", "likes_per_category")
+
+        assert likes is not None
+        assert list(likes.columns) == ["category_id", "category", "likes"]
+
+        diff = store.diff(
+            "owner", "dataset", "1", "2", "GB", "views_to_categories"
+        )
+
+        assert diff is not None
+        assert len(diff) == 2
+        assert (diff["views_change"] == 0).all()
+
+    def test_top_k_over_every_country(self) -> None:
+        profiler = StageProfiler(logger=self.logger)
+
+        for capacity, verify, max_error in [
+            (None, False, 0),
+            (2, False, 150),
+            (2, True, 0),
+        ]:
+            results = run_top_k(
+                [
+                    ("top_videos", "video_id", "views", 2),
+                    ("top_channels", "channel_title", "views", 1),
+                ],
+                save_path=self.save_path,
+                output_save_path=self.output_save_path,
+                countries=["CA", "GB", "FR", "US"],
+                capacity=capacity,
+                verify=verify,
+                chunk_size=None,
+                logger=self.logger,
+                profiler=profiler,
+            )
+
+            assert results["top_channels"] is None
+            assert results["top_videos"] == {
+                "max_error": max_error,
+                "guaranteed": True,
+            }
+
+            with open(f"{self.output_save_path}/top/top_videos.json") as f:
+                top_videos = json.load(f)
+
+            assert [video["video_id"] for video in top_videos] == ["b2", "a1"]
+
+        assert profiler.stages[0]["result"] == "top_videos"
+        assert profiler.stages[0]["rows"] == 12
+
+        run_top_k(
+            [("top_videos", "video_id", "views", 2)],
+            save_path=self.save_path,
+            output_save_path=self.output_save_path,
+            countries=["GB"],
+            capacity=None,
+            verify=False,
+            chunk_size=None,
+            logger=self.logger,
+            profiler=profiler,
+            json_format="ndjson",
+            json_compression="gzip",
+        )
+
+        with gzip.open(
+            f"{self.output_save_path}/top/top_videos.ndjson.gz", "rt"
+        ) as f:
+            assert [json.loads(line)["video_id"] for line in f] == [
+                "b2",
+                "a1",
+            ]
+
+    def test_unchanged_country_skipped(self) -> None:
+        self.runner.cache_path = f"{self.directory}/cache"
+
+        assert "skipped" not in self.runner("GB")
+        assert self.runner("GB")["skipped"]
+
+        os.remove(f"{self.output_save_path}/GB/views_to_categories.json")
+
+        assert "skipped" not in self.runner("GB")
+        assert os.path.exists(
+            f"{self.output_save_path}/GB/views_to_categories.json"
+        )
+
+        self.runner.chart_formats = ["svg"]
+
+        assert "skipped" not in self.runner("GB")
+
+    def test_skipped_country_loads_no_heavy_modules(self) -> None:
+        self.runner.cache_path = f"{self.directory}/cache"
+        self.runner("GB")
+
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; "
+                "from downloader.pipeline.countries import CountryRunner; "
+                f"timings = CountryRunner(**{vars(self.runner)!r})('GB'); "
+                "print(timings.get('skipped'), 'pandas' in sys.modules, "
+                "'matplotlib' in sys.modules)",
+            ],
+            capture_output=True,
+            check=True,
+            cwd=ROOT_PATH,
+            text=True,
+        )
+
+        assert process.stdout.split() == ["True", "False", "False"]
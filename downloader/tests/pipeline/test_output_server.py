@@ -0,0 +1,262 @@
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.output_server import OutputServer
+
+VIEWS = [{"snippet.title": "Music", "views": 1.0001}] * 50
+
+"""
+Writes the views per category outputs of a country and then the run
+metrics of the run, as a finished run does.
+"""
+
+
+def write_run(
+    dataset_path: str, version: str, views: list[dict[str, object]]
+) -> None:
+    os.makedirs(f"{dataset_path}/{version}/GB", exist_ok=True)
+
+    with open(
+        f"{dataset_path}/{version}/GB/views_to_categories.json", "w"
+    ) as f:
+        json.dump(views, f)
+
+    with open(
+        f"{dataset_path}/{version}/GB/views_to_categories_bar_chart.png", "wb"
+    ) as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+
+    with open(f"{dataset_path}/{version}/run_metrics.json", "w") as f:
+        json.dump({"version": version}, f)
+
+
+class TestOutputServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dataset_path = temp_dir.name
+        self.server = OutputServer(
+            dataset_path=self.dataset_path,
+            port=0,
+            reload_interval=0.05,
+            logger=mock.MagicMock(spec=JSONLogger),
+        )
+
+    def start(self) -> http.client.HTTPConnection:
+        thread = threading.Thread(target=self.server.start)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.stop)
+
+        assert self.server.ready.wait(5)
+
+        connection = http.client.HTTPConnection(
+            self.server.host, self.server.port, timeout=5
+        )
+        self.addCleanup(connection.close)
+
+        return connection
+
+    def get(
+        self,
+        connection: http.client.HTTPConnection,
+        path: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+
+        return response, response.read()
+
+    def test_no_finished_run(self) -> None:
+        os.makedirs(f"{self.dataset_path}/1/GB")
+        connection = self.start()
+
+        response, _ = self.get(connection, "/GB/views_to_categories.json")
+
+        assert response.status == 503
+
+    def test_validators_and_gzip(self) -> None:
+        write_run(self.dataset_path, "1", VIEWS)
+        connection = self.start()
+
+        response, body = self.get(connection, "/GB/views_to_categories.json")
+        etag = response.getheader("ETag", "")
+
+        assert response.status == 200
+        assert response.getheader("Content-Type") == "application/json"
+        assert response.getheader("Cache-Control") == "no-cache"
+        assert json.loads(body) == VIEWS
+
+        response, gzip_body = self.get(
+            connection,
+            "/GB/views_to_categories.json",
+            {"Accept-Encoding": "br, gzip;q=0.5"},
+        )
+
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert response.getheader("ETag") != etag
+        assert gzip.decompress(gzip_body) == body
+        assert len(gzip_body) < len(body)
+
+        for headers in [
+            {"If-None-Match": etag},
+            {"If-None-Match": f'"other", W/{etag}'},
+            {"If-Modified-Since": response.getheader("Last-Modified", "")},
+        ]:
+            response, body = self.get(
+                connection, "/GB/views_to_categories.json", headers
+            )
+
+            assert response.status == 304
+            assert body == b""
+
+        response, body = self.get(
+            connection,
+            "/GB/views_to_categories.json",
+            {"If-None-Match": '"x"'},
+        )
+
+        assert response.status == 200
+
+        response, body = self.get(
+            connection,
+            "/GB/views_to_categories_bar_chart.png",
+            {"Accept-Encoding": "gzip"},
+        )
+
+        assert response.getheader("Content-Type") == "image/png"
+        assert response.getheader("Content-Encoding") is None
+        assert body == b"\x89PNG\r\n\x1a\n"
+
+        response, body = self.get(
+            connection, "/GB/views_to_categories.json", method="HEAD"
+        )
+
+        assert response.status == 200
+        assert int(response.getheader("Content-Length", "0")) > 0
+        assert body == b""
+
+        for path, method, status in [
+            ("/GB/run_metrics.json", "GET", 404),
+            ("/", "POST", 405),
+        ]:
+            response, _ = self.get(connection, path, method=method)
+
+            assert response.status == status
+
+    def test_new_run_swapped_in(self) -> None:
+        write_run(self.dataset_path, "1", VIEWS)
+        connection = self.start()
+
+        response, _ = self.get(connection, "/GB/views_to_categories.json")
+        etag = response.getheader("ETag", "")
+
+        os.makedirs(f"{self.dataset_path}/2/GB")
+
+        with open(
+            f"{self.dataset_path}/2/GB/views_to_categories.json", "w"
+        ) as f:
+            f.write("[")
+
+        time.sleep(0.2)
+        response, _ = self.get(
+            connection, "/GB/views_to_categories.json", {"If-None-Match": etag}
+        )
+
+        assert response.status == 304
+
+        write_run(self.dataset_path, "2", VIEWS[:1])
+
+        deadline = time.monotonic() + 5
+
+        while self.server.snapshot and self.server.snapshot.version != "2":
+            assert time.monotonic() < deadline
+
+            time.sleep(0.05)
+
+        response, body = self.get(
+            connection, "/GB/views_to_categories.json", {"If-None-Match": etag}
+        )
+
+        assert response.status == 200
+        assert json.loads(body) == VIEWS[:1]
+
+        response, body = self.get(connection, "/")
+
+        assert json.loads(body)["version"] == "2"
+        assert list(json.loads(body)["files"]) == [
+            "/GB/views_to_categories.json",
+            "/GB/views_to_categories_bar_chart.png",
+        ]
+
+    def test_highest_version_served(self) -> None:
+        write_run(self.dataset_path, "10", VIEWS)
+        write_run(self.dataset_path, "9", VIEWS[:1])
+        connection = self.start()
+
+        response, body = self.get(connection, "/")
+
+        assert json.loads(body)["version"] == "10"
+
+        write_run(self.dataset_path, "9", VIEWS[:1])
+        time.sleep(0.2)
+
+        response, body = self.get(connection, "/GB/views_to_categories.json")
+
+        assert json.loads(body) == VIEWS
+
+        write_run(self.dataset_path, "10", VIEWS[:2])
+
+        deadline = time.monotonic() + 5
+
+        while json.loads(body) != VIEWS[:2]:
+            assert time.monotonic() < deadline
+
+            time.sleep(0.05)
+            response, body = self.get(
+                connection, "/GB/views_to_categories.json"
+            )
+
+    def test_json_formats_served(self) -> None:
+        write_run(self.dataset_path, "1", VIEWS)
+        os.remove(f"{self.dataset_path}/1/GB/views_to_categories.json")
+
+        for name, body in [
+            ("views_to_categories.ndjson.gz", gzip.compress(b"{}\n")),
+            ("views_to_categories.parquet", b"PAR1"),
+        ]:
+            with open(f"{self.dataset_path}/1/GB/{name}", "wb") as f:
+                f.write(body)
+
+        connection = self.start()
+
+        response, body = self.get(connection, "/")
+
+        assert list(json.loads(body)["files"]) == [
+            "/GB/views_to_categories.ndjson.gz",
+            "/GB/views_to_categories.parquet",
+            "/GB/views_to_categories_bar_chart.png",
+        ]
+
+        for path, content_type in [
+            ("/GB/views_to_categories.ndjson.gz", "application/gzip"),
+            (
+                "/GB/views_to_categories.parquet",
+                "application/vnd.apache.parquet",
+            ),
+        ]:
+            response, _ = self.get(connection, path)
+
+            assert response.status == 200
+            assert response.getheader("Content-Type") == content_type
@@ -0,0 +1,84 @@
+import json
+import pickle
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.tests.helpers import NullLogger
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.profiler = StageProfiler(logger=self.logger)
+
+    def test_stage_metrics_logged(self) -> None:
+        with self.profiler.stage("transform", country="GB") as metrics:
+            time.sleep(0.05)
+            metrics["rows"] = 100
+
+        stage = self.profiler.stages[0]
+
+        assert stage["stage"] == "transform"
+        assert stage["country"] == "GB"
+        assert stage["wall_seconds"] >= 0.05
+        assert stage["cpu_seconds"] >= 0
+        assert stage["peak_rss_bytes"] > 0
+        assert 0 < stage["rows_per_second"] <= 2000
+        self.logger.info.assert_called_once_with(
+            "Stage transform completed.", **stage
+        )
+
+    def test_nested_stage_keeps_enclosing_peak(self) -> None:
+        with self.profiler.stage("transform"):
+            data = bytearray(64 * 1024 * 1024)
+
+            del data
+
+            with self.profiler.stage("output"):
+                pass
+
+        output_stage, transform_stage = self.profiler.stages
+
+        assert transform_stage["peak_rss_bytes"] >= 64 * 1024 * 1024
+        assert (
+            transform_stage["peak_rss_bytes"] >= output_stage["peak_rss_bytes"]
+        )
+
+    def test_failed_stage_not_recorded(self) -> None:
+        with self.assertRaises(ValueError):
+            with self.profiler.stage("transform"):
+                raise ValueError("failed")
+
+        assert self.profiler.stages == []
+        self.logger.info.assert_not_called()
+
+    def test_write(self) -> None:
+        with self.profiler.stage("retrieve"):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.profiler.write(f"{directory}/run_metrics.json", version="1")
+
+            with open(f"{directory}/run_metrics.json") as f:
+                assert json.load(f) == {
+                    "version": "1",
+                    "stages": self.profiler.stages,
+                }
+
+    def test_pickled_copy_starts_empty(self) -> None:
+        profiler = StageProfiler(logger=NullLogger())
+
+        with profiler.stage("retrieve"):
+            pass
+
+        profiler = pickle.loads(pickle.dumps(profiler))
+
+        with profiler.stage("output"):
+            pass
+
+        assert [stage["stage"] for stage in profiler.stages] == ["output"]
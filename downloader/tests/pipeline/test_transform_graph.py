@@ -0,0 +1,335 @@
+import gc
+import tempfile
+import threading
+import unittest
+import weakref
+from typing import Any, Callable
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.transform_graph import TransformGraph
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.transform import Transform
+from downloader.transform.transform_aggregations import (
+    Aggregation,
+    TransformAggregations,
+)
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+
+class FrameTransform(Transform):
+    """
+    A transform reading and producing the frames it is given, calling
+    `step` with its input frames to build its result. A result that is not
+    produced for other transforms is kept as `dataframe`. When `cached` is
+    set its results are taken to be cached.
+    """
+
+    def __init__(
+        self,
+        *,
+        reads: dict[str, dict[str, str | None]],
+        produces: str | None = None,
+        step: Callable[[dict[str, pd.DataFrame]], pd.DataFrame] | None = None,
+        cached: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self.reads = reads
+        self.produced = produces
+        self.step = step or (lambda frames: pd.DataFrame({"a": [1]}))
+        self.cached = cached
+
+    def transform(
+        self, paths: dict[str, str], output: list[DataOutput]
+    ) -> None:
+        pass
+
+    def inputs(self) -> dict[str, dict[str, str | None]]:
+        return self.reads
+
+    def produces(self) -> list[str]:
+        return [self.produced] if self.produced else []
+
+    def reuse_cached_results(self, input_paths: list[str]) -> bool:
+        return self.cached
+
+    def derive(
+        self,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> dict[str, pd.DataFrame]:
+        dataframe = self.step(frames)
+
+        if self.produced:
+            return {self.produced: dataframe}
+
+        self.dataframe = dataframe
+
+        return {}
+
+
+class TestTransformGraph(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.paths = {
+            "video_file_path": f"{self.directory}/GBvideos.csv",
+            "category_file_path": f"{self.directory}/GB_category_id.json",
+            "output_path": self.directory,
+        }
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.graph = TransformGraph(logger=self.logger)
+
+    def test_inputs_loaded_once_for_all_transforms(self) -> None:
+        views = TransformViewsToCategories(logger=self.logger)
+        aggregations = TransformAggregations(
+            aggregations=[
+                Aggregation(
+                    name="likes_per_category",
+                    group_by=["category_id"],
+                    metric="likes",
+                )
+            ],
+            logger=self.logger,
+        )
+        output = mock.MagicMock(spec=DataOutput)
+
+        with mock.patch.object(
+            TransformViewsToCategories,
+            "csv_to_dataframe",
+            autospec=True,
+            side_effect=TransformViewsToCategories.csv_to_dataframe,
+        ) as csv_to_dataframe:
+            results = self.graph.run(
+                self.paths,
+                {
+                    "views": (views, [output]),
+                    "aggregations": (aggregations, []),
+                },
+            )
+
+        csv_to_dataframe.assert_called_once_with(
+            views,
+            self.paths["video_file_path"],
+            ["category_id", "views", "likes"],
+            {"category_id": "int32", "views": "int64", "likes": "int64"},
+        )
+        output.generate.assert_called_once_with(
+            views.dataframe, self.directory
+        )
+        assert views.dataframe is not None
+        assert list(views.dataframe["views"]) == [2.5, 1.0001]
+        assert list(aggregations.results["likes_per_category"]["likes"]) == [
+            4,
+            4,
+            2,
+        ]
+        assert sorted(results) == [
+            "aggregations",
+            "categories",
+            "videos",
+            "views",
+        ]
+
+        for metrics in results.values():
+            assert metrics is not None
+            assert metrics["wall_seconds"] >= 0
+            assert metrics["peak_rss_bytes"] > 0
+
+        assert results["videos"]["rows"] == 4  # type: ignore[index]
+
+    def test_inputs_of_cached_results_not_loaded(self) -> None:
+        given: dict[str, list[str]] = {}
+
+        def recording(name: str) -> Callable[[dict[str, pd.DataFrame]], Any]:
+            def step(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+                given[name] = sorted(frames)
+
+                return pd.DataFrame({"a": [1]})
+
+            return step
+
+        with mock.patch.object(
+            FrameTransform,
+            "csv_to_dataframe",
+            autospec=True,
+            side_effect=FrameTransform.csv_to_dataframe,
+        ) as csv_to_dataframe:
+            results = self.graph.run(
+                self.paths,
+                {
+                    name: (
+                        FrameTransform(
+                            reads=inputs,
+                            step=recording(name),
+                            cached=cached,
+                            logger=self.logger,
+                        ),
+                        [],
+                    )
+                    for name, inputs, cached in [
+                        (
+                            "cached",
+                            {
+                                "videos": {"category_id": "int32"},
+                                "categories": {"id": None},
+                            },
+                            True,
+                        ),
+                        ("computed", {"videos": {"views": "int64"}}, False),
+                    ]
+                },
+            )
+
+        assert sorted(results) == ["cached", "computed", "videos"]
+        assert given == {"cached": [], "computed": ["videos"]}
+        assert csv_to_dataframe.call_args.args[2] == ["views"]
+
+    def test_derived_frames_passed_and_released(self) -> None:
+        released = []
+        references: dict[str, weakref.ref[pd.DataFrame]] = {}
+
+        def first(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+            dataframe = frames["videos"][["views"]] * 2
+            references["doubled"] = weakref.ref(dataframe)
+
+            return dataframe
+
+        def second(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+            return frames["doubled"].head(1)
+
+        def third(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+            gc.collect()
+            released.append(references["doubled"]() is None)
+
+            return frames["first_row"]
+
+        last = FrameTransform(
+            reads={"first_row": {}}, step=third, logger=self.logger
+        )
+
+        self.graph.run(
+            self.paths,
+            {
+                "third": (last, []),
+                "second": (
+                    FrameTransform(
+                        reads={"doubled": {}},
+                        produces="first_row",
+                        step=second,
+                        logger=self.logger,
+                    ),
+                    [],
+                ),
+                "first": (
+                    FrameTransform(
+                        reads={"videos": {"views": "int64"}},
+                        produces="doubled",
+                        step=first,
+                        logger=self.logger,
+                    ),
+                    [],
+                ),
+            },
+        )
+
+        assert released == [True]
+        assert last.dataframe is not None
+        assert last.dataframe.to_dict("list") == {"views": [200]}
+
+    def test_independent_transforms_run_in_parallel(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+            barrier.wait()
+
+            return frames["videos"]
+
+        results = self.graph.run(
+            self.paths,
+            {
+                name: (
+                    FrameTransform(
+                        reads={"videos": {"views": "int64"}},
+                        step=wait,
+                        logger=self.logger,
+                    ),
+                    [],
+                )
+                for name in ["first", "second"]
+            },
+        )
+
+        assert results["first"] is not None
+        assert results["second"] is not None
+
+    def test_failed_node_skips_dependents(self) -> None:
+        def fail(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+            raise RuntimeError("Out of memory")
+
+        results = self.graph.run(
+            self.paths,
+            {
+                "failing": (
+                    FrameTransform(
+                        reads={"videos": {"views": "int64"}},
+                        produces="failed",
+                        step=fail,
+                        logger=self.logger,
+                    ),
+                    [],
+                ),
+                "dependent": (
+                    FrameTransform(reads={"failed": {}}, logger=self.logger),
+                    [],
+                ),
+                "independent": (
+                    FrameTransform(
+                        reads={"videos": {"views": "int64"}},
+                        logger=self.logger,
+                    ),
+                    [],
+                ),
+            },
+        )
+
+        assert results["failing"] is None
+        assert results["dependent"] is None
+        assert results["independent"] is not None
+        assert self.logger.error.call_count == 2
+
+    def test_invalid_graphs(self) -> None:
+        for nodes in [
+            {"a": FrameTransform(reads={"missing": {}})},
+            {
+                "a": FrameTransform(reads={"b": {}}, produces="a"),
+                "b": FrameTransform(reads={"a": {}}, produces="b"),
+            },
+            {
+                "a": FrameTransform(reads={}, produces="frame"),
+                "b": FrameTransform(reads={}, produces="frame"),
+            },
+            {
+                "a": FrameTransform(reads={"videos": {"views": "int64"}}),
+                "b": FrameTransform(reads={"videos": {"views": "float64"}}),
+            },
+            {"videos": FrameTransform(reads={})},
+        ]:
+            with self.assertRaises(ValueError):
+                self.graph.run(
+                    self.paths,
+                    {name: (node, []) for name, node in nodes.items()},
+                )
@@ -0,0 +1,155 @@
+import fcntl
+import json
+import tempfile
+import threading
+import unittest
+from typing import Any
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.watcher import Watcher
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.check = mock.MagicMock(return_value="2")
+        self.run_pipeline = mock.MagicMock(return_value={"success": True})
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def watcher(self, **kwargs: Any) -> Watcher:
+        return Watcher(
+            check=self.check,
+            run=self.run_pipeline,
+            lock_path=f"{self.directory.name}/watch.lock",
+            status_path=f"{self.directory.name}/watch.json",
+            interval=60,
+            max_interval=300,
+            jitter=0,
+            logger=self.logger,
+            **kwargs,
+        )
+
+    def status(self) -> dict[str, Any]:
+        with open(f"{self.directory.name}/watch.json") as f:
+            status: dict[str, Any] = json.load(f)
+
+        return status
+
+    def test_poll_runs_changed_version(self) -> None:
+        watcher = self.watcher()
+
+        assert watcher.poll() == 60
+        self.run_pipeline.assert_called_once_with("2")
+        assert watcher.status["version"] == "2"
+        assert watcher.status["last_run"]["version"] == "2"
+        assert watcher.status["last_run"]["success"] is True
+
+        assert watcher.poll() == 60
+        self.run_pipeline.assert_called_once()
+
+    def test_poll_backs_off_on_failure(self) -> None:
+        watcher = self.watcher()
+        self.check.return_value = None
+
+        assert [watcher.poll() for _ in range(4)] == [120, 240, 300, 300]
+        self.run_pipeline.assert_not_called()
+
+        self.check.return_value = "2"
+
+        assert watcher.poll() == 60
+
+    def test_poll_failed_run_retried(self) -> None:
+        watcher = self.watcher()
+        self.run_pipeline.side_effect = [
+            RuntimeError("Disk full"),
+            {"success": True},
+        ]
+
+        assert watcher.poll() == 120
+        assert "version" not in watcher.status
+        assert watcher.status["last_run"]["error"] == "Disk full"
+
+        assert watcher.poll() == 60
+        assert self.run_pipeline.call_count == 2
+        assert watcher.status["version"] == "2"
+
+    def test_check_exception_logged(self) -> None:
+        watcher = self.watcher()
+        self.check.side_effect = ConnectionError("Unreachable")
+
+        assert watcher.poll() == 120
+        self.logger.warning.assert_called_once_with(
+            "Remote version check failed: Unreachable."
+        )
+
+    def test_jitter_bounds_delay(self) -> None:
+        watcher = self.watcher()
+        watcher.jitter = 0.5
+
+        for _ in range(20):
+            assert 30 <= watcher.poll() <= 90
+
+    def test_start_stops_and_writes_status(self) -> None:
+        watcher = self.watcher()
+
+        def run(version: str) -> dict[str, Any]:
+            watcher.stop()
+
+            return {"success": True, "countries": ["GB"]}
+
+        self.run_pipeline.side_effect = run
+
+        assert watcher.start()
+
+        status = self.status()
+
+        assert status["state"] == "stopped"
+        assert status["version"] == "2"
+        assert status["last_run"]["countries"] == ["GB"]
+        assert status["consecutive_failures"] == 0
+        assert status["next_check"] is None
+
+    def test_start_resumes_from_status(self) -> None:
+        with open(f"{self.directory.name}/watch.json", "w") as f:
+            json.dump({"version": "2"}, f)
+
+        watcher = self.watcher()
+
+        def check() -> str:
+            watcher.stop()
+
+            return "2"
+
+        self.check.side_effect = check
+
+        assert watcher.start()
+        self.run_pipeline.assert_not_called()
+
+    def test_start_refused_when_locked(self) -> None:
+        with open(f"{self.directory.name}/watch.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            assert not self.watcher().start()
+
+        self.check.assert_not_called()
+        self.logger.error.assert_called_once()
+
+    def test_stop_interrupts_wait(self) -> None:
+        watcher = self.watcher()
+        watcher.interval = watcher.max_interval = 3600
+        thread = threading.Thread(target=watcher.start)
+        thread.start()
+
+        while self.run_pipeline.call_count == 0:
+            thread.join(0.01)
+
+        watcher.stop()
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert self.status()["state"] == "stopped"
@@ -0,0 +1,185 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import ROOT_PATH
+
+HEAVY_MODULES = ["kaggle", "matplotlib", "numpy", "pandas", "pyarrow"]
+IMPORT_TIME_BUDGET = 0.4
+
+"""
+Runs a python command from the repository root, returning its stdout and
+stderr.
+"""
+
+
+def run_python(*args: str) -> tuple[str, str]:
+    process = subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        check=True,
+        cwd=ROOT_PATH,
+        text=True,
+    )
+
+    return process.stdout, process.stderr
+
+
+class TestMainStartup(unittest.TestCase):
+
+    def test_import_loads_no_heavy_modules(self) -> None:
+        stdout, _ = run_python(
+            "-c",
+            "import json, sys; import downloader.main; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES} "
+            "if m in sys.modules]))",
+        )
+
+        assert json.loads(stdout) == []
+
+    def test_help_within_import_time_budget(self) -> None:
+        stdout, stderr = run_python(
+            "-X", "importtime", "-m", "downloader.main", "-h"
+        )
+
+        import_seconds = (
+            sum(
+                int(line.split("|")[0].split(":")[1])
+                for line in stderr.splitlines()
+                if line.startswith("import time:") and "[us]" not in line
+            )
+            / 1_000_000
+        )
+
+        assert "usage: kaggle_importer" in stdout
+        assert import_seconds < IMPORT_TIME_BUDGET, import_seconds
+
+
+class TestAggregationArgument(unittest.TestCase):
+
+    def test_aggregation_parsed(self) -> None:
+        from downloader.main import aggregation
+
+        assert aggregation("likes_per_channel=channel_title:likes") == (
+            "likes_per_channel",
+            ["channel_title"],
+            "likes",
+            "sum",
+        )
+        assert aggregation("mean=channel_title,category_id:views:mean") == (
+            "mean",
+            ["channel_title", "category_id"],
+            "views",
+            "mean",
+        )
+
+    def test_malformed_aggregation(self) -> None:
+        from downloader.main import aggregation
+
+        for value in ["views", "=a:b", "a=b", "a=:b", "a=b:c:median"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                aggregation(value)
+
+
+class TestTopArgument(unittest.TestCase):
+
+    def test_top_parsed(self) -> None:
+        from downloader.main import top
+
+        assert top("top_channels=channel_title:views") == (
+            "top_channels",
+            "channel_title",
+            "views",
+            10,
+        )
+        assert top("top_videos=video_id:likes:5") == (
+            "top_videos",
+            "video_id",
+            "likes",
+            5,
+        )
+
+    def test_malformed_top(self) -> None:
+        from downloader.main import top
+
+        for value in [
+            "views",
+            "a=b",
+            "a=b:title",
+            "a=b:views:x",
+            "a=b:views:0",
+        ]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                top(value)
+
+
+class TestQuery(unittest.TestCase):
+
+    def test_query(self) -> None:
+        import pandas as pd
+
+        from downloader.data_output.results_store import ResultsStore
+        from downloader.main import query, query_parser
+
+        logger = mock.MagicMock(spec=JSONLogger)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store_path = f"{directory}/results.sqlite3"
+
+            for version, views in [("114", 1.0), ("115", 1.5)]:
+                ResultsStore(store_path=store_path, logger=logger).write(
+                    owner="datasnaek",
+                    dataset="youtube-new",
+                    version=version,
+                    country="GB",
+                    name="views_to_categories",
+                    data=pd.DataFrame(
+                        {
+                            "category_id": [10],
+                            "snippet.title": ["Music"],
+                            "views": [views],
+                        }
+                    ),
+                    keys=["category_id", "snippet.title"],
+                    metrics=["views"],
+                )
+
+            with mock.patch("downloader.main.RESULTS_STORE_PATH", store_path):
+                assert query(
+                    query_parser.parse_args(["--countries", "GB", "US"]),
+                    logger,
+                ) == {
+                    "GB": [
+                        {
+                            "category_id": 10,
+                            "snippet.title": "Music",
+                            "views": 1.5,
+                        }
+                    ],
+                    "US": None,
+                }
+                assert query(
+                    query_parser.parse_args(
+                        ["datasnaek", "youtube-new", "114", "--diff", "115"]
+                    ),
+                    logger,
+                )["GB"] == [
+                    {
+                        "category_id": 10,
+                        "snippet.title": "Music",
+                        "views_from": 1.0,
+                        "views_to": 1.5,
+                        "views_change": 0.5,
+                    }
+                ]
+                assert [
+                    result["version"]
+                    for result in query(
+                        query_parser.parse_args(["--list"]), logger
+                    )["results"]
+                ] == ["114", "115"]
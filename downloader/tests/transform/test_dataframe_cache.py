@@ -0,0 +1,147 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.logger.logger import JSONLogger
+from downloader.transform.dataframe_cache import DataFrameCache
+from downloader.transform.digest_index import DigestIndex
+
+COLUMNS = ["category_id", "views"]
+DTYPES = {"category_id": "int32", "views": "int64"}
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("pyarrow"), "pyarrow is not installed"
+)
+class TestDataFrameCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+        self.file_path = f"{self.directory}/GBvideos.csv"
+
+        with open(self.file_path, "w") as f:
+            f.write("category_id,views,title\n10,100,a\n24,200,b\n")
+
+        self.cache = self._cache()
+
+    def _cache(self, **kwargs: int) -> DataFrameCache:
+        return DataFrameCache(
+            cache_path=f"{self.directory}/cache",
+            namespace="owner/dataset/1",
+            logger=mock.MagicMock(spec=JSONLogger),
+            **kwargs,  # type: ignore[arg-type]
+        )
+
+    def _parse(
+        self,
+        columns: list[str] | None = COLUMNS,
+        dtypes: dict[str, str] | None = DTYPES,
+    ) -> pd.DataFrame:
+        return pd.read_csv(self.file_path, usecols=columns, dtype=dtypes)
+
+    def test_miss_then_hit(self) -> None:
+        assert self.cache.get(self.file_path, COLUMNS, DTYPES) is None
+
+        self.cache.put(self.file_path, COLUMNS, DTYPES, self._parse())
+
+        pd.testing.assert_frame_equal(
+            self._cache().get(self.file_path, COLUMNS, DTYPES),
+            self._parse(),
+        )
+
+    def test_entry_reused_for_subset_of_columns(self) -> None:
+        self.cache.put(self.file_path, COLUMNS, DTYPES, self._parse())
+
+        pd.testing.assert_frame_equal(
+            self.cache.get(self.file_path, ["views"], {"views": "int64"}),
+            self._parse(["views"], {"views": "int64"}),
+        )
+        assert self.cache.get(self.file_path, ["views"], None) is None
+        assert self.cache.get(self.file_path, ["title"], None) is None
+        assert (
+            self.cache.get(self.file_path, COLUMNS, {"views": "float64"})
+            is None
+        )
+
+    def test_str_columns_hit(self) -> None:
+        dtypes = {"views": "int64", "title": "str"}
+
+        self.cache.put(
+            self.file_path,
+            ["views", "title"],
+            dtypes,
+            self._parse(["views", "title"], dtypes),
+        )
+
+        pd.testing.assert_frame_equal(
+            self._cache().get(self.file_path, ["views", "title"], dtypes),
+            self._parse(["views", "title"], dtypes),
+        )
+        assert (
+            self.cache.get(self.file_path, ["title"], {"title": "string"})
+            is None
+        )
+
+    def test_all_columns(self) -> None:
+        self.cache.put(self.file_path, None, None, self._parse(None, None))
+
+        pd.testing.assert_frame_equal(
+            self.cache.get(self.file_path, None, None),
+            self._parse(None, None),
+        )
+        assert self.cache.get(self.file_path, COLUMNS, DTYPES) is None
+
+    def test_changed_file_invalidates(self) -> None:
+        self.cache.put(self.file_path, COLUMNS, DTYPES, self._parse())
+
+        with open(self.file_path, "a") as f:
+            f.write("10,300,c\n")
+
+        assert self.cache.get(self.file_path, COLUMNS, DTYPES) is None
+
+    def test_eviction(self) -> None:
+        self.cache.put(self.file_path, COLUMNS, DTYPES, self._parse())
+        self.cache.put(self.file_path, None, None, self._parse(None, None))
+
+        cache = self._cache(max_bytes=1)
+        cache.put(
+            self.file_path, ["views"], None, self._parse(["views"], None)
+        )
+
+        assert not [
+            file_name
+            for _, _, file_names in os.walk(f"{self.directory}/cache")
+            for file_name in file_names
+            if file_name.endswith(".arrow")
+        ]
+
+
+class TestDigestIndex(unittest.TestCase):
+
+    def test_digest_reused_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = f"{directory}/file.csv"
+            index = DigestIndex(f"{directory}/digests.json")
+
+            with open(file_path, "w") as f:
+                f.write("a")
+
+            digest = index.digest(file_path)
+
+            with mock.patch(
+                "downloader.transform.digest_index.file_sha256"
+            ) as file_sha256:
+                assert index.digest(file_path) == digest
+
+            file_sha256.assert_not_called()
+
+            with open(file_path, "w") as f:
+                f.write("ab")
+
+            assert index.digest(file_path) != digest
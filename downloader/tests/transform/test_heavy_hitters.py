@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from downloader.transform.heavy_hitters import HeavyHitters
+
+
+class TestHeavyHitters(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.keys = pd.Series(rng.zipf(1.5, size=20_000) % 5_000).astype(str)
+        self.weights = pd.Series(rng.integers(0, 100, size=20_000))
+        self.exact = self.weights.groupby(self.keys).sum()
+
+    def update(self, summary: HeavyHitters, chunk_size: int) -> None:
+        for start in range(0, len(self.keys), chunk_size):
+            end = start + chunk_size
+
+            summary.update(self.keys[start:end], self.weights[start:end])
+
+    def assert_bounds(self, summary: HeavyHitters) -> None:
+        bounds = summary.bounds().set_index("key")
+        exact = self.exact.reindex(bounds.index)
+
+        assert len(bounds) <= summary.capacity
+        assert summary.total == self.exact.sum()
+        assert (bounds["lower"] <= exact).all()
+        assert (exact <= bounds["upper"]).all()
+        assert summary.error <= summary.total / (summary.capacity + 1)
+        assert set(self.exact[self.exact > summary.error].index) <= set(
+            bounds.index
+        )
+
+    def test_error_bounds(self) -> None:
+        for capacity, chunk_size in [(10, 100), (50, 1_000), (200, 20_000)]:
+            summary = HeavyHitters(capacity=capacity)
+
+            self.update(summary, chunk_size)
+
+            assert summary.error > 0
+            self.assert_bounds(summary)
+
+    def test_exact_below_capacity(self) -> None:
+        summary = HeavyHitters(capacity=len(self.exact))
+
+        self.update(summary, 1_000)
+
+        assert summary.error == 0
+        pd.testing.assert_series_equal(
+            summary.counts.sort_index(), self.exact, check_names=False
+        )
+
+    def test_merged_summaries(self) -> None:
+        summary = HeavyHitters(capacity=50)
+        other = HeavyHitters(capacity=50)
+
+        summary.update(self.keys[:10_000], self.weights[:10_000])
+        other.update(self.keys[10_000:], self.weights[10_000:])
+        summary.merge(other)
+
+        self.assert_bounds(summary)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            HeavyHitters(capacity=0)
+
+        with self.assertRaises(ValueError):
+            HeavyHitters(capacity=1).update(pd.Series(["a"]), pd.Series([-1]))
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.transform_graph import TransformGraph
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.result_cache import ResultCache
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+
+class FileOutput(DataOutput):
+
+    def generate(self, data: pd.DataFrame, save_path: str) -> None:
+        with open(self.output_files(save_path)[0], "w") as f:
+            f.write(data.to_json())
+
+    def output_files(self, save_path: str) -> list[str]:
+        return [f"{save_path}/output.json"]
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.logger = mock.MagicMock(spec=JSONLogger)
+        self.paths = {
+            "video_file_path": f"{self.directory}/GBvideos.csv",
+            "category_file_path": f"{self.directory}/GB_category_id.json",
+            "output_path": self.directory,
+        }
+
+    def _transform(self) -> TransformViewsToCategories:
+        return TransformViewsToCategories(
+            logger=self.logger,
+            result_cache=ResultCache(
+                cache_path=f"{self.directory}/cache", logger=self.logger
+            ),
+        )
+
+    def _run(self) -> tuple[TransformViewsToCategories, mock.MagicMock]:
+        output = mock.MagicMock(wraps=FileOutput(logger=self.logger))
+        transform = self._transform()
+
+        with mock.patch.object(
+            transform,
+            "_views_to_categories",
+            wraps=transform._views_to_categories,
+        ) as compute:
+            transform.transform(self.paths, [output])
+
+        return transform, compute
+
+    def test_unchanged_inputs_reuse_result_and_outputs(self) -> None:
+        first, compute = self._run()
+        compute.assert_called_once()
+
+        output = mock.MagicMock(wraps=FileOutput(logger=self.logger))
+        transform = self._transform()
+
+        with mock.patch.object(transform, "_views_to_categories") as compute:
+            transform.transform(self.paths, [output])
+
+        compute.assert_not_called()
+        output.generate.assert_not_called()
+        pd.testing.assert_frame_equal(transform.dataframe, first.dataframe)
+        self.logger.info.assert_any_call("Result cache hit.", key=mock.ANY)
+
+    def test_changed_output_regenerated(self) -> None:
+        self._run()
+
+        with open(f"{self.directory}/output.json", "w") as f:
+            f.write("edited")
+
+        output = mock.MagicMock(wraps=FileOutput(logger=self.logger))
+
+        self._transform().transform(self.paths, [output])
+
+        output.generate.assert_called_once()
+
+    def test_changed_input_recomputes(self) -> None:
+        self._run()
+
+        with open(f"{self.directory}/GBvideos.csv", "a") as f:
+            f.write("d4,17.16.11,Title four,24,100,5\n")
+
+        _, compute = self._run()
+
+        compute.assert_called_once()
+
+    def test_graph_reuses_result_and_outputs(self) -> None:
+        TransformGraph(logger=self.logger).run(
+            self.paths,
+            {"views": (self._transform(), [FileOutput(logger=self.logger)])},
+        )
+        first = pd.read_json(f"{self.directory}/output.json")
+
+        os.remove(f"{self.directory}/output.json")
+
+        output = mock.MagicMock(wraps=FileOutput(logger=self.logger))
+        transform = self._transform()
+
+        with mock.patch.object(
+            transform, "_sum_views"
+        ) as compute, mock.patch.object(
+            transform, "csv_to_dataframe"
+        ) as csv_to_dataframe:
+            results = TransformGraph(logger=self.logger).run(
+                self.paths, {"views": (transform, [output])}
+            )
+
+        assert list(results) == ["views"]
+        assert results["views"] is not None
+        compute.assert_not_called()
+        csv_to_dataframe.assert_not_called()
+        output.generate.assert_called_once()
+        self.logger.info.assert_any_call("Result cache hit.", key=mock.ANY)
+        pd.testing.assert_frame_equal(
+            pd.read_json(f"{self.directory}/output.json"), first
+        )
@@ -0,0 +1,191 @@
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.data_output.output_aggregation import AggregationJSON
+from downloader.logger.logger import JSONLogger
+from downloader.pipeline.transform_graph import TransformGraph
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.result_cache import ResultCache
+from downloader.transform.transform_aggregations import (
+    Aggregation,
+    TransformAggregations,
+)
+
+
+class TestTransformAggregations(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.paths = {
+            "video_file_path": f"{self.directory}/GBvideos.csv",
+            "category_file_path": f"{self.directory}/GB_category_id.json",
+            "output_path": self.directory,
+        }
+        self.logger = mock.MagicMock(spec=JSONLogger)
+
+    def aggregations(self) -> list[Aggregation]:
+        return [
+            Aggregation(
+                name="views_per_category",
+                group_by=["category_id"],
+                metric="views",
+            ),
+            Aggregation(
+                name="mean_likes_per_category",
+                group_by=["category_id"],
+                metric="likes",
+                reducer="mean",
+            ),
+            Aggregation(
+                name="peak_views_per_video",
+                group_by=["video_id"],
+                metric="views",
+                reducer="max",
+            ),
+            Aggregation(
+                name="appearances_per_video",
+                group_by=["video_id"],
+                metric="likes",
+                reducer="count",
+            ),
+        ]
+
+    def run_transform(self, **kwargs: object) -> TransformAggregations:
+        transform = TransformAggregations(
+            aggregations=self.aggregations(),
+            logger=self.logger,
+            **kwargs,
+        )
+
+        transform.transform(self.paths, [])
+
+        return transform
+
+    def test_results(self) -> None:
+        results = self.run_transform().results
+
+        pd.testing.assert_frame_equal(
+            results["views_per_category"],
+            pd.DataFrame(
+                {
+                    "category_id": pd.Series([24, 10, 99], dtype="int32"),
+                    "views": [2500000, 1000100, 50],
+                    "category": ["Entertainment", "Music", float("nan")],
+                }
+            ),
+        )
+        assert list(results["mean_likes_per_category"]["likes"]) == [
+            4.0,
+            2.0,
+            2.0,
+        ]
+        assert results["peak_views_per_video"].to_dict("list") == {
+            "video_id": ["b2", "a1", "c3"],
+            "views": [2500000, 1000000, 50],
+        }
+        assert list(results["appearances_per_video"]["likes"]) == [2, 1, 1]
+
+    def test_single_parse(self) -> None:
+        with mock.patch.object(
+            TransformAggregations,
+            "csv_to_dataframe",
+            autospec=True,
+            side_effect=TransformAggregations.csv_to_dataframe,
+        ) as csv_to_dataframe:
+            transform = self.run_transform()
+
+        csv_to_dataframe.assert_called_once()
+        assert transform.rows_read == 4
+
+    def test_chunked_matches_full_read(self) -> None:
+        expected = self.run_transform().results
+
+        for chunk_size in [1, 3, 100]:
+            transform = self.run_transform(chunk_size=chunk_size)
+
+            assert transform.rows_read == 4
+
+            for name, result in transform.results.items():
+                pd.testing.assert_frame_equal(result, expected[name])
+
+    def test_outputs_generated_per_aggregation(self) -> None:
+        output = mock.MagicMock(spec=DataOutput)
+        shared_output = mock.MagicMock(spec=DataOutput)
+        aggregation = Aggregation(
+            name="views_per_category",
+            group_by=["category_id"],
+            metric="views",
+            outputs=[output, AggregationJSON(logger=self.logger)],
+        )
+        transform = TransformAggregations(
+            aggregations=[aggregation], logger=self.logger
+        )
+
+        transform.transform(self.paths, [shared_output])
+
+        save_path = f"{self.directory}/views_per_category"
+        result = transform.results["views_per_category"]
+
+        output.generate.assert_called_once_with(result, save_path)
+        shared_output.generate.assert_called_once_with(result, save_path)
+
+        with open(f"{save_path}/aggregation.json") as f:
+            assert json.load(f)[0] == {
+                "category_id": 24,
+                "views": 2500000,
+                "category": "Entertainment",
+            }
+
+    def test_cached_results_not_recomputed(self) -> None:
+        result_cache = ResultCache(
+            cache_path=f"{self.directory}/cache", logger=self.logger
+        )
+        expected = self.run_transform(result_cache=result_cache).results
+        transform = self.run_transform(result_cache=result_cache)
+
+        assert transform.rows_read == 0
+
+        for name, result in transform.results.items():
+            pd.testing.assert_frame_equal(result, expected[name])
+
+    def test_graph_reuses_cached_results(self) -> None:
+        result_cache = ResultCache(
+            cache_path=f"{self.directory}/cache", logger=self.logger
+        )
+        expected = self.run_transform(result_cache=result_cache).results
+        transform = TransformAggregations(
+            aggregations=self.aggregations(),
+            result_cache=result_cache,
+            logger=self.logger,
+        )
+
+        with mock.patch.object(transform, "_aggregate_chunks") as aggregate:
+            TransformGraph(logger=self.logger).run(
+                self.paths, {"aggregations": (transform, [])}
+            )
+
+        aggregate.assert_not_called()
+
+        for name, result in transform.results.items():
+            pd.testing.assert_frame_equal(result, expected[name])
+
+    def test_invalid_aggregations(self) -> None:
+        with self.assertRaises(ValueError):
+            Aggregation(
+                name="a", group_by=["video_id"], metric="x", reducer="p"
+            )
+
+        with self.assertRaises(ValueError):
+            TransformAggregations(
+                aggregations=self.aggregations()[:1] * 2, logger=self.logger
+            )
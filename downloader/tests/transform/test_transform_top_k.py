@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.transform_top_k import TransformTopK
+
+
+class TestTransformTopK(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.file_path = f"{self.directory}/GBvideos.csv"
+
+    def top_k(
+        self,
+        file_paths: list[str],
+        k: int,
+        capacity: int | None = None,
+        verify: bool = False,
+        chunk_size: int | None = None,
+    ) -> TransformTopK:
+        transform = TransformTopK(
+            key="video_id",
+            metric="views",
+            k=k,
+            capacity=capacity,
+            verify=verify,
+            logger=mock.MagicMock(spec=JSONLogger),
+            chunk_size=chunk_size,
+        )
+
+        transform.top_k(file_paths)
+
+        return transform
+
+    def test_exact_top_k(self) -> None:
+        output = mock.MagicMock(spec=DataOutput)
+        transform = TransformTopK(
+            key="video_id",
+            metric="likes",
+            k=2,
+            logger=mock.MagicMock(spec=JSONLogger),
+        )
+
+        transform.transform(
+            {"video_file_path": self.file_path, "output_path": self.directory},
+            [output],
+        )
+
+        assert transform.dataframe is not None
+        assert transform.dataframe.to_dict("records") == [
+            {"video_id": "a1", "likes": 4, "max_error": 0},
+            {"video_id": "c3", "likes": 4, "max_error": 0},
+        ]
+        assert transform.guaranteed
+        output.generate.assert_called_once_with(
+            transform.dataframe, self.directory
+        )
+
+    def test_estimated_top_k_within_bounds(self) -> None:
+        transform = self.top_k([self.file_path], k=1, capacity=1, chunk_size=1)
+
+        assert transform.dataframe is not None
+        assert transform.dataframe.to_dict("records") == [
+            {"video_id": "b2", "views": 1499850, "max_error": 1000150}
+        ]
+        assert transform.guaranteed
+
+    def test_verified_top_k_exact(self) -> None:
+        file_paths = [self.file_path, self.file_path]
+        exact = self.top_k(file_paths, k=2)
+
+        for chunk_size in [1, 3]:
+            transform = self.top_k(
+                file_paths, k=2, capacity=2, verify=True, chunk_size=chunk_size
+            )
+
+            assert transform.dataframe is not None
+            assert exact.dataframe is not None
+            assert transform.dataframe.to_dict("records") == [
+                {"video_id": "b2", "views": 5000000, "max_error": 0},
+                {"video_id": "a1", "views": 2000200, "max_error": 0},
+            ]
+            assert transform.dataframe.equals(exact.dataframe)
+
+    def test_invalid(self) -> None:
+        for metric, k, capacity in [
+            ("title", 10, None),
+            ("views", 0, None),
+            ("views", 5, 4),
+        ]:
+            with self.assertRaises(ValueError):
+                TransformTopK(
+                    key="video_id",
+                    metric=metric,
+                    k=k,
+                    capacity=capacity,
+                    logger=mock.MagicMock(spec=JSONLogger),
+                )
@@ -0,0 +1,221 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.transform_views_time_series import (
+    TransformViewsTimeSeries,
+)
+
+NEXT_VERSION_CSV = (
+    "video_id,trending_date,category_id,views\n"
+    "a1,17.14.11,10,999\n"
+    "b2,17.14.11,24,2500000\n"
+    "a1,17.15.11,10,1000000\n"
+    "b2,17.15.11,24,3000000\n"
+    "a1,17.16.11,10,1200000\n"
+)
+
+
+class TestTransformViewsTimeSeries(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.paths = {
+            "video_file_path": f"{self.directory}/GBvideos.csv",
+            "category_file_path": f"{self.directory}/GB_category_id.json",
+            "output_path": self.directory,
+        }
+
+    def run_transform(
+        self,
+        store_path: str | None = None,
+        chunk_size: int | None = None,
+        rebuild: bool = False,
+        version: str | None = None,
+    ) -> TransformViewsTimeSeries:
+        output = mock.MagicMock(spec=DataOutput)
+        transform = TransformViewsTimeSeries(
+            store_path=store_path or f"{self.directory}/store",
+            rebuild=rebuild,
+            version=version,
+            logger=mock.MagicMock(spec=JSONLogger),
+            chunk_size=chunk_size,
+        )
+
+        transform.transform(self.paths, [output])
+
+        output.generate.assert_called_once_with(
+            transform.dataframe, self.directory
+        )
+
+        return transform
+
+    def records(
+        self, transform: TransformViewsTimeSeries
+    ) -> list[tuple[str, str, float]]:
+        assert transform.dataframe is not None
+
+        return [
+            (date.strftime("%Y-%m-%d"), title, views)
+            for date, title, views in transform.dataframe[
+                ["trending_date", "snippet.title", "views"]
+            ].itertuples(index=False)
+        ]
+
+    def test_views_per_category_per_day(self) -> None:
+        for chunk_size in [None, 1, 4]:
+            transform = self.run_transform(
+                f"{self.directory}/store_{chunk_size}", chunk_size
+            )
+
+            assert self.records(transform) == [
+                ("2017-11-14", "Music", 0.0001),
+                ("2017-11-14", "Entertainment", 2.5),
+                ("2017-11-15", "Music", 1.0),
+            ]
+            assert transform.dates_added == ["2017-11-14", "2017-11-15"]
+            assert transform.store.dates() == ["2017-11-14", "2017-11-15"]
+
+    def test_only_new_days_aggregated(self) -> None:
+        for chunk_size in [None, 2]:
+            store_path = f"{self.directory}/store_{chunk_size}"
+
+            write_fixtures(self.directory)
+            self.run_transform(store_path, chunk_size)
+
+            with open(self.paths["video_file_path"], "w") as f:
+                f.write(NEXT_VERSION_CSV)
+
+            transform = self.run_transform(store_path, chunk_size)
+
+            assert transform.dates_added == ["2017-11-15", "2017-11-16"]
+            assert self.records(transform) == [
+                ("2017-11-14", "Music", 0.0001),
+                ("2017-11-14", "Entertainment", 2.5),
+                ("2017-11-15", "Music", 1.0),
+                ("2017-11-15", "Entertainment", 3.0),
+                ("2017-11-16", "Music", 1.2),
+            ]
+
+        transform = self.run_transform(store_path, rebuild=True)
+
+        assert transform.dates_added == [
+            "2017-11-14",
+            "2017-11-15",
+            "2017-11-16",
+        ]
+        assert self.records(transform)[0] == ("2017-11-14", "Music", 0.000999)
+
+    def test_only_appended_rows_parsed(self) -> None:
+        for chunk_size in [None, 1]:
+            store_path = f"{self.directory}/store_{chunk_size}"
+
+            write_fixtures(self.directory)
+            self.run_transform(store_path, chunk_size)
+
+            with open(self.paths["video_file_path"], "a") as f:
+                f.write(
+                    "b2,17.15.11,Title two,24,3000000,5\n"
+                    "a1,17.16.11,Title one,10,1200000,6\n"
+                )
+
+            for rows_read, dates_added in [
+                (2, ["2017-11-15", "2017-11-16"]),
+                (0, []),
+            ]:
+                transform = self.run_transform(store_path, chunk_size)
+
+                assert transform.rows_read == rows_read
+                assert transform.dates_added == dates_added
+                assert self.records(transform) == [
+                    ("2017-11-14", "Music", 0.0001),
+                    ("2017-11-14", "Entertainment", 2.5),
+                    ("2017-11-15", "Music", 1.0),
+                    ("2017-11-15", "Entertainment", 3.0),
+                    ("2017-11-16", "Music", 1.2),
+                ]
+
+    def test_days_kept_when_dropped_from_dataset(self) -> None:
+        self.run_transform()
+
+        with open(self.paths["video_file_path"], "w") as f:
+            f.write(
+                "video_id,trending_date,category_id,views\n"
+                "a1,17.16.11,10,1200000\n"
+            )
+
+        transform = self.run_transform()
+
+        assert self.records(transform) == [("2017-11-16", "Music", 1.2)]
+        assert transform.store.dates() == [
+            "2017-11-14",
+            "2017-11-15",
+            "2017-11-16",
+        ]
+
+    def test_versions_transformed_out_of_order(self) -> None:
+        csv = {"1": NEXT_VERSION_CSV[: NEXT_VERSION_CSV.index("a1,17.16")]}
+        csv["2"] = f"{csv['1']}a1,17.16.11,10,1200000\n"
+        csv["3"] = f"{csv['2']}b2,17.17.11,24,4000000\n"
+
+        for chunk_size in [None, 2]:
+            store_path = f"{self.directory}/store_{chunk_size}"
+            transforms = {}
+
+            for version in ["2", "1", "3"]:
+                with open(self.paths["video_file_path"], "w") as f:
+                    f.write(csv[version])
+
+                transforms[version] = self.run_transform(
+                    store_path, chunk_size, version=version
+                )
+
+            assert self.records(transforms["1"]) == [
+                ("2017-11-14", "Music", 0.000999),
+                ("2017-11-14", "Entertainment", 2.5),
+                ("2017-11-15", "Music", 1.0),
+                ("2017-11-15", "Entertainment", 3.0),
+            ]
+            assert transforms["1"].dates_added == []
+            assert transforms["3"].store.source()["version"] == "3"
+            assert self.records(transforms["3"]) == self.records(
+                self.run_transform(
+                    f"{self.directory}/rebuilt_{chunk_size}", chunk_size
+                )
+            )
+
+    def test_derived_from_shared_frames(self) -> None:
+        transform = TransformViewsTimeSeries(
+            store_path=f"{self.directory}/store",
+            logger=mock.MagicMock(spec=JSONLogger),
+        )
+        videos = transform.csv_to_dataframe(
+            self.paths["video_file_path"],
+            list(transform.VIDEO_DTYPES),
+            transform.VIDEO_DTYPES,
+        )
+        categories = transform.json_to_dataframe(
+            self.paths["category_file_path"],
+            list(transform.CATEGORY_COLUMNS),
+        )
+        shared = videos.copy()
+
+        assert (
+            transform.derive(
+                {"videos": videos, "categories": categories}, [], ""
+            )
+            == {}
+        )
+
+        pd.testing.assert_frame_equal(videos, shared)
+        assert self.records(transform) == self.records(self.run_transform())
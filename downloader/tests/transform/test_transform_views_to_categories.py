@@ -0,0 +1,164 @@
+import importlib.util
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.logger.logger import JSONLogger
+from downloader.tests.helpers import write_fixtures
+from downloader.transform.transform_views_to_categories import (
+    TransformViewsToCategories,
+)
+
+SNAPSHOTS_CSV = (
+    "video_id,trending_date,category_id,views\n"
+    "a1,17.14.11,10,100\n"
+    "b2,17.14.11,24,500\n"
+    "a1,17.16.11,10,300\n"
+    "b2,17.15.11,24,900\n"
+    "a1,17.15.11,10,400\n"
+    "b2,17.16.11,24,800\n"
+)
+
+
+def run_transform(
+    paths: dict[str, str],
+    chunk_size: int | None = None,
+    engine: str = "c",
+    snapshot: str | None = None,
+) -> pd.DataFrame:
+    output = mock.MagicMock(spec=DataOutput)
+    transform = TransformViewsToCategories(
+        logger=mock.MagicMock(spec=JSONLogger),
+        chunk_size=chunk_size,
+        engine=engine,
+        snapshot=snapshot,
+    )
+
+    transform.transform(paths, [output])
+
+    output.generate.assert_called_once_with(
+        transform.dataframe, paths["output_path"]
+    )
+
+    return transform.dataframe
+
+
+class TestTransformViewsToCategories(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+        write_fixtures(self.directory)
+
+        self.paths = {
+            "video_file_path": f"{self.directory}/GBvideos.csv",
+            "category_file_path": f"{self.directory}/GB_category_id.json",
+            "output_path": self.directory,
+        }
+
+    def test_views_aggregated_per_category(self) -> None:
+        dataframe = run_transform(self.paths)
+
+        assert list(dataframe["snippet.title"]) == ["Entertainment", "Music"]
+        assert list(dataframe["views"]) == [2.5, 1.0001]
+
+    def test_inputs_read_from_archive(self) -> None:
+        archive_path = f"{self.directory}/youtube-new.zip"
+
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as z:
+            z.write(f"{self.directory}/GBvideos.csv", "GBvideos.csv")
+            z.write(
+                f"{self.directory}/GB_category_id.json", "GB_category_id.json"
+            )
+
+        expected = run_transform(self.paths)
+        dataframe = run_transform(
+            {
+                "video_file_path": f"{archive_path}/GBvideos.csv",
+                "category_file_path": f"{archive_path}/GB_category_id.json",
+                "output_path": self.directory,
+            }
+        )
+
+        pd.testing.assert_frame_equal(dataframe, expected)
+
+    def test_chunked_matches_full_read(self) -> None:
+        expected = run_transform(self.paths)
+
+        for chunk_size in [1, 3, 100]:
+            dataframe = run_transform(self.paths, chunk_size=chunk_size)
+
+            pd.testing.assert_frame_equal(dataframe, expected)
+            assert dataframe.to_json(orient="records") == expected.to_json(
+                orient="records"
+            )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "pyarrow is not installed"
+    )
+    def test_pyarrow_engine_matches_c_engine(self) -> None:
+        pd.testing.assert_frame_equal(
+            run_transform(self.paths, engine="pyarrow"),
+            run_transform(self.paths),
+        )
+
+    def test_unknown_engine(self) -> None:
+        with self.assertRaises(ValueError):
+            TransformViewsToCategories(
+                logger=mock.MagicMock(spec=JSONLogger), engine="python"
+            )
+
+    def test_snapshots_summed_once_per_video(self) -> None:
+        with open(self.paths["video_file_path"], "w") as f:
+            f.write(SNAPSHOTS_CSV)
+
+        for snapshot, views in [
+            (None, [0.0022, 0.0008]),
+            ("latest", [0.0008, 0.0003]),
+            ("peak", [0.0009, 0.0004]),
+        ]:
+            for chunk_size in [None, 1, 4]:
+                dataframe = run_transform(
+                    self.paths, chunk_size=chunk_size, snapshot=snapshot
+                )
+
+                assert list(dataframe["views"]) == views, snapshot
+
+    def test_snapshot_derived_from_shared_frames(self) -> None:
+        with open(self.paths["video_file_path"], "w") as f:
+            f.write(SNAPSHOTS_CSV)
+
+        transform = TransformViewsToCategories(
+            logger=mock.MagicMock(spec=JSONLogger), snapshot="latest"
+        )
+        videos = transform.csv_to_dataframe(
+            self.paths["video_file_path"],
+            list(transform.video_dtypes()),
+            transform.video_dtypes(),
+        )
+        categories = transform.json_to_dataframe(
+            self.paths["category_file_path"], ["id", "snippet.title"]
+        )
+        expected = videos.copy()
+
+        derived = transform.derive(
+            {"videos": videos, "categories": categories}, [], self.directory
+        )
+
+        pd.testing.assert_frame_equal(
+            derived["views_to_categories"],
+            run_transform(self.paths, snapshot="latest"),
+        )
+        pd.testing.assert_frame_equal(videos, expected)
+
+    def test_unknown_snapshot(self) -> None:
+        with self.assertRaises(ValueError):
+            TransformViewsToCategories(
+                logger=mock.MagicMock(spec=JSONLogger), snapshot="first"
+            )
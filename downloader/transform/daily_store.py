@@ -0,0 +1,221 @@
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import pandas as pd
+
+from downloader.logger.logger import JSONLogger
+
+
+class DailyStore:
+    """
+    A persisted store of daily aggregates, partitioned by day.
+
+    Each day is held in a file of its own named by its ISO date, e.g.
+    "2017-11-14.pkl", so the days already aggregated are known from the
+    file names alone and appending new days never rewrites the others.
+    Partitions are written to a temporary file and moved into place, so
+    readers never see partially written days.
+
+    The store may also record details of the source file the days were
+    aggregated from, allowing a later version of that file to be checked
+    for rows appended since.
+
+    Attributes:
+        store_path (str): The directory holding the partitions.
+        date_column (str): The datetime column partitions are split by.
+        logger (JSONLogger): A logger instance for structured logging.
+    """
+
+    def __init__(
+        self,
+        *,
+        store_path: str,
+        date_column: str = "trending_date",
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.store_path = store_path
+        self.date_column = date_column
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Returns the days held by the store.
+
+    Returns:
+        list[str]: The ISO date of each day, in order.
+    """
+
+    def dates(self) -> list[str]:
+        if not os.path.isdir(self.store_path):
+            return []
+
+        return sorted(
+            file_name.removesuffix(".pkl")
+            for file_name in os.listdir(self.store_path)
+            if file_name.endswith(".pkl")
+        )
+
+    """
+    Writes the rows of each day of a dataframe as the partition of that
+    day, replacing any partition already held for it.
+
+    Args:
+        dataframe (pd.DataFrame): The aggregates, with a datetime
+            `date_column`.
+
+    Returns:
+        list[str]: The ISO date of each day written, in order.
+    """
+
+    def append(self, dataframe: pd.DataFrame) -> list[str]:
+        os.makedirs(self.store_path, exist_ok=True)
+
+        dates = []
+
+        for date, partition in dataframe.groupby(self.date_column):
+            iso_date = pd.Timestamp(date).strftime("%Y-%m-%d")
+
+            with self._atomic_path(f"{iso_date}.pkl") as temp_path:
+                partition.reset_index(drop=True).to_pickle(temp_path)
+
+            dates.append(iso_date)
+
+        self.logger.info(
+            "Daily store appended.", path=self.store_path, days=len(dates)
+        )
+
+        return dates
+
+    """
+    Loads the days held by the store.
+
+    Args:
+        dates (list[str] | None): The ISO dates of the days to load, those
+            not held are ignored. Defaults to every day.
+
+    Returns:
+        pd.DataFrame | None: The rows of the days in date order, `None` if
+            none of them are held.
+    """
+
+    def load(self, dates: list[str] | None = None) -> pd.DataFrame | None:
+        held = self.dates()
+        dates = held if dates is None else sorted(set(dates) & set(held))
+
+        if not dates:
+            return None
+
+        return pd.concat(
+            # partitions are only ever pickled by this store
+            [pd.read_pickle(self._path(date)) for date in dates],  # nosec B301
+            ignore_index=True,
+        )
+
+    """
+    Returns the details recorded of the source file the days held were
+    aggregated from.
+
+    Returns:
+        dict[str, Any]: The details, empty if none are recorded.
+    """
+
+    def source(self) -> dict[str, Any]:
+        try:
+            with open(f"{self.store_path}/source.json") as f:
+                source: dict[str, Any] = json.load(f)
+
+            return source
+        except (OSError, ValueError):
+            return {}
+
+    """
+    Records details of the source file the days held were aggregated from,
+    replacing any recorded before.
+
+    Args:
+        source (dict[str, Any] | None): JSON serialisable details, `None`
+            removes the recorded details.
+
+    Returns:
+        None
+    """
+
+    def record_source(self, source: dict[str, Any] | None) -> None:
+        if source is None:
+            if os.path.exists(f"{self.store_path}/source.json"):
+                os.remove(f"{self.store_path}/source.json")
+
+            return
+
+        os.makedirs(self.store_path, exist_ok=True)
+
+        with self._atomic_path("source.json") as temp_path:
+            with open(temp_path, "w") as f:
+                json.dump(source, f, indent=2)
+
+    """
+    Locks the store for the duration of the context, waiting for any other
+    process holding it. The lock is held on a file next to the store
+    directory, so it is kept while the store is cleared.
+
+    Returns:
+        Iterator[None]
+    """
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        os.makedirs(
+            os.path.dirname(os.path.normpath(self.store_path)) or ".",
+            exist_ok=True,
+        )
+
+        with open(f"{os.path.normpath(self.store_path)}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    """
+    Removes every day held by the store.
+
+    Returns:
+        None
+    """
+
+    def clear(self) -> None:
+        shutil.rmtree(self.store_path, ignore_errors=True)
+
+    """
+    returns the path of the partition of a day
+    """
+
+    def _path(self, iso_date: str) -> str:
+        return f"{self.store_path}/{iso_date}.pkl"
+
+    """
+    yields a temporary path which replaces a file of the store once it has
+    been written
+    """
+
+    @contextmanager
+    def _atomic_path(self, file_name: str) -> Iterator[str]:
+        fd, temp_path = tempfile.mkstemp(dir=self.store_path, suffix=".tmp")
+        os.close(fd)
+
+        try:
+            yield temp_path
+
+            os.replace(temp_path, f"{self.store_path}/{file_name}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,300 @@
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from downloader.logger.logger import JSONLogger
+from downloader.transform.digest_index import DigestIndex
+
+CACHE_EXTENSION = ".arrow"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class DataFrameCache:
+    """
+    An on-disk cache of parsed input files stored in the Arrow IPC
+    columnar format.
+
+    Entries are grouped by a namespace, typically the dataset version, and
+    keyed by the digest of the source file and the columns and dtypes it
+    was parsed with. Entries are memory-mapped when read, so a cached file
+    is loaded without being parsed again. A cached entry is reused for any
+    request whose columns it contains with the same dtypes.
+
+    Once the cache exceeds `max_bytes` the least recently used entries,
+    across all namespaces, are evicted.
+
+    The cache requires pyarrow, without it every lookup misses and nothing
+    is stored.
+
+    Attributes:
+        cache_path (str): The directory holding the cache.
+        namespace (str): The namespace new entries are stored under.
+        max_bytes (int): The maximum total size of the cached entries.
+        logger (JSONLogger): A logger instance for structured logging.
+        enabled (bool): Whether pyarrow is available to the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_path: str,
+        namespace: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        logger: JSONLogger | None = None,
+    ) -> None:
+        self.cache_path = cache_path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.digests = DigestIndex(f"{cache_path}/digests.json")
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+        self.enabled = importlib.util.find_spec("pyarrow") is not None
+
+        if not self.enabled:
+            self.logger.warning(
+                "pyarrow is not installed, dataframe cache disabled."
+            )
+
+    """
+    Retrieves a cached DataFrame for a file.
+
+    Args:
+        file_path (str): The source file, a plain file or archive member.
+        columns (list[str] | None): The columns required, `None` for the
+            columns of an entry stored for all columns.
+        dtypes (dict[str, str] | None): The dtypes the columns are required
+            in, `None` for the inferred dtypes.
+
+    Returns:
+        pd.DataFrame | None: The cached DataFrame, or `None` on a miss.
+    """
+
+    def get(
+        self,
+        file_path: str,
+        columns: list[str] | None,
+        dtypes: dict[str, str] | None,
+    ) -> pd.DataFrame | None:
+        if not self.enabled:
+            return None
+
+        from pyarrow import feather
+
+        entry_path = self._find_entry(
+            self._entry_directory(file_path), columns, dtypes
+        )
+
+        if entry_path is None:
+            self.logger.info(f"Dataframe cache miss for {file_path}.")
+
+            return None
+
+        os.utime(entry_path)
+
+        self.logger.info(
+            f"Dataframe cache hit for {file_path}.", entry=entry_path
+        )
+
+        dataframe: pd.DataFrame = feather.read_table(
+            entry_path, columns=columns, memory_map=True
+        ).to_pandas()
+
+        return dataframe
+
+    """
+    Stores a parsed DataFrame for a file and evicts old entries if the
+    cache has grown beyond `max_bytes`.
+
+    Args:
+        file_path (str): The source file, a plain file or archive member.
+        columns (list[str] | None): The columns the file was parsed with.
+        dtypes (dict[str, str] | None): The dtypes the file was parsed with.
+        dataframe (pd.DataFrame): The parsed DataFrame.
+
+    Returns:
+        None
+    """
+
+    def put(
+        self,
+        file_path: str,
+        columns: list[str] | None,
+        dtypes: dict[str, str] | None,
+        dataframe: pd.DataFrame,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        from pyarrow import feather
+
+        directory = self._entry_directory(file_path)
+        os.makedirs(directory, exist_ok=True)
+
+        metadata = {
+            "all_columns": columns is None,
+            "columns": list(dataframe.columns),
+            "dtypes": {
+                column: str(dtype)
+                for column, dtype in dataframe.dtypes.items()
+            },
+            "inferred": dtypes is None,
+        }
+        entry_path = f"{directory}/{self._digest(metadata)}{CACHE_EXTENSION}"
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+
+        feather.write_feather(
+            dataframe.reset_index(drop=True),
+            temp_path,
+            compression="uncompressed",
+        )
+
+        with open(f"{entry_path}.json", "w") as f:
+            json.dump(metadata, f)
+
+        os.replace(temp_path, entry_path)
+
+        self.logger.info(
+            f"Dataframe cache stored {file_path}.", entry=entry_path
+        )
+
+        self._evict()
+
+    """
+    Returns the directory holding the entries for a source file.
+    """
+
+    def _entry_directory(self, file_path: str) -> str:
+        return (
+            f"{self.cache_path}/{self.namespace}/"
+            f"{self.digests.digest(file_path)}"
+        )
+
+    """
+    Finds an entry in a directory containing the requested columns in the
+    requested dtypes.
+    """
+
+    def _find_entry(
+        self,
+        directory: str,
+        columns: list[str] | None,
+        dtypes: dict[str, str] | None,
+    ) -> str | None:
+        if not os.path.isdir(directory):
+            return None
+
+        for entry in sorted(os.listdir(directory)):
+            entry_path = f"{directory}/{entry}"
+
+            if not entry.endswith(CACHE_EXTENSION) or not os.path.exists(
+                f"{entry_path}.json"
+            ):
+                continue
+
+            with open(f"{entry_path}.json") as f:
+                metadata = json.load(f)
+
+            if self._entry_matches(metadata, columns, dtypes):
+                return entry_path
+
+        return None
+
+    """
+    Checks whether an entry can satisfy a request.
+    """
+
+    def _entry_matches(
+        self,
+        metadata: dict[str, Any],
+        columns: list[str] | None,
+        dtypes: dict[str, str] | None,
+    ) -> bool:
+        if columns is None:
+            if not metadata["all_columns"]:
+                return False
+
+            columns = metadata["columns"]
+        elif not set(columns) <= set(metadata["columns"]):
+            return False
+
+        if dtypes is None:
+            return bool(metadata["inferred"])
+
+        return all(
+            _dtype_name(metadata["dtypes"][column]) == _dtype_name(dtype)
+            for column, dtype in dtypes.items()
+            if column in columns
+        )
+
+    """
+    Removes the least recently used entries until the cache is no larger
+    than `max_bytes`.
+    """
+
+    def _evict(self) -> None:
+        entries = []
+
+        for directory, _, file_names in os.walk(self.cache_path):
+            for file_name in file_names:
+                if file_name.endswith(CACHE_EXTENSION):
+                    stat = os.stat(f"{directory}/{file_name}")
+                    entries.append(
+                        (stat.st_mtime, stat.st_size, directory, file_name)
+                    )
+
+        total_bytes = sum(entry[1] for entry in entries)
+
+        for _, size, directory, file_name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            os.remove(f"{directory}/{file_name}")
+
+            if os.path.exists(f"{directory}/{file_name}.json"):
+                os.remove(f"{directory}/{file_name}.json")
+
+            if not os.listdir(directory):
+                os.rmdir(directory)
+
+            total_bytes -= size
+
+            self.logger.info(
+                "Dataframe cache evicted entry.",
+                entry=f"{directory}/{file_name}",
+            )
+
+    """
+    Returns a short digest identifying an entry's columns and dtypes.
+    """
+
+    def _digest(self, metadata: dict[str, Any]) -> str:
+        return hashlib.sha256(
+            json.dumps(metadata, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+
+"""
+returns the name of the dtype a column is parsed in, the numpy string
+dtypes, such as "str", being parsed as "object" columns
+"""
+
+
+def _dtype_name(dtype: str) -> str:
+    parsed = pd.api.types.pandas_dtype(dtype)
+
+    if isinstance(parsed, np.dtype) and parsed.kind in "OSU":
+        return "object"
+
+    return str(parsed)
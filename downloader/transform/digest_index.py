@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from downloader.data_retrieve.archive import split_archive_path
+from downloader.data_retrieve.manifest import file_sha256
+
+
+class DigestIndex:
+    """
+    Provides SHA-256 digests of input files, remembering each digest
+    against the size and modification time of the file so unchanged files
+    are not re-read on every run.
+
+    The index is persisted as a JSON file and shared between runs, a file
+    is only hashed again once its size or modification time changes.
+
+    Attributes:
+        index_path (str): The path of the JSON file holding the index.
+    """
+
+    def __init__(self, index_path: str) -> None:
+        self.index_path = index_path
+        self._lock = threading.Lock()
+
+    """
+    Returns the digest of a file.
+
+    Members of a zip archive are identified by the digest of the archive
+    combined with the member name.
+
+    Args:
+        file_path (str): A plain file path or archive member path.
+
+    Returns:
+        str: The hex encoded digest.
+    """
+
+    def digest(self, file_path: str) -> str:
+        archive_path = split_archive_path(file_path)
+
+        if archive_path is None:
+            return self._stored_digest(file_path)
+
+        archive_digest = self._stored_digest(archive_path[0])
+
+        return hashlib.sha256(
+            f"{archive_digest}:{archive_path[1]}".encode()
+        ).hexdigest()
+
+    """
+    Returns the digest of a file on disk, hashing it only if it is not in
+    the index or has changed since it was indexed.
+    """
+
+    def _stored_digest(self, file_path: str) -> str:
+        path = os.path.realpath(file_path)
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+
+        with self._lock:
+            index = self._load()
+            entry = index.get(path)
+
+            if entry and entry["signature"] == signature:
+                return str(entry["sha256"])
+
+        sha256 = file_sha256(path)
+
+        with self._lock:
+            index = self._load()
+            index[path] = {"signature": signature, "sha256": sha256}
+            self._save(index)
+
+        return sha256
+
+    """
+    Reads the index, an unreadable index is treated as empty.
+    """
+
+    def _load(self) -> dict[str, dict[str, object]]:
+        try:
+            with open(self.index_path) as f:
+                index: dict[str, dict[str, object]] = json.load(f)
+
+            return index
+        except (OSError, ValueError):
+            return {}
+
+    """
+    Writes the index atomically so concurrent readers never see a
+    partially written file.
+    """
+
+    def _save(self, index: dict[str, dict[str, object]]) -> None:
+        directory = os.path.dirname(self.index_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,4 @@
+PARSE_ENGINES = ("c", "pyarrow")
+REDUCERS = ("sum", "count", "mean", "min", "max")
+SNAPSHOTS = ("latest", "peak")
+COUNT_METRICS = ("views", "likes", "dislikes", "comment_count")
@@ -0,0 +1,116 @@
+import pandas as pd
+
+
+class HeavyHitters:
+    """
+    A summary of the heaviest keys of a stream of weighted keys, such as
+    the views of each channel, held in a fixed number of counters.
+
+    The summary is a Misra-Gries summary, the dual of Space-Saving, kept
+    in its mergeable form. Each batch of keys is summed per key, then added
+    to the counters. When more than `capacity` keys are counted, the
+    `capacity` + 1 largest count is subtracted from every counter and keys
+    left without a positive count are dropped. A batch is merged with a
+    vectorized group-by rather than a key at a time, and memory is bounded
+    by `capacity` and the number of keys in a batch, however long the
+    stream.
+
+    Error bounds, for non-negative weights summing to `total`:
+        - A key's count never exceeds its true weight and falls short of
+          it by at most `error`, so its true weight lies within
+          [count, count + `error`], the upper bound being the Space-Saving
+          estimate.
+        - `error` is at most (`total` - the sum of the counts) /
+          (`capacity` + 1), so at most `total` / (`capacity` + 1).
+        - Every key weighing more than `error`, in particular every key
+          weighing more than `total` / (`capacity` + 1), is counted.
+
+    Attributes:
+        capacity (int): The maximum number of keys counted.
+        counts (pd.Series): The count of each key counted, indexed by key.
+        error (int): The most by which any count falls short of its key's
+            true weight.
+        total (int): The total weight of the stream.
+    """
+
+    def __init__(self, *, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("A summary needs a capacity of at least 1.")
+
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.error = 0
+        self.total = 0
+
+    """
+    Adds a batch of weighted keys to the summary.
+
+    Args:
+        keys (pd.Series): The key of each item.
+        weights (pd.Series): The non-negative weight of each item.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a weight is negative.
+    """
+
+    def update(self, keys: pd.Series, weights: pd.Series) -> None:
+        self._add(weights.groupby(keys, sort=False).sum())
+
+    """
+    Merges another summary into this one, as if its stream had been added
+    to this summary. The errors of both summaries add up.
+
+    Args:
+        other (HeavyHitters): The summary merged.
+
+    Returns:
+        None
+    """
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.error += other.error
+        self.total += other.total - int(other.counts.sum())
+        self._add(other.counts)
+
+    """
+    Returns the counted keys with the lower and upper bounds of their true
+    weights, heaviest first.
+
+    Returns:
+        pd.DataFrame: The "key", "lower" and "upper" of each key counted.
+    """
+
+    def bounds(self) -> pd.DataFrame:
+        counts = self.counts.sort_values(ascending=False, kind="stable")
+
+        return pd.DataFrame(
+            {
+                "key": counts.index,
+                "lower": counts.to_numpy(),
+                "upper": counts.to_numpy() + self.error,
+            }
+        )
+
+    """
+    adds the summed weight of each key to the counters, reducing the
+    counters to `capacity` keys
+    """
+
+    def _add(self, sums: pd.Series) -> None:
+        if (sums < 0).any():
+            raise ValueError("Weights must not be negative.")
+
+        self.total += int(sums.sum())
+        counts = (
+            pd.concat([self.counts, sums]).groupby(level=0, sort=False).sum()
+        )
+
+        if len(counts) > self.capacity:
+            threshold = counts.nlargest(self.capacity + 1).iloc[-1]
+            counts = counts[counts > threshold] - threshold
+            self.error += int(threshold)
+
+        self.counts = counts
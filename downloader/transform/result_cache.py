@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+from downloader.data_retrieve.manifest import file_sha256
+from downloader.logger.logger import JSONLogger
+from downloader.transform.digest_index import DigestIndex
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ResultCache:
+    """
+    An on-disk cache of transform results.
+
+    Results are keyed by the transform, its parameters and the digests of
+    its input files, so a transform whose inputs are unchanged can reuse
+    its previous result instead of being recomputed. The digests of the
+    output files generated from a result are also recorded, allowing
+    outputs that are already up to date to be skipped.
+
+    pandas is only imported when a result is loaded, so checking whether
+    outputs are up to date does not load it.
+
+    Attributes:
+        cache_path (str): The directory holding the cache.
+        logger (JSONLogger): A logger instance for structured logging, hits
+            and misses are logged with the cache key.
+    """
+
+    def __init__(
+        self, *, cache_path: str, logger: JSONLogger | None = None
+    ) -> None:
+        self.cache_path = cache_path
+        self.digests = DigestIndex(f"{cache_path}/digests.json")
+
+        if not logger:
+            self.logger = JSONLogger()
+        else:
+            self.logger = logger
+
+    """
+    Builds the cache key for a transform.
+
+    Args:
+        transform_name (str): The fully qualified name of the transform.
+        parameters (dict[str, Any]): The JSON serialisable parameters that
+            affect the result of the transform.
+        input_paths (list[str]): The input files of the transform.
+
+    Returns:
+        str: The hex encoded cache key.
+    """
+
+    def key(
+        self,
+        transform_name: str,
+        parameters: dict[str, Any],
+        input_paths: list[str],
+    ) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    "transform": transform_name,
+                    "parameters": parameters,
+                    "inputs": [
+                        self.digests.digest(input_path)
+                        for input_path in input_paths
+                    ],
+                },
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    """
+    Loads a cached result.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        pd.DataFrame | None: The cached result, or `None` on a miss.
+    """
+
+    def load(self, key: str) -> "pd.DataFrame | None":
+        import pandas as pd
+
+        result_path = self._path(key, "pkl")
+
+        if not os.path.exists(result_path):
+            self.logger.info("Result cache miss.", key=key)
+
+            return None
+
+        self.logger.info("Result cache hit.", key=key)
+
+        # results are only ever pickled by this cache
+        dataframe: pd.DataFrame = pd.read_pickle(result_path)  # nosec B301
+
+        return dataframe
+
+    """
+    Stores a result.
+
+    Args:
+        key (str): The cache key.
+        dataframe (pd.DataFrame): The result.
+
+    Returns:
+        None
+    """
+
+    def store(self, key: str, dataframe: "pd.DataFrame") -> None:
+        with self._atomic_path(key, "pkl") as temp_path:
+            dataframe.to_pickle(temp_path)
+
+        self.logger.info("Result cache stored.", key=key)
+
+    """
+    Checks whether output files match those last generated from a result.
+
+    Args:
+        key (str): The cache key.
+        file_paths (list[str]): The output files, an empty list is never
+            current as nothing is known about the output.
+
+    Returns:
+        bool
+    """
+
+    def outputs_current(self, key: str, file_paths: list[str]) -> bool:
+        if not file_paths:
+            return False
+
+        recorded = self._load_outputs(key)
+
+        return all(
+            os.path.abspath(file_path) in recorded
+            and os.path.exists(file_path)
+            and file_sha256(file_path) == recorded[os.path.abspath(file_path)]
+            for file_path in file_paths
+        )
+
+    """
+    Records the digests of output files generated from a result.
+
+    Args:
+        key (str): The cache key.
+        file_paths (list[str]): The generated output files.
+
+    Returns:
+        None
+    """
+
+    def record_outputs(self, key: str, file_paths: list[str]) -> None:
+        recorded = self._load_outputs(key)
+        recorded.update(
+            {
+                os.path.abspath(file_path): file_sha256(file_path)
+                for file_path in file_paths
+                if os.path.exists(file_path)
+            }
+        )
+
+        with self._atomic_path(key, "outputs.json") as temp_path:
+            with open(temp_path, "w") as f:
+                json.dump(recorded, f, indent=2)
+
+    """
+    Returns the output files recorded for a key.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        list[str]
+    """
+
+    def recorded_outputs(self, key: str) -> list[str]:
+        return sorted(self._load_outputs(key))
+
+    """
+    Reads the recorded output digests for a key.
+    """
+
+    def _load_outputs(self, key: str) -> dict[str, str]:
+        try:
+            with open(self._path(key, "outputs.json")) as f:
+                recorded: dict[str, str] = json.load(f)
+
+            return recorded
+        except (OSError, ValueError):
+            return {}
+
+    """
+    Returns the path of a cache file for a key.
+    """
+
+    def _path(self, key: str, extension: str) -> str:
+        return f"{self.cache_path}/results/{key}.{extension}"
+
+    """
+    Yields a temporary path which replaces the cache file for a key once
+    it has been written, so readers never see partially written files.
+    """
+
+    @contextmanager
+    def _atomic_path(self, key: str, extension: str) -> Iterator[str]:
+        path = self._path(key, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".tmp"
+        )
+        os.close(fd)
+
+        try:
+            yield temp_path
+
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -1,9 +1,18 @@
+import importlib.util
+import json
 from abc import ABC, abstractmethod
+from typing import Any, Iterator
 
 import pandas as pd
 
 from downloader.data_output.data_output import DataOutput
+from downloader.data_output.output_executor import OutputExecutor, generate
+from downloader.data_retrieve.archive import open_file
 from downloader.logger.logger import JSONLogger
+from downloader.pipeline.stage_profiler import StageProfiler
+from downloader.transform.dataframe_cache import DataFrameCache
+from downloader.transform.engines import PARSE_ENGINES
+from downloader.transform.result_cache import ResultCache
 
 
 class Transform(ABC):
@@ -24,6 +33,39 @@ class Transform(ABC):
         logger (JSONLogger):
             A structured logger instance used to log events, errors, or
             debugging information during the transformation process.
+
+        chunk_size (int | None):
+            The number of rows read at a time when a transformation streams
+            its input, if `None` the input is read in full.
+
+        engine (str):
+            The CSV parse engine, one of `PARSE_ENGINES`. The "pyarrow"
+            engine parses using multiple threads but cannot stream input in
+            chunks.
+
+        cache (DataFrameCache | None):
+            A cache of parsed input files, when set input files read in full
+            are parsed once and then loaded from the cache.
+
+        result_cache (ResultCache | None):
+            A cache of transform results, when set a transform whose inputs
+            and parameters are unchanged reuses its previous result and
+            skips outputs that are already up to date.
+
+        output_executor (OutputExecutor | None):
+            Generates outputs concurrently, when `None` outputs are generated
+            one after another.
+
+        profiler (StageProfiler | None):
+            When set each output generated one after another is measured as
+            an "output" stage.
+
+        rows_read (int):
+            The number of rows parsed from CSV files, for throughput metrics.
+
+        output_errors (dict[int, Exception]):
+            The errors raised by outputs generated concurrently in the last
+            call to `generate_outputs`, keyed by position.
     """
 
     @property
@@ -40,16 +82,57 @@ class Transform(ABC):
     Args:
         logger (JSONLogger | None): A logger instance for structured
         logging. If not provided, a new instance of `JSONLogger` is created.
+        chunk_size (int | None): The number of rows read at a time when
+        streaming input. If not provided, input is read in full.
+        engine (str): The CSV parse engine, falls back to "c" if "pyarrow" is
+        requested but not installed. Defaults to "c".
+        cache (DataFrameCache | None): A cache of parsed input files. If not
+        provided, input files are always parsed.
+        result_cache (ResultCache | None): A cache of transform results. If
+        not provided, results are always computed.
+        output_executor (OutputExecutor | None): Generates outputs
+        concurrently. If not provided, outputs are generated in turn.
+        profiler (StageProfiler | None): Measures outputs generated in turn.
+        If not provided, outputs are not measured.
     """
 
-    def __init__(self, *, logger: JSONLogger | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        logger: JSONLogger | None = None,
+        chunk_size: int | None = None,
+        engine: str = "c",
+        cache: DataFrameCache | None = None,
+        result_cache: ResultCache | None = None,
+        output_executor: OutputExecutor | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
         self.dataframe: pd.DataFrame | None = None
+        self.rows_read = 0
+        self.output_errors: dict[int, Exception] = {}
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.result_cache = result_cache
+        self.output_executor = output_executor
+        self.profiler = profiler
 
         if not logger:
             self.logger = JSONLogger()
         else:
             self.logger = logger
 
+        if engine not in PARSE_ENGINES:
+            raise ValueError(f"Unknown parse engine {engine}.")
+
+        if engine == "pyarrow" and not importlib.util.find_spec("pyarrow"):
+            self.logger.warning(
+                "pyarrow is not installed, falling back to the c parse engine."
+            )
+
+            engine = "c"
+
+        self.engine = engine
+
     """
     Abstract method for performing a data transformation.
 
@@ -74,6 +157,183 @@ class Transform(ABC):
     ) -> None:
         pass
 
+    """
+    Returns the frames read by the transformation when it is run by a
+    `TransformGraph`, mapping each frame to the columns read from it and
+    their dtypes, `None` leaving a column as parsed.
+
+    The "videos" and "categories" frames are loaded from the video CSV and
+    category JSON files, any other frame is produced by another
+    transformation of the graph, no columns meaning the whole frame.
+
+    Returns:
+        dict[str, dict[str, str | None]]
+    """
+
+    def inputs(self) -> dict[str, dict[str, str | None]]:
+        return {}
+
+    """
+    Returns the frames the transformation produces for other
+    transformations of a `TransformGraph`.
+
+    Returns:
+        list[str]
+    """
+
+    def produces(self) -> list[str]:
+        return []
+
+    """
+    Loads the results of the transformation cached for the input files of
+    a `TransformGraph`, which the next call to `derive` reuses as
+    `transform` does rather than computing them.
+
+    The graph calls this before loading the input files, a file read only
+    by transformations whose results are all cached is not loaded. The
+    default caches no results.
+
+    Args:
+        input_paths (list[str]): The input files of the graph, keying
+            cached results.
+
+    Returns:
+        bool: `True` if every result is cached, `derive` is then given no
+            frame loaded from an input file.
+    """
+
+    def reuse_cached_results(self, input_paths: list[str]) -> bool:
+        return False
+
+    """
+    Performs the transformation on frames loaded by a `TransformGraph`
+    rather than reading its input files, then generates each output.
+
+    The frames are shared with other transformations and must not be
+    modified. Results loaded by `reuse_cached_results` are reused, results
+    are otherwise not cached.
+
+    Args:
+        frames (dict[str, pd.DataFrame]): The frames declared by `inputs`.
+        data_outputs (list[DataOutput]): The outputs to generate.
+        output_path (str): The directory the outputs are saved to.
+
+    Returns:
+        dict[str, pd.DataFrame]: The frames declared by `produces`.
+
+    Raises:
+        NotImplementedError: If the transformation cannot be run by a
+            `TransformGraph`.
+    """
+
+    def derive(
+        self,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> dict[str, pd.DataFrame]:
+        raise NotImplementedError(
+            f"{type(self).__name__} cannot be run by a TransformGraph."
+        )
+
+    """
+    Returns the parameters of the transformation that affect its result,
+    these form part of the `result_cache` key.
+
+    Returns:
+        dict[str, Any]: JSON serialisable parameters.
+    """
+
+    def parameters(self) -> dict[str, Any]:
+        return {}
+
+    """
+    Loads the result of a previous run of the transformation over the same
+    inputs from the `result_cache`.
+
+    Args:
+        input_paths (list[str]): The input files of the transformation.
+
+    Returns:
+        tuple[str | None, pd.DataFrame | None]: The cache key, `None` if no
+        `result_cache` is set, and the cached result, `None` on a miss.
+    """
+
+    def cached_result(
+        self, input_paths: list[str]
+    ) -> tuple[str | None, pd.DataFrame | None]:
+        if not self.result_cache:
+            return None, None
+
+        key = self.result_cache.key(
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.parameters(),
+            input_paths,
+        )
+
+        return key, self.result_cache.load(key)
+
+    """
+    Generates each output from `dataframe`.
+
+    When a result cache key is given, outputs whose files match those last
+    generated for the key are skipped and the files of the generated
+    outputs are recorded.
+
+    If an `output_executor` is set the outputs are generated concurrently
+    and a failed output does not stop the others.
+
+    Args:
+        data_outputs (list[DataOutput]): The outputs to generate.
+        output_path (str): The directory the outputs are saved to.
+        result_key (str | None): The `result_cache` key of `dataframe`.
+
+    Returns:
+        None
+    """
+
+    def generate_outputs(
+        self,
+        data_outputs: list[DataOutput],
+        output_path: str,
+        result_key: str | None = None,
+    ) -> None:
+        pending_outputs = []
+
+        for output in data_outputs:
+            if (
+                self.result_cache
+                and result_key
+                and self.result_cache.outputs_current(
+                    result_key, output.output_files(output_path)
+                )
+            ):
+                self.logger.info(
+                    f"{type(output).__name__} is up to date, skipped.",
+                    key=result_key,
+                )
+            else:
+                pending_outputs.append(output)
+
+        errors: dict[int, Exception] = {}
+
+        if self.output_executor:
+            errors = self.output_executor.run(
+                pending_outputs, self.dataframe, output_path
+            )
+        else:
+            for output in pending_outputs:
+                generate(output, self.dataframe, output_path, self.profiler)
+
+        self.output_errors = errors
+
+        if self.result_cache and result_key:
+            for index, output in enumerate(pending_outputs):
+                if index not in errors:
+                    self.result_cache.record_outputs(
+                        result_key, output.output_files(output_path)
+                    )
+
     """
     Load a CSV file into a pandas DataFrame.
 
@@ -81,13 +341,110 @@ class Transform(ABC):
     specified `filepath` and converts it into a pandas DataFrame for
     further data manipulation or analysis.
 
+    The file may be a member of a zip archive, see `open_file`, in which
+    case it is decompressed as it is parsed.
+
+    Subclasses should declare the columns they use and compact dtypes for
+    them, skipped columns are never converted into Python objects.
+
+    If a `cache` is set the parsed DataFrame is loaded from it when
+    available and stored in it otherwise.
+
     Args:
         file_path (str): The file_path from
             where the file should be retrieved.
+        columns (list[str] | None): The columns to parse, all other columns
+            are skipped. Defaults to all columns.
+        dtypes (dict[str, str] | None): The dtype to parse each column as,
+            e.g. {"views": "int64"}. Defaults to inferring dtypes.
 
     Returns:
         pd.DataFrame
     """
 
-    def csv_to_dataframe(self, file_path: str) -> pd.DataFrame:
-        return pd.read_csv(file_path)
+    def csv_to_dataframe(
+        self,
+        file_path: str,
+        columns: list[str] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> pd.DataFrame:
+        if self.cache:
+            dataframe = self.cache.get(file_path, columns, dtypes)
+
+            if dataframe is not None:
+                self.rows_read += len(dataframe)
+
+                return dataframe
+
+        with open_file(file_path) as f:
+            dataframe = pd.read_csv(
+                f, usecols=columns, dtype=dtypes, engine=self.engine
+            )
+
+        if self.cache:
+            self.cache.put(file_path, columns, dtypes, dataframe)
+
+        self.rows_read += len(dataframe)
+
+        return dataframe
+
+    """
+    Load a CSV file as a sequence of pandas DataFrames.
+
+    Each DataFrame holds at most `chunk_size` rows, allowing files to be
+    processed with memory bounded by the chunk size rather than the size
+    of the file. Chunks are always parsed with the "c" engine.
+
+    Args:
+        file_path (str): The file_path from
+            where the file should be retrieved.
+        chunk_size (int): The maximum number of rows in each DataFrame.
+        columns (list[str] | None): The columns to parse, all other columns
+            are skipped. Defaults to all columns.
+        dtypes (dict[str, str] | None): The dtype to parse each column as.
+            Defaults to inferring dtypes.
+
+    Returns:
+        Iterator[pd.DataFrame]
+    """
+
+    def csv_to_dataframe_chunks(
+        self,
+        file_path: str,
+        chunk_size: int,
+        columns: list[str] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        with open_file(file_path) as f:
+            with pd.read_csv(
+                f, usecols=columns, dtype=dtypes, chunksize=chunk_size
+            ) as reader:
+                for chunk in reader:
+                    self.rows_read += len(chunk)
+
+                    yield chunk
+
+    """
+    Load the items of a JSON file, such as a category file, into a pandas
+    DataFrame.
+
+    Nested fields of each item are flattened into columns named by their
+    path, e.g. "snippet.title". The file may be a member of a zip archive,
+    see `open_file`.
+
+    Args:
+        file_path (str): The file_path from
+            where the file should be retrieved.
+        columns (list[str]): The columns to keep.
+
+    Returns:
+        pd.DataFrame
+    """
+
+    def json_to_dataframe(
+        self, file_path: str, columns: list[str]
+    ) -> pd.DataFrame:
+        with open_file(file_path) as f:
+            json_data = json.load(f)
+
+        return pd.json_normalize(json_data["items"])[columns]
@@ -0,0 +1,575 @@
+import os
+from typing import Any, Iterable, Sequence
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.transform.engines import REDUCERS
+from downloader.transform.transform import Transform
+
+# The partial results computed per chunk for each reducer, and how the
+# partial results of several chunks are combined.
+PARTIALS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "mean": ("sum", "count"),
+    "min": ("min",),
+    "max": ("max",),
+}
+COMBINERS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+class Aggregation:
+    """
+    Describes a metric of the video data reduced per group, computed by
+    `TransformAggregations`.
+
+    The result holds a row per group with the group-by columns and the
+    reduced metric, in a column named after the metric, sorted by the
+    metric in descending order. Results grouped by "category_id" also hold
+    the title of each category in a "category" column.
+
+    Attributes:
+        name (str): The name of the result, outputs are saved in a
+            directory of this name.
+        group_by (Sequence[str]): The columns the rows are grouped by, e.g.
+            ["category_id"] or ["channel_title"].
+        metric (str): The column reduced, e.g. "likes".
+        reducer (str): How the metric is reduced, one of `REDUCERS`.
+        outputs (Sequence[DataOutput]): The outputs generated from the
+            result.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        group_by: Sequence[str],
+        metric: str,
+        reducer: str = "sum",
+        outputs: Sequence[DataOutput] = (),
+    ) -> None:
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown reducer {reducer}.")
+
+        if not group_by:
+            raise ValueError(f"Aggregation {name} has no group-by columns.")
+
+        self.name = name
+        self.group_by = tuple(group_by)
+        self.metric = metric
+        self.reducer = reducer
+        self.outputs = outputs
+
+    """
+    Returns the settings of the aggregation that affect its result, these
+    form part of the `result_cache` key.
+
+    Returns:
+        dict[str, Any]: JSON serialisable settings.
+    """
+
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "group_by": list(self.group_by),
+            "metric": self.metric,
+            "reducer": self.reducer,
+        }
+
+
+class TransformAggregations(Transform):
+    """
+    Computes any number of `Aggregation` results from a single scan of the
+    video data.
+
+    The columns used by every aggregation are parsed once. Aggregations
+    sharing the same group-by columns share a single group-by of each chunk
+    or of the whole file, computing the partial results their reducers
+    need, e.g. a sum and a count for a mean. With `chunk_size` set, the
+    partial results of each chunk are combined as the file is streamed, so
+    memory is bounded by the chunk size and the number of groups.
+
+    Each result is cached separately when a `result_cache` is set, and only
+    the aggregations missing from the cache are computed.
+
+    Attributes:
+        aggregations (list[Aggregation]): The aggregations computed.
+
+        results (dict[str, pd.DataFrame]):
+            The result of each aggregation by name, `dataframe` holds the
+            result whose outputs were generated last.
+
+        output_errors (dict[int, Exception]):
+            Inherited from the `Transform` base class. The errors raised by
+            outputs generated concurrently, keyed by position across the
+            outputs of every aggregation in turn.
+
+        VIDEO_DTYPES (dict[str, str]):
+            The dtypes of the numeric columns of the video CSV file, the
+            dtypes of other columns are inferred by the parser.
+    """
+
+    VIDEO_DTYPES = {
+        "category_id": "int32",
+        "views": "int64",
+        "likes": "int64",
+        "dislikes": "int64",
+        "comment_count": "int64",
+    }
+
+    """
+    Initializes the transform with the aggregations to compute.
+
+    Args:
+        aggregations (list[Aggregation]): The aggregations to compute, each
+        must have a different name.
+        **kwargs (Any): The settings of the `Transform` base class.
+    """
+
+    def __init__(
+        self, *, aggregations: list[Aggregation], **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+
+        names = [aggregation.name for aggregation in aggregations]
+
+        if len(set(names)) != len(names):
+            raise ValueError("Aggregation names must be unique.")
+
+        self.aggregations = aggregations
+        self.results: dict[str, pd.DataFrame] = {}
+        self._reused: dict[str, str | None] | None = None
+
+    """
+    Computes every aggregation and generates the outputs of each result.
+
+    The outputs of each aggregation, followed by `data_outputs`, are
+    generated from its result and saved in a directory named after the
+    aggregation within the output path. Outputs already up to date are
+    skipped.
+
+    Args:
+        paths (dict[str, str]):
+            A dictionary containing file paths used during the transformation.
+            The dictionary must include:
+            - `"video_file_path"`: The path to the CSV file containing video
+              data.
+            - `"category_file_path"`: The path to the JSON file containing
+              category information with "id" and "snippet.title".
+            - `"output_path"`: The directory where output files will be saved.
+            The input paths may refer to members of a zip archive.
+        data_outputs (list[DataOutput]):
+            Outputs generated from the result of every aggregation.
+
+    Returns:
+        None
+    """
+
+    def transform(
+        self,
+        paths: dict[str, str],
+        data_outputs: list[DataOutput],
+    ) -> None:
+        self.logger.info("Starting TransformAggregations")
+
+        result_keys = self._load_cached_results(
+            [paths["video_file_path"], paths["category_file_path"]]
+        )
+        pending = self._pending()
+
+        if pending:
+            self._store_results(self._aggregate(paths, pending), result_keys)
+
+        self.logger.info("Completed TransformAggregations")
+
+        self._generate_aggregation_outputs(
+            data_outputs, paths["output_path"], result_keys
+        )
+
+    """
+    Loads the results of a previous run over the video and category files
+    of a `TransformGraph` for the next call to `derive`.
+
+    Args:
+        input_paths (list[str]): The video and category files.
+
+    Returns:
+        bool: `True` if the result of every aggregation is cached.
+    """
+
+    def reuse_cached_results(self, input_paths: list[str]) -> bool:
+        self._reused = self._load_cached_results(input_paths)
+
+        return not self._pending()
+
+    """
+    Computes every aggregation from the frames of a `TransformGraph`, then
+    generates the outputs of each result as `transform` does. Results
+    loaded by `reuse_cached_results` are used instead, no frame is given
+    when every result was loaded.
+
+    Args:
+        frames (dict[str, pd.DataFrame]): The "videos" frame, and the
+        "categories" frame if any aggregation is grouped by category.
+        data_outputs (list[DataOutput]): Outputs generated from the result
+        of every aggregation.
+        output_path (str): The directory the outputs are saved under.
+
+    Returns:
+        dict[str, pd.DataFrame]: The result of each aggregation by name.
+    """
+
+    def derive(
+        self,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> dict[str, pd.DataFrame]:
+        result_keys = (
+            self._load_cached_results([])
+            if self._reused is None
+            else self._reused
+        )
+        self._reused = None
+        pending = self._pending()
+
+        if pending:
+            self._store_results(
+                self._aggregate_chunks(
+                    [frames["videos"]], pending, frames.get("categories")
+                ),
+                result_keys,
+            )
+
+        self._generate_aggregation_outputs(
+            data_outputs, output_path, result_keys
+        )
+
+        return dict(self.results)
+
+    """
+    Returns the video columns read by the aggregations, and the category
+    columns when an aggregation is grouped by category.
+
+    Returns:
+        dict[str, dict[str, str | None]]
+    """
+
+    def inputs(self) -> dict[str, dict[str, str | None]]:
+        columns, dtypes = self._columns(self.aggregations)
+        inputs: dict[str, dict[str, str | None]] = {
+            "videos": {column: dtypes.get(column) for column in columns}
+        }
+
+        if self._by_category(self.aggregations):
+            inputs["categories"] = dict.fromkeys(["id", "snippet.title"])
+
+        return inputs
+
+    """
+    Returns the frame of each aggregation, named after it.
+
+    Returns:
+        list[str]
+    """
+
+    def produces(self) -> list[str]:
+        return [aggregation.name for aggregation in self.aggregations]
+
+    """
+    generates the outputs of each aggregation from its result, in a
+    directory named after the aggregation
+    """
+
+    def _generate_aggregation_outputs(
+        self,
+        data_outputs: list[DataOutput],
+        output_path: str,
+        result_keys: dict[str, str | None],
+    ) -> None:
+        output_errors: dict[int, Exception] = {}
+        position = 0
+
+        for aggregation in self.aggregations:
+            outputs = [*aggregation.outputs, *data_outputs]
+            aggregation_path = os.path.join(output_path, aggregation.name)
+
+            os.makedirs(aggregation_path, exist_ok=True)
+
+            self.dataframe = self.results[aggregation.name]
+            self.generate_outputs(
+                outputs, aggregation_path, result_keys[aggregation.name]
+            )
+
+            for index, error in self.output_errors.items():
+                output_errors[position + index] = error
+
+            position += len(outputs)
+
+        self.output_errors = output_errors
+
+    """
+    parameters affecting every result, the declared dtypes of the video
+    data
+    """
+
+    def parameters(self) -> dict[str, Any]:
+        return {"video_dtypes": self.VIDEO_DTYPES}
+
+    """
+    replaces `results` with the cached result of each aggregation, returning
+    the cache key of each aggregation, `None` without input paths
+    """
+
+    def _load_cached_results(
+        self, input_paths: list[str]
+    ) -> dict[str, str | None]:
+        result_keys: dict[str, str | None] = {}
+        self.results = {}
+
+        for aggregation in self.aggregations:
+            result_key, result = (
+                self._cached_result(aggregation, input_paths)
+                if input_paths
+                else (None, None)
+            )
+            result_keys[aggregation.name] = result_key
+
+            if result is not None:
+                self.results[aggregation.name] = result
+
+        return result_keys
+
+    """
+    returns the aggregations without a result
+    """
+
+    def _pending(self) -> list[Aggregation]:
+        return [
+            aggregation
+            for aggregation in self.aggregations
+            if aggregation.name not in self.results
+        ]
+
+    """
+    adds computed results to `results`, storing each in the `result_cache`
+    """
+
+    def _store_results(
+        self,
+        results: dict[str, pd.DataFrame],
+        result_keys: dict[str, str | None],
+    ) -> None:
+        for name, result in results.items():
+            self.results[name] = result
+            result_key = result_keys[name]
+
+            if self.result_cache and result_key:
+                self.result_cache.store(result_key, result)
+
+    """
+    loads the result of an aggregation from the `result_cache`, returning
+    the cache key and the result, `None` on a miss
+    """
+
+    def _cached_result(
+        self, aggregation: Aggregation, input_paths: list[str]
+    ) -> tuple[str | None, pd.DataFrame | None]:
+        if not self.result_cache:
+            return None, None
+
+        key = self.result_cache.key(
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            {**self.parameters(), **aggregation.parameters()},
+            input_paths,
+        )
+
+        return key, self.result_cache.load(key)
+
+    """
+    computes the given aggregations from a single scan of the video CSV
+    file, in chunks if `chunk_size` is set
+    """
+
+    def _aggregate(
+        self, paths: dict[str, str], aggregations: list[Aggregation]
+    ) -> dict[str, pd.DataFrame]:
+        columns, dtypes = self._columns(aggregations)
+        chunks: Iterable[pd.DataFrame]
+
+        if self.chunk_size:
+            chunks = self.csv_to_dataframe_chunks(
+                paths["video_file_path"], self.chunk_size, columns, dtypes
+            )
+        else:
+            chunks = [
+                self.csv_to_dataframe(
+                    paths["video_file_path"], columns, dtypes
+                )
+            ]
+
+        categories = None
+
+        if self._by_category(aggregations):
+            categories = self.json_to_dataframe(
+                paths["category_file_path"], ["id", "snippet.title"]
+            )
+
+        return self._aggregate_chunks(chunks, aggregations, categories)
+
+    """
+    computes the given aggregations from the chunks of the video data,
+    adding category titles from the categories dataframe, if given, to
+    results grouped by category
+    """
+
+    def _aggregate_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        aggregations: list[Aggregation],
+        categories: pd.DataFrame | None,
+    ) -> dict[str, pd.DataFrame]:
+        columns, dtypes = self._columns(aggregations)
+        partial_columns = self._partial_columns(aggregations)
+        partials: dict[tuple[str, ...], pd.DataFrame] = {}
+
+        for chunk in chunks:
+            for group_by, named in partial_columns.items():
+                partial = self._reduce(chunk, group_by, named)
+
+                if group_by in partials:
+                    partial = self._combine(
+                        pd.concat([partials[group_by], partial])
+                    )
+
+                partials[group_by] = partial
+
+        for group_by, named in partial_columns.items():
+            if group_by not in partials:
+                partials[group_by] = self._reduce(
+                    pd.DataFrame(columns=columns).astype(dtypes),
+                    group_by,
+                    named,
+                )
+
+        if categories is not None:
+            categories = pd.DataFrame(
+                {
+                    "category_id": categories["id"].astype("int32"),
+                    "category": categories["snippet.title"],
+                }
+            )
+
+        return {
+            aggregation.name: self._result(
+                aggregation, partials[aggregation.group_by], categories
+            )
+            for aggregation in aggregations
+        }
+
+    """
+    the columns of the video data read by the given aggregations and the
+    dtypes of the numeric ones
+    """
+
+    def _columns(
+        self, aggregations: list[Aggregation]
+    ) -> tuple[list[str], dict[str, str]]:
+        columns = list(
+            dict.fromkeys(
+                column
+                for aggregation in aggregations
+                for column in [*aggregation.group_by, aggregation.metric]
+            )
+        )
+
+        return columns, {
+            column: self.VIDEO_DTYPES[column]
+            for column in columns
+            if column in self.VIDEO_DTYPES
+        }
+
+    """
+    whether any of the given aggregations is grouped by category
+    """
+
+    def _by_category(self, aggregations: list[Aggregation]) -> bool:
+        return any("category_id" in a.group_by for a in aggregations)
+
+    """
+    the partial result columns computed for each distinct set of group-by
+    columns, mapping each column name to the metric and partial reducer
+    """
+
+    def _partial_columns(
+        self, aggregations: list[Aggregation]
+    ) -> dict[tuple[str, ...], dict[str, tuple[str, str]]]:
+        partial_columns: dict[tuple[str, ...], dict[str, tuple[str, str]]] = {}
+
+        for aggregation in aggregations:
+            named = partial_columns.setdefault(aggregation.group_by, {})
+
+            for partial in PARTIALS[aggregation.reducer]:
+                named[f"{aggregation.metric}.{partial}"] = (
+                    aggregation.metric,
+                    partial,
+                )
+
+        return partial_columns
+
+    """
+    computes the partial results of a dataframe, indexed by the group-by
+    columns
+    """
+
+    def _reduce(
+        self,
+        dataframe: pd.DataFrame,
+        group_by: tuple[str, ...],
+        named: dict[str, tuple[str, str]],
+    ) -> pd.DataFrame:
+        return dataframe.groupby(list(group_by), sort=False).agg(**named)
+
+    """
+    combines the concatenated partial results of several chunks
+    """
+
+    def _combine(self, partials: pd.DataFrame) -> pd.DataFrame:
+        return partials.groupby(
+            level=list(range(partials.index.nlevels)), sort=False
+        ).agg(
+            {
+                column: COMBINERS[column.rsplit(".", 1)[1]]
+                for column in partials.columns
+            }
+        )
+
+    """
+    builds the result of an aggregation from its partial results, adding
+    category titles when grouped by category
+    """
+
+    def _result(
+        self,
+        aggregation: Aggregation,
+        partials: pd.DataFrame,
+        categories: pd.DataFrame | None,
+    ) -> pd.DataFrame:
+        metric = aggregation.metric
+
+        if aggregation.reducer == "mean":
+            values = partials[f"{metric}.sum"] / partials[f"{metric}.count"]
+        else:
+            values = partials[f"{metric}.{aggregation.reducer}"]
+
+        result = (
+            values.rename(metric)
+            .reset_index()
+            .sort_values(by=[metric], ascending=[False], kind="stable")
+            .reset_index(drop=True)
+        )
+
+        if categories is not None and "category_id" in aggregation.group_by:
+            result = result.merge(categories, on="category_id", how="left")
+
+        return result
@@ -0,0 +1,263 @@
+from typing import Any, Iterator
+
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.transform.engines import COUNT_METRICS
+from downloader.transform.heavy_hitters import HeavyHitters
+from downloader.transform.transform import Transform
+
+
+class TransformTopK(Transform):
+    """
+    Computes the `k` keys with the largest summed metric, e.g. the top
+    channels by views or the top videos by likes, over one or more video
+    files such as those of every country.
+
+    Without a `capacity` the metric is summed exactly per key, which holds
+    a row per distinct key in memory. With a `capacity` the files are
+    streamed into a `HeavyHitters` summary of at most `capacity` keys,
+    bounding memory by the chunk size and the capacity, see
+    `HeavyHitters` for the error bounds. With `verify` also set, a second
+    pass sums the metric exactly for the keys of the summary only, giving
+    exact sums, and the exact top `k` whenever `guaranteed` is set.
+
+    The result holds a row per key, heaviest first, with the key, the
+    summed metric, a lower bound when estimated, and a "max_error" column
+    giving how much larger the true sum may be.
+
+    Attributes:
+        key (str): The column the metric is summed per, e.g.
+            "channel_title".
+        metric (str): The count column summed, one of `VIDEO_DTYPES`.
+        k (int): The number of keys kept.
+        capacity (int | None): The number of keys held by the summary,
+            `None` sums exactly.
+        verify (bool): Whether the keys of the summary are summed exactly
+            in a second pass.
+        summary (HeavyHitters | None): The summary of the last
+            transformation.
+        guaranteed (bool): Whether the keys of the result are known to be
+            the top `k`, always set when summing exactly.
+
+        VIDEO_DTYPES (dict[str, str]):
+            The count columns of the video CSV file and their dtypes.
+
+        SKETCH_CHUNK_SIZE (int):
+            The number of rows streamed at a time into the summary when
+            `chunk_size` is not set.
+    """
+
+    VIDEO_DTYPES = {metric: "int64" for metric in COUNT_METRICS}
+    SKETCH_CHUNK_SIZE = 1_000_000
+
+    """
+    Initializes the transform.
+
+    Args:
+        key (str): The column the metric is summed per.
+        metric (str): The count column summed.
+        k (int): The number of keys kept. Defaults to 10.
+        capacity (int | None): The number of keys held by the summary, at
+        least `k`. If not provided, the metric is summed exactly.
+        verify (bool): Whether the keys of the summary are summed exactly in
+        a second pass. Defaults to False.
+        **kwargs (Any): The settings of the `Transform` base class.
+    """
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        metric: str,
+        k: int = 10,
+        capacity: int | None = None,
+        verify: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if metric not in self.VIDEO_DTYPES:
+            raise ValueError(f"{metric} is not a count column.")
+
+        if k < 1 or (capacity is not None and capacity < k):
+            raise ValueError("The capacity must be at least k, at least 1.")
+
+        self.key = key
+        self.metric = metric
+        self.k = k
+        self.capacity = capacity
+        self.verify = verify
+        self.summary: HeavyHitters | None = None
+        self.guaranteed = False
+
+    """
+    Computes the top `k` keys of the video file and generates each output.
+
+    Args:
+        paths (dict[str, str]):
+            A dictionary containing file paths used during the transformation.
+            The dictionary must include:
+            - `"video_file_path"`: The path to the CSV file containing video
+              data, which may refer to a member of a zip archive.
+            - `"output_path"`: The directory where output files will be saved.
+        data_outputs (list[DataOutput]):
+            A list of `DataOutput` instances to define and handle
+            the output generation process for the transformed data.
+
+    Returns:
+        None
+    """
+
+    def transform(
+        self,
+        paths: dict[str, str],
+        data_outputs: list[DataOutput],
+    ) -> None:
+        self.dataframe = self.top_k([paths["video_file_path"]])
+
+        self.generate_outputs(data_outputs, paths["output_path"])
+
+    """
+    Computes the top `k` keys over several video files, e.g. the video
+    files of every country.
+
+    Args:
+        file_paths (list[str]): The video CSV files, which may refer to
+        members of zip archives.
+
+    Returns:
+        pd.DataFrame: The result, also stored in `dataframe`.
+    """
+
+    def top_k(self, file_paths: list[str]) -> pd.DataFrame:
+        self.logger.info(
+            "Starting TransformTopK",
+            key=self.key,
+            metric=self.metric,
+            capacity=self.capacity,
+        )
+
+        if self.capacity is None:
+            sums = self._exact_sums(file_paths)
+            error = 0
+            self.guaranteed = True
+        else:
+            self.summary = HeavyHitters(capacity=self.capacity)
+
+            for chunk in self._chunks(file_paths):
+                self.summary.update(chunk[self.key], chunk[self.metric])
+
+            sums = self.summary.counts
+            error = self.summary.error
+
+            if self.verify:
+                sums = self._exact_sums(file_paths, set(sums.index))
+
+            self.guaranteed = self._guaranteed(sums, error)
+
+        top = sums.sort_values(ascending=False, kind="stable").head(self.k)
+        self.dataframe = pd.DataFrame(
+            {
+                self.key: top.index,
+                self.metric: top.to_numpy(),
+                "max_error": 0 if self.verify else error,
+            }
+        )
+
+        self.logger.info(
+            "Completed TransformTopK",
+            max_error=error,
+            guaranteed=self.guaranteed,
+        )
+
+        return self.dataframe
+
+    """
+    parameters affecting the result
+    """
+
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "key": self.key,
+            "metric": self.metric,
+            "k": self.k,
+            "capacity": self.capacity,
+            "verify": self.verify,
+        }
+
+    """
+    streams the key and metric columns of each file in chunks
+    """
+
+    def _chunks(self, file_paths: list[str]) -> Iterator[pd.DataFrame]:
+        for file_path in file_paths:
+            yield from self.csv_to_dataframe_chunks(
+                file_path,
+                self.chunk_size or self.SKETCH_CHUNK_SIZE,
+                [self.key, self.metric],
+                {self.key: "str", self.metric: self.VIDEO_DTYPES[self.metric]},
+            )
+
+    """
+    sums the metric exactly per key, of the given candidate keys only when
+    set. Files are read in full unless `chunk_size` is set or candidates
+    are given, in which case they are streamed
+    """
+
+    def _exact_sums(
+        self, file_paths: list[str], candidates: set[Any] | None = None
+    ) -> pd.Series:
+        if candidates is None and not self.chunk_size:
+            chunks: Iterator[pd.DataFrame] = (
+                self.csv_to_dataframe(
+                    file_path,
+                    [self.key, self.metric],
+                    {
+                        self.key: "str",
+                        self.metric: self.VIDEO_DTYPES[self.metric],
+                    },
+                )
+                for file_path in file_paths
+            )
+        else:
+            chunks = self._chunks(file_paths)
+
+        sums = pd.Series(dtype="int64")
+
+        for chunk in chunks:
+            if candidates is not None:
+                chunk = chunk[chunk[self.key].isin(candidates)]
+
+            sums = (
+                pd.concat(
+                    [
+                        sums,
+                        chunk.groupby(self.key, sort=False)[self.metric].sum(),
+                    ]
+                )
+                .groupby(level=0, sort=False)
+                .sum()
+            )
+
+        return sums
+
+    """
+    whether the `k` heaviest keys of the sums are known to be the top `k`.
+    A key missing from a summary weighs at most `error`, and a summed key at
+    most its sum plus `error` unless summed exactly
+    """
+
+    def _guaranteed(self, sums: pd.Series, error: int) -> bool:
+        if not error:
+            return True
+
+        ranked = sums.sort_values(ascending=False, kind="stable").to_numpy()
+
+        if len(ranked) < self.k or ranked[self.k - 1] < error:
+            return False
+
+        if self.verify or len(ranked) == self.k:
+            return True
+
+        return bool(ranked[self.k - 1] >= ranked[self.k] + error)
@@ -0,0 +1,519 @@
+import hashlib
+import os
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from downloader.data_output.data_output import DataOutput
+from downloader.data_retrieve.manifest import HASH_BLOCK_SIZE
+from downloader.transform.daily_store import DailyStore
+from downloader.transform.transform import Transform
+
+
+class TransformViewsTimeSeries(Transform):
+    """
+    Transforms video view data into the views of each category on each
+    trending date.
+
+    The views per category per day are kept in a `DailyStore`, so a new
+    dataset version only aggregates the trending dates the store does not
+    hold yet and appends them, older days are never recomputed. The last
+    day held is aggregated again, as the version it came from may have been
+    published before that day was complete. Outputs are then generated
+    from the compact store rather than from the video data.
+
+    The size and digest of the video CSV file, its trending dates and the
+    dataset version are recorded with the store. When a later version of
+    the file starts with the recorded file unchanged, as when a dataset
+    only appends rows, only the rows appended are parsed and their views
+    added to the days held. Otherwise, or when the file is a member of a
+    zip archive, the whole file is parsed and the rows of days held
+    skipped.
+
+    A version earlier than the one recorded leaves the store unchanged, its
+    days are aggregated from its own file alone. Days of earlier versions
+    are kept even once a later version no longer holds them, but only the
+    days of the file transformed are output. A version revising days
+    already held is only picked up when the store is rebuilt. The store is
+    locked while it is updated, so versions of a dataset sharing a store
+    may be transformed concurrently.
+
+    Attributes:
+        dataframe (pd.DataFrame | None):
+            Inherited from the `Transform` base class. Stores the views, in
+            millions, of each category on each trending date.
+
+        chunk_size (int | None):
+            Inherited from the `Transform` base class. When set the video
+            data is streamed in chunks of this many rows, bounding memory by
+            the chunk size and the number of new days.
+
+        store (DailyStore):
+            The store of the views per category per day.
+
+        rebuild (bool):
+            Whether the store is cleared and every day aggregated again.
+
+        version (str | None):
+            The dataset version transformed, `None` if unknown. Versions
+            are compared as integers.
+
+        dates_added (list[str]):
+            The ISO dates aggregated by the last transformation.
+
+        VIDEO_DTYPES (dict[str, str]):
+            The columns read from the video CSV file and their dtypes.
+
+        CATEGORY_COLUMNS (tuple[str, ...]):
+            The columns read from the category JSON file.
+
+        DATE_FORMAT (str):
+            The format of trending dates in the video CSV file.
+    """
+
+    VIDEO_DTYPES = {
+        "trending_date": "str",
+        "category_id": "int32",
+        "views": "int64",
+    }
+    CATEGORY_COLUMNS = ("id", "snippet.title")
+    DATE_FORMAT = "%y.%d.%m"
+
+    """
+    Initializes the transform.
+
+    Args:
+        store_path (str): The directory of the `DailyStore`.
+        rebuild (bool): Whether the store is cleared before the next
+        transformation. Defaults to False.
+        version (str | None): The dataset version transformed. Defaults to
+        None, in which case the store is always updated.
+        **kwargs (Any): The settings of the `Transform` base class.
+    """
+
+    def __init__(
+        self,
+        *,
+        store_path: str,
+        rebuild: bool = False,
+        version: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self.store = DailyStore(store_path=store_path, logger=self.logger)
+        self.rebuild = rebuild
+        self.version = version
+        self.dates_added: list[str] = []
+
+    """
+    Appends the views per category of each new trending date to the store,
+    then transforms the store into the views per category per day.
+
+    This method performs the following steps:
+    - Clears the store if `rebuild` is set.
+    - Reads the rows appended to the video data since the last
+      transformation, or all the video data if its earlier rows changed
+      or the store holds a later version, in chunks if `chunk_size` is set.
+    - Sums the views per category of each trending date, adding appended
+      rows to the days held and skipping rows of days already held.
+    - Appends those days to the store and records the video data read,
+      unless the store holds a later version.
+    - Merges the days of the video data with the category details,
+      dropping rows with missing category information.
+    - Normalizes the number of views by dividing them by 1,000,000.
+    - Stores the transformed data into `self.dataframe`.
+    - Generates outputs using the provided `data_outputs`.
+
+    Args:
+        paths (dict[str, str]):
+            A dictionary containing file paths used during the transformation.
+            The dictionary must include:
+            - `"video_file_path"`: The path to the CSV file containing video
+              data with "trending_date", "category_id" and "views" columns.
+            - `"category_file_path"`: The path to the JSON file containing
+              category information with "id" and "snippet.title".
+            - `"output_path"`: The directory where output files will be saved.
+            The input paths may refer to members of a zip archive.
+        data_outputs (list[DataOutput]):
+            A list of `DataOutput` instances to define and handle
+            the output generation process for the transformed data.
+
+    Returns:
+        None
+    """
+
+    def transform(
+        self,
+        paths: dict[str, str],
+        data_outputs: list[DataOutput],
+    ) -> None:
+        self.logger.info("Starting TransformViewsTimeSeries")
+
+        with self.store.lock():
+            if self.rebuild:
+                self.store.clear()
+
+            self.dates_added = []
+
+            file_path = paths["video_file_path"]
+            columns = list(self.VIDEO_DTYPES)
+            recorded = self.store.source()
+            store_ahead = self._store_ahead(recorded)
+            offset, source = (
+                (None, {})
+                if store_ahead
+                else self._appended_offset(file_path, recorded)
+            )
+            seen = [] if store_ahead else self._seen_dates()
+            present: set[str] = set()
+
+            if offset is not None:
+                present.update(recorded["dates"])
+                views = self._add_stored(
+                    self._combine(
+                        self._views_per_day(chunk, [], present)
+                        for chunk in self._appended_chunks(file_path, offset)
+                    )
+                )
+            elif not self.chunk_size:
+                views = self._views_per_day(
+                    self.csv_to_dataframe(
+                        file_path, columns, self.VIDEO_DTYPES
+                    ),
+                    seen,
+                    present,
+                )
+            else:
+                views = self._combine(
+                    self._views_per_day(chunk, seen, present)
+                    for chunk in self.csv_to_dataframe_chunks(
+                        file_path, self.chunk_size, columns, self.VIDEO_DTYPES
+                    )
+                )
+
+            self.dataframe = self._time_series(
+                views if store_ahead else self._record(views, source, present),
+                self.json_to_dataframe(
+                    paths["category_file_path"], list(self.CATEGORY_COLUMNS)
+                ),
+            )
+
+        self.logger.info(
+            "Completed TransformViewsTimeSeries",
+            dates_added=len(self.dates_added),
+        )
+
+        self.generate_outputs(data_outputs, paths["output_path"])
+
+    """
+    Appends the new trending dates of the video frame of a
+    `TransformGraph` to the store, then transforms the store into the
+    views per category of each day of the frame and generates each output.
+    The store is left unchanged when it holds a later version. As the file
+    the frame was read from is not known, the next transformation parses
+    the whole file.
+
+    Args:
+        frames (dict[str, pd.DataFrame]): The "videos" and "categories"
+        frames.
+        data_outputs (list[DataOutput]): The outputs to generate.
+        output_path (str): The directory the outputs are saved to.
+
+    Returns:
+        dict[str, pd.DataFrame]: No frames are produced.
+    """
+
+    def derive(
+        self,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> dict[str, pd.DataFrame]:
+        with self.store.lock():
+            if self.rebuild:
+                self.store.clear()
+
+            self.dates_added = []
+
+            store_ahead = self._store_ahead(self.store.source())
+            present: set[str] = set()
+            views = self._views_per_day(
+                frames["videos"],
+                [] if store_ahead else self._seen_dates(),
+                present,
+            )
+
+            self.dataframe = self._time_series(
+                views if store_ahead else self._record(views, {}, present),
+                frames["categories"],
+            )
+
+        self.logger.info(
+            "Completed TransformViewsTimeSeries",
+            dates_added=len(self.dates_added),
+        )
+
+        self.generate_outputs(data_outputs, output_path)
+
+        return {}
+
+    """
+    Returns the video columns and the category columns read.
+
+    Returns:
+        dict[str, dict[str, str | None]]
+    """
+
+    def inputs(self) -> dict[str, dict[str, str | None]]:
+        return {
+            "videos": dict(self.VIDEO_DTYPES),
+            "categories": dict.fromkeys(self.CATEGORY_COLUMNS),
+        }
+
+    """
+    returns the days held which are not aggregated again when the whole
+    video file is parsed, every day but the last
+    """
+
+    def _seen_dates(self) -> list[str]:
+        return self.store.dates()[:-1]
+
+    """
+    returns whether the store holds a version later than the one
+    transformed, which then leaves the store unchanged
+    """
+
+    def _store_ahead(self, recorded: dict[str, Any]) -> bool:
+        recorded_version = str(recorded.get("version", ""))
+
+        if not (
+            self.version
+            and self.version.isdigit()
+            and recorded_version.isdigit()
+            and int(self.version) < int(recorded_version)
+        ):
+            return False
+
+        self.logger.info(
+            "Daily store holds a later version, leaving it unchanged.",
+            version=self.version,
+            store_version=recorded_version,
+        )
+
+        return True
+
+    """
+    hashes the video file in a single pass, returning the offset of the
+    rows appended since the recorded file if the file starts with it, and
+    the details to record for the file, empty for archive members and files
+    not ending in a line break
+    """
+
+    def _appended_offset(
+        self, file_path: str, recorded: dict[str, Any]
+    ) -> tuple[int | None, dict[str, Any]]:
+        if not os.path.isfile(file_path):
+            return None, {}
+
+        size = os.path.getsize(file_path)
+        prefix_size = recorded.get("size", 0) if "dates" in recorded else 0
+        prefix_matches = False
+        digest = hashlib.sha256()
+
+        with open(file_path, "rb") as f:
+            if 0 < prefix_size <= size:
+                remaining = prefix_size
+
+                while remaining:
+                    block = f.read(min(HASH_BLOCK_SIZE, remaining))
+                    digest.update(block)
+                    remaining -= len(block)
+
+                prefix_matches = digest.hexdigest() == recorded.get("sha256")
+
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+            f.seek(max(size - 1, 0))
+            ends_with_line_break = f.read(1) == b"\n"
+
+        return (
+            prefix_size if prefix_matches else None,
+            (
+                {"size": size, "sha256": digest.hexdigest()}
+                if ends_with_line_break
+                else {}
+            ),
+        )
+
+    """
+    parses the rows of the video file from an offset, using the column
+    names of its header, in chunks if `chunk_size` is set
+    """
+
+    def _appended_chunks(
+        self, file_path: str, offset: int
+    ) -> Iterator[pd.DataFrame]:
+        if offset >= os.path.getsize(file_path):
+            return
+
+        options: dict[str, Any] = {
+            "header": None,
+            "names": list(pd.read_csv(file_path, nrows=0).columns),
+            "usecols": list(self.VIDEO_DTYPES),
+            "dtype": self.VIDEO_DTYPES,
+        }
+
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+
+            if not self.chunk_size:
+                dataframe = pd.read_csv(f, engine=self.engine, **options)
+                self.rows_read += len(dataframe)
+
+                yield dataframe
+
+                return
+
+            with pd.read_csv(
+                f, chunksize=self.chunk_size, **options
+            ) as reader:
+                for chunk in reader:
+                    self.rows_read += len(chunk)
+
+                    yield chunk
+
+    """
+    adds the views per category held for each day to those of the rows
+    appended on that day
+    """
+
+    def _add_stored(self, views: pd.DataFrame) -> pd.DataFrame:
+        stored = self.store.load(
+            list(
+                pd.Series(views["trending_date"].unique()).dt.strftime(
+                    "%Y-%m-%d"
+                )
+            )
+        )
+
+        if stored is None:
+            return views
+
+        return self._combine([stored, views])
+
+    """
+    sums the views per category of each trending date not yet seen, adding
+    every trending date of the frame to `present`. Each distinct trending
+    date is parsed once and rows are filtered and grouped by the integer
+    code of their date rather than the date text
+    """
+
+    def _views_per_day(
+        self, dataframe: pd.DataFrame, seen: list[str], present: set[str]
+    ) -> pd.DataFrame:
+        codes, date_texts = pd.factorize(dataframe["trending_date"])
+        dates = pd.to_datetime(
+            pd.Series(date_texts, dtype="str"), format=self.DATE_FORMAT
+        )
+        iso_dates = dates.dt.strftime("%Y-%m-%d")
+        new_dates = ~iso_dates.isin(seen).to_numpy()
+        present.update(iso_dates)
+        mask = codes >= 0
+        mask[mask] = new_dates[codes[mask]]
+
+        views = (
+            pd.DataFrame(
+                {
+                    "date_code": codes[mask],
+                    "category_id": dataframe["category_id"].to_numpy()[mask],
+                    "views": dataframe["views"].to_numpy()[mask],
+                }
+            )
+            .groupby(["date_code", "category_id"], sort=False)["views"]
+            .sum()
+            .reset_index()
+        )
+
+        return pd.DataFrame(
+            {
+                "trending_date": dates.to_numpy()[
+                    views["date_code"].to_numpy(dtype=np.intp)
+                ],
+                "category_id": views["category_id"],
+                "views": views["views"],
+            }
+        )
+
+    """
+    combines the views per category per day of each chunk
+    """
+
+    def _combine(self, chunk_views: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        frames = list(chunk_views)
+
+        if not frames:
+            return pd.DataFrame(
+                {
+                    "trending_date": pd.Series(dtype="datetime64[ns]"),
+                    "category_id": pd.Series(dtype="int32"),
+                    "views": pd.Series(dtype="int64"),
+                }
+            )
+
+        views = pd.concat(frames, ignore_index=True)
+
+        return (
+            views.groupby(["trending_date", "category_id"], sort=False)[
+                "views"
+            ]
+            .sum()
+            .reset_index()
+        )
+
+    """
+    appends the new days to the store, recording the video file they were
+    read from with its trending dates and the version, and returns the
+    days held of those dates. The recorded file is removed while days are
+    appended, so an interrupted append is never taken for the file
+    """
+
+    def _record(
+        self, views: pd.DataFrame, source: dict[str, Any], present: set[str]
+    ) -> pd.DataFrame:
+        self.store.record_source(None)
+        self.dates_added = self.store.append(views)
+        self.store.record_source(
+            {
+                **source,
+                **({"version": self.version} if self.version else {}),
+                "dates": sorted(present),
+            }
+        )
+        stored = self.store.load(sorted(present))
+
+        return views if stored is None else stored
+
+    """
+    merges the views per category per day with the category titles, in
+    date order and views in millions. The categories dataframe is left
+    unchanged as it may be shared
+    """
+
+    def _time_series(
+        self, views: pd.DataFrame, categories_dataframe: pd.DataFrame
+    ) -> pd.DataFrame:
+        time_series = views.merge(
+            categories_dataframe.assign(
+                id=categories_dataframe["id"].astype(int)
+            ),
+            left_on="category_id",
+            right_on="id",
+            how="inner",
+        ).sort_values(["trending_date", "category_id"], ignore_index=True)
+
+        time_series["views"] = time_series["views"] / 1_000_000
+
+        return time_series
@@ -1,8 +1,9 @@
-import json
+from typing import Any
 
 import pandas as pd
 
 from downloader.data_output.data_output import DataOutput
+from downloader.transform.engines import SNAPSHOTS
 from downloader.transform.transform import Transform
 
 
@@ -22,20 +23,75 @@ class TransformViewsToCategories(Transform):
         logger (JSONLogger):
             Inherited from the `Transform` base class. Used to log information,
             warnings, and errors during the transformation process.
+
+        chunk_size (int | None):
+            Inherited from the `Transform` base class. When set the video
+            data is streamed in chunks of this many rows and the views are
+            summed per chunk, bounding memory by the chunk size and the
+            number of categories, or by the number of videos when
+            `snapshot` is set.
+
+        snapshot (str | None):
+            The dataset holds a row per video for each day it trended, with
+            the views counted so far. When `None` every row is summed, so a
+            video's views are counted once per day it trended. Otherwise
+            only one snapshot of each video is summed, its "latest" row by
+            trending date or its "peak" row by views.
+
+            Snapshots are kept without sorting, by taking the row holding
+            the maximum of each video in a single grouping pass, and when
+            streaming only the snapshot of each video seen so far is kept
+            between chunks.
+
+        VIDEO_DTYPES (dict[str, str]):
+            The columns read from the video CSV file and their dtypes.
+
+        SNAPSHOT_DTYPES (dict[str, str]):
+            The further columns read when `snapshot` is set.
+
+        CATEGORY_COLUMNS (tuple[str, ...]):
+            The columns read from the category JSON file.
     """
 
+    VIDEO_DTYPES = {"category_id": "int32", "views": "int64"}
+    SNAPSHOT_DTYPES = {"video_id": "str", "trending_date": "str"}
+    CATEGORY_COLUMNS = ("id", "snippet.title")
+
+    """
+    Initializes the transform.
+
+    Args:
+        snapshot (str | None): The snapshot of each video summed, one of
+        `SNAPSHOTS`. If not provided, every row is summed.
+        **kwargs (Any): The settings of the `Transform` base class.
+    """
+
+    def __init__(self, *, snapshot: str | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+        if snapshot is not None and snapshot not in SNAPSHOTS:
+            raise ValueError(f"Unknown snapshot {snapshot}.")
+
+        self.snapshot = snapshot
+        self._reused: tuple[str | None, pd.DataFrame | None] = (None, None)
+
     """
     Transforms video view data into aggregated category-level view data.
 
     This method performs the following steps:
+    - Reuses the result of a previous run over the same inputs if a
+      `result_cache` is set, otherwise:
     - Reads video data and category data from CSV and JSON files.
-    - Aggregates video views per category.
+    - Reduces the video data to one snapshot per video if `snapshot` is
+      set.
+    - Aggregates video views per category, in chunks if `chunk_size` is set.
     - Merges video views data with corresponding category details.
     - Normalizes the number of views by dividing them by 1,000,000.
     - Sorts the data by the number of views in descending order and removes
       any rows with missing category information.
     - Stores the transformed data into `self.dataframe`.
-    - Generates outputs using the provided `data_outputs`.
+    - Generates outputs using the provided `data_outputs`, skipping those
+      already up to date.
 
     Args:
         paths (dict[str, str]):
@@ -46,6 +102,7 @@ class TransformViewsToCategories(Transform):
             - `"category_file_path"`: The path to the JSON file containing
               category information with "id" and "snippet.title".
             - `"output_path"`: The directory where output files will be saved.
+            The input paths may refer to members of a zip archive.
         data_outputs (list[DataOutput]):
             A list of `DataOutput` instances to define and handle
             the output generation process for the transformed data.
@@ -61,20 +118,146 @@ class TransformViewsToCategories(Transform):
     ) -> None:
         self.logger.info("Starting TransformViewsToCategories")
 
-        videos_dataframe = self.csv_to_dataframe(paths["video_file_path"])[
-            ["category_id", "views"]
-        ]
+        result_key, self.dataframe = self.cached_result(
+            [paths["video_file_path"], paths["category_file_path"]]
+        )
+
+        if self.dataframe is None:
+            self.dataframe = self._views_to_categories(paths)
+
+            if self.result_cache and result_key:
+                self.result_cache.store(result_key, self.dataframe)
+
+        self.logger.info("Completed TransformViewsToCategories")
+
+        self.generate_outputs(data_outputs, paths["output_path"], result_key)
+
+    """
+    Loads the result of a previous run over the video and category files
+    of a `TransformGraph` for the next call to `derive`.
+
+    Args:
+        input_paths (list[str]): The video and category files.
+
+    Returns:
+        bool: `True` if the result is cached.
+    """
+
+    def reuse_cached_results(self, input_paths: list[str]) -> bool:
+        self._reused = self.cached_result(input_paths)
+
+        return self._reused[1] is not None
+
+    """
+    Transforms the video and category frames of a `TransformGraph` into
+    aggregated category-level view data, then generates each output. A
+    result loaded by `reuse_cached_results` is used instead, no frame is
+    then given.
+
+    Args:
+        frames (dict[str, pd.DataFrame]): The "videos" and "categories"
+        frames.
+        data_outputs (list[DataOutput]): The outputs to generate.
+        output_path (str): The directory the outputs are saved to.
+
+    Returns:
+        dict[str, pd.DataFrame]: The "views_to_categories" frame.
+    """
+
+    def derive(
+        self,
+        frames: dict[str, pd.DataFrame],
+        data_outputs: list[DataOutput],
+        output_path: str,
+    ) -> dict[str, pd.DataFrame]:
+        result_key, self.dataframe = self._reused
+        self._reused = (None, None)
+
+        if self.dataframe is None:
+            videos_dataframe = frames["videos"][list(self.video_dtypes())]
+
+            if self.snapshot:
+                videos_dataframe = self._snapshots(videos_dataframe)
+
+            self.dataframe = self._merge_categories(
+                self._sum_views(videos_dataframe), frames["categories"]
+            )
+
+            if self.result_cache and result_key:
+                self.result_cache.store(result_key, self.dataframe)
+
+        self.generate_outputs(data_outputs, output_path, result_key)
 
-        categories_dataframe = self._json_to_dataframe(
-            paths["category_file_path"]
-        )[["id", "snippet.title"]]
+        return {"views_to_categories": self.dataframe}
 
-        categories_dataframe["id"] = categories_dataframe["id"].astype(int)
+    """
+    Returns the video columns and the category columns read.
+
+    Returns:
+        dict[str, dict[str, str | None]]
+    """
+
+    def inputs(self) -> dict[str, dict[str, str | None]]:
+        return {
+            "videos": dict(self.video_dtypes()),
+            "categories": dict.fromkeys(self.CATEGORY_COLUMNS),
+        }
+
+    """
+    Returns the frame holding the views per category.
+
+    Returns:
+        list[str]
+    """
+
+    def produces(self) -> list[str]:
+        return ["views_to_categories"]
+
+    """
+    Returns the columns read from the video CSV file and their dtypes.
+
+    Returns:
+        dict[str, str]
+    """
+
+    def video_dtypes(self) -> dict[str, str]:
+        if self.snapshot:
+            return {**self.VIDEO_DTYPES, **self.SNAPSHOT_DTYPES}
+
+        return self.VIDEO_DTYPES
+
+    """
+    parameters affecting the result, the declared dtypes of the video data
+    and the snapshot summed
+    """
+
+    def parameters(self) -> dict[str, Any]:
+        return {"video_dtypes": self.video_dtypes(), "snapshot": self.snapshot}
+
+    """
+    computes the views per category from the video and category files
+    """
+
+    def _views_to_categories(self, paths: dict[str, str]) -> pd.DataFrame:
+        return self._merge_categories(
+            self._views_per_category(paths["video_file_path"]),
+            self.json_to_dataframe(
+                paths["category_file_path"], list(self.CATEGORY_COLUMNS)
+            ),
+        )
+
+    """
+    merges the views per category with the category titles, the categories
+    dataframe is left unchanged as it may be shared
+    """
 
-        videos_dataframe = (
-            videos_dataframe.groupby("category_id")["views"]
-            .sum()
-            .reset_index()
+    def _merge_categories(
+        self,
+        videos_dataframe: pd.DataFrame,
+        categories_dataframe: pd.DataFrame,
+    ) -> pd.DataFrame:
+        categories_dataframe = categories_dataframe.assign(
+            id=categories_dataframe["id"].astype(int)
         )
 
         videos_dataframe = videos_dataframe.merge(
@@ -90,19 +273,71 @@ class TransformViewsToCategories(Transform):
 
         videos_dataframe["views"] = videos_dataframe["views"] / 1_000_000
 
-        self.dataframe = videos_dataframe
+        return videos_dataframe
 
-        self.logger.info("Completed TransformViewsToCategories")
+    """
+    sums the views per category in the video CSV file, of one snapshot per
+    video if `snapshot` is set. When `chunk_size` is set the file is
+    streamed and the per chunk sums, or snapshots, are combined
+    """
+
+    def _views_per_category(self, file_path: str) -> pd.DataFrame:
+        dtypes = self.video_dtypes()
+        columns = list(dtypes)
+        reduce = self._snapshots if self.snapshot else self._sum_views
 
-        for output in data_outputs:
-            output.generate(self.dataframe, paths["output_path"])
+        if not self.chunk_size:
+            views = reduce(
+                self.csv_to_dataframe(file_path, columns, dtypes)[columns]
+            )
+        else:
+            views = None
+
+            for chunk in self.csv_to_dataframe_chunks(
+                file_path, self.chunk_size, columns, dtypes
+            ):
+                chunk_views = reduce(chunk[columns])
+
+                if views is None:
+                    views = chunk_views
+                else:
+                    views = reduce(pd.concat([views, chunk_views]))
+
+            if views is None:
+                views = reduce(pd.DataFrame(columns=columns).astype(dtypes))
+
+        if self.snapshot:
+            return self._sum_views(views)
+
+        return views
 
     """
-    converts the categories json file into a pandas dataframe
+    keeps the snapshot of each video, the row with the latest trending date
+    or the most views, using the position of each video's maximum rather
+    than sorting. Trending dates are converted to datetimes once, so
+    snapshots can be combined again
     """
 
-    def _json_to_dataframe(self, file_path: str) -> pd.DataFrame:
-        with open(file_path) as f:
-            json_data = json.load(f)
+    def _snapshots(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        if self.snapshot == "peak":
+            key = "views"
+        else:
+            key = "trending_date"
+
+            if not pd.api.types.is_datetime64_any_dtype(dataframe[key]):
+                dataframe = dataframe.assign(
+                    trending_date=pd.to_datetime(
+                        dataframe[key], format="%y.%d.%m"
+                    )
+                )
+
+        return dataframe.loc[
+            dataframe.groupby("video_id", sort=False)[key].idxmax()
+        ]
+
+    """
+    sums the views per category of a dataframe
+    """
 
-        return pd.json_normalize(json_data["items"])
+    def _sum_views(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return dataframe.groupby("category_id")["views"].sum().reset_index()
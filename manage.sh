@@ -11,6 +11,14 @@ elif [ "$ACTION" == "logs" ]; then
   docker-compose --project-directory "$SCRIPT_DIR"/ logs -f -t
 elif [ "$ACTION" == "generate" ]; then
   docker exec -it kaggle bash -c "cd .. && python -m downloader.main $*"
+elif [ "$ACTION" == "watch" ]; then
+  docker exec -d kaggle bash -c "cd .. && python -m downloader.main watch $*"
+elif [ "$ACTION" == "batch" ]; then
+  docker exec -it kaggle bash -c "cd .. && python -m downloader.main batch $*"
+elif [ "$ACTION" == "query" ]; then
+  docker exec -it kaggle bash -c "cd .. && python -m downloader.main query $*"
+elif [ "$ACTION" == "serve" ]; then
+  docker exec -d kaggle bash -c "cd .. && python -m downloader.main serve --host 0.0.0.0 $*"
 elif [ "$ACTION" == "tests" ]; then
   docker exec -it kaggle bash -c "pytest"
 elif [ "$ACTION" == "mypy" ]; then